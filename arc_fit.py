@@ -0,0 +1,300 @@
+# arc_fit.py
+"""
+Bıçak yolu noktalarından G2/G3 yay uydurma.
+
+Kavisli contalar binlerce küçük G1 segmenti olarak çıkar; bu da kontrol
+cihazının ileri bakış (look-ahead) tamponunu doldurup yavaşlatır. Bu
+modül ardışık noktalardan oluşan dizileri, verilen tolerans içinde
+kalıyorsa tek bir çember yayı ile değiştirir.
+
+Yöntem (tamamı NumPy ile, tüm adaylar aynı anda işlenir):
+
+1. Aday diziler: dönüş yönü (ardışık segmentlerin çapraz çarpımının
+   işareti) aynı kalan ve eğriliği komşu köşeye göre ani değişmeyen
+   köşe grupları.
+2. Her aday için merkez, başlangıç-bitiş kirişinin orta dikmesi üzerinde
+   en küçük kareler ile bulunur; böylece yay uç noktalardan tam geçer
+   (G2/G3'te başlangıç ve bitiş yarıçapı eşit olmalıdır).
+3. Kontroller: noktaların çembere uzaklığı <= tolerance, açı monoton,
+   toplam tarama açısı <= max_sweep_deg, yarıçap <= max_radius; Z ve A
+   yay boyunca doğrusal kabul edildiğinde sapma toleransta.
+4. Reddedilen adaylar en büyük sapmanın olduğu noktada ikiye bölünüp
+   tekrar denenir; çok kısa kalanlar G1 olarak bırakılır.
+
+Not: biarc (iki yaylı) uydurma yerine tek çember + bölme kullanılır;
+bölme, değişen yarıçaplı eğrileri ardışık yaylara ayırır.
+"""
+
+import numpy as np
+
+# Hareket tipleri (G kodu numarası ile aynı)
+LINE = 1
+ARC_CW = 2
+ARC_CCW = 3
+
+
+class ArcFit:
+    """
+    Uydurma sonucu: yol, hareketler (G1/G2/G3) dizisi olarak.
+
+    ends    : (M,) her hareketin bitiş noktası indisi (ilk nokta başlıkta)
+    kinds   : (M,) LINE / ARC_CW / ARC_CCW
+    starts  : (M,) her hareketin başlangıç noktası indisi
+    centers : (M,2) yay merkezleri (doğrularda nan)
+    """
+
+    def __init__(self, n_points, ends, kinds, starts, centers, max_deviation):
+        self.n_points = int(n_points)
+        self.ends = ends
+        self.kinds = kinds
+        self.starts = starts
+        self.centers = centers
+        self.max_deviation = float(max_deviation)
+
+    @property
+    def n_moves(self) -> int:
+        return len(self.ends)
+
+    @property
+    def n_arcs(self) -> int:
+        return int(np.count_nonzero(self.kinds != LINE))
+
+    def report(self) -> str:
+        before = max(self.n_points - 1, 0)
+        pct = 100.0 * (1.0 - self.n_moves / before) if before else 0.0
+        return (
+            f"Yay uydurma: {before:,} segment -> {self.n_moves:,} hareket "
+            f"({self.n_arcs:,} yay, %{pct:.0f} azalma), "
+            f"en büyük sapma {self.max_deviation:.4f} mm"
+        )
+
+
+def _ranges(starts, stops):
+    """[start, stop] (dahil) aralıklarının birleşik indisleri + grup numaraları."""
+    lengths = stops - starts + 1
+    total = int(lengths.sum())
+    g = np.repeat(np.arange(len(starts)), lengths)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    idx = np.arange(total) - offsets[g] + starts[g]
+    return idx, g, offsets
+
+
+def _fit_runs(xy, starts, stops, z, angles, tolerance, a_tolerance,
+              max_sweep, max_radius):
+    """
+    Aday dizilere (starts[i]..stops[i]) çember uydur.
+
+    Dönen: (ok, centers, ccw, max_dev, worst)
+    """
+    R = len(starts)
+    idx, g, offsets = _ranges(starts, stops)
+
+    s = xy[starts]
+    e = xy[stops]
+    half = 0.5 * (e - s)
+    chord = 2.0 * np.hypot(half[:, 0], half[:, 1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        nrm = np.column_stack((-half[:, 1], half[:, 0])) / (0.5 * chord)[:, None]
+
+    # Merkez = s + half + t * nrm ; t en küçük kareler ile
+    q = xy[idx] - s[g]
+    a = (q * q).sum(axis=1) - 2.0 * (q * half[g]).sum(axis=1)
+    b = 2.0 * (q * nrm[g]).sum(axis=1)
+    sab = np.bincount(g, weights=a * b, minlength=R)
+    sbb = np.bincount(g, weights=b * b, minlength=R)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = sab / sbb
+    centers = s + half + t[:, None] * nrm
+    radius = np.hypot(*(s - centers).T)
+
+    u = xy[idx] - centers[g]
+    dev = np.abs(np.hypot(u[:, 0], u[:, 1]) - radius[g])
+    dev = np.where(np.isfinite(dev), dev, np.inf)
+    max_dev = np.maximum.reduceat(dev, offsets)
+
+    # Ardışık noktalar arası açı artışları (grup sınırları hariç)
+    same = g[1:] == g[:-1]
+    u0, u1 = u[:-1], u[1:]
+    dth = np.arctan2(u0[:, 0] * u1[:, 1] - u0[:, 1] * u1[:, 0],
+                     (u0 * u1).sum(axis=1))
+    dth = np.where(same, dth, 0.0)
+    gp = g[:-1]
+    sweep = np.bincount(gp, weights=dth, minlength=R)
+    ccw = sweep > 0
+    direction = np.where(ccw, 1.0, -1.0)
+    backwards = np.bincount(gp, weights=(same & (dth * direction[gp] <= 0.0)),
+                            minlength=R)
+
+    ok = (
+        (sbb > 0) & np.isfinite(t) & (chord > 0)
+        & (max_dev <= tolerance)
+        & (backwards == 0)
+        & (np.abs(sweep) <= max_sweep)
+        & (radius <= max_radius)
+    )
+
+    # Z ve A yay boyunca doğrusal (açıya göre) interpolasyonla yazılır
+    extra = [(c, tolerance) for c in (z,) if c is not None]
+    extra += [(c, a_tolerance) for c in (angles,) if c is not None]
+    if extra:
+        cum = np.concatenate(([0.0], np.cumsum(np.abs(dth))))
+        cum = cum - cum[offsets][g]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frac = cum / np.abs(sweep)[g]
+        frac = np.where(np.isfinite(frac), frac, 0.0)
+        for col, tol in extra:
+            lin = col[starts][g] + frac * (col[stops] - col[starts])[g]
+            err = np.maximum.reduceat(np.abs(col[idx] - lin), offsets)
+            ok &= err <= tol
+
+    # Bölme noktası: en büyük sapmanın olduğu nokta
+    worst = np.minimum.reduceat(
+        np.where(dev == max_dev[g], idx, np.iinfo(np.int64).max), offsets
+    )
+    return ok, centers, ccw, max_dev, worst
+
+
+def _candidate_runs(xy, min_points, curvature_ratio):
+    """
+    Dönüş yönü aynı kalan ve eğriliği ani değişmeyen nokta dizileri
+    (başlangıç, bitiş dahil).
+    """
+    d = np.diff(xy, axis=0)
+    cross = d[:-1, 0] * d[1:, 1] - d[:-1, 1] * d[1:, 0]
+    la = np.hypot(*d[:-1].T)
+    lb = np.hypot(*d[1:].T)
+    sign = np.where(np.abs(cross) > 1e-12 * la * lb, np.sign(cross), 0.0)
+    if sign.size == 0:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+
+    # Köşe çevre çemberinin eğriliği; komşu köşeler arasında oran
+    # curvature_ratio'yu aşarsa (ör. yaydan düz kenara geçiş) dizi bölünür
+    lc = np.hypot(*(d[:-1] + d[1:]).T)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        k = 2.0 * np.abs(cross) / (la * lb * lc)
+        jump = np.abs(np.log(k[1:] / k[:-1])) > np.log(curvature_ratio)
+
+    # Aynı işaretli köşe grupları: köşe i, nokta i+1'dir
+    brk = np.flatnonzero((np.diff(sign) != 0) | jump) + 1
+    g_start = np.concatenate(([0], brk))
+    g_stop = np.concatenate((brk - 1, [len(sign) - 1]))
+    keep = sign[g_start] != 0
+    g_start, g_stop = g_start[keep], g_stop[keep]
+
+    # Köşe grubu [a, b] -> noktalar [a, b + 2]; komşu dizilerle örtüşme kırpılır
+    starts = g_start.astype(np.int64)
+    stops = (g_stop + 2).astype(np.int64)
+    if len(starts) > 1:
+        starts[1:] = np.maximum(starts[1:], stops[:-1])
+    keep = stops - starts + 1 >= min_points
+    return starts[keep], stops[keep]
+
+
+def fit_arcs(xy, tolerance: float = 0.01, z=None, angles=None,
+             a_tolerance: float = 0.5, min_points: int = 4,
+             max_sweep_deg: float = 180.0, max_radius: float = 5000.0,
+             curvature_ratio: float = 2.0) -> ArcFit:
+    """
+    Noktaları G1/G2/G3 hareketlerine dönüştür.
+
+    xy          : (N,2) yol noktaları
+    tolerance   : noktaların yaya en büyük uzaklığı (mm); Z için de kullanılır
+    z, angles   : (opsiyonel) yay boyunca doğrusal kabul edilen eksenler
+    a_tolerance : A ekseni için en büyük sapma (derece)
+    """
+    xy = np.asarray(xy, dtype=float)
+    n = xy.shape[0]
+    z = None if z is None else np.asarray(z, dtype=float)
+    angles = None if angles is None else np.asarray(angles, dtype=float)
+    min_points = max(3, int(min_points))
+    max_sweep = np.radians(max_sweep_deg)
+
+    pending = _candidate_runs(xy, min_points, curvature_ratio)
+    arc_s, arc_e, arc_c, arc_ccw, arc_dev = [], [], [], [], []
+
+    while len(pending[0]):
+        starts, stops = pending
+        ok, centers, ccw, dev, worst = _fit_runs(
+            xy, starts, stops, z, angles, tolerance, a_tolerance,
+            max_sweep, max_radius,
+        )
+        arc_s.append(starts[ok])
+        arc_e.append(stops[ok])
+        arc_c.append(centers[ok])
+        arc_ccw.append(ccw[ok])
+        arc_dev.append(dev[ok])
+
+        # Reddedilenleri en kötü noktada (çok uçtaysa ortadan) ikiye böl;
+        # bölme noktası her iki yarıda da var
+        bad = ~ok & (stops - starts + 1 >= 2 * min_points - 1)
+        s_bad, e_bad = starts[bad], stops[bad]
+        mid = worst[bad]
+        edge = (mid - s_bad + 1 < min_points) | (e_bad - mid + 1 < min_points)
+        mid = np.where(edge, (s_bad + e_bad) // 2, mid)
+        pending = (np.concatenate((s_bad, mid)), np.concatenate((mid, e_bad)))
+
+    if arc_s:
+        arc_s = np.concatenate(arc_s)
+        arc_e = np.concatenate(arc_e)
+        arc_c = np.concatenate(arc_c).reshape(-1, 2)
+        arc_ccw = np.concatenate(arc_ccw)
+        arc_dev = np.concatenate(arc_dev)
+    else:
+        arc_s = arc_e = np.zeros(0, np.int64)
+        arc_c = np.zeros((0, 2))
+        arc_ccw = np.zeros(0, bool)
+        arc_dev = np.zeros(0)
+
+    # Hareket tablosu: yayların iç noktaları atlanır, diğer her nokta bir G1
+    interior = np.zeros(n, dtype=np.int64)
+    np.add.at(interior, arc_s + 1, 1)
+    np.add.at(interior, arc_e, -1)
+    interior = np.cumsum(interior) > 0
+    arc_of_end = np.full(n, -1, dtype=np.int64)
+    arc_of_end[arc_e] = np.arange(len(arc_e))
+
+    ends = np.flatnonzero(~interior[1:]) + 1
+    which = arc_of_end[ends]
+    is_arc = which >= 0
+    kinds = np.full(len(ends), LINE, dtype=np.int8)
+    kinds[is_arc] = np.where(arc_ccw[which[is_arc]], ARC_CCW, ARC_CW)
+    starts = np.concatenate(([0], ends[:-1]))
+    centers = np.full((len(ends), 2), np.nan)
+    centers[is_arc] = arc_c[which[is_arc]]
+
+    max_dev = float(arc_dev.max()) if len(arc_dev) else 0.0
+    return ArcFit(n, ends, kinds, starts, centers, max_dev)
+
+
+def check_arcs(xy, fit: ArcFit) -> float:
+    """
+    Hareket tablosunu orijinal noktalarla karşılaştır; en büyük sapmayı döndür.
+
+    Her yay için: aradaki tüm noktaların çembere uzaklığı ve yayın
+    açısal aralığında kalıp kalmadıkları; başlangıç/bitiş yarıçapı farkı.
+    Tablodan bağımsız hesaplanır (uydurma kodunu kullanmaz).
+    Yay dışında kalan nokta varsa inf döner.
+    """
+    xy = np.asarray(xy, dtype=float)
+    arc = fit.kinds != LINE
+    if not arc.any():
+        return 0.0
+    s, e, c = fit.starts[arc], fit.ends[arc], fit.centers[arc]
+    ccw = fit.kinds[arc] == ARC_CCW
+    idx, g, offsets = _ranges(s, e)
+
+    r0 = np.hypot(*(xy[s] - c).T)
+    r1 = np.hypot(*(xy[e] - c).T)
+    u = xy[idx] - c[g]
+    dev = np.abs(np.hypot(u[:, 0], u[:, 1]) - r0[g])
+
+    # Başlangıçtan itibaren yön doğrultusunda ölçülen açı [0, 2pi)
+    ang = np.arctan2(u[:, 1], u[:, 0])
+    ang0 = ang[offsets][g]
+    rel = np.where(ccw[g], ang - ang0, ang0 - ang) % (2 * np.pi)
+    rel = np.where(idx == s[g], 0.0, rel)
+    span = rel[offsets + (e - s)]
+    outside = rel > span[g] + 1e-9
+    if outside.any():
+        return float("inf")
+    return float(max(dev.max(), np.abs(r0 - r1).max()))
@@ -0,0 +1,471 @@
+# benchmark.py
+"""
+Performans ölçümleri (GUI gerektirmez).
+
+Kullanım:
+    python benchmark.py            # tüm ölçümler
+    python benchmark.py gcode      # sadece G-kodu üretimi
+    python benchmark.py arcs       # G2/G3 yay uydurma
+    python benchmark.py cycle      # süre tahmini
+    python benchmark.py parse      # G-kodu dosyası okuma
+    python benchmark.py import2d   # DXF kontur içe aktarma
+    python benchmark.py sender     # kontrolcüye gönderim (pty taklidi)
+    python benchmark.py edges      # tel kafes kenarları
+    python benchmark.py lod        # etkileşimli ayrıntı seviyeleri
+    python benchmark.py pathlod    # yol çizgisi seyreltme piramidi
+    python benchmark.py glyphs     # bıçak yönü işaretleri
+    python benchmark.py playback   # simülasyon zaman çizelgesi
+    python benchmark.py colors     # yol renklendirme kolonları
+    python benchmark.py thumbnail  # OpenGL'siz önizleme resmi
+
+gcode, arcs, cycle, parse, import2d, sender ve edges ölçümleri hızlı
+yolun çıktısını ayrıca bir referansla (eski satır satır uygulama,
+bağımsız kontrol ya da trimesh) karşılaştırır; diğerleri sadece süre
+ve boyut yazar.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from path_generator import PathData
+
+
+def _random_path(n: int, seed: int = 0) -> PathData:
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0.0, 2.0 * np.pi, n)
+    xy = np.column_stack((200 + 150 * np.cos(t), 400 + 350 * np.sin(t)))
+    xy += rng.normal(scale=0.05, size=xy.shape)
+    z = rng.uniform(-2.0, 0.0, n)
+    angles = np.degrees(np.arctan2(np.gradient(xy[:, 1]), np.gradient(xy[:, 0])))
+    return PathData(xy, z, angles, meta={"depth": 1.0})
+
+
+def _reference_gcode_3d(path_data, feed_xy=2000.0, feed_z=800.0, safe_z=5.0,
+                        knife_axis="A", knife_offset_deg=0.0,
+                        origin_mode="bottom_left"):
+    """Eski, satır satır f-string ile çalışan 3D üretici (karşılaştırma için)."""
+    from gcode_generator import _fmt, _ensure_xy, _compute_origin_offset
+
+    xy = _ensure_xy(path_data)
+    ox, oy = _compute_origin_offset(xy, origin_mode)
+    xy = xy - np.array([ox, oy])
+    z = np.asarray(path_data.z, dtype=float)
+    angles = np.asarray(path_data.angles, dtype=float)
+
+    lines = [
+        "(Tangential CAM - 3D G-kodu, Z takipli)",
+        "G21  (mm)",
+        "G90  (mutlak koordinat)",
+        "G54",
+        f"G0 Z{_fmt(safe_z)}",
+        f"G0 X{_fmt(xy[0, 0])} Y{_fmt(xy[0, 1])} "
+        f"{knife_axis}{_fmt(angles[0] + knife_offset_deg)}",
+        f"G1 Z{_fmt(z[0])} F{_fmt(feed_z)}",
+    ]
+    for i in range(1, xy.shape[0]):
+        x, y = xy[i]
+        cmd = f"G1 X{_fmt(x)} Y{_fmt(y)} F{_fmt(feed_xy)}"
+        cmd += f" Z{_fmt(z[i])}"
+        cmd += f" {knife_axis}{_fmt(angles[i] + knife_offset_deg)}"
+        lines.append(cmd)
+    lines.append(f"G0 Z{_fmt(safe_z)}")
+    lines.append("M30")
+    return "\n".join(lines)
+
+
+def bench_gcode(sizes=(10_000, 100_000, 1_000_000)):
+    """
+    G-kodu üretimi: satır/saniye (vektörel motor vs. referans döngü).
+    Çıktı referanstan farklıysa False döner (tam karşılaştırma:
+    tests/test_gcode_format.py).
+    """
+    from gcode_generator import generate_gcode_3d, gcode_program_3d
+
+    print("== G-kodu üretimi (3D) ==")
+    ok = True
+    for n in sizes:
+        pd = _random_path(n)
+
+        t0 = time.perf_counter()
+        fast = generate_gcode_3d(pd, knife_offset_deg=90.0)
+        t_fast = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        ref = _reference_gcode_3d(pd, knife_offset_deg=90.0)
+        t_ref = time.perf_counter() - t0
+
+        ok &= fast == ref
+        same = "aynı" if fast == ref else "FARKLI!"
+        print(f"{n:>10,} nokta: vektörel {n / t_fast:>12,.0f} satır/s | "
+              f"referans {n / t_ref:>10,.0f} satır/s | çıktı {same}")
+
+        t0 = time.perf_counter()
+        compact = gcode_program_3d(pd, knife_offset_deg=90.0, compact=True).text()
+        t_comp = time.perf_counter() - t0
+        print(f"{'':>10}  kompakt  {n / t_comp:>12,.0f} satır/s | "
+              f"boyut {len(compact) / len(fast):.0%} (tam çıktıya göre)")
+    return ok
+
+
+def _gasket_path(n: int) -> np.ndarray:
+    """Köşeleri yuvarlatılmış dikdörtgen conta + iç delik (yay uydurma için)."""
+    k = max(n // 8, 4)
+    t = np.linspace(0.0, 0.5 * np.pi, k)
+    parts = []
+    for cx, cy, a0 in ((180, 80, 0.0), (20, 80, 0.5 * np.pi),
+                       (20, 20, np.pi), (180, 20, 1.5 * np.pi)):
+        parts.append(np.column_stack((cx + 20 * np.cos(t + a0),
+                                      cy + 20 * np.sin(t + a0))))
+    outer = np.vstack(parts)
+    u = np.linspace(0.0, 2.0 * np.pi, n - len(outer))
+    hole = np.column_stack((100 + 30 * np.cos(u), 50 + 30 * np.sin(u)))
+    return np.vstack((outer, outer[:1], hole))
+
+
+def bench_arcs(sizes=(10_000, 100_000, 1_000_000), tolerance=0.01):
+    """
+    G2/G3 yay uydurma: süre, satır azalması ve sapma.
+
+    Sapma, hareket tablosundan bağımsız olarak orijinal noktalarla yeniden
+    hesaplanır (arc_fit.check_arcs); tolerans aşılırsa belirtilir.
+    """
+    from arc_fit import fit_arcs, check_arcs
+
+    print("== G2/G3 yay uydurma ==")
+    for n in sizes:
+        for name, xy in (("conta", _gasket_path(n)), ("gürültülü elips", _random_path(n).xy)):
+            t0 = time.perf_counter()
+            fit = fit_arcs(xy, tolerance=tolerance)
+            dt = time.perf_counter() - t0
+            dev = check_arcs(xy, fit)
+            status = "tamam" if dev <= tolerance else "TOLERANS AŞILDI!"
+            print(f"{n:>10,} nokta ({name}): {dt:6.2f} s | "
+                  f"{fit.n_points - 1:,} -> {fit.n_moves:,} hareket | "
+                  f"kontrol sapması {dev:.4f} mm ({status})")
+
+
+def _reference_node_speeds(node_lim, L, acc):
+    """Klasik ileri/geri geçişli (döngülü) ileri bakış; karşılaştırma için."""
+    v2 = list(node_lim)
+    for k in range(len(L) - 1, -1, -1):
+        v2[k] = min(v2[k], v2[k + 1] + 2.0 * acc[k] * L[k])
+    for k in range(len(L)):
+        v2[k + 1] = min(v2[k + 1], v2[k] + 2.0 * acc[k] * L[k])
+    return np.sqrt(np.maximum(v2, 0.0))
+
+
+def bench_cycle(sizes=(10_000, 100_000, 1_000_000)):
+    """
+    Süre tahmini: hareket/saniye; ileri bakışın vektörel hali küçük bir
+    programda döngülü referansla karşılaştırılır.
+    """
+    from gcode_generator import gcode_program_3d
+    from cycle_time import node_speeds, simulate, summary_text
+
+    print("== Süre tahmini ==")
+    rng = np.random.default_rng(1)
+    n = 20_000
+    node_lim = np.concatenate(([0.0], rng.uniform(0, 2500, n - 1), [0.0]))
+    L = rng.uniform(0.001, 2.0, n)
+    acc = rng.uniform(100, 1000, n)
+    fast = node_speeds(node_lim, L, acc)
+    ref = _reference_node_speeds(node_lim, L, acc)
+    err = float(np.abs(fast - ref).max())
+    print(f"ileri bakış (vektörel vs döngü, {n:,} düğüm): en büyük fark {err:.2e} mm/s")
+
+    for n in sizes:
+        program = gcode_program_3d(_random_path(n))
+        t0 = time.perf_counter()
+        result = simulate(program.motion())
+        dt = time.perf_counter() - t0
+        print(f"{n:>10,} hareket: {dt:6.2f} s ({n / dt:,.0f} hareket/s) | "
+              f"{summary_text(result)}")
+
+
+def bench_parse(sizes=(100_000, 1_000_000, 5_000_000)):
+    """
+    G-kodu okuma: satır/saniye. Okunan hareketler üreticinin hareket
+    tablosuyla karşılaştırılır (3 ondalık yuvarlama farkı beklenir).
+    """
+    from gcode_generator import gcode_program_3d
+    from gcode_writer import write_gcode
+    from gcode_parser import parse_gcode
+
+    print("== G-kodu okuma ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.nc")
+        for n in sizes:
+            program = gcode_program_3d(_random_path(n), compact=True)
+            stats = write_gcode(path, program.iter_chunks())
+            t0 = time.perf_counter()
+            parsed = parse_gcode(path)
+            dt = time.perf_counter() - t0
+            # Okunan: G0 Z, G0 XYA, dalış, gövde, çıkış
+            ref = program.motion().targets
+            err = float(np.abs(parsed.end[2:] - ref).max())
+            print(f"{stats['lines']:>10,} satır ({stats['chars'] / 1e6:6.1f} MB): "
+                  f"{dt:6.2f} s ({stats['lines'] / dt:>10,.0f} satır/s) | "
+                  f"en büyük konum farkı {err:.4f}")
+
+
+def _grid_dxf(path: str, n: int):
+    """n varlıklı DXF: bulge'lı kapalı LWPOLYLINE'lar, her 10.'u CIRCLE, ve bir dış çerçeve."""
+    cols = 300
+    lines = ["0", "SECTION", "2", "ENTITIES"]
+    for k in range(n - 1):
+        x, y = (k % cols) * 20.0, (k // cols) * 20.0
+        if k % 10 == 9:
+            lines += ["0", "CIRCLE", "8", "0", "10", f"{x + 5}", "20", f"{y + 5}", "40", "4"]
+            continue
+        lines += ["0", "LWPOLYLINE", "8", "0", "90", "4", "70", "1",
+                  "10", f"{x}", "20", f"{y}", "10", f"{x + 10}", "20", f"{y}", "42", "0.5",
+                  "10", f"{x + 10}", "20", f"{y + 10}", "10", f"{x}", "20", f"{y + 10}"]
+    w, h = cols * 20.0, ((n - 2) // cols + 1) * 20.0
+    lines += ["0", "LWPOLYLINE", "8", "0", "90", "4", "70", "1",
+              "10", "-10", "20", "-10", "10", f"{w}", "20", "-10",
+              "10", f"{w}", "20", f"{h}", "10", "-10", "20", f"{h}"]
+    lines += ["0", "ENDSEC", "0", "EOF"]
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def bench_import2d(sizes=(10_000, 100_000)):
+    """
+    DXF içe aktarma: sadece dış kontur (load_2d_outer) ve bütün konturlar.
+    Dış kontur, bütün konturlar arasından alanla seçilenle karşılaştırılır.
+    """
+    from import_2d import load_2d_outer, load_dxf_contours, outer_contour
+
+    print("== DXF kontur içe aktarma ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.dxf")
+        for n in sizes:
+            _grid_dxf(path, n)
+            mb = os.path.getsize(path) / 1e6
+            t0 = time.perf_counter()
+            outer, count = load_2d_outer(path)
+            dt_outer = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            contours = load_dxf_contours(path)
+            dt_all = time.perf_counter() - t0
+            same = "aynı" if np.array_equal(outer, outer_contour(contours)) else "FARKLI!"
+            print(f"{count:>10,} kontur ({mb:5.1f} MB): dış kontur {dt_outer:.2f} s, "
+                  f"bütün konturlar {dt_all:.2f} s | dış kontur {same}")
+
+
+def bench_sender(n=5_000, block_time=0.0005, latency=0.002):
+    """
+    Kontrolcüye gönderim: karakter sayma ve gönder-bekle modları pty
+    üzerindeki GRBL taklidine karşı. Taklit alınan satırları üretilen
+    satırlarla karşılaştırır; tampon taşması 0 olmalıdır.
+    """
+    from gcode_generator import gcode_program_3d
+    from gcode_sender import GCodeSender, GrblEmulator, iter_lines, open_port, summary_text
+
+    print(f"== Kontrolcüye gönderim (taklit: blok {block_time * 1000:.1f} ms, "
+          f"gecikme {latency * 1000:.1f} ms) ==")
+    program = gcode_program_3d(_random_path(n), compact=True)
+    expected = list(iter_lines(program.iter_chunks()))
+    for mode in GCodeSender.MODES:
+        with GrblEmulator(block_time=block_time, latency=latency) as emu:
+            emu.keep_lines = len(expected)
+            port = open_port(emu.path)
+            try:
+                sender = GCodeSender(port, mode=mode)
+                sender.wake()
+                stats = sender.stream(program)
+            finally:
+                port.close()
+            same = "aynı" if emu.received == expected else "FARKLI!"
+            print(f"{mode:>5}: {summary_text(stats)}")
+            print(f"{'':>5}  taklit: {emu.overflows} tampon taşması, en dolu tampon "
+                  f"{emu.max_rx} bayt, planlayıcı boş {emu.starved:.2f} s | satırlar {same}")
+
+
+def bench_edges(subdivisions=(5, 6, 7)):
+    """
+    Tel kafes kenarları: tekil ve keskin kenar sayısı ve süresi. Tekil
+    kenar sayısı trimesh'in edges_unique sonucuyla karşılaştırılır.
+    """
+    import trimesh
+    from mesh_edges import unique_edges, feature_edges
+
+    print("== Tel kafes kenarları ==")
+    for sub in subdivisions:
+        # Pürüzsüz küre + üstüne oturan kutu (keskin kenarlı parça)
+        mesh = trimesh.util.concatenate([trimesh.creation.icosphere(sub, radius=80),
+                                         trimesh.creation.box((60, 60, 60))])
+        t0 = time.perf_counter()
+        edges = unique_edges(mesh.faces)
+        t_all = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        sharp = feature_edges(mesh.vertices, mesh.faces, normals=mesh.face_normals)
+        t_feat = time.perf_counter() - t0
+        same = "aynı" if len(edges) == len(mesh.edges_unique) else "FARKLI!"
+        print(f"{len(mesh.faces):>10,} üçgen: {3 * len(mesh.faces):,} kenar -> "
+              f"tekil {len(edges):,} ({t_all:.2f} s, {same}) -> "
+              f"keskin {len(sharp):,} ({t_feat:.2f} s)")
+
+
+def bench_lod(subdivisions=(7, 8)):
+    """
+    Ayrıntı seviyeleri: köşe kümeleme ile üretilen seviyelerin üçgen
+    sayısı, hücre boyu, süresi ve yüzey alanı / sınır kutusu sapması.
+    """
+    import trimesh
+    from mesh_lod import build_lods, surface_area
+
+    print("== Ayrıntı seviyeleri (LOD) ==")
+    for sub in subdivisions:
+        mesh = trimesh.util.concatenate([trimesh.creation.icosphere(sub, radius=80),
+                                         trimesh.creation.box((60, 60, 60))])
+        area = surface_area(mesh.vertices, mesh.faces)
+        t0 = time.perf_counter()
+        lods = build_lods(mesh.vertices, mesh.faces, build_above=0)
+        dt = time.perf_counter() - t0
+        print(f"{len(mesh.faces):>10,} üçgen ({dt:.2f} s):")
+        for v, f, cell in lods:
+            grow = np.abs(v.min(axis=0) - mesh.bounds[0]).max()
+            print(f"    -> {len(f):>9,} üçgen, hücre {cell:.2f} mm, "
+                  f"alan oranı {surface_area(v, f) / area:.3f}, "
+                  f"sınır sapması {grow:.2f} mm")
+
+
+def bench_pathlod(sizes=(200_000, 2_000_000)):
+    """
+    Yol çizgisi piramidi: kurulum süresi, seviyelerin nokta sayısı ve
+    hata sınırı; 1 mm / piksel ölçeğinde seçilen seviye.
+    """
+    from path_lod import PathPyramid
+
+    print("== Yol çizgisi seyreltme piramidi ==")
+    for n in sizes:
+        # Dalgalı spiral: 200 tur, her turda 37 dalga
+        t = np.linspace(0.0, 400.0 * np.pi, n)
+        pts = np.column_stack((200 + 150 * np.cos(t) * (1 + 0.1 * np.sin(37 * t)),
+                               400 + 350 * np.sin(t), 5 * np.sin(3 * t)))
+        pyr = PathPyramid(pts)
+        levels = ", ".join(f"{len(idx):,} ({err:.2f} mm)" for idx, err in pyr.levels)
+        k = pyr.level_for_pixel(1.0)
+        print(f"{n:>10,} nokta: {pyr.build_time:.2f} s -> {levels}")
+        print(f"{'':>17}1 mm/piksel: seviye {k} ({len(pyr.levels[k][0]):,} nokta)")
+
+
+def bench_glyphs(sizes=(200_000, 2_000_000)):
+    """Bıçak yönü işaretleri: bütün seviyelerin üçgenlerini üretme süresi ve boyutu."""
+    from knife_glyphs import KnifeGlyphs
+
+    print("== Bıçak yönü işaretleri ==")
+    for n in sizes:
+        t = np.linspace(0.0, 400.0 * np.pi, n)
+        pts = np.column_stack((200 + 150 * np.cos(t), 400 + 350 * np.sin(t), np.zeros(n)))
+        angles = np.degrees(t) + 90.0
+        t0 = time.perf_counter()
+        glyphs = KnifeGlyphs(pts, angles)
+        dt = time.perf_counter() - t0
+        print(f"{n:>10,} nokta: {dt:.2f} s, {len(glyphs.levels)} seviye, "
+              f"en sık {len(glyphs):,} işaret ({glyphs.levels[0][2]:.2f} mm aralık), "
+              f"tampon {glyphs.vertices.nbytes / 1e6:.1f} MB")
+
+
+def bench_playback(n=2_000_000, lookups=10_000):
+    """Simülasyon: zaman çizelgesi kurulumu ve kare başına konum arama süresi."""
+    from playback import Timeline
+
+    print("== Simülasyon zaman çizelgesi ==")
+    t = np.linspace(0.0, 40.0 * np.pi, n)
+    pts = np.column_stack((200 + 150 * np.cos(t), 400 + 350 * np.sin(t), np.zeros(n)))
+    angles = np.degrees(t) + 90.0
+    t0 = time.perf_counter()
+    timeline = Timeline(pts, angles, a_vmax=36000.0)
+    build = time.perf_counter() - t0
+    at = np.random.default_rng(0).uniform(0.0, timeline.total, lookups)
+    t0 = time.perf_counter()
+    for x in at:
+        timeline.state_at(x)
+    per = (time.perf_counter() - t0) / lookups
+    print(f"{n:,} nokta: kurulum {build:.2f} s, program {timeline.total / 60:.1f} dk, "
+          f"konum arama {per * 1e6:.1f} µs/kare")
+
+
+def bench_colors(n=2_000_000, step=4):
+    """Yol renklendirme: her modun renk kolonunu (değer + renk skalası) hesaplama süresi."""
+    from path_colors import COLOR_MODES, PathColors
+
+    print("== Yol renklendirme ==")
+    # Seyreltilmiş yolun noktaları arasına sapmalı kontur noktaları
+    rng = np.random.default_rng(1)
+    path = _random_path(n)
+    path.xy_geom = path.xy
+    outline = np.repeat(path.xy, step, axis=0)
+    outline += rng.normal(scale=0.05, size=outline.shape)
+    outline[::step] = path.xy
+    path.outline = outline
+    path.meta["outline_step"] = step
+    path.feed = np.full(n, 1500.0)
+    pts = np.column_stack((path.xy, path.z))
+    colors = PathColors(path, pts, path.angles)
+    for key, _label, unit in COLOR_MODES[1:]:
+        t0 = time.perf_counter()
+        entry = colors.get(key)
+        dt = time.perf_counter() - t0
+        lo, hi = entry[1]
+        print(f"{key:>10}: {dt * 1000:.0f} ms ({lo:.3g} .. {hi:.3g} {unit}), "
+              f"renk tamponu {entry[0].nbytes / 1e6:.1f} MB")
+
+
+def bench_thumbnail(subdivisions=(7, 8), size=512):
+    """OpenGL'siz önizleme: mesh tarama + yol çizimi + PNG yazma süresi."""
+    import trimesh
+    from thumbnail import render, write_png
+
+    print(f"== OpenGL'siz önizleme ({size}x{size}) ==")
+    t = np.linspace(0.0, 2.0 * np.pi, 200_000)
+    path = np.column_stack((90 * np.cos(t), 90 * np.sin(t), 10 * np.sin(6 * t)))
+    for sub in subdivisions:
+        mesh = trimesh.creation.icosphere(sub, radius=80)
+        t0 = time.perf_counter()
+        img = render(mesh.vertices, mesh.faces, path_points=path, size=size)
+        dt = time.perf_counter() - t0
+        with tempfile.TemporaryDirectory() as tmp:
+            t0 = time.perf_counter()
+            write_png(os.path.join(tmp, "t.png"), img)
+            png = time.perf_counter() - t0
+        print(f"{len(mesh.faces):>10,} üçgen: çizim {dt:.2f} s, PNG {png * 1000:.0f} ms")
+
+
+BENCHMARKS = {
+    "gcode": bench_gcode,
+    "arcs": bench_arcs,
+    "cycle": bench_cycle,
+    "parse": bench_parse,
+    "import2d": bench_import2d,
+    "sender": bench_sender,
+    "edges": bench_edges,
+    "lod": bench_lod,
+    "pathlod": bench_pathlod,
+    "glyphs": bench_glyphs,
+    "playback": bench_playback,
+    "colors": bench_colors,
+    "thumbnail": bench_thumbnail,
+}
+
+
+def main(argv):
+    names = argv[1:] or list(BENCHMARKS)
+    status = 0
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Bilinmeyen ölçüm: {name} (seçenekler: {', '.join(BENCHMARKS)})")
+            return 1
+        if BENCHMARKS[name]() is False:
+            status = 2
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
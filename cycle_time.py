@@ -0,0 +1,262 @@
+# cycle_time.py
+"""
+İşleme süresi tahmini (hareket simülasyonu).
+
+Hareketler (G0/G1/G2/G3) eksen başına hız ve ivme sınırlarıyla,
+trapez hız profili ve ileri bakış (look-ahead) ile planlanır:
+
+- Her segmentin yol boyunca en yüksek hızı: besleme ve eksen hız
+  sınırlarının (yön vektörüne göre) en küçüğü; yaylarda ayrıca merkezcil
+  ivme sınırı (v^2 <= a * r).
+- Köşe (birleşim) hızları GRBL tarzı "junction deviation" ile sınırlanır.
+- İleri bakış: hız^2 bir segment boyunca en fazla 2*a*L değişebilir.
+  Segment başına "hız^2 bütçesi" D = cumsum(2*a*L) ile ileri ve geri
+  geçişler, döngü yerine np.minimum.accumulate ile tek seferde yapılır:
+
+      geri : v2[k] <= min_{m>=k} (lim[m] + D[m]) - D[k]
+      ileri: v2[k] <= min_{m<=k} (lim[m] - D[m]) + D[k]
+
+- Segment süreleri giriş/çıkış/tepe hızından kapalı formülle hesaplanır.
+
+Birimler GRBL ile aynı: doğrusal eksenler mm/dk ve mm/s^2, A ekseni
+derece/dk ve derece/s^2. Besleme (F) XYZ yol uzunluğuna uygulanır; sadece
+A ekseninin döndüğü hareketlerde F derece/dk kabul edilir (LinuxCNC gibi).
+"""
+
+import logging
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+AXES = ("X", "Y", "Z", "A")
+
+# Varsayılan makine sınırları (tangential_cam.ini [machine] ile değiştirilebilir)
+DEFAULT_LIMITS = {
+    "v_max": {"X": 20000.0, "Y": 20000.0, "Z": 5000.0, "A": 36000.0},  # /dk
+    "a_max": {"X": 800.0, "Y": 800.0, "Z": 400.0, "A": 3600.0},        # /s^2
+    "junction_deviation": 0.01,  # mm
+}
+
+
+def machine_limits() -> dict:
+    """
+    tangential_cam.ini [machine] bölümündeki sınırlar (yoksa varsayılanlar).
+
+    Anahtarlar: v_max_x ... v_max_a, a_max_x ... a_max_a, junction_deviation
+    """
+    from settings import load_section
+
+    section = load_section("machine")
+    limits = {"v_max": {}, "a_max": {}}
+    for kind in ("v_max", "a_max"):
+        for axis in AXES:
+            key = f"{kind}_{axis.lower()}"
+            if key in section:
+                try:
+                    limits[kind][axis] = float(section[key])
+                except ValueError:
+                    log.warning("Geçersiz makine sınırı: %s = %s", key, section[key])
+    if "junction_deviation" in section:
+        try:
+            limits["junction_deviation"] = float(section["junction_deviation"])
+        except ValueError:
+            pass
+    return limits
+
+
+class Motion:
+    """
+    Simüle edilecek hareket dizisi.
+
+    start   : (4,) başlangıç konumu (X, Y, Z, A)
+    targets : (M,4) her hareketin bitiş konumu
+    feed    : (M,) besleme (mm/dk); hızlı hareketlerde inf
+    rapid   : (M,) G0 mı
+    radius  : (M,) yay yarıçapı (doğrularda 0)
+    sweep   : (M,) yay tarama açısı (radyan, doğrularda 0)
+    """
+
+    def __init__(self, start, targets, feed, rapid, radius=None, sweep=None):
+        self.start = np.asarray(start, dtype=float).reshape(4)
+        self.targets = np.asarray(targets, dtype=float).reshape(-1, 4)
+        m = len(self.targets)
+        self.feed = np.broadcast_to(np.asarray(feed, dtype=float), (m,))
+        self.rapid = np.broadcast_to(np.asarray(rapid, dtype=bool), (m,))
+        self.radius = np.zeros(m) if radius is None else np.asarray(radius, dtype=float)
+        self.sweep = np.zeros(m) if sweep is None else np.asarray(sweep, dtype=float)
+
+    def __len__(self):
+        return len(self.targets)
+
+
+def _limits(limits):
+    lim = {
+        "v_max": dict(DEFAULT_LIMITS["v_max"]),
+        "a_max": dict(DEFAULT_LIMITS["a_max"]),
+        "junction_deviation": DEFAULT_LIMITS["junction_deviation"],
+    }
+    if limits:
+        lim["v_max"].update(limits.get("v_max", {}))
+        lim["a_max"].update(limits.get("a_max", {}))
+        if "junction_deviation" in limits:
+            lim["junction_deviation"] = float(limits["junction_deviation"])
+    v_max = np.array([lim["v_max"][k] for k in AXES], dtype=float) / 60.0
+    a_max = np.array([lim["a_max"][k] for k in AXES], dtype=float)
+    return v_max, a_max, lim["junction_deviation"]
+
+
+def _segment_times(length, v0, v1, vmax, acc):
+    """Trapez profil süresi (v0, v1 <= vmax ve ulaşılabilir kabul edilir)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vp2 = np.minimum(vmax * vmax, acc * length + 0.5 * (v0 * v0 + v1 * v1))
+        vp = np.sqrt(np.maximum(vp2, np.maximum(v0, v1) ** 2))
+        d_acc = (vp * vp - v0 * v0) / (2.0 * acc)
+        d_dec = (vp * vp - v1 * v1) / (2.0 * acc)
+        cruise = np.maximum(length - d_acc - d_dec, 0.0)
+        t = (vp - v0) / acc + (vp - v1) / acc + cruise / vp
+    return np.where(length > 0, t, 0.0)
+
+
+def node_speeds(node_lim, length, acc):
+    """
+    İleri bakış: düğüm hız^2 sınırları (M+1,) ve segment uzunluk/ivmelerinden
+    (M,) ulaşılabilir düğüm hızları (mm/s). Geri ve ileri geçişler
+    np.minimum.accumulate ile yapılır (bkz. modül açıklaması).
+    """
+    D = np.concatenate(([0.0], np.cumsum(2.0 * acc * length)))
+    back = np.minimum.accumulate((node_lim + D)[::-1])[::-1] - D
+    fwd = np.minimum.accumulate(node_lim - D) + D
+    return np.sqrt(np.maximum(np.minimum(np.minimum(node_lim, back), fwd), 0.0))
+
+
+def simulate(motion: Motion, limits=None) -> dict:
+    """
+    Hareketleri planla ve süreleri hesapla.
+
+    Dönen sözlük:
+        total, cutting, rapid, rotate_only : saniye
+        segment_time : (M,) her hareketin süresi
+        n_moves      : hareket sayısı
+    """
+    v_max, a_max, jd = _limits(limits)
+
+    pos = np.vstack((motion.start[None, :], motion.targets))
+    d = np.diff(pos, axis=0)
+    radius = motion.radius
+    arc = radius > 0
+
+    # Yol uzunluğu: XYZ (yaylarda r*|sweep| ile Z'nin bileşkesi); sadece A
+    # dönen hareketlerde A açısı
+    xy_len = np.where(arc, radius * np.abs(motion.sweep), np.hypot(d[:, 0], d[:, 1]))
+    lin_len = np.hypot(xy_len, d[:, 2])
+    rotate_only = (lin_len <= 1e-12) & (np.abs(d[:, 3]) > 1e-12)
+    length = np.where(rotate_only, np.abs(d[:, 3]), lin_len)
+    moving = length > 0
+
+    # Yol birimi başına eksen değişimi (yaylarda XY için en kötü durum 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        unit = np.abs(d) / length[:, None]
+    unit = np.where(moving[:, None], unit, 0.0)
+    unit[arc, 0] = 1.0
+    unit[arc, 1] = 1.0
+
+    with np.errstate(divide="ignore"):
+        v_axis = np.min(np.where(unit > 0, v_max / unit, np.inf), axis=1)
+        acc = np.min(np.where(unit > 0, a_max / unit, np.inf), axis=1)
+    acc = np.where(np.isfinite(acc), acc, a_max.min())
+
+    feed = np.asarray(motion.feed, dtype=float) / 60.0
+    v_lim = np.minimum(np.where(motion.rapid, np.inf, feed), v_axis)
+    # Yaylarda merkezcil ivme sınırı
+    a_xy = min(a_max[0], a_max[1])
+    v_lim = np.where(arc, np.minimum(v_lim, np.sqrt(a_xy * radius)), v_lim)
+    v_lim = np.where(np.isfinite(v_lim), v_lim, v_axis)
+
+    # Sıfır uzunluklu hareketler plandan çıkarılır
+    keep = np.flatnonzero(moving)
+    L = length[keep]
+    acc_k = acc[keep]
+    vl = v_lim[keep]
+    m = len(keep)
+    if m == 0:
+        return {"total": 0.0, "cutting": 0.0, "rapid": 0.0, "rotate_only": 0.0,
+                "segment_time": np.zeros(len(motion)), "n_moves": len(motion)}
+
+    # Birleşim (köşe) hızları^2: vj2[k] = hareket k ile k+1 arası.
+    # Yön: XYZ birim vektörü; yaylarda kiriş yönü, uçlardaki teğete
+    # çevrilir (başlangıçta -sweep/2, bitişte +sweep/2 döndürülmüş).
+    dk = d[keep]
+    ll = np.where(lin_len[keep] > 0, lin_len[keep], 1.0)
+    chord = np.hypot(dk[:, 0], dk[:, 1])
+    xy_dir = dk[:, :2] / np.where(chord > 0, chord, 1.0)[:, None]
+    xy_part = (xy_len[keep] / ll)[:, None]
+    half = 0.5 * motion.sweep[keep]
+
+    def tangent(rot):
+        c, s_ = np.cos(rot), np.sin(rot)
+        x = xy_dir[:, 0] * c - xy_dir[:, 1] * s_
+        y = xy_dir[:, 0] * s_ + xy_dir[:, 1] * c
+        return np.column_stack((x * xy_part[:, 0], y * xy_part[:, 0], dk[:, 2] / ll))
+
+    u_start = tangent(-half)
+    u_end = tangent(half)
+    cos_t = -(u_end[:-1] * u_start[1:]).sum(axis=1)
+    sin_half = np.sqrt(np.clip(0.5 * (1.0 - cos_t), 0.0, 1.0))
+    a_j = np.minimum(acc_k[:-1], acc_k[1:])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vj2 = a_j * jd * sin_half / (1.0 - sin_half)
+    vj2 = np.where(sin_half >= 1.0 - 1e-12, np.inf, vj2)
+    vj2 = np.minimum(vj2, np.minimum(vl[:-1], vl[1:]) ** 2)
+
+    # Hareket tipi değişimlerinde (G0 <-> G1, sadece-A) dur
+    rap = motion.rapid[keep]
+    rot = rotate_only[keep]
+    stop = (rap[:-1] != rap[1:]) | rot[:-1] | rot[1:]
+    vj2 = np.where(stop, 0.0, vj2)
+    vj2 = np.where(np.isfinite(vj2), vj2, 0.0)
+
+    # Düğümler: 0 = başlangıç, 1..m-1 = birleşimler, m = bitiş
+    node_lim = np.concatenate(([0.0], vj2, [0.0]))
+    v_node = node_speeds(node_lim, L, acc_k)
+
+    t_k = _segment_times(L, v_node[:-1], v_node[1:], vl, acc_k)
+    seg_time = np.zeros(len(motion))
+    seg_time[keep] = t_k
+
+    rapid_t = float(seg_time[motion.rapid].sum())
+    rotate_t = float(seg_time[rotate_only & ~motion.rapid].sum())
+    total = float(seg_time.sum())
+    return {
+        "total": total,
+        "cutting": total - rapid_t - rotate_t,
+        "rapid": rapid_t,
+        "rotate_only": rotate_t,
+        "segment_time": seg_time,
+        "n_moves": len(motion),
+    }
+
+
+def format_duration(seconds: float) -> str:
+    seconds = float(seconds)
+    h, rem = divmod(int(round(seconds)), 3600)
+    mi, s = divmod(rem, 60)
+    if h:
+        return f"{h} sa {mi:02d} dk {s:02d} s"
+    if mi:
+        return f"{mi} dk {s:02d} s"
+    return f"{seconds:.1f} s"
+
+
+def summary_text(result: dict) -> str:
+    return (
+        f"Tahmini süre: {format_duration(result['total'])} "
+        f"(kesme {format_duration(result['cutting'])}, "
+        f"hızlı {format_duration(result['rapid'])}, "
+        f"sadece A dönüşü {format_duration(result['rotate_only'])})"
+    )
+
+
+def estimate_program(program, limits=None) -> dict:
+    """G-kodu programının (GCodeProgram.motion()) süresini tahmin et."""
+    return simulate(program.motion(), limits)
@@ -0,0 +1,103 @@
+# feed_schedule.py
+"""
+A ekseni açısal hızına göre besleme planlama.
+
+Teğetsel bıçakta A ekseni yolun yönünü takip eder; keskin dönüşlerde XY
+sabit beslemeyle giderken A ekseni kendi hız sınırına takılır ve makine
+kontrolcüsü hareketi zaten yavaşlatır (ya da bıçak yolun gerisinde kalır).
+Bu modül her segment için A ekseninin yetişebileceği beslemeyi hesaplar:
+
+    F_i = min(F_max, vA_max * L_i / |dA_i|)      (mm/dk, vA_max derece/dk)
+
+|dA_i| köşe eşiğini (corner_deg) aşan segmentlerde bıçak malzeme içinde
+döndürülmez: bıçak kaldırılır, döndürülür ve tekrar daldırılır (lift);
+bu segmentler F_max ile kesilir.
+
+Sonuç PathData'ya `feed` (N,) ve `lift` (N,) kolonları olarak eklenir;
+i. eleman (i-1 -> i) segmentine aittir (0. eleman kullanılmaz). G-kodu
+üreticileri bu kolonlar varsa satır başına F kelimesi ve
+kaldır-döndür-daldır satırları yazar.
+"""
+
+import numpy as np
+
+from cycle_time import DEFAULT_LIMITS, machine_limits
+
+
+def a_axis_speed() -> float:
+    """A ekseninin en yüksek hızı (derece/dk), INI [machine] v_max_a."""
+    return float(machine_limits()["v_max"].get("A", DEFAULT_LIMITS["v_max"]["A"]))
+
+
+def schedule_feed(xy, angles, feed_max: float = 2000.0, a_vmax: float | None = None,
+                  feed_min: float = 100.0, corner_deg: float = 60.0):
+    """
+    Segment başına besleme ve köşe kaldırma işaretleri.
+
+    angles G-kodunda yazılan A değerleridir (açılmamış); ±180 sıçramaları
+    makinede gerçekten büyük bir dönüş olduğundan köşe sayılır.
+
+    Dönen: (feed (N,), lift (N,) bool)
+    """
+    xy = np.asarray(xy, dtype=float)
+    angles = np.asarray(angles, dtype=float)
+    n = xy.shape[0]
+    if a_vmax is None:
+        a_vmax = a_axis_speed()
+    feed_max = float(feed_max)
+    feed_min = min(float(feed_min), feed_max)
+
+    feed = np.full(n, feed_max)
+    lift = np.zeros(n, dtype=bool)
+    if n < 2:
+        return feed, lift
+
+    L = np.hypot(*np.diff(xy, axis=0).T)
+    dA = np.abs(np.diff(angles))
+    if corner_deg and corner_deg > 0:
+        lift[1:] = dA > corner_deg
+    # Kaldırılan segmentlerde dönüş havada yapılır
+    dA = np.where(lift[1:], 0.0, dA)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        limit = np.where(dA > 0, a_vmax * L / dA, np.inf)
+    feed[1:] = np.clip(limit, feed_min, feed_max)
+    return feed, lift
+
+
+def apply_feed_schedule(path_data, feed_max: float = 2000.0, feed_min: float = 100.0,
+                        corner_deg: float = 60.0, a_vmax: float | None = None) -> dict:
+    """
+    path_data.feed / path_data.lift kolonlarını hesapla ve özetini
+    path_data.meta["feed_schedule"] içine yaz. Açı yoksa hiçbir şey yapmaz.
+    """
+    angles = getattr(path_data, "angles", None)
+    if angles is None or len(angles) != len(path_data.xy):
+        return {}
+    if a_vmax is None:
+        a_vmax = a_axis_speed()
+    feed, lift = schedule_feed(path_data.xy, angles, feed_max=feed_max,
+                               a_vmax=a_vmax, feed_min=feed_min,
+                               corner_deg=corner_deg)
+    path_data.feed = feed
+    path_data.lift = lift
+
+    seg = feed[1:]
+    info = {
+        "feed_max": float(feed_max),
+        "feed_min": float(feed_min),
+        "corner_deg": float(corner_deg),
+        "a_vmax": float(a_vmax),
+        "lifts": int(lift.sum()),
+        "slowed": int((seg < feed_max).sum()),
+        "lowest_feed": float(seg.min()) if len(seg) else float(feed_max),
+    }
+    path_data.meta["feed_schedule"] = info
+    return info
+
+
+def summary_text(info: dict) -> str:
+    if not info:
+        return "Besleme planı yok (açı verisi bulunamadı)."
+    return (f"Besleme planı: {info['slowed']:,} segment yavaşlatıldı "
+            f"(en düşük F{info['lowest_feed']:.0f}), "
+            f"{info['lifts']:,} köşede kaldır-döndür-daldır")
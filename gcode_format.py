@@ -0,0 +1,280 @@
+# gcode_format.py
+"""
+G-kodu satırlarını NumPy ile toplu (vektörel) biçimlendirme.
+
+Her satır "alanlardan" oluşur: sabit metin ("G1 X"), sayı kolonu
+(x değerleri, 3 ondalık) vb. Her alan (N, genişlik) boyutlu bir uint8
+karakter matrisi ve aynı boyutta bir "geçerli" maskesi olarak üretilir.
+Tüm alanlar yan yana eklenip maske ile süzülünce, satır satır birleştirilmiş
+metin tek bir bayt tamponu olarak çıkar; Python döngüsü yoktur.
+
+Sayılar f"{v:.{d}f}" ile BİREBİR aynı yazılır: değer 10^d ile ölçeklenip
+tamsayıya yuvarlanır (rint = çifte yuvarlama, Python ile aynı). Yuvarlamanın
+ölçekleme hatası yüzünden şüpheli olduğu (x.5 sınırına çok yakın), çok
+büyük ya da sonlu olmayan değerler Python ile ayrıca biçimlendirilir.
+
+Kelime (Word) listeleri satır bazında maskelenebilir: kompakt çıktıda
+değişmeyen modal kelimeler yazılmaz, sondaki sıfırlar atılır (trim).
+Aynı kurallarla satır uzunlukları metin üretmeden de hesaplanabilir.
+"""
+
+import numpy as np
+
+_ZERO = ord("0")
+_MINUS = ord("-")
+_DOT = ord(".")
+
+
+class Field:
+    """Bir satır alanı: karakter matrisi + geçerlilik maskesi."""
+
+    __slots__ = ("chars", "mask")
+
+    def __init__(self, chars: np.ndarray, mask: np.ndarray):
+        self.chars = chars
+        self.mask = mask
+
+    def only(self, rows: np.ndarray) -> "Field":
+        """Alanı sadece rows=True olan satırlarda yaz (opsiyonel kelimeler için)."""
+        rows = np.asarray(rows, dtype=bool)
+        return Field(self.chars, self.mask & rows[:, None])
+
+
+def text(s: str, n: int) -> Field:
+    """Her satırda aynı olan sabit metin alanı."""
+    b = np.frombuffer(s.encode("ascii"), dtype=np.uint8)
+    chars = np.broadcast_to(b, (n, len(b)))
+    mask = np.ones((n, len(b)), dtype=bool)
+    return Field(chars, mask)
+
+
+def _digit_count(a: np.ndarray) -> np.ndarray:
+    """Negatif olmayan tamsayıların basamak sayısı (0 -> 1)."""
+    nd = np.ones(a.shape, dtype=np.int64)
+    if a.size == 0:
+        return nd
+    top = int(a.max())
+    p = 10
+    while p <= top:
+        nd += a >= p
+        p *= 10
+    return nd
+
+
+def _digits_into(chars, mask, col0, width, values, counts=None):
+    """values'in son `width` basamağını chars[:, col0:col0+width]'e yaz."""
+    p = 1
+    for j in range(width - 1, -1, -1):
+        chars[:, col0 + j] = (values // p) % 10 + _ZERO
+        if counts is not None:
+            mask[:, col0 + j] = (width - 1 - j) < counts
+        p *= 10
+
+
+def _split(values, d: int):
+    """
+    Değerleri tamsayı kısım / kesir kısmı olarak ayır.
+
+    Dönen: (v, special, neg, ip, fp, zero) — special satırlar Python ile
+    biçimlendirilmelidir; zero, yuvarlanmış değeri 0 olan satırlardır.
+    """
+    v = np.asarray(values, dtype=float).ravel()
+    scale = 10.0 ** d
+
+    s = v * scale
+    finite = np.isfinite(s)
+    s0 = np.where(finite, s, 0.0)
+    q = np.rint(s0)
+    frac = np.abs(s0 - np.floor(s0))
+    # Yuvarlamanın ölçekleme hatasından etkilenebileceği ya da tamsayıya
+    # sığmayan değerler Python'a bırakılır.
+    special = (~finite
+               | (np.abs(s0) >= 2.0 ** 52)
+               | (np.abs(frac - 0.5) <= np.abs(s0) * 2.0 ** -50))
+    if special.any():
+        q[special] = 0.0
+
+    neg = np.signbit(v) & ~special
+    aq = np.abs(q).astype(np.int64)
+    ip = aq // int(scale)
+    fp = aq - ip * int(scale)
+    return v, special, neg, ip, fp, aq == 0
+
+
+def trim_text(s: str) -> str:
+    """'1.500' -> '1.5', '2.000' -> '2', '-0.000' -> '0' (sondaki sıfırları at)."""
+    if "." in s:
+        s = s.rstrip("0").rstrip(".")
+    if s == "-0":
+        s = "0"
+    return s
+
+
+def _python_text(v: float, d: int, trim: bool) -> str:
+    t = f"{float(v):.{d}f}"
+    return trim_text(t) if trim else t
+
+
+def _frac_digits(fp: np.ndarray, d: int) -> np.ndarray:
+    """Sondaki sıfırlar atıldığında kalan kesir basamağı sayısı (0..d)."""
+    keep = np.full(fp.shape, d, dtype=np.int64)
+    rest = fp.copy()
+    for _ in range(d):
+        z = (rest % 10 == 0) & (keep > 0)
+        keep -= z
+        rest = np.where(z, rest // 10, rest)
+    return keep
+
+
+def number(values, decimals: int = 3, trim: bool = False) -> Field:
+    """
+    Sayı kolonu; her eleman f"{v:.{decimals}f}" ile aynı metni üretir.
+
+    trim=True ise sondaki sıfırlar ve gereksiz nokta atılır (trim_text).
+    """
+    d = int(decimals)
+    v, special, neg, ip, fp, zero = _split(values, d)
+    n = len(v)
+    if trim:
+        neg = neg & ~zero
+
+    nd = _digit_count(ip)
+    D = int(nd.max()) if n else 1
+    width = 1 + D + (1 + d if d > 0 else 0)
+
+    overrides = {}
+    if special.any():
+        for r in np.flatnonzero(special):
+            overrides[int(r)] = _python_text(v[r], d, trim).encode("ascii")
+        width = max(width, max(len(b) for b in overrides.values()))
+
+    chars = np.zeros((n, width), dtype=np.uint8)
+    mask = np.zeros((n, width), dtype=bool)
+
+    chars[:, 0] = _MINUS
+    mask[:, 0] = neg
+    _digits_into(chars, mask, 1, D, ip, nd)
+    if d > 0:
+        chars[:, 1 + D] = _DOT
+        _digits_into(chars, mask, 2 + D, d, fp)
+        if trim:
+            keep = _frac_digits(fp, d)
+            mask[:, 1 + D] = keep > 0
+            mask[:, 2 + D:2 + D + d] = np.arange(d) < keep[:, None]
+        else:
+            mask[:, 1 + D] = True
+            mask[:, 2 + D:2 + D + d] = True
+
+    for r, b in overrides.items():
+        mask[r, :] = False
+        chars[r, :len(b)] = np.frombuffer(b, dtype=np.uint8)
+        mask[r, :len(b)] = True
+
+    return Field(chars, mask)
+
+
+def number_lengths(values, decimals: int = 3, trim: bool = False) -> np.ndarray:
+    """number() ile yazılacak metinlerin uzunlukları (karakter matrisi kurmadan)."""
+    d = int(decimals)
+    v, special, neg, ip, fp, zero = _split(values, d)
+    if trim:
+        neg = neg & ~zero
+    lengths = neg.astype(np.int64) + _digit_count(ip)
+    if d > 0:
+        if trim:
+            keep = _frac_digits(fp, d)
+            lengths += np.where(keep > 0, keep + 1, 0)
+        else:
+            lengths += 1 + d
+    for r in np.flatnonzero(special):
+        lengths[r] = len(_python_text(v[r], d, trim))
+    return lengths
+
+
+# ---------------------------------------------------------
+# Kelime tabanlı satırlar
+# ---------------------------------------------------------
+class Word:
+    """
+    Bir G-kodu kelimesi: önek (" X") + opsiyonel sayı kolonu.
+
+    values None ise kelime sabit metindir (ör. " F2000.000").
+    rows verilirse kelime sadece rows=True olan satırlarda yazılır.
+    Satırın ilk yazılan kelimesinin baştaki boşluğu atılır.
+    """
+
+    __slots__ = ("prefix", "values", "decimals", "rows")
+
+    def __init__(self, prefix: str, values=None, decimals: int = 3, rows=None):
+        self.prefix = prefix
+        self.values = values
+        self.decimals = decimals
+        self.rows = rows
+
+
+def _first_word(words, n):
+    """Her satırda yazılan ilk kelimenin indisi."""
+    first = np.full(n, len(words), dtype=np.int64)
+    for k in range(len(words) - 1, -1, -1):
+        rows = words[k].rows
+        if rows is None:
+            first[:] = k
+        else:
+            first[rows] = k
+    return first
+
+
+def line_fields(words, n: int, trim: bool = False) -> list:
+    """Kelime listesinden render() için alan listesi üret."""
+    first = _first_word(words, n)
+    fields = []
+    for k, w in enumerate(words):
+        pre = text(w.prefix, n)
+        if w.prefix.startswith(" "):
+            mask = pre.mask.copy()
+            mask[:, 0] = first != k
+            pre = Field(pre.chars, mask)
+        parts = [pre]
+        if w.values is not None:
+            parts.append(number(w.values, w.decimals, trim))
+        if w.rows is not None:
+            parts = [f.only(w.rows) for f in parts]
+        fields += parts
+    return fields
+
+
+def line_lengths(words, n: int, trim: bool = False) -> np.ndarray:
+    """line_fields ile yazılacak satırların uzunlukları (satır sonu hariç)."""
+    first = _first_word(words, n)
+    total = np.zeros(n, dtype=np.int64)
+    for k, w in enumerate(words):
+        ln = np.full(n, len(w.prefix), dtype=np.int64)
+        if w.prefix.startswith(" "):
+            ln -= first == k
+        if w.values is not None:
+            ln += number_lengths(w.values, w.decimals, trim)
+        if w.rows is not None:
+            ln *= w.rows
+        total += ln
+    return total
+
+
+def render(fields, newline: bool = True) -> bytes:
+    """Alanları satır satır birleştir; newline=True ise her satır '\\n' ile biter."""
+    fields = list(fields)
+    if not fields:
+        return b""
+    n = fields[0].chars.shape[0]
+    if newline:
+        fields.append(text("\n", n))
+    if n == 0:
+        return b""
+    chars = np.concatenate([f.chars for f in fields], axis=1)
+    mask = np.concatenate([f.mask for f in fields], axis=1)
+    return chars[mask].tobytes()
+
+
+def format_fixed(values, decimals: int = 3) -> list:
+    """Kolaylık: değerleri f"{v:.{decimals}f}" ile aynı metin listesi olarak döndür."""
+    buf = render([number(values, decimals)], newline=True)
+    return buf.decode("ascii").split("\n")[:-1]
@@ -1,12 +1,20 @@
 import numpy as np
 
+import gcode_format as gf
+from arc_fit import fit_arcs, ARC_CCW
+from cycle_time import Motion
 
-def _fmt(v: float, decimals: int = 3) -> str:
-    """Kısa float formatı."""
+# Akışlı üretimde bir parçadaki gövde satırı sayısı
+DEFAULT_CHUNK_LINES = 50_000
+
+
+def _fmt(v: float, decimals: int = 3, trim: bool = False) -> str:
+    """Kısa float formatı (trim=True: sondaki sıfırlar atılır)."""
     try:
-        return f"{float(v):.{decimals}f}"
+        t = f"{float(v):.{decimals}f}"
     except Exception:
         return str(v)
+    return gf.trim_text(t) if trim else t
 
 
 def _ensure_xy(path_data):
@@ -43,7 +51,397 @@ def _compute_origin_offset(xy: np.ndarray, origin_mode: str):
     # tanınmayan durumda offset yok
     return 0.0, 0.0
 
-def generate_gcode_flat(
+
+class GCodeProgram:
+    """
+    Üretilen G-kodu: başlık satırları + gövde + bitiş satırları.
+
+    Gövde (yol noktası başına en fazla bir satır) gcode_format ile kolon
+    kolon biçimlendirilir; body_words(start, stop) ilgili satır aralığının
+    kelimelerini (gf.Word) döndürür.
+    """
+
+    def __init__(self, header, n_body, body_words, footer, trim=False):
+        self.header = list(header)
+        self.n_body = int(n_body)
+        self.body_words = body_words
+        self.footer = list(footer)
+        self.trim = bool(trim)
+        # Yay uydurma yapıldıysa sonucu (arc_fit.ArcFit)
+        self.arc_fit = None
+        # Hareket tablosunu (cycle_time.Motion) kuran fonksiyon
+        self.motion_source = None
+        # Yolun besleme planı (feed/lift kolonları) kullanıldı mı
+        self.feed_scheduled = False
+        # Bölme / devam programları için (bkz. gcode_split):
+        # başlığın ilk n_setup satırı hareket içermez (birimler, G90, G54);
+        # rows_source() -> (satırın bitiş noktası indisi, güvenli başlangıç mı)
+        self.n_setup = 0
+        self.safe_z = None
+        self.knife_axis = None
+        self.rows_source = None
+
+    def body_bytes(self, start: int = 0, stop: int | None = None) -> bytes:
+        stop = self.n_body if stop is None else min(stop, self.n_body)
+        if stop <= start:
+            return b""
+        words = self.body_words(start, stop)
+        return gf.render(gf.line_fields(words, stop - start, self.trim))
+
+    def text(self) -> str:
+        return "".join(self.iter_chunks(chunk_lines=None))
+
+    def iter_chunks(self, chunk_lines: int | None = DEFAULT_CHUNK_LINES):
+        """
+        Programı parça parça (str) üret; birleşimi text() ile aynıdır.
+
+        Bellekte aynı anda en fazla chunk_lines satırlık metin bulunur.
+        chunk_lines=None tüm gövdeyi tek parça üretir.
+        """
+        yield "\n".join(self.header) + "\n"
+        step = self.n_body if not chunk_lines else max(1, int(chunk_lines))
+        for start in range(0, self.n_body, max(1, step)):
+            yield self.body_bytes(start, start + step).decode("ascii")
+        yield "\n".join(self.footer)
+
+    def line_count(self) -> int:
+        return len(self.header) + self.n_body + len(self.footer)
+
+    def motion(self) -> Motion:
+        """Süre tahmini için hareket tablosu (ilk noktaya yaklaşma hariç)."""
+        if self.motion_source is None:
+            raise ValueError("Bu program için hareket tablosu yok.")
+        return self.motion_source()
+
+    def body_line_lengths(self, chunk_lines: int = 1_000_000) -> np.ndarray:
+        """Gövde satırlarının uzunlukları (satır sonu dahil), metin üretmeden."""
+        out = np.empty(self.n_body, dtype=np.int64)
+        for start in range(0, self.n_body, chunk_lines):
+            stop = min(start + chunk_lines, self.n_body)
+            words = self.body_words(start, stop)
+            out[start:stop] = gf.line_lengths(words, stop - start, self.trim) + 1
+        return out
+
+    def size_chars(self, chunk_lines: int = 1_000_000) -> int:
+        """Metnin uzunluğu (karakter); satırlar biçimlendirilmeden hesaplanır."""
+        total = len("\n".join(self.header)) + 1 + len("\n".join(self.footer))
+        for start in range(0, self.n_body, chunk_lines):
+            stop = min(start + chunk_lines, self.n_body)
+            words = self.body_words(start, stop)
+            total += int(gf.line_lengths(words, stop - start, self.trim).sum())
+            total += stop - start
+        return total
+
+    def rows(self):
+        """(satır bitiş noktaları, güvenli satırlar); bilinmiyorsa ValueError."""
+        if self.rows_source is None:
+            raise ValueError("Bu program için satır bilgisi yok.")
+        return self.rows_source()
+
+
+def _fit(xy, z, a_all, arc_tolerance, a_arc_tolerance):
+    """arc_tolerance > 0 ise yay uydurma sonucunu (ArcFit) döndür."""
+    if not arc_tolerance or xy.shape[0] < 3:
+        return None
+    return fit_arcs(xy, tolerance=arc_tolerance, z=z, angles=a_all,
+                    a_tolerance=a_arc_tolerance)
+
+
+def _feed_columns(path_data, n, use_feed_column=True):
+    """Besleme planı kolonları (feed, lift); yoksa ya da boyu tutmazsa None."""
+    if not use_feed_column:
+        return None, None
+    cols = []
+    for name in ("feed", "lift"):
+        arr = getattr(path_data, name, None)
+        if arr is not None:
+            arr = np.asarray(arr)
+            if arr.shape != (n,):
+                arr = None
+        cols.append(arr)
+    return cols[0], cols[1]
+
+
+def _resume_info(program, safe_z, knife_axis, moves=None):
+    """Bölme / devam programları için gereken bilgileri programa ekle."""
+    program.n_setup = 4  # açıklama, G21, G90, G54
+    program.safe_z = float(safe_z)
+    program.knife_axis = knife_axis
+    if moves is not None:
+        program.rows_source = moves.rows
+    else:
+        n = program.n_body
+        program.rows_source = lambda: (np.arange(1, n + 1), np.ones(n, dtype=bool))
+
+
+def _changed(values, step):
+    """
+    Değerler step ızgarasına yuvarlandığında bir önceki noktaya göre
+    değişen noktalar (ilk nokta için False).
+    """
+    q = np.rint(np.asarray(values, dtype=float) / step)
+    out = np.zeros(q.shape, dtype=bool)
+    out[1:] = q[1:] != q[:-1]
+    return out
+
+
+class _Moves:
+    """
+    Genel gövde tablosu (kompakt çıktı ve/veya yay uydurma için).
+
+    Her gövde satırı bir hareket: idx bitiş noktası indisi, kind 1/2/3
+    (G1/G2/G3), ij yay merkezinin başlangıç noktasına göre konumu.
+    emit[isim] (kompakt çıktıda) kelimenin o satırda yazılıp yazılmayacağı;
+    None ise her satırda yazılır.
+
+    feed/lift (nokta başına, bkz. feed_schedule) verilirse her hareketin
+    beslemesi kapsadığı segmentlerin en düşüğüdür; kaldırılan hareketlerden
+    önce üç satır eklenir (op 1: G0 Z güvenli, 2: G0 A, 3: G1 Z dalış).
+    src/op: gövde satırının hareket indisi ve tipi (0 = hareketin kendisi).
+    """
+
+    def __init__(self, xy, columns, arcs=None, compact=False,
+                 resolution=0.001, initial_kind=None, feed=None, lift=None):
+        n = xy.shape[0]
+        if arcs is not None:
+            cand = np.concatenate(([0], arcs.ends))
+            kinds = np.concatenate(([0], arcs.kinds)).astype(np.int8)
+            starts = np.concatenate(([0], arcs.starts))
+            centers = np.vstack((np.full((1, 2), np.nan), arcs.centers))
+        else:
+            cand = np.arange(n)
+            kinds = np.ones(n, dtype=np.int8)
+            starts = centers = None
+        is_arc = kinds > 1
+
+        if compact:
+            # Bir kelime ancak değeri kendi ölü bandı ızgarasında değişmişse
+            # yazılır; hiçbir kelimesi değişmeyen doğrusal hareketler
+            # (makine çözünürlüğünün altındakiler) bir öncekiyle birleştirilir.
+            changed = {}
+            for name, (values, band) in columns.items():
+                if values is None:
+                    continue
+                changed[name] = _changed(values[cand], max(float(band), resolution))
+            keep = is_arc.copy()
+            for c in changed.values():
+                keep |= c
+            keep[0] = False  # ilk nokta başlıkta
+            pos = np.flatnonzero(keep)
+            emit = {name: c[pos] for name, c in changed.items()}
+            # Yayın bitişi her zaman tam yazılır (X/Y yoksa tam çember olur)
+            for name in ("x", "y"):
+                emit[name] = emit[name] | is_arc[pos]
+            if len(pos) and not is_arc[pos[-1]]:
+                # Son tutulan satırdan sonraki noktalar aynı ızgara hücresinde;
+                # son satır yolun gerçek bitiş noktasını yazsın
+                pos[-1] = len(cand) - 1
+            # G kelimesi sadece hareket tipi değişince
+            k = kinds[pos]
+            prev = np.empty_like(k)
+            if len(k):
+                prev[0] = -1 if initial_kind is None else initial_kind
+                prev[1:] = k[:-1]
+            emit["g"] = k != prev
+            first = np.zeros(len(pos), dtype=bool)
+            first[:1] = True
+            emit["f"] = first
+        else:
+            pos = np.arange(1, len(cand))
+            emit = None
+
+        self.idx = cand[pos]
+        self.kind = kinds[pos]
+        self.ij = None
+        self.start_idx = None
+        if starts is not None:
+            self.start_idx = starts[pos]
+            self.ij = centers[pos] - xy[starts[pos]]
+        # Hareketin kapsadığı ilk nokta (önceki hareketin bitişinden sonraki)
+        self.first_pt = np.concatenate(([0], self.idx[:-1])) + 1
+        self.feed = None
+        self.lift = None
+        self.turn_pt = None
+        m = len(self.idx)
+        if feed is not None and m:
+            self.feed = np.minimum.reduceat(np.asarray(feed, dtype=float),
+                                            self.first_pt)
+        if lift is not None and m:
+            lift = np.asarray(lift, dtype=bool)
+            # Bıçak hareketin ilk köşe noktasındaki açıya döndürülür
+            turn = np.minimum.reduceat(np.where(lift, np.arange(n), n), self.first_pt)
+            self.lift = turn < n
+            self.turn_pt = np.minimum(turn, self.idx)
+            if not self.lift.any():
+                self.lift = None
+
+        if emit is not None and self.feed is not None:
+            # Planlı beslemede F değişince (ve dalıştan sonra) yazılır
+            f = _changed(self.feed, 0.001)
+            f[:1] = True
+            emit["f"] = f
+        if emit is not None and self.lift is not None:
+            emit["f"] = emit["f"] | self.lift
+            # Dalış satırı G1'i modal yapar
+            emit["g"] = np.where(self.lift, self.kind != 1, emit["g"])
+        self.emit = emit
+
+        if self.lift is None:
+            self.src = np.arange(m)
+            self.op = None
+        else:
+            counts = 1 + 3 * self.lift
+            self.src = np.repeat(np.arange(m), counts)
+            off = np.arange(len(self.src)) - (np.cumsum(counts) - counts)[self.src]
+            self.op = np.where(self.lift[self.src], (off + 1) % 4, 0).astype(np.int8)
+
+    def __len__(self):
+        return len(self.src)
+
+    def rows(self):
+        """
+        Satır başına bitiş noktası ve güvenli başlangıç işareti.
+
+        Bir satırdan başlayan program (gcode_split) önce G1 ile dalış yapar;
+        G kelimesi atlanmış yay satırları ve kaldırma dizisinin ortası
+        bu yüzden güvenli değildir.
+        """
+        points = self.idx[self.src]
+        if self.emit is None:
+            safe = np.ones(len(points), dtype=bool)
+        else:
+            safe = (self.kind[self.src] == 1) | self.emit["g"][self.src]
+        if self.op is not None:
+            safe = np.where(self.op == 0, safe, self.op == 1)
+        return points, safe
+
+    def words(self, start, stop, order, values, feed_txt, knife_axis, lift=None):
+        """
+        [start, stop) satırlarının kelimeleri.
+
+        order: kelime sırası, ör. ("g", "x", "y", "ij", "f", "z", "a")
+        values: {"x": dizi, ...} (tüm noktalar)
+        feed_txt: sabit F kelimesi; planlı beslemede sadece " F" öneki
+        lift: (güvenli Z, dalış Z'leri (nokta başına), dalış F kelimesi)
+        """
+        src = slice(start, stop) if self.op is None else self.src[start:stop]
+        rows = self.idx[src]
+        kind = self.kind[src]
+        emit = self.emit
+        move = None if self.op is None else self.op[start:stop] == 0
+
+        def on(name):
+            sel = None if emit is None else emit[name][src]
+            if move is None:
+                return sel
+            return move if sel is None else sel & move
+
+        words = []
+        if move is not None and lift is not None:
+            safe_z, plunge_z, plunge_txt = lift
+            op = self.op[start:stop]
+            up, turn, down = op == 1, op == 2, op == 3
+            prev = self.first_pt[src] - 1
+            words += [gf.Word("G0", rows=up | turn),
+                      gf.Word(" Z", np.full(len(src), float(safe_z)), rows=up),
+                      gf.Word(f" {knife_axis}", values["a"][self.turn_pt[src]], rows=turn),
+                      gf.Word("G1", rows=down),
+                      gf.Word(" Z", plunge_z[prev], rows=down),
+                      gf.Word(plunge_txt, rows=down)]
+
+        for name in order:
+            if name == "g":
+                g_rows = on("g")
+                for code in (1, 2, 3):
+                    sel = kind == code
+                    if g_rows is not None:
+                        sel &= g_rows
+                    words.append(gf.Word(f"G{code}", rows=sel))
+            elif name == "ij":
+                if self.ij is not None:
+                    arc = kind > 1
+                    if move is not None:
+                        arc &= move
+                    words.append(gf.Word(" I", self.ij[src, 0], rows=arc))
+                    words.append(gf.Word(" J", self.ij[src, 1], rows=arc))
+            elif name == "f":
+                if self.feed is not None:
+                    words.append(gf.Word(" F", self.feed[src], rows=on("f")))
+                elif feed_txt:
+                    words.append(gf.Word(feed_txt, rows=on("f")))
+            elif values.get(name) is not None:
+                prefix = f" {knife_axis}" if name == "a" else f" {name.upper()}"
+                words.append(gf.Word(prefix, values[name][rows], rows=on(name)))
+        return words
+
+
+def _program_motion(xy, z_all, a_all, safe_z, plunge_feed, feed_xy, moves=None):
+    """
+    Programın hareket tablosu: ilk noktada güvenli Z'den dalış, gövde
+    hareketleri (G1/G2/G3, varsa kaldır-döndür-daldır satırları) ve güvenli
+    Z'ye çıkış. Makinenin programdan önceki konumu bilinmediğinden ilk
+    noktaya hızlı yaklaşma dahil edilmez.
+    """
+    n = xy.shape[0]
+    if a_all is None:
+        a_all = np.zeros(n)
+    pts = np.column_stack((xy, z_all, a_all))
+    start = pts[0].copy()
+    start[2] = safe_z
+
+    if moves is None:
+        idx = np.arange(1, n)
+        kind = np.ones(len(idx), dtype=np.int8)
+    else:
+        idx, kind = moves.idx, moves.kind
+
+    radius = np.zeros(len(idx))
+    sweep = np.zeros(len(idx))
+    if moves is not None and moves.ij is not None:
+        arc = kind > 1
+        ij = moves.ij[arc]
+        s = xy[moves.start_idx[arc]]
+        e = xy[idx[arc]]
+        c = s + ij
+        radius[arc] = np.hypot(ij[:, 0], ij[:, 1])
+        th0 = np.arctan2(s[:, 1] - c[:, 1], s[:, 0] - c[:, 0])
+        th1 = np.arctan2(e[:, 1] - c[:, 1], e[:, 0] - c[:, 0])
+        ccw = kind[arc] == ARC_CCW
+        sweep[arc] = np.where(ccw, (th1 - th0) % (2 * np.pi),
+                              -((th0 - th1) % (2 * np.pi)))
+
+    body = pts[idx]
+    feed = np.full(len(idx), float(feed_xy))
+    if moves is not None and moves.feed is not None:
+        feed = moves.feed
+    rapid = np.zeros(len(idx), dtype=bool)
+    if moves is not None and moves.op is not None:
+        # Kaldırılan hareketlerden önce: G0 Z güvenli, G0 A, G1 Z dalış
+        src, op = moves.src, moves.op
+        prev = moves.first_pt[src] - 1
+        body = pts[idx[src]]
+        lifted = op > 0
+        body[lifted] = pts[prev[lifted]]
+        body[op == 1, 2] = safe_z
+        turned = op > 1
+        body[turned, 3] = a_all[moves.turn_pt[src[turned]]]
+        feed = np.where(op == 3, plunge_feed, feed[src])
+        feed[(op == 1) | (op == 2)] = np.inf
+        rapid = (op == 1) | (op == 2)
+        radius = np.where(lifted, 0.0, radius[src])
+        sweep = np.where(lifted, 0.0, sweep[src])
+
+    retract = (body[-1] if len(body) else pts[0]).copy()
+    retract[2] = safe_z
+    targets = np.vstack((pts[:1], body, retract[None, :]))
+    return Motion(start, targets,
+                  np.concatenate(([plunge_feed], feed, [np.inf])),
+                  np.concatenate(([False], rapid, [True])),
+                  np.concatenate(([0.0], radius, [0.0])),
+                  np.concatenate(([0.0], sweep, [0.0])))
+
+
+def gcode_program_flat(
     path_data,
     feed_xy: float = 2000.0,
     safe_z: float = 5.0,
@@ -51,15 +449,28 @@ def generate_gcode_flat(
     knife_axis: str = "A",
     knife_offset_deg: float = 0.0,
     origin_mode: str = "bottom_left",
-) -> str:
-    """Z takibi OLMAYAN (sabit Z'li) basit XY + bıçak ekseni G-kodu üretir.
+    compact: bool = False,
+    resolution: float = 0.001,
+    a_deadband: float = 0.0,
+    arc_tolerance: float = 0.0,
+    a_arc_tolerance: float = 0.5,
+    use_feed_column: bool = True,
+) -> GCodeProgram:
+    """
+    generate_gcode_flat'in programı (metin üretmeden).
 
-    - path_data.xy kullanılır
-    - path_data.angles varsa, bıçak eksenini (A vb.) döndürmek için kullanılır
-    - path_data.z göz ardı edilir
-    - Z ekseni sabit `cut_z` derinliğine iner
+    compact=True: tekrarlanan modal kelimeler (G1, F, değişmeyen X/Y/A)
+    yazılmaz, sayıların sondaki sıfırları atılır, `resolution` altındaki
+    hareketler birleştirilir. A ekseni `a_deadband` (derece) kadar
+    değişmedikçe yazılmaz.
 
-    Not: path_data.meta["depth"] varsa onu kullanıp cut_z = -depth yapar.
+    arc_tolerance > 0: yol arc_fit ile G2/G3 yaylarına dönüştürülür
+    (noktalar yaya en fazla arc_tolerance mm, A ekseni a_arc_tolerance
+    derece uzak); sonuç program.arc_fit içindedir.
+
+    path_data.feed / path_data.lift varsa (feed_schedule) her satıra kendi
+    F'si yazılır ve işaretli köşelerde bıçak kaldırılıp döndürülür;
+    use_feed_column=False bunları yok sayar (sabit besleme).
     """
     xy = _ensure_xy(path_data)
 
@@ -82,20 +493,19 @@ def generate_gcode_flat(
     # Açı vektörü (opsiyonel)
     angles = None
     if hasattr(path_data, "angles") and path_data.angles is not None:
-        import numpy as _np
         try:
-            angles = _np.asarray(path_data.angles, dtype=float)
-            if angles.shape[0] != _ensure_xy(path_data).shape[0]:
+            angles = np.asarray(path_data.angles, dtype=float)
+            if angles.shape[0] != xy.shape[0]:
                 angles = None
         except Exception:
             angles = None
 
-    lines = []
-    lines.append("(Tangential CAM - 2D G-kodu, Z takibi yok)")
-    lines.append("G21  (mm)")
-    lines.append("G90  (mutlak koordinat)")
-    lines.append("G54")
-    lines.append(f"G0 Z{_fmt(safe_z)}")
+    header = []
+    header.append("(Tangential CAM - 2D G-kodu, Z takibi yok)")
+    header.append("G21  (mm)")
+    header.append("G90  (mutlak koordinat)")
+    header.append("G54")
+    header.append(f"G0 Z{_fmt(safe_z)}")
 
     x0, y0 = xy[0]
     a0 = angles[0] + knife_offset_deg if angles is not None else None
@@ -104,38 +514,115 @@ def generate_gcode_flat(
     cmd0 = f"G0 X{_fmt(x0)} Y{_fmt(y0)}"
     if a0 is not None:
         cmd0 += f" {knife_axis}{_fmt(a0)}"
-    lines.append(cmd0)
+    header.append(cmd0)
 
     # Sabit kesme derinliğine in
-    lines.append(f"G1 Z{_fmt(cut_z)} F{_fmt(feed_xy)}")
+    header.append(f"G1 Z{_fmt(cut_z)} F{_fmt(feed_xy)}")
 
-    # Yol boyunca ilerle
-    for i, (x, y) in enumerate(xy[1:], start=1):
-        cmd = f"G1 X{_fmt(x)} Y{_fmt(y)}"
-        if angles is not None:
-            a = angles[i] + knife_offset_deg
-            cmd += f" {knife_axis}{_fmt(a)}"
-        cmd += f" F{_fmt(feed_xy)}"
-        lines.append(cmd)
+    # Yol boyunca ilerle: "G1 X.. Y.. [A..] F.."
+    a_all = angles + knife_offset_deg if angles is not None else None
+    feed_txt = f" F{_fmt(feed_xy)}"
+    footer = [f"G0 Z{_fmt(safe_z)}", "M30"]
 
-    lines.append(f"G0 Z{_fmt(safe_z)}")
-    lines.append("M30")
-    return "\n".join(lines)
+    feed_col, lift_col = _feed_columns(path_data, xy.shape[0], use_feed_column)
+    if a_all is None:
+        lift_col = None  # bıçak ekseni yoksa döndürülecek bir şey yok
 
+    if not compact and not arc_tolerance and feed_col is None and lift_col is None:
+        def body_words(start, stop):
+            i0, i1 = start + 1, stop + 1
+            words = [gf.Word("G1"),
+                     gf.Word(" X", xy[i0:i1, 0]), gf.Word(" Y", xy[i0:i1, 1])]
+            if a_all is not None:
+                words.append(gf.Word(f" {knife_axis}", a_all[i0:i1]))
+            words.append(gf.Word(feed_txt))
+            return words
 
-def generate_gcode_3d(
+        program = GCodeProgram(header, xy.shape[0] - 1, body_words, footer)
+        program.motion_source = lambda: _program_motion(
+            xy, np.full(xy.shape[0], cut_z), a_all, safe_z, feed_xy, feed_xy)
+        _resume_info(program, safe_z, knife_axis if a_all is not None else None)
+        return program
+
+    # Kompakt: G1 ve F başlıktaki "G1 Z.. F.." satırından modal olarak geçerli
+    arcs = _fit(xy, None, a_all, arc_tolerance, a_arc_tolerance)
+    moves = _Moves(
+        xy,
+        {"x": (xy[:, 0], resolution), "y": (xy[:, 1], resolution),
+         "a": (a_all, a_deadband)},
+        arcs=arcs, compact=compact, resolution=resolution, initial_kind=1,
+        feed=feed_col, lift=lift_col,
+    )
+    values = {"x": xy[:, 0], "y": xy[:, 1], "a": a_all}
+    feed = None if compact else feed_txt
+    z_cut = np.full(xy.shape[0], float(cut_z))
+    lift = (safe_z, z_cut, f" F{_fmt(feed_xy, trim=compact)}")
+
+    def body_words(start, stop):
+        return moves.words(start, stop, ("g", "x", "y", "ij", "a", "f"),
+                           values, feed, knife_axis, lift)
+
+    program = GCodeProgram(header, len(moves), body_words, footer, trim=compact)
+    program.arc_fit = arcs
+    program.feed_scheduled = feed_col is not None or lift_col is not None
+    program.motion_source = lambda: _program_motion(
+        xy, z_cut, a_all, safe_z, feed_xy, feed_xy, moves)
+    _resume_info(program, safe_z, knife_axis if a_all is not None else None, moves)
+    return program
+
+
+def generate_gcode_flat(
     path_data,
     feed_xy: float = 2000.0,
-    feed_z: float = 800.0,
     safe_z: float = 5.0,
+    cut_z: float = -1.0,
     knife_axis: str = "A",
     knife_offset_deg: float = 0.0,
     origin_mode: str = "bottom_left",
 ) -> str:
-    """Z derinliği + bıçak açısı (A ekseni) içeren G-kodu üretir.
+    """Z takibi OLMAYAN (sabit Z'li) basit XY + bıçak ekseni G-kodu üretir.
 
-    - path_data.xy, path_data.z, path_data.angles kullanılır.
-    - knife_offset_deg ile bıçak yönü (+0, +180 vb.) kaydırılabilir.
+    - path_data.xy kullanılır
+    - path_data.angles varsa, bıçak eksenini (A vb.) döndürmek için kullanılır
+    - path_data.z göz ardı edilir
+    - Z ekseni sabit `cut_z` derinliğine iner
+
+    Not: path_data.meta["depth"] varsa onu kullanıp cut_z = -depth yapar.
+    """
+    return gcode_program_flat(
+        path_data, feed_xy=feed_xy, safe_z=safe_z, cut_z=cut_z,
+        knife_axis=knife_axis, knife_offset_deg=knife_offset_deg,
+        origin_mode=origin_mode,
+    ).text()
+
+
+def gcode_program_3d(
+    path_data,
+    feed_xy: float = 2000.0,
+    feed_z: float = 800.0,
+    safe_z: float = 5.0,
+    knife_axis: str = "A",
+    knife_offset_deg: float = 0.0,
+    origin_mode: str = "bottom_left",
+    compact: bool = False,
+    resolution: float = 0.001,
+    z_deadband: float = 0.0,
+    a_deadband: float = 0.0,
+    arc_tolerance: float = 0.0,
+    a_arc_tolerance: float = 0.5,
+    use_feed_column: bool = True,
+) -> GCodeProgram:
+    """
+    generate_gcode_3d'nin programı (metin üretmeden).
+
+    compact=True: G1 ve F sadece ilk gövde satırında yazılır; X/Y
+    `resolution`, Z `z_deadband` (mm), A `a_deadband` (derece) ızgarasında
+    değişmedikçe tekrar edilmez; sayıların sondaki sıfırları atılır ve
+    hiçbir ekseni değişmeyen noktalar birleştirilir.
+
+    arc_tolerance > 0: yol G2/G3 yaylarına dönüştürülür (Z ve A yay boyunca
+    doğrusal); planlı besleme ve köşe kaldırma için de bkz.
+    gcode_program_flat (dalış feed_z ile yapılır).
     """
     xy = _ensure_xy(path_data)
 
@@ -155,13 +642,13 @@ def generate_gcode_3d(
         if angles.shape[0] != xy.shape[0]:
             angles = None
 
-    n = xy.shape[0]
-    lines = []
-    lines.append("(Tangential CAM - 3D G-kodu, Z takipli)")
-    lines.append("G21  (mm)")
-    lines.append("G90  (mutlak koordinat)")
-    lines.append("G54")
-    lines.append(f"G0 Z{_fmt(safe_z)}")
+    n_pts = xy.shape[0]
+    header = []
+    header.append("(Tangential CAM - 3D G-kodu, Z takipli)")
+    header.append("G21  (mm)")
+    header.append("G90  (mutlak koordinat)")
+    header.append("G54")
+    header.append(f"G0 Z{_fmt(safe_z)}")
 
     x0, y0 = xy[0]
     z0 = z[0] if z is not None else None
@@ -171,23 +658,98 @@ def generate_gcode_3d(
     cmd = f"G0 X{_fmt(x0)} Y{_fmt(y0)}"
     if a0 is not None:
         cmd += f" {knife_axis}{_fmt(a0)}"
-    lines.append(cmd)
+    header.append(cmd)
 
     # Z'ye in
     if z0 is not None:
-        lines.append(f"G1 Z{_fmt(z0)} F{_fmt(feed_z)}")
-
-    # Kalan noktalar
-    for i in range(1, n):
-        x, y = xy[i]
-        cmd = f"G1 X{_fmt(x)} Y{_fmt(y)} F{_fmt(feed_xy)}"
-        if z is not None:
-            cmd += f" Z{_fmt(z[i])}"
-        if angles is not None:
-            a = angles[i] + knife_offset_deg
-            cmd += f" {knife_axis}{_fmt(a)}"
-        lines.append(cmd)
-
-    lines.append(f"G0 Z{_fmt(safe_z)}")
-    lines.append("M30")
-    return "\n".join(lines)
+        header.append(f"G1 Z{_fmt(z0)} F{_fmt(feed_z)}")
+
+    # Kalan noktalar: "G1 X.. Y.. F.. [Z..] [A..]"
+    a_all = angles + knife_offset_deg if angles is not None else None
+    # Z yoksa gövde güvenli Z'de kalır (süre tahmini için)
+    z_all = z if z is not None else np.full(n_pts, float(safe_z))
+    feed_txt = f" F{_fmt(feed_xy)}"
+
+    footer = [f"G0 Z{_fmt(safe_z)}", "M30"]
+
+    feed_col, lift_col = _feed_columns(path_data, n_pts, use_feed_column)
+    if a_all is None or z is None:
+        lift_col = None
+
+    if not compact and not arc_tolerance and feed_col is None and lift_col is None:
+        def body_words(start, stop):
+            i0, i1 = start + 1, stop + 1
+            words = [gf.Word("G1"),
+                     gf.Word(" X", xy[i0:i1, 0]), gf.Word(" Y", xy[i0:i1, 1]),
+                     gf.Word(feed_txt)]
+            if z is not None:
+                words.append(gf.Word(" Z", z[i0:i1]))
+            if a_all is not None:
+                words.append(gf.Word(f" {knife_axis}", a_all[i0:i1]))
+            return words
+
+        program = GCodeProgram(header, n_pts - 1, body_words, footer)
+        program.motion_source = lambda: _program_motion(
+            xy, z_all, a_all, safe_z, feed_z, feed_xy)
+        _resume_info(program, safe_z, knife_axis if a_all is not None else None)
+        return program
+
+    arcs = _fit(xy, z, a_all, arc_tolerance, a_arc_tolerance)
+    moves = _Moves(
+        xy,
+        {"x": (xy[:, 0], resolution), "y": (xy[:, 1], resolution),
+         "z": (z, z_deadband), "a": (a_all, a_deadband)},
+        arcs=arcs, compact=compact, resolution=resolution,
+        feed=feed_col, lift=lift_col,
+    )
+    values = {"x": xy[:, 0], "y": xy[:, 1], "z": z, "a": a_all}
+    if compact:
+        # G ve besleme sadece ilk satırda / tip değişince (sonrasında modal)
+        feed_txt = f" F{_fmt(feed_xy, trim=True)}"
+    lift = (safe_z, z_all, f" F{_fmt(feed_z, trim=compact)}")
+
+    def body_words(start, stop):
+        return moves.words(start, stop, ("g", "x", "y", "ij", "f", "z", "a"),
+                           values, feed_txt, knife_axis, lift)
+
+    program = GCodeProgram(header, len(moves), body_words, footer, trim=compact)
+    program.arc_fit = arcs
+    program.feed_scheduled = feed_col is not None or lift_col is not None
+    program.motion_source = lambda: _program_motion(
+        xy, z_all, a_all, safe_z, feed_z, feed_xy, moves)
+    _resume_info(program, safe_z, knife_axis if a_all is not None else None, moves)
+    return program
+
+
+def generate_gcode_3d(
+    path_data,
+    feed_xy: float = 2000.0,
+    feed_z: float = 800.0,
+    safe_z: float = 5.0,
+    knife_axis: str = "A",
+    knife_offset_deg: float = 0.0,
+    origin_mode: str = "bottom_left",
+) -> str:
+    """Z derinliği + bıçak açısı (A ekseni) içeren G-kodu üretir.
+
+    - path_data.xy, path_data.z, path_data.angles kullanılır.
+    - knife_offset_deg ile bıçak yönü (+0, +180 vb.) kaydırılabilir.
+    """
+    return gcode_program_3d(
+        path_data, feed_xy=feed_xy, feed_z=feed_z, safe_z=safe_z,
+        knife_axis=knife_axis, knife_offset_deg=knife_offset_deg,
+        origin_mode=origin_mode,
+    ).text()
+
+
+# ---------------------------------------------------------
+# Akışlı (parça parça) üretim
+# ---------------------------------------------------------
+def iter_gcode_flat(path_data, chunk_lines: int = DEFAULT_CHUNK_LINES, **kwargs):
+    """generate_gcode_flat'in akışlı hali: metni parçalar halinde üretir."""
+    return gcode_program_flat(path_data, **kwargs).iter_chunks(chunk_lines)
+
+
+def iter_gcode_3d(path_data, chunk_lines: int = DEFAULT_CHUNK_LINES, **kwargs):
+    """generate_gcode_3d'nin akışlı hali: metni parçalar halinde üretir."""
+    return gcode_program_3d(path_data, **kwargs).iter_chunks(chunk_lines)
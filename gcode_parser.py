@@ -0,0 +1,431 @@
+# gcode_parser.py
+"""
+Hazır G-kodu programlarını (.nc / .tap / .gcode, başka CAM'lerden)
+NumPy dizilerine çeviren hızlı okuyucu; geri çizim (back-plot), sınırlar
+ve süre tahmini için.
+
+Dosya satır sınırlarında bölünmüş büyük bloklar halinde okunur ve her
+blok tek seferde (Python döngüsü olmadan) işlenir:
+
+1. Yorumlar ("( ... )" ve ";" sonrası) ve boşluklar bytes.translate /
+   re ile atılır, harfler büyütülür.
+2. Harfler kelime başlarıdır: harfler (ve satır sonları) ayrı bir akışa
+   alınır, sayılar harfler ayırıcıya çevrilip tek np.fromstring çağrısıyla
+   okunur. Bozuk kelime varsa (sayısız harf vb.) karakter karakter
+   vektörel okuyucuya geçilir: rakamlar tamsayı mantis olarak toplanır
+   (np.bincount) ve 10^kesir_basamağı ile bölünür.
+3. Kelimeler satır tablosuna yazılır; modal durum (G0/G1/G2/G3, F,
+   G20/G21, G90/G91, eksen konumları) ileri doldurma (maximum.accumulate)
+   ile çözülür. Blok sonundaki durum bir sonraki bloğa taşınır.
+
+Desteklenenler: G0/G1/G2/G3 (yaylar I/J ya da R ile, XY düzleminde),
+X/Y/Z/A/F, G20/G21, G90/G91. G4/G10/G28/G30/G53/G92 satırlarındaki eksen
+kelimeleri hareket sayılmaz; diğer kelimeler (M, S, T, N ...) yok sayılır.
+"""
+
+import gzip
+import re
+import warnings
+
+import numpy as np
+
+from cycle_time import Motion
+
+# Bir seferde işlenen blok boyutu (bayt)
+CHUNK_BYTES = 8 << 20
+
+# Bu G kodlarının bulunduğu satırlardaki eksen kelimeleri hareket değildir
+_NON_MOTION_G = (4, 10, 28, 30, 53, 92)
+
+_POW10 = 10.0 ** np.arange(64)
+
+KIND_NAMES = ("G0", "G1", "G2", "G3")
+
+
+# Yorumlar; harfleri büyütüp kelime dışı karakterleri silen çeviri tablosu
+_COMMENT = re.compile(rb"\([^)\n]*\)|;[^\n]*")
+_UPPER = bytes(range(256)).upper()
+_WORD_CHARS = set(b"0123456789.+-\nABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")
+_DELETE = bytes(b for b in range(256) if b not in _WORD_CHARS)
+# Sayı akışı: harfler ve satır sonları ayırıcı olur
+_NUMBERS = bytes(32 if (65 <= b <= 90 or b == 10) else b for b in range(256))
+
+
+def _clean(raw: bytes) -> bytes:
+    """Yorumları ve boşlukları at, harfleri büyüt (satır sonları korunur)."""
+    if b"(" in raw or b";" in raw:
+        raw = _COMMENT.sub(b"", raw)
+    return raw.translate(_UPPER, _DELETE)
+
+
+def _tokenize(s: bytes):
+    """
+    Temizlenmiş metni kelimelere ayır.
+
+    Dönen: (harf, değer, satır, satır_sayısı); harf ASCII kodu, satır blok
+    içi satır indisi. Sayılar tek seferde np.fromstring ile okunur; her
+    harfin bir sayısı yoksa (bozuk kelime) _tokenize_digits kullanılır.
+    """
+    n_lines = s.count(b"\n") + (1 if s and not s.endswith(b"\n") else 0)
+    marks = np.frombuffer(s.translate(None, b"0123456789.+-"), dtype=np.uint8)
+    nl = marks == 10
+    line = np.cumsum(nl, dtype=np.int32)
+    word = ~nl
+    letter = marks[word]
+    wline = line[word]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        value = np.fromstring(s.translate(_NUMBERS), sep=" ")
+    if len(value) != len(letter):
+        return _tokenize_digits(np.frombuffer(s, dtype=np.uint8), n_lines)
+    return letter, value, wline, n_lines
+
+
+def _tokenize_digits(s: np.ndarray, n_lines: int):
+    """
+    _tokenize'ın karakter karakter (vektörel) hali: sayısı olmayan ya da
+    bozuk kelimeler NaN olur, satırın geri kalanı etkilenmez.
+    """
+    nl = s == 10
+    ln = np.cumsum(nl, dtype=np.int32)
+    is_letter = (s >= 65) & (s <= 90)
+    pos = np.flatnonzero(is_letter)
+    n_words = len(pos)
+    letter = s[pos]
+    wline = ln[pos]
+    if n_words == 0:
+        return letter, np.zeros(0), wline, n_lines
+
+    word = np.cumsum(is_letter, dtype=np.int32) - 1
+    # Sayı karakteri kendi satırındaki son harfe aittir
+    valid = (word >= 0) & ~is_letter & ~nl
+    valid[valid] = ln[valid] == wline[word[valid]]
+
+    digit = np.flatnonzero(valid & (s >= 48) & (s <= 57))
+    w = word[digit]
+    count = np.bincount(w, minlength=n_words)
+    first = np.cumsum(count) - count
+    rank = np.arange(len(digit)) - first[w]
+    k = count[w] - rank - 1
+    # Rakamlar tamsayı mantis olarak toplanır, sonra 10^kesir ile bölünür
+    mant = np.bincount(w, weights=(s[digit] - 48) * _POW10[np.minimum(k, 63)],
+                       minlength=n_words)
+    dot = np.full(n_words, len(s), dtype=np.int64)
+    dots = np.flatnonzero(valid & (s == 46))
+    dot[word[dots]] = dots
+    frac = np.bincount(w[digit > dot[w]], minlength=n_words)
+    value = mant / _POW10[np.minimum(frac, 63)]
+
+    minus = np.flatnonzero(valid & (s == 45))
+    value[word[minus]] *= -1.0
+    value[count == 0] = np.nan
+    return letter, value, wline, n_lines
+
+
+def _ffill(values, present, initial):
+    """present=False olan yerleri bir önceki değerle (yoksa initial) doldur."""
+    idx = np.where(present, np.arange(len(values)), -1)
+    np.maximum.accumulate(idx, out=idx)
+    return np.where(idx >= 0, values[np.maximum(idx, 0)], initial)
+
+
+def _positions(values, present, incremental, start):
+    """
+    Eksen konumu: mutlak satırlarda değer, artımsal satırlarda önceki
+    konum + değer, kelime yoksa önceki konum.
+    """
+    if not incremental.any():
+        return _ffill(values, present, start)
+    b = np.where(present, values, 0.0)
+    reset = present & ~incremental
+    total = np.cumsum(b)
+    r = np.where(reset, np.arange(len(b)), -1)
+    np.maximum.accumulate(r, out=r)
+    r0 = np.maximum(r, 0)
+    return np.where(r >= 0, b[r0] + total - total[r0], start + total)
+
+
+class _State:
+    """Bloklar arasında taşınan modal durum."""
+
+    def __init__(self):
+        self.pos = np.zeros(4)
+        self.mode = 0
+        self.feed = 0.0
+        self.inch = False
+        self.incremental = False
+
+
+def _chunk_moves(raw: bytes, line0: int, state: _State) -> dict:
+    """Bir bloğun hareketleri; state bloğun sonundaki duruma güncellenir."""
+    letter, value, wline, n = _tokenize(_clean(raw))
+
+    def column(ch):
+        sel = letter == ord(ch)
+        col = np.full(n, np.nan)
+        col[wline[sel]] = value[sel]
+        return col
+
+    g = letter == ord("G")
+    gv, gl = value[g], wline[g]
+
+    def flag(codes):
+        out = np.zeros(n, dtype=bool)
+        out[gl[np.isin(gv, codes)]] = True
+        return out
+
+    mode = np.full(n, -1, dtype=np.int8)
+    sel = np.isin(gv, (0, 1, 2, 3))
+    mode[gl[sel]] = gv[sel]
+    mode = _ffill(mode, mode >= 0, state.mode)
+
+    units = np.full(n, -1, dtype=np.int8)
+    units[gl[gv == 21]] = 0
+    units[gl[gv == 20]] = 1
+    inch = _ffill(units, units >= 0, int(state.inch)) == 1
+    dist = np.full(n, -1, dtype=np.int8)
+    dist[gl[gv == 90]] = 0
+    dist[gl[gv == 91]] = 1
+    incremental = _ffill(dist, dist >= 0, int(state.incremental)) == 1
+    scale = np.where(inch, 25.4, 1.0)
+
+    motion_line = ~flag(_NON_MOTION_G)
+    cols = []
+    present_any = np.zeros(n, dtype=bool)
+    for k, ch in enumerate("XYZA"):
+        v = column(ch)
+        present = ~np.isnan(v) & motion_line
+        if ch != "A":
+            v = v * scale
+        present_any |= present
+        cols.append(_positions(v, present, incremental, state.pos[k]))
+    pos = np.column_stack(cols)
+
+    f = column("F") * scale
+    feed = _ffill(f, ~np.isnan(f), state.feed)
+
+    moves = np.flatnonzero(present_any)
+    prev = np.vstack((state.pos[None, :], pos))[moves]
+    end = pos[moves]
+    kind = mode[moves].astype(np.int8)
+
+    # Yay merkezleri (XY düzlemi): I/J artımsal ya da R ile
+    center = np.full((len(moves), 2), np.nan)
+    arc = kind >= 2
+    if arc.any():
+        lines = moves[arc]
+        i = column("I")[lines] * scale[lines]
+        j = column("J")[lines] * scale[lines]
+        r = column("R")[lines] * scale[lines]
+        s = prev[arc, :2]
+        e = end[arc, :2]
+        use_r = np.isnan(i) & np.isnan(j) & ~np.isnan(r)
+        off = np.column_stack((np.nan_to_num(i), np.nan_to_num(j)))
+        if use_r.any():
+            # GRBL ile aynı: h = -sqrt(4r^2 - d^2)/d, G3 ve R<0 işareti çevirir
+            d = e[use_r] - s[use_r]
+            rr = r[use_r]
+            dd = np.hypot(d[:, 0], d[:, 1])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                h = -np.sqrt(np.maximum(4 * rr * rr - dd * dd, 0.0)) / dd
+            h = np.where(kind[arc][use_r] == 3, -h, h)
+            h = np.where(rr < 0, -h, h)
+            off[use_r] = 0.5 * np.column_stack((d[:, 0] - d[:, 1] * h,
+                                                d[:, 1] + d[:, 0] * h))
+        center[arc] = s + off
+
+    if n:
+        state.pos = pos[-1].copy()
+        state.mode = int(mode[-1])
+        state.feed = float(feed[-1])
+        state.inch = bool(inch[-1])
+        state.incremental = bool(incremental[-1])
+    return {
+        "line": moves + line0,
+        "kind": kind,
+        "end": end,
+        "feed": feed[moves],
+        "center": center,
+        "n_lines": n,
+    }
+
+
+def _read_blocks(path: str, chunk_bytes: int = CHUNK_BYTES):
+    """Dosyayı satır sınırında biten bloklar halinde oku (.gz desteklenir)."""
+    opener = gzip.open if str(path).lower().endswith(".gz") else open
+    rest = b""
+    with opener(path, "rb") as f:
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                break
+            data = rest + data
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                rest = data
+                continue
+            rest = data[cut:]
+            yield data[:cut]
+    if rest:
+        yield rest
+
+
+def iter_text(path: str, chunk_bytes: int = 4 << 20):
+    """Dosyanın metnini parça parça döndür (G-kodu sekmesi önizlemesi için)."""
+    for raw in _read_blocks(path, chunk_bytes):
+        yield raw.decode("utf-8", errors="replace")
+
+
+class ParsedGCode:
+    """
+    Okunmuş program.
+
+    line   : (M,) hareketin kaynak satırı (0'dan)
+    kind   : (M,) 0/1/2/3 (G0/G1/G2/G3)
+    start  : (4,) ilk hareketten önceki konum (X, Y, Z, A)
+    end    : (M,4) hareketlerin bitiş konumu (mm, derece)
+    feed   : (M,) modal besleme (mm/dk)
+    center : (M,2) yay merkezi (doğrularda NaN)
+    """
+
+    def __init__(self, path, n_lines, line, kind, end, feed, center):
+        self.path = path
+        self.n_lines = int(n_lines)
+        self.line = line
+        self.kind = kind
+        self.start = np.zeros(4)
+        self.end = end
+        self.feed = feed
+        self.center = center
+
+    def __len__(self):
+        return len(self.kind)
+
+    def starts(self) -> np.ndarray:
+        return np.vstack((self.start[None, :], self.end[:-1]))
+
+    def arc_geometry(self):
+        """Yarıçap ve tarama açısı (radyan, CCW pozitif); doğrularda 0."""
+        m = len(self)
+        radius = np.zeros(m)
+        sweep = np.zeros(m)
+        arc = self.kind >= 2
+        if arc.any():
+            s = self.starts()[arc, :2]
+            e = self.end[arc, :2]
+            c = self.center[arc]
+            radius[arc] = np.hypot(*(s - c).T)
+            th0 = np.arctan2(s[:, 1] - c[:, 1], s[:, 0] - c[:, 0])
+            th1 = np.arctan2(e[:, 1] - c[:, 1], e[:, 0] - c[:, 0])
+            ccw = (th1 - th0) % (2 * np.pi)
+            cw = (th0 - th1) % (2 * np.pi)
+            # Başlangıç = bitiş: tam çember
+            ccw[ccw == 0] = 2 * np.pi
+            cw[cw == 0] = 2 * np.pi
+            sweep[arc] = np.where(self.kind[arc] == 3, ccw, -cw)
+        return radius, sweep
+
+    def to_motion(self) -> Motion:
+        """Süre tahmini için hareket tablosu (cycle_time.simulate)."""
+        radius, sweep = self.arc_geometry()
+        rapid = self.kind == 0
+        feed = np.where(rapid, np.inf, np.maximum(self.feed, 1e-9))
+        return Motion(self.start, self.end, feed, rapid, radius, sweep)
+
+    def lengths(self) -> np.ndarray:
+        """Hareketlerin XYZ yol uzunluğu (yaylarda helis)."""
+        d = self.end[:, :3] - self.starts()[:, :3]
+        radius, sweep = self.arc_geometry()
+        xy = np.where(self.kind >= 2, np.abs(sweep) * radius, np.hypot(d[:, 0], d[:, 1]))
+        return np.hypot(xy, d[:, 2])
+
+    def stats(self) -> dict:
+        """Satır / hareket sayıları, sınırlar ve yol uzunlukları."""
+        out = {"lines": self.n_lines, "moves": len(self)}
+        for k, name in enumerate(KIND_NAMES):
+            out[name] = int((self.kind == k).sum())
+        if len(self):
+            out["bounds"] = (self.end.min(axis=0), self.end.max(axis=0))
+            cut = self.kind > 0
+            if cut.any():
+                out["cut_bounds"] = (self.end[cut].min(axis=0), self.end[cut].max(axis=0))
+            length = self.lengths()
+            out["cut_length"] = float(length[cut].sum())
+            out["rapid_length"] = float(length[~cut].sum())
+            feeds = self.feed[cut]
+            if len(feeds):
+                out["feed_range"] = (float(feeds.min()), float(feeds.max()))
+        return out
+
+    def summary_text(self) -> str:
+        st = self.stats()
+        parts = [f"{st['lines']:,} satır, {st['moves']:,} hareket "
+                 f"(G0 {st['G0']:,} / G1 {st['G1']:,} / G2 {st['G2']:,} / G3 {st['G3']:,})"]
+        if "cut_bounds" in st:
+            lo, hi = st["cut_bounds"]
+            parts.append(f"kesme sınırları X {lo[0]:.2f}..{hi[0]:.2f}  "
+                         f"Y {lo[1]:.2f}..{hi[1]:.2f}  Z {lo[2]:.2f}..{hi[2]:.2f}")
+            parts.append(f"kesme yolu {st['cut_length'] / 1000:.2f} m, "
+                         f"hızlı {st['rapid_length'] / 1000:.2f} m")
+        return "\n".join(parts)
+
+    def backplot(self, max_angle_deg: float = 5.0):
+        """
+        Çizim için nokta dizisi: (P,3) float32 XYZ ve (P,) hareket tipi
+        (noktada biten hareketin tipi; ilk nokta için -1). Yaylar en fazla
+        max_angle_deg'lik parçalara bölünür.
+        """
+        m = len(self)
+        radius, sweep = self.arc_geometry()
+        steps = np.ones(m, dtype=np.int64)
+        arc = self.kind >= 2
+        steps[arc] = np.maximum(
+            np.ceil(np.abs(sweep[arc]) / np.radians(max_angle_deg)), 1).astype(np.int64)
+
+        owner = np.repeat(np.arange(m), steps)
+        t = (np.arange(len(owner)) - (np.cumsum(steps) - steps)[owner] + 1) / steps[owner]
+        s = self.starts()[owner, :3]
+        e = self.end[owner, :3]
+        pts = s + (e - s) * t[:, None]
+        on_arc = arc[owner]
+        if on_arc.any():
+            c = self.center[owner[on_arc]]
+            s0 = s[on_arc, :2] - c
+            th = np.arctan2(s0[:, 1], s0[:, 0]) + sweep[owner[on_arc]] * t[on_arc]
+            r = radius[owner[on_arc]]
+            pts[on_arc, 0] = c[:, 0] + r * np.cos(th)
+            pts[on_arc, 1] = c[:, 1] + r * np.sin(th)
+        pts = np.vstack((self.start[None, :3], pts)).astype(np.float32)
+        kinds = np.concatenate(([-1], self.kind[owner])).astype(np.int8)
+        return pts, kinds
+
+
+def parse_gcode(path: str, chunk_bytes: int = CHUNK_BYTES, progress=None) -> ParsedGCode:
+    """
+    G-kodu dosyasını oku. progress(okunan_bayt) verilirse her bloktan sonra
+    çağrılır.
+    """
+    state = _State()
+    parts = []
+    n_lines = 0
+    done = 0
+    for raw in _read_blocks(path, chunk_bytes):
+        part = _chunk_moves(raw, n_lines, state)
+        n_lines += part.pop("n_lines")
+        parts.append(part)
+        done += len(raw)
+        if progress is not None:
+            progress(done)
+
+    def cat(name, empty):
+        arrays = [p[name] for p in parts]
+        return np.concatenate(arrays) if arrays else empty
+
+    return ParsedGCode(
+        path, n_lines,
+        cat("line", np.zeros(0, dtype=np.int64)),
+        cat("kind", np.zeros(0, dtype=np.int8)),
+        cat("end", np.zeros((0, 4))),
+        cat("feed", np.zeros(0)),
+        cat("center", np.zeros((0, 2))),
+    )
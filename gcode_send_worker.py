@@ -0,0 +1,81 @@
+# gcode_send_worker.py
+"""
+G-kodunu arka plan iş parçacığında kontrolcüye gönderen QThread.
+
+Gönderim saatlerce sürebilir; GUI iş parçacığına sadece ilerleme
+istatistikleri (gcode_sender.GCodeSender.stats kopyası) ve sonuç iletilir.
+Durdur düğmesi stop() çağırır: yeni satır gönderilmez, kontrolcü
+tamponundaki satırlar tamamlanır. İlerleme yüzdesi için satırlar,
+gönderilecekleri gibi (yorumsuz, boşlar hariç) önce sayılır.
+"""
+
+import logging
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from gcode_sender import GCodeSender, iter_lines, open_port
+
+log = logging.getLogger(__name__)
+
+
+class GCodeSendWorker(QThread):
+    """program() (her çağrıda baştan başlayan metin parçası iteratörü) -> seri port."""
+
+    progress = pyqtSignal(object)   # istatistik sözlüğü
+    finished_ok = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, program, port_path: str, baud: int = 115200, mode: str = "char",
+                 parent=None):
+        super().__init__(parent)
+        self.program = program
+        self.port_path = port_path
+        self.baud = int(baud)
+        self.mode = mode
+        self.total_lines = None
+        self._sender = None
+        # run() başlamadan (gönderici kurulmadan) gelen stop() da kaybolmasın
+        self._stop_requested = False
+
+    def stop(self):
+        self._stop_requested = True
+        if self._sender is not None:
+            self._sender.stop()
+
+    def _chunks(self):
+        # stream() gönderici bayrağını sıfırlar; akış başlamadan gelen stop()
+        # burada yakalanır
+        for chunk in self.program():
+            if self._stop_requested:
+                return
+            yield chunk
+
+    def _on_progress(self, stats):
+        if self.total_lines:
+            stats["total_lines"] = self.total_lines
+        self.progress.emit(stats)
+
+    def run(self):
+        try:
+            self.total_lines = sum(1 for _line in iter_lines(self.program()))
+        except Exception as e:
+            self.failed.emit(f"G-kodu okunamadı: {e}")
+            return
+        if self._stop_requested:
+            return
+        try:
+            port = open_port(self.port_path, self.baud)
+        except Exception as e:
+            self.failed.emit(f"{self.port_path} açılamadı: {e}")
+            return
+        try:
+            self._sender = GCodeSender(port, mode=self.mode, progress=self._on_progress)
+            for msg in self._sender.wake():
+                log.info("Kontrolcü: %s", msg)
+            stats = self._sender.stream(self._chunks())
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        finally:
+            port.close()
+        self.finished_ok.emit(stats)
@@ -0,0 +1,563 @@
+# gcode_sender.py
+"""
+G-kodunu seri port üzerinden GRBL tarzı bir kontrolcüye akıtma.
+
+İki akış modu vardır:
+
+    char : karakter sayma. Kontrolcünün alma tamponu (GRBL'de 128 bayt)
+           dolmayacak kadar satır ard arda gönderilir; her "ok" / "error"
+           yanıtı en eski bekleyen satırın baytlarını serbest bırakır.
+           Tampon ve planlayıcı sürekli dolu kalır, satırlar arası gecikme
+           harekete yansımaz.
+    line : gönder-bekle. Her satırdan sonra yanıt beklenir; basit ve her
+           kontrolcüde çalışır, ama kısa segmentlerde planlayıcı boşalır.
+
+Satırlar GCodeProgram.iter_chunks() ya da gcode_parser.iter_text() gibi
+parça üreticilerinden okunur; program hiçbir zaman tamamen belleğe alınmaz.
+Yorumlar ve boşluklar gönderilmeden önce atılır (tampona daha çok satır
+sığar).
+
+Seri port için pyserial kullanılır; kurulu değilse Linux/macOS'ta termios
+ile ham modda açılan bir dosya tanımlayıcısına düşülür. GrblEmulator bir
+sözde terminal (pty) üzerinde kontrolcüyü taklit eder; gerçek donanım
+olmadan deneme ve ölçüm içindir:
+
+    python gcode_sender.py is.nc --emulate
+    python gcode_sender.py is.nc --port /dev/ttyUSB0 --baud 115200 --mode char
+"""
+
+import argparse
+import logging
+import os
+import re
+import select
+import sys
+import threading
+import time
+from collections import deque
+
+try:
+    import serial  # pyserial (opsiyonel)
+except ImportError:
+    serial = None
+
+try:
+    import pty
+    import termios
+    import tty
+except ImportError:  # Windows: sadece pyserial
+    pty = termios = tty = None
+
+log = logging.getLogger(__name__)
+
+RX_BUFFER = 128         # GRBL seri alma tamponu (bayt)
+PLANNER_BLOCKS = 15     # GRBL planlayıcı blok sayısı (Uno)
+
+_COMMENT_RE = re.compile(r"\([^)]*\)|;.*")
+
+
+class SenderError(Exception):
+    """Kontrolcü yanıt vermedi, alarm verdi ya da satır tampona sığmıyor."""
+
+
+# ---------------------------------------------------------------------------
+# Seri port
+# ---------------------------------------------------------------------------
+
+class _LineReader:
+    """Baytları satırlara bölen ortak okuma katmanı."""
+
+    def __init__(self):
+        self._rx = bytearray()
+
+    def _read_some(self, timeout: float) -> bytes:
+        raise NotImplementedError
+
+    def read_line(self, timeout: float) -> str | None:
+        """Bir yanıt satırı (\\r\\n hariç); timeout içinde gelmezse None."""
+        deadline = time.monotonic() + timeout
+        while True:
+            cut = self._rx.find(b"\n")
+            if cut >= 0:
+                line = bytes(self._rx[:cut])
+                del self._rx[:cut + 1]
+                return line.decode("ascii", errors="replace").strip()
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return None
+            self._rx += self._read_some(left)
+
+
+class _SerialPort(_LineReader):
+    """pyserial ile açılan port."""
+
+    def __init__(self, path: str, baud: int):
+        super().__init__()
+        self._ser = serial.Serial(path, baud, timeout=0)
+
+    def _read_some(self, timeout: float) -> bytes:
+        self._ser.timeout = min(timeout, 0.05)
+        return self._ser.read(max(1, self._ser.in_waiting))
+
+    def write(self, data: bytes):
+        self._ser.write(data)
+
+    def close(self):
+        self._ser.close()
+
+
+class _FdPort(_LineReader):
+    """pyserial yoksa: termios ile ham modda açılan tty (pty dahil)."""
+
+    def __init__(self, path: str, baud: int):
+        super().__init__()
+        if termios is None:
+            raise SenderError("Seri port için pyserial gerekli (pip install pyserial).")
+        self._fd = os.open(path, os.O_RDWR | os.O_NOCTTY)
+        tty.setraw(self._fd)
+        speed = getattr(termios, f"B{int(baud)}", None)
+        if speed is not None:
+            attrs = termios.tcgetattr(self._fd)
+            attrs[4] = attrs[5] = speed
+            termios.tcsetattr(self._fd, termios.TCSANOW, attrs)
+
+    def _read_some(self, timeout: float) -> bytes:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return b""
+        return os.read(self._fd, 4096)
+
+    def write(self, data: bytes):
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view):]
+
+    def close(self):
+        os.close(self._fd)
+
+
+def open_port(path: str, baud: int = 115200):
+    """Seri portu aç (pyserial varsa onunla, yoksa termios ile)."""
+    if serial is not None:
+        return _SerialPort(path, baud)
+    return _FdPort(path, baud)
+
+
+# ---------------------------------------------------------------------------
+# Satırlar
+# ---------------------------------------------------------------------------
+
+def iter_lines(chunks):
+    """
+    Metin parçalarından gönderilecek satırlar: yorumlar ve boşluklar
+    atılır, boş satırlar atlanır. Parça sınırında bölünen satırlar
+    birleştirilir.
+    """
+    rest = ""
+    for chunk in chunks:
+        text = rest + chunk
+        lines = text.split("\n")
+        rest = lines.pop()
+        for line in lines:
+            line = "".join(_COMMENT_RE.sub("", line).split())
+            if line:
+                yield line
+    line = "".join(_COMMENT_RE.sub("", rest).split())
+    if line:
+        yield line
+
+
+def _source_chunks(source):
+    """GCodeProgram, dosya yolu ya da metin parçası üreticisi -> (parçalar, satır sayısı)."""
+    if hasattr(source, "iter_chunks"):
+        return source.iter_chunks(), source.line_count()
+    if isinstance(source, (str, os.PathLike)):
+        from gcode_parser import iter_text
+        return iter_text(source), None
+    return iter(source), None
+
+
+# ---------------------------------------------------------------------------
+# Gönderici
+# ---------------------------------------------------------------------------
+
+class GCodeSender:
+    """
+    Programı açık bir porta akıtır.
+
+    mode        : "char" (karakter sayma) ya da "line" (gönder-bekle)
+    rx_buffer   : kontrolcünün alma tamponu (bayt)
+    timeout     : tek bir yanıt için en uzun bekleme (s)
+    stall_time  : bundan uzun süren yanıt beklemeleri "takılma" sayılır (s)
+    progress    : progress(stats: dict) geri çağrısı (en fazla ~10 kez/s)
+    stop_on_error: "error:N" yanıtında gönderimi durdur
+    """
+
+    MODES = ("char", "line")
+
+    def __init__(self, port, mode: str = "char", rx_buffer: int = RX_BUFFER,
+                 timeout: float = 30.0, stall_time: float = 1.0, progress=None,
+                 stop_on_error: bool = True):
+        if mode not in self.MODES:
+            raise ValueError(f"Bilinmeyen gönderim modu: {mode}")
+        self.port = port
+        self.mode = mode
+        self.rx_buffer = int(rx_buffer)
+        self.timeout = float(timeout)
+        self.stall_time = float(stall_time)
+        self.progress = progress
+        self.stop_on_error = stop_on_error
+        self._stop = False
+        self._pending = deque()   # (satır no, bayt)
+        self._used = 0
+        self.stats = {}
+
+    # ---- kontrol ----
+    def stop(self):
+        """Yeni satır göndermeyi bırak (kontrolcü tampondakileri bitirir)."""
+        self._stop = True
+
+    def feed_hold(self):
+        """Gerçek zamanlı besleme beklet ("!")."""
+        self.port.write(b"!")
+
+    def cycle_start(self):
+        """Gerçek zamanlı devam ("~")."""
+        self.port.write(b"~")
+
+    def wake(self, settle: float = 0.3, timeout: float = 3.0) -> list:
+        """
+        Kontrolcüyü uyandır ve açılış mesajlarını boşalt: "\\r\\n\\r\\n"
+        gönderilir, settle süresince sessiz kalana kadar gelen satırlar
+        okunup döndürülür.
+        """
+        self.port.write(b"\r\n\r\n")
+        got = []
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            line = self.port.read_line(settle)
+            if line is None:
+                break
+            if line:
+                got.append(line)
+        return got
+
+    # ---- akış ----
+    def _new_stats(self, total):
+        return {
+            "mode": self.mode,
+            "total_lines": total,   # kaynaktaki satır sayısı (biliniyorsa, yorumlar dahil)
+            "sent_lines": 0,
+            "acked_lines": 0,
+            "sent_bytes": 0,
+            "errors": [],           # [(satır no, yanıt), ...]
+            "messages": [],         # ok/error dışındaki yanıtlar
+            "stalls": 0,
+            "wait_time": 0.0,       # yanıt beklemekle geçen toplam süre (s)
+            "max_wait": 0.0,
+            "elapsed": 0.0,
+            "lines_per_s": 0.0,
+            "bytes_per_s": 0.0,
+            "stopped": False,
+        }
+
+    def _report(self, t0, force=False):
+        now = time.monotonic()
+        st = self.stats
+        st["elapsed"] = now - t0
+        if st["elapsed"] > 0:
+            st["lines_per_s"] = st["acked_lines"] / st["elapsed"]
+            st["bytes_per_s"] = st["sent_bytes"] / st["elapsed"]
+        if self.progress is not None and (force or now - self._last_report >= 0.1):
+            self._last_report = now
+            self.progress(dict(st))
+
+    def _wait_response(self):
+        """En eski bekleyen satırın yanıtını bekle ve tampondan düş."""
+        st = self.stats
+        t0 = time.monotonic()
+        while True:
+            line = self.port.read_line(self.timeout)
+            if line is None:
+                raise SenderError(f"Kontrolcü {self.timeout:.0f} s içinde yanıt vermedi "
+                                  f"({len(self._pending)} satır bekliyor).")
+            if line == "ok" or line.startswith("error"):
+                break
+            if line.startswith("ALARM"):
+                raise SenderError(f"Kontrolcü alarmı: {line}")
+            if line:
+                st["messages"].append(line)   # [MSG:...], <durum>, açılış mesajı
+        waited = time.monotonic() - t0
+        st["wait_time"] += waited
+        st["max_wait"] = max(st["max_wait"], waited)
+        if waited > self.stall_time:
+            st["stalls"] += 1
+        number, size = self._pending.popleft()
+        self._used -= size
+        st["acked_lines"] += 1
+        if line != "ok":
+            st["errors"].append((number, line))
+            log.warning("Satır %d: %s", number, line)
+            if self.stop_on_error:
+                self._stop = True
+
+    def stream(self, source) -> dict:
+        """
+        Programı gönder; bütün yanıtlar gelince istatistik sözlüğünü döndürür.
+
+        source: GCodeProgram, G-kodu dosya yolu ya da metin parçaları üreticisi.
+        """
+        chunks, total = _source_chunks(source)
+        self.stats = self._new_stats(total)
+        self._pending.clear()
+        self._used = 0
+        self._stop = False
+        self._last_report = 0.0
+        st = self.stats
+        t0 = time.monotonic()
+
+        for number, line in enumerate(iter_lines(chunks), start=1):
+            if self._stop:
+                break
+            data = (line + "\n").encode("ascii")
+            size = len(data)
+            if size > self.rx_buffer:
+                raise SenderError(f"Satır {number} alma tamponundan uzun ({size} bayt).")
+            if self.mode == "char":
+                while self._used + size > self.rx_buffer:
+                    self._wait_response()
+            else:
+                while self._pending:
+                    self._wait_response()
+            if self._stop:
+                break
+            self.port.write(data)
+            self._pending.append((number, size))
+            self._used += size
+            st["sent_lines"] += 1
+            st["sent_bytes"] += size
+            self._report(t0)
+
+        while self._pending:
+            self._wait_response()
+        st["stopped"] = self._stop
+        self._report(t0, force=True)
+        return dict(st)
+
+
+def summary_text(stats: dict) -> str:
+    text = (f"{stats['acked_lines']:,} satır / {stats['sent_bytes'] / 1024:,.1f} kB, "
+            f"{stats['elapsed']:.1f} s ({stats['lines_per_s']:,.0f} satır/s, "
+            f"{stats['bytes_per_s'] / 1024:,.1f} kB/s) | "
+            f"{stats['stalls']} takılma, en uzun bekleme {stats['max_wait'] * 1000:.0f} ms")
+    if stats["errors"]:
+        text += f" | {len(stats['errors'])} hata (ilk: satır {stats['errors'][0][0]} "
+        text += f"{stats['errors'][0][1]})"
+    if stats["stopped"]:
+        text += " | durduruldu"
+    return text
+
+
+# ---------------------------------------------------------------------------
+# Kontrolcü taklidi (pty)
+# ---------------------------------------------------------------------------
+
+class GrblEmulator:
+    """
+    Sözde terminal üzerinde GRBL benzeri kontrolcü.
+
+    Gelen baytlar rx_buffer boyutlu alma tamponuna girer; tampon taşarsa
+    "overflows" sayılır (gerçek kontrolcüde bu bayt kaybıdır). Planlayıcıda
+    yer oldukça tampondan satır alınır ve "ok" yazılır; planlayıcı her
+    bloğu block_time saniyede yürütür. latency, yanıtların porttan
+    gecikmesidir (USB-seri dönüştürücü). Her error_every. satıra
+    "error:20" yanıtı verilir (0: hiç).
+
+    İstatistikler: lines, overflows, max_rx, starved (planlayıcının ilk ve
+    son satır arasında boş kaldığı süre, s).
+    """
+
+    def __init__(self, rx_buffer: int = RX_BUFFER, planner_blocks: int = PLANNER_BLOCKS,
+                 block_time: float = 0.002, latency: float = 0.0, error_every: int = 0):
+        if pty is None:
+            raise SenderError("Kontrolcü taklidi için pty gerekli (Linux/macOS).")
+        self.rx_buffer = int(rx_buffer)
+        self.planner_blocks = int(planner_blocks)
+        self.block_time = float(block_time)
+        self.latency = float(latency)
+        self.error_every = int(error_every)
+        self.lines = 0
+        self.overflows = 0
+        self.max_rx = 0
+        self.starved = 0.0
+        self.received = []      # son satırlar (kontrol için, en fazla keep_lines)
+        self.keep_lines = 0
+        self._master = self._slave = None
+        self._thread = None
+        self._running = False
+        self.path = None
+
+    def start(self) -> str:
+        """pty'yi aç ve taklidi başlat; dönen: port yolu (ör. /dev/pts/5)."""
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        self.path = os.ttyname(self._slave)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="GrblEmulator", daemon=True)
+        self._thread.start()
+        return self.path
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        rx = bytearray()
+        planner = deque()
+        replies = deque()       # (gönderim zamanı, bayt)
+        block_end = None
+        paused = False
+        first = None
+        idle_from = None
+        self._write(b"\r\nGrbl 1.1h ['$' for help]\r\n")
+
+        while self._running:
+            now = time.monotonic()
+            wait = 0.01
+            if planner and not paused:
+                wait = min(wait, max(0.0, block_end - now))
+            if replies:
+                wait = min(wait, max(0.0, replies[0][0] - now))
+            ready, _, _ = select.select([self._master], [], [], wait)
+            if ready:
+                try:
+                    data = os.read(self._master, 4096)
+                except OSError:
+                    break
+                for ch in b"!~?":
+                    if ch in data:
+                        data = data.replace(bytes([ch]), b"")
+                        if ch == ord("!"):
+                            paused = True
+                        elif ch == ord("~"):
+                            paused = False
+                        else:
+                            state = "Hold" if paused else ("Run" if planner else "Idle")
+                            replies.append((now + self.latency, f"<{state}>\r\n".encode()))
+                rx += data
+                if len(rx) > self.rx_buffer:
+                    self.overflows += 1
+                    del rx[self.rx_buffer:]
+                self.max_rx = max(self.max_rx, len(rx))
+
+            now = time.monotonic()
+            # Planlayıcıyı yürüt
+            while planner and not paused and now >= block_end:
+                planner.popleft()
+                block_end = block_end + self.block_time if planner else None
+            # Tampondan planlayıcıya
+            while len(planner) < self.planner_blocks:
+                cut = rx.find(b"\n")
+                if cut < 0:
+                    break
+                line = bytes(rx[:cut]).strip()
+                del rx[:cut + 1]
+                reply = b"ok\r\n"
+                if line:
+                    self.lines += 1
+                    if len(self.received) < self.keep_lines:
+                        self.received.append(line.decode("ascii", errors="replace"))
+                    if self.error_every and self.lines % self.error_every == 0:
+                        reply = b"error:20\r\n"
+                    else:
+                        if not planner:
+                            block_end = now + self.block_time
+                            if idle_from is not None:
+                                self.starved += now - idle_from
+                                idle_from = None
+                        planner.append(line)
+                    first = now if first is None else first
+                replies.append((now + self.latency, reply))
+            if not planner and first is not None and idle_from is None:
+                idle_from = now
+            while replies and replies[0][0] <= now:
+                self._write(replies.popleft()[1])
+
+    def _write(self, data: bytes):
+        try:
+            os.write(self._master, data)
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Komut satırı
+# ---------------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="G-kodu dosyasını GRBL kontrolcüsüne gönder.")
+    ap.add_argument("file", help="G-kodu dosyası (.nc, .gz ...)")
+    ap.add_argument("--port", help="seri port (ör. /dev/ttyUSB0, COM3)")
+    ap.add_argument("--baud", type=int, default=115200)
+    ap.add_argument("--mode", choices=GCodeSender.MODES, default="char")
+    ap.add_argument("--rx-buffer", type=int, default=RX_BUFFER)
+    ap.add_argument("--emulate", action="store_true",
+                    help="gerçek port yerine pty üzerinde kontrolcü taklidi kullan")
+    args = ap.parse_args(argv)
+
+    if not args.port and not args.emulate:
+        ap.error("--port ya da --emulate gerekli")
+
+    emulator = None
+    if args.emulate:
+        emulator = GrblEmulator(rx_buffer=args.rx_buffer)
+        args.port = emulator.start()
+        print(f"Kontrolcü taklidi: {args.port}")
+
+    def progress(st):
+        total = st["total_lines"]
+        pct = f" ({100.0 * st['acked_lines'] / total:.0f}%)" if total else ""
+        print(f"\r{st['acked_lines']:,} satır{pct}, {st['lines_per_s']:,.0f} satır/s",
+              end="", flush=True)
+
+    port = None
+    try:
+        port = open_port(args.port, args.baud)
+        sender = GCodeSender(port, mode=args.mode, rx_buffer=args.rx_buffer,
+                             progress=progress)
+        for msg in sender.wake():
+            print(msg)
+        stats = sender.stream(args.file)
+        print()
+        print(summary_text(stats))
+    except KeyboardInterrupt:
+        print("\nDurduruldu.")
+        return 1
+    except (SenderError, OSError) as e:
+        print(f"\nHata: {e}")
+        return 1
+    finally:
+        if port is not None:
+            port.close()
+        if emulator is not None:
+            print(f"Taklit: {emulator.lines:,} satır, {emulator.overflows} tampon taşması, "
+                  f"planlayıcı boş {emulator.starved:.2f} s")
+            emulator.stop()
+    return 0 if not stats["errors"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
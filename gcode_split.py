@@ -0,0 +1,194 @@
+# gcode_split.py
+"""
+Uzun işleri parçalara bölme ve yarıda kalan işe devam etme.
+
+Program belleği sınırlı kontrolcüler için bir GCodeProgram, satır sayısı
+ya da bayt boyutu sınırına göre birden fazla dosyaya bölünür. Bölme
+noktaları metin üretilmeden bulunur: gövde satırlarının uzunlukları
+(GCodeProgram.body_line_lengths) bir kez hesaplanır, kümülatif toplam
+üzerinde np.searchsorted ile sınır aranır ve en yakın "güvenli" satıra
+(GCodeProgram.rows) geri çekilir.
+
+İlk parça programın kendi başlığıyla başlar; sonraki parçalar ve devam
+programları bıçağı önceki satırın bitiş noktasına götüren bir giriş
+bloğuyla başlar:
+
+    G0 Z<güvenli>           bıçağı kaldır
+    G0 X.. Y.. A..          önceki satırın bitiş noktası ve bıçak açısı
+    G1 Z.. F<dalış>         kesme derinliğine dal
+    G1 F<besleme>           satırın beslemesi (kompakt çıktıda F modal)
+
+Konumlar programın hareket tablosundan (GCodeProgram.motion) alınır.
+"""
+
+import logging
+import os
+
+import numpy as np
+
+from gcode_generator import GCodeProgram, _fmt
+from gcode_writer import write_gcode
+
+log = logging.getLogger(__name__)
+
+
+def _text_size(lines) -> int:
+    """Satır listesinin dosyadaki boyutu (bayt, her satır '\\n' ile)."""
+    return sum(len(s.encode("utf-8")) + 1 for s in lines)
+
+
+def preamble_lines(program, motion, row: int, note: str = "") -> list:
+    """row. gövde satırından başlamak için bıçağı konumlandıran satırlar."""
+    trim = program.trim
+    # targets[0] başlıktaki dalış; gövde satırı k -> targets[k + 1]
+    x, y, z, a = motion.targets[row]
+    lines = [f"({note})"] if note else []
+    lines.append(f"G0 Z{_fmt(program.safe_z, trim=trim)}")
+    cmd = f"G0 X{_fmt(x, trim=trim)} Y{_fmt(y, trim=trim)}"
+    if program.knife_axis:
+        cmd += f" {program.knife_axis}{_fmt(a, trim=trim)}"
+    lines.append(cmd)
+    lines.append(f"G1 Z{_fmt(z, trim=trim)} F{_fmt(motion.feed[0], trim=trim)}")
+    feed = motion.feed[row + 1]
+    if np.isfinite(feed):
+        lines.append(f"G1 F{_fmt(feed, trim=trim)}")
+    return lines
+
+
+def sub_program(program, start: int, stop: int, header) -> GCodeProgram:
+    """Gövdenin [start, stop) satırlarından, verilen başlıkla yeni program."""
+    def body_words(s, e):
+        return program.body_words(start + s, start + e)
+
+    return GCodeProgram(header, stop - start, body_words, program.footer,
+                        trim=program.trim)
+
+
+def part_header(program, motion, index: int, start: int) -> list:
+    """index. parçanın (0'dan) başlık satırları; start: ilk gövde satırı."""
+    if index == 0:
+        return list(program.header)
+    note = f"Parca {index + 1} - orijinal satir {len(program.header) + start + 1}"
+    return program.header[:program.n_setup] + preamble_lines(program, motion, start, note)
+
+
+def _snap(safe_rows, row: int) -> int:
+    """row ya da ondan önceki ilk güvenli satır (yoksa 0)."""
+    j = int(np.searchsorted(safe_rows, row, side="right")) - 1
+    return int(safe_rows[j]) if j >= 0 else 0
+
+
+def split_bounds(program, max_lines: int | None = None, max_bytes: int | None = None,
+                 parts: int | None = None, lengths=None, motion=None) -> list:
+    """
+    Bölme sınırları: [(başlangıç, bitiş), ...] gövde satırı aralıkları.
+
+    max_lines / max_bytes: dosya başına en fazla satır / bayt (başlık,
+    giriş bloğu ve bitiş satırları dahil). parts: boyutça eşit N parça.
+    Tek bir güvenli aralık sınırı aşıyorsa o parça sınırı aşar.
+    """
+    n = program.n_body
+    if n == 0:
+        return [(0, 0)]
+    if lengths is None:
+        lengths = program.body_line_lengths()
+    if motion is None:
+        motion = program.motion()
+    _points, safe = program.rows()
+    safe_rows = np.flatnonzero(safe)
+    cum = np.concatenate(([0], np.cumsum(lengths)))
+
+    if parts:
+        targets = cum[-1] * np.arange(1, int(parts)) / int(parts)
+        rows = np.searchsorted(cum, targets)
+        cuts = sorted({_snap(safe_rows, int(r)) for r in rows} - {0, n})
+        bounds = [0] + [c for c in cuts if 0 < c < n] + [n]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    if not max_lines and not max_bytes:
+        return [(0, n)]
+
+    footer = program.footer
+    bounds = [0]
+    a = 0
+    while a < n:
+        head = part_header(program, motion, len(bounds) - 1, a)
+        if max_lines:
+            b = a + int(max_lines) - len(head) - len(footer)
+        else:
+            budget = int(max_bytes) - _text_size(head) - _text_size(footer)
+            b = int(np.searchsorted(cum, cum[a] + budget, side="right")) - 1
+        if b >= n:
+            break
+        b = _snap(safe_rows, b)
+        if b <= a:
+            # Sınır tek bir güvenli aralıktan küçük: bir sonraki güvenli satıra kadar
+            j = int(np.searchsorted(safe_rows, a, side="right"))
+            b = int(safe_rows[j]) if j < len(safe_rows) else n
+            log.warning("%d. satırdan başlayan parça sınırı aşıyor.", a)
+        bounds.append(b)
+        a = b
+    if bounds[-1] != n:
+        bounds.append(n)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def split_program(program, max_lines: int | None = None, max_bytes: int | None = None,
+                  parts: int | None = None) -> list:
+    """Programı parçalara böl; her parça ayrı bir GCodeProgram'dır."""
+    motion = program.motion()
+    bounds = split_bounds(program, max_lines, max_bytes, parts, motion=motion)
+    return [sub_program(program, start, stop, part_header(program, motion, k, start))
+            for k, (start, stop) in enumerate(bounds)]
+
+
+def resume_row(program, path_index: int | None = None, gcode_line: int | None = None) -> int:
+    """
+    Devam edilecek gövde satırı.
+
+    path_index: yol noktası; bu noktayı içeren satırdan başlanır.
+    gcode_line: tam programdaki satır numarası (1'den başlar).
+    Sonuç bir önceki güvenli satıra çekilir (gerekirse biraz geriden başlar).
+    """
+    n = program.n_body
+    points, safe = program.rows()
+    if path_index is not None:
+        row = int(np.searchsorted(points, int(path_index), side="right"))
+    elif gcode_line is not None:
+        row = int(gcode_line) - len(program.header) - 1
+    else:
+        row = 0
+    row = min(max(row, 0), max(n - 1, 0))
+    return _snap(np.flatnonzero(safe), row)
+
+
+def resume_program(program, path_index: int | None = None,
+                   gcode_line: int | None = None) -> GCodeProgram:
+    """Yol noktasından ya da G-kodu satırından devam eden program."""
+    row = resume_row(program, path_index, gcode_line)
+    if row == 0:
+        return sub_program(program, 0, program.n_body, program.header)
+    points, _safe = program.rows()
+    note = (f"Devam - orijinal satir {len(program.header) + row + 1}, "
+            f"yol noktasi {int(points[row - 1])}")
+    header = (program.header[:program.n_setup]
+              + preamble_lines(program, program.motion(), row, note))
+    return sub_program(program, row, program.n_body, header)
+
+
+def part_paths(path: str, count: int) -> list:
+    """"is.nc" -> ["is_01.nc", "is_02.nc", ...] (.gz uzantısı korunur)."""
+    root, ext = os.path.splitext(path)
+    if ext.lower() == ".gz":
+        root, inner = os.path.splitext(root)
+        ext = inner + ext
+    width = max(2, len(str(count)))
+    return [f"{root}_{k + 1:0{width}d}{ext}" for k in range(count)]
+
+
+def write_parts(path: str, programs) -> list:
+    """Parçaları path_01, path_02 ... olarak yaz; dönen: [(dosya, istatistik), ...]."""
+    out = []
+    for fname, prog in zip(part_paths(path, len(programs)), programs):
+        out.append((fname, write_gcode(fname, prog.iter_chunks())))
+    return out
@@ -0,0 +1,303 @@
+# gcode_view.py
+"""
+Milyonlarca satırlık G-kodu için sanal (model/view) görüntüleyici.
+
+Metin QTextEdit'e yüklenmez. Dosya mmap ile açılır (üretilen programlar
+önce geçici bir dosyaya akıtılır, kısa metinler bellekte tutulur) ve
+satır başlarının bayt konumları bir kez çıkarılır (LineIndex.offsets,
+satır başına 8 bayt). QListView sadece ekrandaki satırları ister; her
+satır istendiği anda tampondan çözülür.
+
+Arama ve satıra gitme de bu indeksi kullanır: alt dizi tampon üzerinde
+bloklar halinde bytes.find ile aranır, bulunan bayt konumu
+np.searchsorted ile satır numarasına çevrilir.
+"""
+
+import gzip
+import mmap
+import os
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt5.QtGui import QFontDatabase
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListView, QLineEdit,
+    QPushButton, QCheckBox, QSpinBox, QAbstractItemView,
+)
+
+from gcode_writer import is_gzip_path, write_gcode
+
+# İndeksleme ve aramada bir seferde taranan bayt
+INDEX_BLOCK = 16 << 20
+
+
+def _release(mm, fh, temp_path):
+    """LineIndex kapatılırken / çöp toplanırken kaynakları bırak."""
+    if mm is not None:
+        mm.close()
+    if fh is not None:
+        fh.close()
+    if temp_path:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+class LineIndex:
+    """
+    Bir metin tamponu ve satır başı konumları.
+
+    buf     : bytes ya da mmap
+    offsets : (n+1,) int64; i. satır buf[offsets[i]:offsets[i+1]] (satır sonu dahil)
+    """
+
+    def __init__(self, buf, fh=None, temp_path: str | None = None):
+        self.buf = buf
+        self.size = len(buf)
+        self.offsets = self._build_offsets(buf, self.size)
+        mm = buf if isinstance(buf, mmap.mmap) else None
+        self._finalizer = weakref.finalize(self, _release, mm, fh, temp_path)
+
+    @staticmethod
+    def _build_offsets(buf, size: int) -> np.ndarray:
+        parts = [np.zeros(1, dtype=np.int64)]
+        for start in range(0, size, INDEX_BLOCK):
+            count = min(INDEX_BLOCK, size - start)
+            block = np.frombuffer(buf, dtype=np.uint8, count=count, offset=start)
+            parts.append(np.flatnonzero(block == 10).astype(np.int64) + (start + 1))
+        offsets = np.concatenate(parts)
+        if offsets[-1] != size:
+            # Son satırın sonunda '\n' yok
+            offsets = np.append(offsets, size)
+        return offsets
+
+    # ---- oluşturma ----
+    @classmethod
+    def from_text(cls, text: str) -> "LineIndex":
+        return cls(text.encode("utf-8"))
+
+    @classmethod
+    def from_file(cls, path: str) -> "LineIndex":
+        """Dosyayı mmap ile aç (.gz önce geçici dosyaya açılır)."""
+        if is_gzip_path(path):
+            fd, temp_path = tempfile.mkstemp(suffix=".nc", prefix="tcam_view_")
+            with os.fdopen(fd, "wb") as out, gzip.open(path, "rb") as src:
+                shutil.copyfileobj(src, out, 4 << 20)
+            return cls._map(temp_path, temp_path)
+        return cls._map(path, None)
+
+    @classmethod
+    def from_chunks(cls, chunks) -> "LineIndex":
+        """Metin parçalarını geçici dosyaya akıt ve mmap ile aç."""
+        fd, temp_path = tempfile.mkstemp(suffix=".nc", prefix="tcam_view_")
+        os.close(fd)
+        try:
+            write_gcode(temp_path, chunks, compress=False)
+        except Exception:
+            os.remove(temp_path)
+            raise
+        return cls._map(temp_path, temp_path)
+
+    @classmethod
+    def _map(cls, path: str, temp_path: str | None) -> "LineIndex":
+        fh = open(path, "rb")
+        if os.fstat(fh.fileno()).st_size == 0:
+            # Boş dosya mmap ile açılamaz
+            fh.close()
+            if temp_path:
+                os.remove(temp_path)
+            return cls(b"")
+        buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buf, fh, temp_path)
+
+    def close(self):
+        self._finalizer()
+
+    # ---- erişim ----
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def line(self, i: int) -> str:
+        a, b = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self.buf[a:b].rstrip(b"\r\n").decode("utf-8", errors="replace")
+
+    def line_at(self, pos: int) -> int:
+        """Bayt konumunu içeren satır."""
+        return int(np.searchsorted(self.offsets, pos, side="right")) - 1
+
+    def find(self, text: str, start_line: int = -1, backward: bool = False,
+             case_sensitive: bool = False) -> int:
+        """
+        text'i içeren ilk satır: ileri aramada start_line'dan sonra, geri
+        aramada start_line'dan önce. Bulunamazsa -1.
+        """
+        if not text or not len(self):
+            return -1
+        needle = text.encode("utf-8")
+        if not case_sensitive:
+            needle = needle.lower()
+        if backward:
+            end = int(self.offsets[max(0, min(start_line, len(self)))])
+            pos = self._scan(needle, 0, end, True, case_sensitive)
+        else:
+            start = int(self.offsets[max(0, min(start_line + 1, len(self)))])
+            pos = self._scan(needle, start, self.size, False, case_sensitive)
+        return -1 if pos < 0 else self.line_at(pos)
+
+    def _scan(self, needle: bytes, start: int, end: int, backward: bool,
+              case_sensitive: bool) -> int:
+        """
+        buf[start:end] içinde needle'ın ilk (geri aramada son) konumu.
+
+        Tampon INDEX_BLOCK'luk kopyalar halinde taranır: bytes.find
+        mmap.find'dan birkaç kat hızlıdır ve büyük/küçük harf duyarsız
+        arama blok .lower() ile yapılır (G-kodu ASCII'dir).
+        """
+        overlap = len(needle) - 1
+        blocks = range(start, end, INDEX_BLOCK)
+        for a in (reversed(blocks) if backward else blocks):
+            b = min(a + INDEX_BLOCK + overlap, end)
+            data = self.buf[a:b]
+            if not case_sensitive:
+                data = data.lower()
+            pos = data.rfind(needle) if backward else data.find(needle)
+            if pos >= 0:
+                return a + pos
+        return -1
+
+
+class GCodeLineModel(QAbstractListModel):
+    """LineIndex satırlarını (satır numarasıyla) veren liste modeli."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index_data = None
+        self._width = 1
+
+    def set_line_index(self, line_index):
+        self.beginResetModel()
+        if self.index_data is not None and self.index_data is not line_index:
+            self.index_data.close()
+        self.index_data = line_index
+        self._width = len(str(len(line_index))) if line_index is not None else 1
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.index_data is None:
+            return 0
+        return len(self.index_data)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid() or self.index_data is None:
+            return None
+        row = index.row()
+        return f"{row + 1:>{self._width}}  {self.index_data.line(row)}"
+
+
+class GCodeView(QWidget):
+    """
+    Sanal G-kodu görüntüleyici: satır listesi + arama ve satıra gitme.
+
+    Tüm satırlar aynı yükseklikte (setUniformItemSizes) olduğundan
+    QListView kaydırma çubuğunu satır sayısından hesaplar ve sadece
+    görünen satırlar için model.data() çağırır.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        self.model = GCodeLineModel(self)
+        self.list = QListView()
+        self.list.setModel(self.model)
+        self.list.setUniformItemSizes(True)
+        self.list.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.list.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.list.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.list, 1)
+
+        row = QHBoxLayout()
+        row.addWidget(QLabel("Ara:"))
+        self.edit_find = QLineEdit()
+        self.edit_find.setPlaceholderText("ör. G2, F1200, X10.5")
+        self.edit_find.returnPressed.connect(self.find_next)
+        row.addWidget(self.edit_find, 1)
+        self.btn_prev = QPushButton("Önceki")
+        self.btn_prev.clicked.connect(self.find_prev)
+        row.addWidget(self.btn_prev)
+        self.btn_next = QPushButton("Sonraki")
+        self.btn_next.clicked.connect(self.find_next)
+        row.addWidget(self.btn_next)
+        self.chk_case = QCheckBox("Büyük/küçük harf")
+        row.addWidget(self.chk_case)
+        row.addWidget(QLabel("Satıra git:"))
+        self.spin_line = QSpinBox()
+        self.spin_line.setRange(1, 1)
+        self.spin_line.editingFinished.connect(
+            lambda: self.goto_line(self.spin_line.value()))
+        row.addWidget(self.spin_line)
+        self.label_status = QLabel("")
+        row.addWidget(self.label_status)
+        layout.addLayout(row)
+
+    # ---- içerik ----
+    def set_line_index(self, line_index):
+        self.model.set_line_index(line_index)
+        self.spin_line.setRange(1, max(1, len(line_index) if line_index is not None else 1))
+        self.label_status.setText("")
+
+    def clear(self):
+        self.set_line_index(None)
+
+    def line_count(self) -> int:
+        return self.model.rowCount()
+
+    # ---- gezinme ----
+    def current_line(self) -> int:
+        """Seçili satır (0'dan); seçim yoksa -1."""
+        index = self.list.currentIndex()
+        return index.row() if index.isValid() else -1
+
+    def goto_line(self, number: int):
+        """number. satırı (1'den) seç ve ortala."""
+        n = self.line_count()
+        if n == 0:
+            return
+        row = min(max(int(number), 1), n) - 1
+        index = self.model.index(row)
+        self.list.setCurrentIndex(index)
+        self.list.scrollTo(index, QAbstractItemView.PositionAtCenter)
+
+    def find_next(self):
+        self._find(backward=False)
+
+    def find_prev(self):
+        self._find(backward=True)
+
+    def _find(self, backward: bool):
+        data = self.model.index_data
+        text = self.edit_find.text()
+        if data is None or not text:
+            return
+        case = self.chk_case.isChecked()
+        current = self.current_line()
+        if backward and current < 0:
+            current = len(data)
+        row = data.find(text, current, backward=backward, case_sensitive=case)
+        wrapped = False
+        if row < 0:
+            # Sona / başa gelindi: diğer uçtan devam
+            row = data.find(text, len(data) if backward else -1,
+                            backward=backward, case_sensitive=case)
+            wrapped = row >= 0
+        if row < 0:
+            self.label_status.setText("Bulunamadı")
+            return
+        self.label_status.setText("Başa dönüldü" if wrapped else "")
+        self.goto_line(row + 1)
@@ -0,0 +1,45 @@
+# gcode_writer.py
+"""
+G-kodunu belleğe bütün olarak almadan diske yazma.
+
+Üreticiler (gcode_generator.iter_gcode_flat / iter_gcode_3d) metni
+parçalar halinde verir; burada bu parçalar doğrudan düz dosyaya ya da
+gzip akışına yazılır. Tepe bellek kullanımı program uzunluğundan
+bağımsızdır (bir parça kadardır).
+"""
+
+import gzip
+
+
+def is_gzip_path(path: str) -> bool:
+    return str(path).lower().endswith(".gz")
+
+
+def write_gcode(path: str, chunks, compress: bool | None = None) -> dict:
+    """
+    Parçaları dosyaya yaz.
+
+    compress=None ise uzantıya bakılır (.gz -> gzip).
+    Dönen: {"lines": satır sayısı, "chars": karakter sayısı}
+    """
+    if compress is None:
+        compress = is_gzip_path(path)
+
+    n_lines = 0
+    n_chars = 0
+    last = ""
+    if compress:
+        f = gzip.open(path, "wt", encoding="utf-8")
+    else:
+        f = open(path, "w", encoding="utf-8")
+    with f:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            f.write(chunk)
+            n_lines += chunk.count("\n")
+            n_chars += len(chunk)
+            last = chunk
+    if n_chars and not last.endswith("\n"):
+        n_lines += 1
+    return {"lines": n_lines, "chars": n_chars}
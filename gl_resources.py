@@ -0,0 +1,417 @@
+# gl_resources.py
+"""
+Görüntüleyiciler arasında paylaşılan OpenGL kaynakları.
+
+Model sekmesindeki GLViewer ve 3D önizlemedeki Path3DViewer aynı mesh'i
+çizer. Uygulama Qt.AA_ShareOpenGLContexts ile başlatıldığında bütün
+QOpenGLWidget bağlamları tek bir paylaşım grubundadır; bir bağlamda
+oluşturulan tampon diğerinde de geçerlidir. Bu modül tamponları
+(paylaşım grubu, mesh, tür) anahtarıyla tutar:
+
+    "tri"           araya serpiştirilmiş konum + normal VBO (float32, 24 bayt/köşe;
+                    köşeler keskin kenarlarda bölünmüş, crease_normals)
+    "idx"           üçgen indisleri EBO (uint32, bölünmüş köşelere)
+    "edges:<mod>"   tel kafes kenar indisleri EBO (uint32, GL_LINES)
+    "path"          takım yolu noktaları VBO (float32, 12 bayt/nokta; path_lod)
+    "path:<k>"      yolun k. seyreltme seviyesinin indisleri EBO (GL_LINE_STRIP)
+    "color:<mod>"   yolun nokta başına renkleri VBO (uint8 RGB; path_colors)
+    "glyph"         bıçak yönü işaretlerinin üçgenleri VBO (float32; knife_glyphs)
+
+Hangi görüntüleyici önce çizerse tamponu o yükler; diğeri aynı tamponu
+kullanır. Mesh'in yönü (Model sekmesindeki döndürme / ölçek) köşelere
+uygulanmaz, çizimde model matrisiyle verilir; böylece döndürmede tampon
+yeniden yüklenmez ve dönüştürülmüş bir kopya tutulmaz.
+
+Paylaşım yoksa (ayrı gruplar) her grup kendi kopyasını yükler; rapor
+bunu da gösterir. Artık kullanılmayan mesh'lerin tamponları, GL bağlamı
+geçerliyken çağrılan collect() ile silinir.
+"""
+
+import ctypes
+import itertools
+import time
+import weakref
+
+import numpy as np
+from OpenGL.GL import (
+    glGenBuffers, glBindBuffer, glBufferData, glDeleteBuffers,
+    glEnableClientState, glDisableClientState, glVertexPointer, glNormalPointer,
+    glColorPointer,
+    glDrawElements, glDrawArrays,
+    GL_ARRAY_BUFFER, GL_ELEMENT_ARRAY_BUFFER, GL_STATIC_DRAW,
+    GL_VERTEX_ARRAY, GL_NORMAL_ARRAY, GL_COLOR_ARRAY, GL_FLOAT, GL_UNSIGNED_INT,
+    GL_UNSIGNED_BYTE,
+    GL_TRIANGLES, GL_LINES, GL_LINE_STRIP,
+)
+from PyQt5 import sip
+from PyQt5.QtGui import QOpenGLContext
+
+from mesh_edges import FEATURE_ANGLE_DEG, unique_edges, feature_edges
+
+STRIDE = 24     # "tri" VBO'da köşe başına bayt (3 konum + 3 normal, float32)
+
+# Köşe normalleri bu açıdan keskin kenarlarda ortalanmaz (derece)
+CREASE_ANGLE_DEG = FEATURE_ANGLE_DEG
+
+
+def crease_normals(vertices, faces, angle_deg: float = CREASE_ANGLE_DEG):
+    """
+    Keskin kenarlarda bölünmüş köşe normalleri, vektörel.
+
+    Bir köşeyi paylaşan üçgen köşeleri (corner), ortak kenarları keskin
+    değilse (yüz normalleri arası açı <= angle_deg, kenar tam iki yüzlü)
+    aynı gruba girer; her grup ayrı bir çizim köşesi olur ve normali
+    grubun alan ağırlıklı ortalamasıdır. Böylece pürüzsüz yüzeyler yumuşak,
+    90°'lik kenarlar keskin taranır (tek köşe normali kenarı yayar).
+
+    Keskin kenara değmeyen köşeler olduğu gibi kalır; bölünen köşelerin
+    grupları sona eklenir. İlk N konum özgün köşelerdir, bu yüzden kenar
+    (tel kafes) indisleri değişmeden kullanılabilir.
+
+    Dönen: (positions (K,3) float32, normals (K,3) float32, faces (M,3) uint32)
+    """
+    v = np.asarray(vertices, dtype=np.float32)
+    f = np.asarray(faces, dtype=np.int64)
+    m, nv = len(f), len(v)
+    n = np.cross(v[f[:, 1]] - v[f[:, 0]], v[f[:, 2]] - v[f[:, 0]])
+    lens = np.linalg.norm(n, axis=1)
+    unit = n / np.where(lens > 0, lens, 1.0)[:, None]
+
+    # r = k*m + i satırı: i. üçgenin k -> k+1 kenarı (va -> vb)
+    va = f.T.ravel()
+    vb = np.roll(f, -1, axis=1).T.ravel()
+    keys = np.minimum(va, vb) * nv + np.maximum(va, vb)
+    order = np.argsort(keys)
+    sk = keys[order]
+    first = np.flatnonzero(np.concatenate(([True], sk[1:] != sk[:-1])))
+    counts = np.diff(np.append(first, len(sk)))
+    pair = first[counts == 2]
+    p, q = order[pair], order[pair + 1]
+    smooth = np.einsum("ij,ij->i", unit[p % m], unit[q % m]) >= np.cos(np.radians(angle_deg))
+    p, q = p[smooth], q[smooth]
+
+    # Keskin, açık ya da ikiden fazla yüzlü kenarlara değen köşeler bölünür
+    soft = np.zeros(3 * m, dtype=bool)
+    soft[p] = soft[q] = True
+    hard = np.zeros(nv, dtype=bool)
+    hard[va[~soft]] = True
+    hard[vb[~soft]] = True
+
+    corner_v = f.ravel()
+    group = corner_v.copy()
+    hc = np.flatnonzero(hard[corner_v])
+    extra = np.zeros(0, dtype=np.int64)
+    if len(hc):
+        local = np.full(3 * m, -1, dtype=np.int64)
+        local[hc] = np.arange(len(hc))
+
+        # Satır r'nin uçlarındaki köşeler: 3i+k (va), 3i+(k+1)%3 (vb)
+        def corner_a(r):
+            return 3 * (r % m) + r // m
+
+        def corner_b(r):
+            return 3 * (r % m) + (r // m + 1) % 3
+
+        same = va[p] == va[q]
+        a = np.concatenate((corner_a(p), corner_b(p)))
+        b = np.concatenate((np.where(same, corner_a(q), corner_b(q)),
+                            np.where(same, corner_b(q), corner_a(q))))
+        a, b = local[a], local[b]
+        keep = a >= 0
+        a, b = a[keep], b[keep]
+
+        # Bağlı bileşenler: en küçük etiket yayma + işaretçi atlama
+        label = np.arange(len(hc))
+        while len(a):
+            low = np.minimum(label[a], label[b])
+            new = label.copy()
+            np.minimum.at(new, a, low)
+            np.minimum.at(new, b, low)
+            new = new[new]
+            if np.array_equal(new, label):
+                break
+            label = new
+        _, rep, comp = np.unique(label, return_index=True, return_inverse=True)
+        group[hc] = nv + comp
+        extra = corner_v[hc[rep]]
+
+    positions = np.concatenate((v, v[extra]))
+    out = np.empty((len(positions), 3), dtype=np.float32)
+    for c in range(3):
+        out[:, c] = np.bincount(group, weights=np.repeat(n[:, c], 3), minlength=len(positions))
+    norm = np.linalg.norm(out, axis=1)
+    empty = norm == 0
+    out[empty] = (0.0, 0.0, 1.0)
+    norm[empty] = 1.0
+    out /= norm[:, None]
+    return positions, out, group.reshape(m, 3).astype(np.uint32)
+
+
+_serial = itertools.count(1)
+
+
+def new_key() -> int:
+    """Tampon kaydı için yeni nesne anahtarı (SharedMesh, PathPyramid, KnifeGlyphs)."""
+    return next(_serial)
+
+
+class SharedMesh:
+    """
+    Görüntüleyicilerin ortak kullandığı mesh (CPU tarafı).
+
+    vertices     : (N,3) float32
+    faces        : (M,3) uint32
+    face_normals : (M,3) float32 ya da None
+    Çizim köşeleri (keskin kenarlarda bölünmüş, normalli) ve kenar listeleri
+    ilk ihtiyaçta hesaplanıp saklanır.
+    """
+
+    def __init__(self, vertices, faces, face_normals=None):
+        self.key = new_key()
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+        self.faces = np.ascontiguousarray(faces, dtype=np.uint32)
+        self.face_normals = (None if face_normals is None
+                             else np.asarray(face_normals, dtype=np.float32))
+        self._shading = None
+        self._edges = {}
+        # Basitleştirilmiş seviyeler (SharedMesh, ayrıntılıdan kabaya; mesh_lod)
+        self.lods = []
+
+    def __len__(self) -> int:
+        return len(self.faces)
+
+    def shading(self):
+        """crease_normals sonucu: (konumlar, normaller, üçgenler)."""
+        if self._shading is None:
+            self._shading = crease_normals(self.vertices, self.faces)
+        return self._shading
+
+    def edges(self, mode: str) -> np.ndarray:
+        """Tel kafes kenarları (E,2) uint32: "all" tekil, "feature" keskin kenarlar."""
+        if mode not in self._edges:
+            if mode == "feature":
+                self._edges[mode] = feature_edges(self.vertices, self.faces,
+                                                  normals=self.face_normals)
+            else:
+                self._edges[mode] = unique_edges(self.faces)
+        return self._edges[mode]
+
+    def interleaved(self) -> np.ndarray:
+        positions, normals, _faces = self.shading()
+        data = np.empty((len(positions), 6), dtype=np.float32)
+        data[:, :3] = positions
+        data[:, 3:] = normals
+        return data
+
+
+class _Buffer:
+    __slots__ = ("gl_id", "nbytes", "count", "users")
+
+    def __init__(self, gl_id, nbytes, count):
+        self.gl_id = gl_id
+        self.nbytes = int(nbytes)
+        self.count = int(count)
+        self.users = set()      # tamponu çizen görüntüleyiciler (rapor için)
+
+
+class _Group:
+    """Bir paylaşım grubundaki tamponlar."""
+
+    def __init__(self):
+        self.buffers = {}       # (mesh.key, tür) -> _Buffer
+        self.meshes = {}        # mesh.key -> weakref(SharedMesh)
+
+
+_groups = {}
+
+# Tampon yüklemeleri: veri hazırlama + glBufferData (render_stats kare başına farkı alır)
+upload_stats = {"count": 0, "bytes": 0, "seconds": 0.0}
+
+
+def _group_key():
+    """Geçerli bağlamın paylaşım grubu (Qt bağlamı yoksa 0)."""
+    ctx = QOpenGLContext.currentContext()
+    if ctx is None:
+        return 0
+    return sip.unwrapinstance(ctx.shareGroup())
+
+
+def _group() -> _Group:
+    key = _group_key()
+    if key not in _groups:
+        _groups[key] = _Group()
+    return _groups[key]
+
+
+def _buffer(mesh, kind: str, target, make_data, user: str) -> _Buffer:
+    group = _group()
+    key = (mesh.key, kind)
+    buf = group.buffers.get(key)
+    if buf is None:
+        t0 = time.perf_counter()
+        data = make_data()
+        gl_id = int(glGenBuffers(1))
+        glBindBuffer(target, gl_id)
+        glBufferData(target, data.nbytes, data, GL_STATIC_DRAW)
+        glBindBuffer(target, 0)
+        upload_stats["count"] += 1
+        upload_stats["bytes"] += data.nbytes
+        upload_stats["seconds"] += time.perf_counter() - t0
+        buf = _Buffer(gl_id, data.nbytes, data.size)
+        group.buffers[key] = buf
+        group.meshes[mesh.key] = weakref.ref(mesh)
+    buf.users.add(user)
+    return buf
+
+
+def _bind_vertices(mesh, user: str, normals: bool):
+    vbo = _buffer(mesh, "tri", GL_ARRAY_BUFFER, mesh.interleaved, user)
+    glBindBuffer(GL_ARRAY_BUFFER, vbo.gl_id)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(3, GL_FLOAT, STRIDE, ctypes.c_void_p(0))
+    if normals:
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glNormalPointer(GL_FLOAT, STRIDE, ctypes.c_void_p(12))
+
+
+def _unbind_vertices():
+    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+    glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_NORMAL_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+    glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+
+def draw_triangles(mesh, user: str):
+    """Dolu mesh: paylaşılan VBO + üçgen EBO, tek glDrawElements."""
+    if mesh is None or not len(mesh):
+        return
+    ebo = _buffer(mesh, "idx", GL_ELEMENT_ARRAY_BUFFER, lambda: mesh.shading()[2].ravel(), user)
+    _bind_vertices(mesh, user, normals=True)
+    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo.gl_id)
+    glDrawElements(GL_TRIANGLES, ebo.count, GL_UNSIGNED_INT, ctypes.c_void_p(0))
+    _unbind_vertices()
+
+
+def draw_edges(mesh, mode: str, user: str) -> int:
+    """Tel kafes: paylaşılan VBO + moda ait kenar EBO'su (GL_LINES). Dönen: çizgi sayısı."""
+    if mesh is None or not len(mesh) or mode == "none":
+        return 0
+    ebo = _buffer(mesh, f"edges:{mode}", GL_ELEMENT_ARRAY_BUFFER,
+                  lambda: mesh.edges(mode).ravel(), user)
+    if ebo.count:
+        _bind_vertices(mesh, user, normals=False)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo.gl_id)
+        glDrawElements(GL_LINES, ebo.count, GL_UNSIGNED_INT, ctypes.c_void_p(0))
+        _unbind_vertices()
+    return ebo.count // 2
+
+
+def draw_line_strip(path, level: int, user: str, count: int | None = None,
+                    color_mode: str | None = None) -> int:
+    """
+    Yol çizgisi (path_lod.PathPyramid): noktalar tek VBO, seviye indisleri
+    ayrı EBO. count verilirse sadece ilk count indis (yolun baştan bir
+    kısmı) çizilir. color_mode verilirse (path.colors'ta verisi olan bir
+    mod) o modun renk VBO'su köşe rengi olarak bağlanır; renkler moda göre
+    bir kez yüklenir. Dönen: çizgi parçası sayısı.
+    """
+    vbo = _buffer(path, "path", GL_ARRAY_BUFFER, lambda: path.points, user)
+    ebo = _buffer(path, f"path:{level}", GL_ELEMENT_ARRAY_BUFFER,
+                  lambda: path.levels[level][0], user)
+    count = ebo.count if count is None else min(int(count), ebo.count)
+    if count < 2:
+        return 0
+    glBindBuffer(GL_ARRAY_BUFFER, vbo.gl_id)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, ctypes.c_void_p(0))
+    if color_mode is not None:
+        cbo = _buffer(path, f"color:{color_mode}", GL_ARRAY_BUFFER,
+                      lambda: path.colors.get(color_mode)[0], user)
+        glBindBuffer(GL_ARRAY_BUFFER, cbo.gl_id)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glColorPointer(3, GL_UNSIGNED_BYTE, 0, ctypes.c_void_p(0))
+    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo.gl_id)
+    glDrawElements(GL_LINE_STRIP, count, GL_UNSIGNED_INT, ctypes.c_void_p(0))
+    _unbind_vertices()
+    return count - 1
+
+
+def draw_triangle_range(obj, first: int, count: int, user: str):
+    """Düz üçgen dizisi (knife_glyphs.KnifeGlyphs): VBO'nun [first, first+count) köşeleri."""
+    if count < 3:
+        return
+    vbo = _buffer(obj, "glyph", GL_ARRAY_BUFFER, lambda: obj.vertices, user)
+    glBindBuffer(GL_ARRAY_BUFFER, vbo.gl_id)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, ctypes.c_void_p(0))
+    glDrawArrays(GL_TRIANGLES, first, count)
+    _unbind_vertices()
+
+
+def collect():
+    """Geçerli gruptaki, artık hiçbir yerde kullanılmayan mesh'lerin tamponlarını sil."""
+    group = _groups.get(_group_key())
+    if group is None:
+        return
+    dead = {key for key, ref in group.meshes.items() if ref() is None}
+    if not dead:
+        return
+    drop = [k for k in group.buffers if k[0] in dead]
+    glDeleteBuffers(len(drop), [group.buffers[k].gl_id for k in drop])
+    for k in drop:
+        del group.buffers[k]
+    for key in dead:
+        del group.meshes[key]
+
+
+def release_context():
+    """
+    Bağlam yok edilmeden önce (bağlam geçerliyken) çağrılır. Grupta başka
+    bağlam kalmıyorsa grubun bütün tamponları silinir.
+    """
+    ctx = QOpenGLContext.currentContext()
+    key = _group_key()
+    group = _groups.get(key)
+    if group is None:
+        return
+    if ctx is not None and len(ctx.shareGroup().shares()) > 1:
+        return
+    if group.buffers:
+        glDeleteBuffers(len(group.buffers), [b.gl_id for b in group.buffers.values()])
+    del _groups[key]
+
+
+def memory_report() -> dict:
+    """
+    GPU'daki tamponların özeti.
+
+    total    : yüklü toplam bayt (bütün gruplar)
+    unshared : her görüntüleyici kendi kopyasını tutsaydı gereken bayt
+    by_kind  : {tür: bayt}
+    """
+    total = unshared = 0
+    by_kind = {}
+    for group in _groups.values():
+        for (_mesh, kind), buf in group.buffers.items():
+            kind = kind.split(":")[0]
+            total += buf.nbytes
+            unshared += buf.nbytes * max(1, len(buf.users))
+            by_kind[kind] = by_kind.get(kind, 0) + buf.nbytes
+    return {"groups": len(_groups), "total": total, "unshared": unshared,
+            "by_kind": by_kind}
+
+
+def memory_report_text() -> str:
+    rep = memory_report()
+    names = {"tri": "köşe (konum + normal)", "idx": "üçgen indisleri",
+             "edges": "tel kafes kenarları", "path": "takım yolu",
+             "glyph": "bıçak yönü işaretleri", "color": "yol renkleri"}
+    lines = [f"GPU tamponları: {rep['total'] / 1e6:.1f} MB "
+             f"({rep['groups']} paylaşım grubu)"]
+    for kind, nbytes in sorted(rep["by_kind"].items()):
+        lines.append(f"  {names.get(kind, kind)}: {nbytes / 1e6:.1f} MB")
+    saved = rep["unshared"] - rep["total"]
+    lines.append(f"Paylaşım olmasaydı: {rep['unshared'] / 1e6:.1f} MB "
+                 f"(tasarruf {saved / 1e6:.1f} MB)")
+    return "\n".join(lines)
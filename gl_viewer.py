@@ -1,7 +1,7 @@
 from tool_arrow import draw_tool_arrow
 from knife_visual import compute_path_tangent_angle_deg, estimate_visual_length, draw_knife_gl_3d, draw_knife_2d_matplotlib
 from PyQt5.QtWidgets import QOpenGLWidget
-from PyQt5.QtCore import Qt, QPoint
+from PyQt5.QtCore import Qt, QPoint, QTimer
 
 from OpenGL.GL import *
 from OpenGL.GLU import gluPerspective
@@ -9,6 +9,12 @@ from OpenGL.GLUT import glutInit, glutBitmapCharacter, GLUT_BITMAP_HELVETICA_18
 
 import numpy as np
 
+import gl_resources
+from gl_resources import SharedMesh
+from mesh_lod import LodBuildWorker, lod_settings
+from render_stats import RenderStats, draw_overlay
+from path_lod import PathPyramid
+
 
 class GLViewer(QOpenGLWidget):
     """
@@ -25,9 +31,28 @@ class GLViewer(QOpenGLWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Paylaşılan mesh (gl_resources.SharedMesh); GPU tamponları ilk
+        # çizimde (GL bağlamı geçerliyken) bir kez yüklenir ve 3D önizleme
+        # ile ortak kullanılır
+        self.mesh = None
         self.vertices = None   # Nx3
         self.faces = None      # Mx3 (indis)
         self.face_normals = None   # üçgen başına normal vektörleri
+
+        # Ayrıntı seviyesi (LOD): büyük mesh'ler döndürülürken / yakınlaştırılırken
+        # basitleştirilmiş seviye çizilir, fare durduktan idle_ms sonra tam mesh
+        self.lod = lod_settings()
+        self.drawn_faces = 0       # son karede çizilen üçgen sayısı
+        self._interacting = False
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(int(self.lod["idle_ms"]))
+        self._idle_timer.timeout.connect(self._end_interaction)
+        self._lod_workers = []
+
+        # Kare istatistikleri; show_stats ile sol üstte gösterilir
+        self.stats = RenderStats()
+        self.show_stats = False
         self.center = np.zeros(3)
         self.radius = 1.0
 
@@ -38,8 +63,10 @@ class GLViewer(QOpenGLWidget):
         # STL görünürlüğü
         self.mesh_visible = True
 
-        # Yol noktaları (Nx2) – isteğe bağlı
+        # Yol noktaları (Nx2) – isteğe bağlı; çizim için seyreltme piramidi
+        # (path_lod) ilk çizimde kurulur
         self.path_points = None
+        self._path_lod = None
 
         # Kamera / kontrol parametreleri
         self.base_dist = 1000.0   # makine zarfını görecek uzaklık
@@ -90,11 +117,25 @@ class GLViewer(QOpenGLWidget):
 
     # ---- Dışarıdan çağrılan metodlar ----
 
-    def set_mesh(self, vertices, faces):
+    def set_mesh(self, vertices, faces, face_normals=None):
         """Mesh verisini yükle ve merkez/yarıçap hesapla."""
+        if vertices is None or faces is None:
+            self.set_shared_mesh(None)
+        else:
+            self.set_shared_mesh(SharedMesh(vertices, faces, face_normals))
+
+    def set_shared_mesh(self, mesh):
+        """
+        3D önizlemeyle ortak kullanılan mesh'i göster (None: temizle).
+        Tampon yükleme ilk karede yapılır.
+        """
+        self.mesh = mesh
+        vertices = None if mesh is None else mesh.vertices
         self.vertices = vertices
-        self.faces = faces
-        self.face_normals = None
+        self.faces = None if mesh is None else mesh.faces
+        self.face_normals = None if mesh is None else mesh.face_normals
+        if mesh is not None and not mesh.lods and len(mesh) > self.lod["build_above"]:
+            self._start_lod_build(mesh)
 
         if vertices is not None and len(vertices) > 0:
             vmin = vertices.min(axis=0)
@@ -108,24 +149,73 @@ class GLViewer(QOpenGLWidget):
             # distance ~ 3x radius => Windows 3B Görüntüleyici benzeri uzaklık
             self.base_dist = self.radius * 3.0
 
-            # Yüzey normallerini önceden hesapla (smooth shading için)
-            try:
-                f = np.asarray(self.faces, dtype=int)
-                v = np.asarray(self.vertices, dtype=float)
-                v0 = v[f[:, 0]]
-                v1 = v[f[:, 1]]
-                v2 = v[f[:, 2]]
-                n = np.cross(v1 - v0, v2 - v0)
-                lens = np.linalg.norm(n, axis=1)
-                lens[lens == 0] = 1.0
-                n = n / lens[:, None]
-                self.face_normals = n
-            except Exception:
-                self.face_normals = None
-
         self.reset_view()
         self.update()
 
+    # ---- Ayrıntı seviyesi ----
+
+    def _start_lod_build(self, mesh):
+        worker = LodBuildWorker(mesh, self)
+        worker.built.connect(self._on_lods_built)
+        worker.finished.connect(lambda w=worker: self._lod_workers.remove(w))
+        self._lod_workers.append(worker)
+        worker.start()
+
+    def stop_workers(self):
+        """Uygulama kapanırken: süren LOD üretimlerinin bitmesini bekle."""
+        for worker in list(self._lod_workers):
+            worker.wait()
+
+    def _on_lods_built(self, mesh, lods):
+        mesh.lods = [SharedMesh(v, f) for v, f, _cell in lods]
+        if mesh is self.mesh and self._interacting:
+            self.update()
+
+    def _begin_interaction(self):
+        self._interacting = True
+        self._idle_timer.start()
+
+    def _end_interaction(self):
+        self._interacting = False
+        if self.mesh is not None and self.mesh.lods:
+            self.update()
+
+    def mesh_for_frame(self):
+        """
+        Bu karede çizilecek mesh: etkileşim sürerken üçgen sayısı
+        interactive_faces'i aşmayan en ayrıntılı seviye (yoksa en kaba),
+        aksi halde tam mesh.
+        """
+        mesh = self.mesh
+        if (not self._interacting or mesh is None or not mesh.lods
+                or len(mesh) <= self.lod["interactive_faces"]):
+            return mesh
+        for lod in mesh.lods:
+            if len(lod) <= self.lod["interactive_faces"]:
+                return lod
+        return mesh.lods[-1]
+
+    # ---- Performans göstergesi ----
+
+    def set_stats_overlay(self, visible: bool):
+        self.show_stats = bool(visible)
+        self.update()
+
+    def render_stats(self) -> dict:
+        """Kare süresi yüzdelikleri, FPS, çizilen üçgen / çizgi vb. (RenderStats.snapshot)."""
+        return self.stats.snapshot()
+
+    def request_update(self):
+        """Fare olayları için update(): bekleyen çizim varsa istek birleştirilir."""
+        if self.stats.request():
+            self.update()
+
+    def _release_gl(self):
+        """GL bağlamı yok edilmeden önce (grupta son bağlamsa) tamponları bırak."""
+        self.makeCurrent()
+        gl_resources.release_context()
+        self.doneCurrent()
+
     def set_user_transform(self, rot_x, rot_y, rot_z, scale=1.0):
         """
         Model döndürme butonlarından gelen açıları uygula.
@@ -172,6 +262,10 @@ class GLViewer(QOpenGLWidget):
         glLightfv(GL_LIGHT0, GL_SPECULAR, specular)
         glLightfv(GL_LIGHT0, GL_POSITION, position)
 
+        ctx = self.context()
+        if ctx is not None:
+            ctx.aboutToBeDestroyed.connect(self._release_gl)
+
     def resizeGL(self, w, h):
         if h == 0:
             h = 1
@@ -187,6 +281,8 @@ class GLViewer(QOpenGLWidget):
         # Zemin rengi değişmiş olabilir, her frame set edelim
         glClearColor(self.bg_color[0], self.bg_color[1], self.bg_color[2], 1.0)
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        self.stats.begin_frame()
+        gl_resources.collect()
         glLoadIdentity()
 
         # ---- Kamera transformu (her şey için ortak) ----
@@ -217,24 +313,13 @@ class GLViewer(QOpenGLWidget):
             # Mesh merkezini orijine taşı
             glTranslatef(-self.center[0], -self.center[1], -self.center[2])
 
-            # --- STL çiz (smooth shading + ışık) ---
+            # --- STL çiz (smooth shading + ışık): VBO'dan tek çağrı ---
             if self.mesh_visible:
                 glColor3f(self.mesh_color[0], self.mesh_color[1], self.mesh_color[2])
-                glBegin(GL_TRIANGLES)
-                if self.face_normals is not None:
-                    for fi, f in enumerate(self.faces):
-                        if fi < len(self.face_normals):
-                            nx, ny, nz = self.face_normals[fi]
-                            glNormal3f(nx, ny, nz)
-                        for idx in f:
-                            x, y, z = self.vertices[int(idx)]
-                            glVertex3f(x, y, z)
-                else:
-                    for f in self.faces:
-                        for idx in f:
-                            x, y, z = self.vertices[int(idx)]
-                            glVertex3f(x, y, z)
-                glEnd()
+                mesh = self.mesh_for_frame()
+                gl_resources.draw_triangles(mesh, "model")
+                self.drawn_faces = len(mesh)
+                self.stats.add_triangles(len(mesh))
 
             # --- Yol çiz (varsa) ---
             if self.path_points is not None and len(self.path_points) > 1:
@@ -242,10 +327,7 @@ class GLViewer(QOpenGLWidget):
                 glDisable(GL_LIGHTING)
                 glLineWidth(2.0)
                 glColor3f(1.0, 0.3, 0.0)
-                glBegin(GL_LINE_STRIP)
-                for x, y in self.path_points:
-                    glVertex3f(x, y, 0.5)   # z=0.5 mm yukarıda
-                glEnd()
+                self.stats.add_lines(self._path_pyramid().draw("model"))
                 glLineWidth(1.0)
 
                 # Başlangıç noktasına küçük bir kırmızı nokta
@@ -259,6 +341,20 @@ class GLViewer(QOpenGLWidget):
                 glEnable(GL_LIGHTING)
 
             glPopMatrix()
+
+        self.stats.end_frame()
+        if self.show_stats:
+            draw_overlay(self.stats.text_lines(), self.width(), self.height())
+
+    def _path_pyramid(self):
+        """path_points için seyreltme piramidi (yol değişince yeniden kurulur)."""
+        if self._path_lod is None or self._path_lod.source is not self.path_points:
+            pts = self.path_points
+            # z=0.5 mm: yol STL yüzeyinin hemen üstünde
+            self._path_lod = PathPyramid(np.column_stack((pts, np.full(len(pts), 0.5))))
+            self._path_lod.source = pts
+        return self._path_lod
+
     # ---- Fare kontrolleri ----
 
     def mousePressEvent(self, event):
@@ -275,8 +371,10 @@ class GLViewer(QOpenGLWidget):
             # Pan
             self.pan_x += dx * 0.01
             self.pan_y -= dy * 0.01
+        if event.buttons() & (Qt.LeftButton | Qt.RightButton):
+            self._begin_interaction()
         self._last_pos = event.pos()
-        self.update()
+        self.request_update()
 
     def wheelEvent(self, event):
         # Zoom
@@ -286,7 +384,8 @@ class GLViewer(QOpenGLWidget):
             self.dist = 50.0
         if self.dist > 5000.0:
             self.dist = 5000.0
-        self.update()
+        self._begin_interaction()
+        self.request_update()
 
     # ---- Yardımcı: 3D metin ----
 
@@ -0,0 +1,869 @@
+# import_2d.py
+"""
+DXF / SVG dosyalarından doğrudan 2D kontur okuma.
+
+Düz contalar gibi zaten 2D çizilmiş parçalarda STL + üçgen birleştirme
+adımı gereksizdir. Bu modül çizimdeki çoklu çizgileri (polyline) okur,
+eğrileri kiriş toleransıyla (chord tolerance) doğru parçalarına böler ve
+kapalı konturları (N,2) dizileri olarak döndürür. Sonuç
+path_generator.generate_path_from_contour ile PathData'ya çevrilir.
+
+Desteklenen varlıklar:
+    DXF : LWPOLYLINE (bulge dahil), LINE, ARC, CIRCLE
+    SVG : path (M/L/H/V/C/S/Q/T/A/Z), polyline, polygon, line, rect,
+          circle, ellipse + transform nitelikleri
+
+DXF okuma grup kodu / değer çiftleri üzerinde NumPy ile yapılır; 100k+
+varlıklı dosyalar bir saniyenin altında okunur.
+"""
+
+import math
+import re
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+DEFAULT_CHORD_TOL = 0.01  # mm
+
+
+# ---------------------------------------------------------------------------
+#  Ortak yardımcılar
+# ---------------------------------------------------------------------------
+
+def _arc_segments(radius, sweep_rad, chord_tol):
+    """Yayı kiriş hatası <= chord_tol olacak şekilde bölen parça sayısı."""
+    radius = np.abs(np.asarray(radius, dtype=float))
+    sweep = np.abs(np.asarray(sweep_rad, dtype=float))
+    tol = max(float(chord_tol), 1e-9)
+    ratio = np.clip(1.0 - tol / np.maximum(radius, 1e-12), -1.0, 1.0)
+    step = 2.0 * np.arccos(ratio)
+    step = np.where(step <= 1e-9, 1e-9, step)
+    n = np.ceil(sweep / step).astype(np.int64)
+    return np.clip(n, 1, 100_000)
+
+
+def _flatten_arcs(cx, cy, r, a0, sweep, chord_tol, include_start=True):
+    """
+    Çok sayıda yayı tek seferde noktalara çevir.
+
+    a0, sweep radyan; sweep işaretli (+ saat yönü tersi).
+    Dönen: (points (K,2), counts (n_arc,)) – yay başına nokta sayıları.
+    """
+    cx = np.asarray(cx, dtype=float)
+    n_arc = len(cx)
+    if n_arc == 0:
+        return np.empty((0, 2)), np.zeros(0, dtype=np.int64)
+    nseg = _arc_segments(r, sweep, chord_tol)
+    first = 0 if include_start else 1
+    counts = nseg + 1 - first
+    owner = np.repeat(np.arange(n_arc), counts)
+    starts = np.cumsum(counts) - counts
+    k = np.arange(len(owner)) - starts[owner] + first
+    t = a0[owner] + sweep[owner] * (k / nseg[owner])
+    pts = np.column_stack((cx[owner] + r[owner] * np.cos(t),
+                           cy[owner] + r[owner] * np.sin(t)))
+    return pts, counts
+
+
+def _split_by_counts(points, counts):
+    ends = np.cumsum(counts)
+    return np.split(points, ends[:-1]) if len(counts) else []
+
+
+def _is_closed(pts, tol):
+    return len(pts) > 2 and np.hypot(*(pts[0] - pts[-1])) <= tol
+
+
+def _close_flat(points, counts):
+    """
+    Art arda dizilmiş konturları (points, counts) tek adımda kapat: ilk
+    noktası sonda olmayan her kontura ilk noktası eklenir (Shapely exterior
+    düzeni). counts >= 1.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    if len(counts) == 0:
+        return points, counts
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    need = (points[starts] != points[ends - 1]).any(axis=1)
+    points = np.insert(points, ends[need], points[starts[need]], axis=0)
+    return points, counts + need
+
+
+def polygon_area(pts: np.ndarray) -> float:
+    """Shoelace alanı (işaretli: saat yönü tersi pozitif)."""
+    x = pts[:, 0]
+    y = pts[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def chain_pieces(pieces, tol):
+    """
+    Açık parçaları (LINE, ARC, açık polyline) uç noktalarından zincirle.
+
+    Uç noktalar `tol` ızgarasına yuvarlanıp düğüm numarasına çevrilir
+    (vektörel); zincir yürüyüşü sadece tamsayı dizileri üzerinde yapılır.
+    Kapanan zincirler kontur olarak, kapanmayanlar açık çoklu çizgi
+    olarak döner.
+    """
+    n = len(pieces)
+    if n == 0:
+        return [], []
+    q = max(float(tol), 1e-9)
+
+    ends_xy = np.array([p[0] for p in pieces] + [p[-1] for p in pieces], dtype=float)
+    ij = np.round(ends_xy / q).astype(np.int64)
+    keys = (ij[:, 0] << 32) + (ij[:, 1] & 0xFFFFFFFF)
+    _, node = np.unique(keys, return_inverse=True)
+    node = node.ravel()
+    start_node = node[:n].tolist()
+    end_node = node[n:].tolist()
+
+    # Düğüm -> (parça, uç) kayıtları (CSR düzeni)
+    order = np.argsort(node, kind="stable")
+    ptr = np.searchsorted(node[order], np.arange(node.max() + 2)).tolist()
+    slot_piece = (order % n).tolist()
+    slot_end = (order >= n).astype(np.int64).tolist()
+
+    used = [False] * n
+    closed, open_ = [], []
+
+    for i in range(n):
+        if used[i]:
+            continue
+        used[i] = True
+        chain = [pieces[i]]
+        first = start_node[i]
+        k = end_node[i]
+        while k != first:
+            j = None
+            for s_ in range(ptr[k], ptr[k + 1]):
+                cand = slot_piece[s_]
+                if not used[cand]:
+                    j, end = cand, slot_end[s_]
+                    break
+            if j is None:
+                break
+            used[j] = True
+            if end == 0:
+                chain.append(pieces[j][1:])
+                k = end_node[j]
+            else:
+                chain.append(pieces[j][-2::-1])
+                k = start_node[j]
+        pts = np.vstack(chain)
+        if k == first and len(pts) > 2:
+            pts[-1] = pts[0]
+            closed.append(pts)
+        else:
+            open_.append(pts)
+    return closed, open_
+
+
+# ---------------------------------------------------------------------------
+#  DXF
+# ---------------------------------------------------------------------------
+
+def _group_codes(lines):
+    """
+    Grup kodu satırlarını int64'e çevir. Satırlar sabit genişlikli bayt
+    dizisi olarak tutulup rakam sütunları vektörel toplanır (astype(int)
+    satır satır ayrıştırdığından 1M+ satırda birkaç kat yavaştır).
+    """
+    raw = np.array(lines)
+    cols = raw.view(np.uint8).reshape(len(raw), -1)
+    codes = np.zeros(len(raw), dtype=np.int64)
+    bad = np.zeros(len(raw), dtype=bool)
+    for col in cols.T:
+        digit = col - np.uint8(48)
+        ok = digit <= 9
+        codes = np.where(ok, codes * 10 + digit, codes)
+        bad |= ~ok & (col != 0) & (col != 32) & (col != 9)
+    if bad.any():
+        line = 2 * int(np.argmax(bad)) + 1
+        raise RuntimeError(f"DXF grup kodu okunamadı (satır {line}).")
+    return codes
+
+
+def _floats(values, idx):
+    """values[idx] satırlarını float dizisine çevir."""
+    idx = np.asarray(idx).tolist()
+    return np.fromiter(map(float, map(values.__getitem__, idx)), float, len(idx))
+
+
+def _dxf_pairs(path):
+    """DXF'i (kodlar, değerler) olarak oku – sadece ENTITIES bölümü."""
+    with open(path, "rb") as f:
+        lines = f.read().splitlines()
+    n = len(lines) // 2 * 2
+    codes = _group_codes(lines[0:n:2])
+    values = lines[1:n:2]
+
+    # ENTITIES bölümünü bul (2 / ENTITIES ... 0 / ENDSEC)
+    start, stop = 0, len(values)
+    for i in np.flatnonzero(codes == 2):
+        if values[i].strip().upper() == b"ENTITIES":
+            start = int(i) + 1
+            for j in np.flatnonzero(codes[start:] == 0):
+                if values[start + j].strip().upper() == b"ENDSEC":
+                    stop = start + int(j)
+                    break
+            break
+    return codes[start:stop], values[start:stop]
+
+
+def _first_per_entity(codes, values, ent_id, ent_mask, code, n_ent):
+    """Her varlık için verilen grup kodunun ilk değeri (yoksa NaN)."""
+    sel = np.flatnonzero((codes == code) & ent_mask[ent_id])
+    out = np.full(n_ent, np.nan)
+    if len(sel):
+        ids, first = np.unique(ent_id[sel], return_index=True)
+        idx = sel[first]
+        out[ids] = _floats(values, idx)
+    return out
+
+
+def _dxf_lw_vertices(codes, values, ent_id, is_lw, n_ent):
+    """
+    LWPOLYLINE köşeleri: (vx, vy, bulge, owner, closed_ent).
+
+    owner köşenin varlık numarası, closed_ent varlık başına kapalılık
+    bayrağıdır (70 grup kodunun 1. biti).
+    """
+    m10 = np.flatnonzero((codes == 10) & is_lw[ent_id])
+    m20 = np.flatnonzero((codes == 20) & is_lw[ent_id])
+    if len(m20) != len(m10):
+        raise RuntimeError("DXF LWPOLYLINE köşe verisi bozuk (10/20 eşleşmiyor).")
+    vx = _floats(values, m10)
+    vy = _floats(values, m20)
+    owner = ent_id[m10]
+
+    # Bulge (42) kendinden önceki köşeye aittir
+    bulge = np.zeros(len(m10))
+    m42 = np.flatnonzero((codes == 42) & is_lw[ent_id])
+    if len(m42) and len(m10):
+        vidx = np.searchsorted(m10, m42) - 1
+        ok = vidx >= 0
+        bulge[vidx[ok]] = _floats(values, m42[ok])
+
+    flags = _first_per_entity(codes, values, ent_id, is_lw, 70, n_ent)
+    closed_ent = (np.nan_to_num(flags).astype(np.int64) & 1) == 1
+    return vx, vy, bulge, owner, closed_ent
+
+
+def _lw_segments(owner, closed_ent):
+    """
+    Segmentin bitiş köşesi: aynı polyline'daki sonraki köşe, kapalıysa
+    sondaki köşe ilk köşeye bağlanır. Dönen: (first_of, nxt, has_seg).
+    """
+    first_of = np.r_[True, owner[1:] != owner[:-1]]
+    last_of = np.r_[owner[1:] != owner[:-1], True]
+    start_idx = np.maximum.accumulate(np.where(first_of, np.arange(len(owner)), 0))
+    nxt = np.arange(1, len(owner) + 1)
+    nxt[last_of] = start_idx[last_of]
+    has_seg = ~last_of | closed_ent[owner]
+    return first_of, nxt, has_seg
+
+
+def _lw_areas(vx, vy, bulge, owner, closed_ent, n_ent):
+    """
+    Kapalı polyline'ların işaretli alanı, noktalara açmadan: köşelerin
+    shoelace alanı + bulge yaylarının daire kesmesi alanları r²(θ - sin θ)/2.
+    """
+    if len(owner) == 0:
+        return np.zeros(n_ent)
+    _, nxt, has_seg = _lw_segments(owner, closed_ent)
+    x1, y1 = vx[nxt], vy[nxt]
+    area = np.where(has_seg, 0.5 * (vx * y1 - x1 * vy), 0.0)
+    ai = np.flatnonzero(has_seg & (np.abs(bulge) > 1e-12))
+    theta = 4.0 * np.arctan(bulge[ai])
+    chord2 = (x1[ai] - vx[ai]) ** 2 + (y1[ai] - vy[ai]) ** 2
+    r2 = chord2 / (4.0 * np.sin(theta / 2.0) ** 2)
+    area[ai] += 0.5 * r2 * (theta - np.sin(theta))
+    return np.bincount(owner, weights=area, minlength=n_ent)
+
+
+def _lw_points(vx, vy, bulge, owner, closed_ent, chord_tol):
+    """
+    Polyline köşelerini (bulge yaylarıyla) noktalara çevir.
+
+    Dönen: (points (K,2), counts) – polyline'lar art arda dizilmiş halde;
+    counts polyline başına nokta sayısı.
+    """
+    if len(owner) == 0:
+        return np.empty((0, 2)), np.zeros(0, dtype=np.int64)
+    first_of, nxt, has_seg = _lw_segments(owner, closed_ent)
+
+    # Bulge'lı segmentleri yay olarak aç
+    arc = has_seg & (np.abs(bulge) > 1e-12)
+    ai = np.flatnonzero(arc)
+    extra_pts = np.empty((0, 2))
+    extra_cnt = np.zeros(len(owner), dtype=np.int64)
+    if len(ai):
+        x0, y0 = vx[ai], vy[ai]
+        x1, y1 = vx[nxt[ai]], vy[nxt[ai]]
+        theta = 4.0 * np.arctan(bulge[ai])
+        chord = np.hypot(x1 - x0, y1 - y0)
+        r = chord / (2.0 * np.abs(np.sin(theta / 2.0)))
+        # Merkez: kirişin ortasından dik doğrultuda
+        mx, my = (x0 + x1) / 2.0, (y0 + y1) / 2.0
+        d = r * np.cos(theta / 2.0)
+        ux, uy = -(y1 - y0) / chord, (x1 - x0) / chord
+        sgn = np.sign(theta)
+        cx, cy = mx + sgn * d * ux, my + sgn * d * uy
+        a0 = np.arctan2(y0 - cy, x0 - cx)
+        pts, cnt = _flatten_arcs(cx, cy, r, a0, theta, chord_tol,
+                                 include_start=False)
+        # Son nokta bitiş köşesidir; köşe zaten ayrıca eklenecek
+        keep = np.ones(len(pts), dtype=bool)
+        keep[np.cumsum(cnt) - 1] = False
+        extra_pts = pts[keep]
+        extra_cnt[ai] = cnt - 1
+
+    # Sıralama: her köşe, ardından (varsa) yay ara noktaları
+    per_vertex = 1 + extra_cnt
+    total = int(per_vertex.sum())
+    out = np.empty((total, 2))
+    vpos = np.cumsum(per_vertex) - per_vertex
+    out[vpos, 0] = vx
+    out[vpos, 1] = vy
+    if len(extra_pts):
+        mask = np.ones(total, dtype=bool)
+        mask[vpos] = False
+        out[mask] = extra_pts
+
+    return out, np.add.reduceat(per_vertex, np.flatnonzero(first_of))
+
+
+class _DxfContours:
+    """
+    DXF'teki kapalı konturlar.
+
+    Açık parçalar (LINE, ARC, açık LWPOLYLINE) okurken zincirlenir. Kapalı
+    LWPOLYLINE ve CIRCLE'lar ise ancak istendiğinde noktalara açılır: dış
+    kontur alanı köşelerden/yarıçaptan hesaplanıp sadece seçilen kontur
+    açılır; böylece 100k konturluk dosyada konturlar tek tek dizi olarak
+    üretilmez.
+    """
+
+    def __init__(self, path, chord_tol, join_tol):
+        self.chord_tol = chord_tol
+        codes, values = _dxf_pairs(path)
+
+        starts = np.flatnonzero(codes == 0)
+        if len(starts) == 0:
+            raise RuntimeError("DXF içinde varlık (entity) bulunamadı.")
+        types = np.array([values[i].strip().upper() for i in starts.tolist()])
+        n_ent = len(starts)
+        ent_id = np.cumsum(codes == 0) - 1
+        # ENTITIES başındaki olası başıboş satırlar
+        ent_id = np.maximum(ent_id, 0)
+
+        def mask_of(name):
+            return types == name
+
+        def column(code, mask):
+            return _first_per_entity(codes, values, ent_id, mask, code, n_ent)[mask]
+
+        is_lw = mask_of(b"LWPOLYLINE")
+        is_line = mask_of(b"LINE")
+        is_arc = mask_of(b"ARC")
+        is_circle = mask_of(b"CIRCLE")
+
+        pieces = []
+
+        vx, vy, bulge, owner, closed_ent = _dxf_lw_vertices(codes, values, ent_id, is_lw, n_ent)
+        is_cl = closed_ent[owner]
+        self.lw = (vx[is_cl], vy[is_cl], bulge[is_cl], owner[is_cl], closed_ent)
+        self.lw_ids = np.unique(owner[is_cl])
+        op = ~is_cl
+        pts, cnt = _lw_points(vx[op], vy[op], bulge[op], owner[op], closed_ent, chord_tol)
+        pieces.extend(p for p in _split_by_counts(pts, cnt) if len(p) > 1)
+
+        if is_line.any():
+            x0, y0 = column(10, is_line), column(20, is_line)
+            x1, y1 = column(11, is_line), column(21, is_line)
+            segs = np.stack((np.column_stack((x0, y0)), np.column_stack((x1, y1))), axis=1)
+            segs = segs[np.isfinite(segs).all(axis=(1, 2))]
+            pieces.extend(list(segs))
+
+        self.circles = np.empty((0, 3))
+        if is_circle.any():
+            self.circles = np.column_stack((column(10, is_circle), column(20, is_circle),
+                                            column(40, is_circle)))
+
+        if is_arc.any():
+            cx, cy, r = column(10, is_arc), column(20, is_arc), column(40, is_arc)
+            a0 = np.radians(column(50, is_arc))
+            sweep = np.mod(np.radians(column(51, is_arc)) - a0, 2.0 * np.pi)
+            sweep[sweep <= 1e-12] = 2.0 * np.pi
+            pts, cnt = _flatten_arcs(cx, cy, r, a0, sweep, chord_tol)
+            pieces.extend(_split_by_counts(pts, cnt))
+
+        self.chained, _ = chain_pieces(pieces, join_tol)
+        if len(self) == 0:
+            raise RuntimeError("DXF içinde kapalı kontur bulunamadı.")
+
+    def __len__(self):
+        return len(self.lw_ids) + len(self.circles) + len(self.chained)
+
+    def _points(self, lw_sel, circle_sel):
+        """Seçilen polyline köşeleri ve daireler -> kapatılmış (points, counts)."""
+        vx, vy, bulge, owner, closed_ent = self.lw
+        pts, cnt = _lw_points(vx[lw_sel], vy[lw_sel], bulge[lw_sel], owner[lw_sel],
+                              closed_ent, self.chord_tol)
+        cx, cy, r = self.circles[circle_sel].T
+        n = len(cx)
+        cpts, ccnt = _flatten_arcs(cx, cy, r, np.zeros(n), np.full(n, 2.0 * np.pi),
+                                   self.chord_tol)
+        if n:
+            ends = np.cumsum(ccnt)
+            cpts[ends - 1] = cpts[ends - ccnt]
+        return _close_flat(np.concatenate((pts, cpts)), np.concatenate((cnt, ccnt)))
+
+    def all(self):
+        """Tüm kapalı konturların listesi."""
+        points, counts = self._points(slice(None), slice(None))
+        return _split_by_counts(points, counts) + self.chained
+
+    def outer(self):
+        """En büyük alanlı kontur."""
+        vx, vy, bulge, owner, closed_ent = self.lw
+        lw_area = np.abs(_lw_areas(vx, vy, bulge, owner, closed_ent, len(closed_ent)))
+        circle_area = np.pi * self.circles[:, 2] ** 2
+        areas = np.concatenate((lw_area[self.lw_ids], circle_area,
+                                [abs(polygon_area(c)) for c in self.chained]))
+        k = int(np.argmax(areas))
+        if k < len(self.lw_ids):
+            points, _ = self._points(owner == self.lw_ids[k], slice(0, 0))
+            return points
+        k -= len(self.lw_ids)
+        if k < len(self.circles):
+            points, _ = self._points(np.zeros(len(owner), dtype=bool), slice(k, k + 1))
+            return points
+        return self.chained[k - len(self.circles)]
+
+
+def load_dxf_contours(path: str, chord_tol: float = DEFAULT_CHORD_TOL,
+                      join_tol: float | None = None):
+    """
+    DXF dosyasından kapalı konturları oku.
+
+    Dönen: kapalı konturların listesi, her biri (N,2) ve ilk nokta sonda
+    tekrar edilmiş halde.
+    """
+    if join_tol is None:
+        join_tol = max(chord_tol, 1e-4)
+    return _DxfContours(path, chord_tol, join_tol).all()
+
+
+def load_dxf_outer(path: str, chord_tol: float = DEFAULT_CHORD_TOL,
+                   join_tol: float | None = None):
+    """
+    DXF'in dış konturunu (en büyük alanlı) oku: (kontur, kontur sayısı).
+
+    Sadece seçilen kontur noktalara açılır.
+    """
+    if join_tol is None:
+        join_tol = max(chord_tol, 1e-4)
+    contours = _DxfContours(path, chord_tol, join_tol)
+    return contours.outer(), len(contours)
+
+
+# ---------------------------------------------------------------------------
+#  SVG
+# ---------------------------------------------------------------------------
+
+_SVG_TOKEN_RE = re.compile(
+    r"[MmLlHhVvCcSsQqTtAaZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+)
+_SVG_NUM_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_SVG_TRANSFORM_RE = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+
+_UNIT_MM = {"mm": 1.0, "cm": 10.0, "in": 25.4, "pt": 25.4 / 72.0,
+            "pc": 25.4 / 6.0, "px": 25.4 / 96.0, "": 25.4 / 96.0}
+
+_PARAM_COUNT = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4,
+                "Q": 4, "T": 2, "A": 7, "Z": 0}
+
+
+def _parse_length_mm(text):
+    if not text:
+        return None
+    m = re.match(r"\s*([-+]?[\d.eE+-]+)\s*([a-z%]*)", text)
+    if not m or m.group(2) == "%":
+        return None
+    return float(m.group(1)) * _UNIT_MM.get(m.group(2), _UNIT_MM["px"])
+
+
+def _parse_transform(text):
+    """SVG transform niteliğini 3x3 matrise çevir."""
+    M = np.eye(3)
+    if not text:
+        return M
+    for name, args in _SVG_TRANSFORM_RE.findall(text):
+        v = [float(a) for a in _SVG_NUM_RE.findall(args)]
+        T = np.eye(3)
+        if name == "matrix" and len(v) == 6:
+            T[:2, :] = [[v[0], v[2], v[4]], [v[1], v[3], v[5]]]
+        elif name == "translate":
+            T[0, 2] = v[0]
+            T[1, 2] = v[1] if len(v) > 1 else 0.0
+        elif name == "scale":
+            T[0, 0] = v[0]
+            T[1, 1] = v[1] if len(v) > 1 else v[0]
+        elif name == "rotate":
+            a = math.radians(v[0])
+            R = np.array([[math.cos(a), -math.sin(a), 0.0],
+                          [math.sin(a), math.cos(a), 0.0],
+                          [0.0, 0.0, 1.0]])
+            if len(v) == 3:
+                C = np.eye(3)
+                C[:2, 2] = v[1:3]
+                Ci = np.eye(3)
+                Ci[:2, 2] = [-v[1], -v[2]]
+                R = C @ R @ Ci
+            T = R
+        elif name == "skewX":
+            T[0, 1] = math.tan(math.radians(v[0]))
+        elif name == "skewY":
+            T[1, 0] = math.tan(math.radians(v[0]))
+        M = M @ T
+    return M
+
+
+class _SvgSegments:
+    """
+    Bir SVG belgesindeki tüm eğri segmentlerini toplar; düzleştirme
+    (flatten) her tür için toplu ve vektörel yapılır.
+    """
+
+    def __init__(self):
+        self.seg_id = 0
+        self.points = []     # (seg_id, (k,2)) doğrudan noktalar
+        self.cubics = []     # (seg_id, p0, p1, p2, p3)
+        self.quads = []      # (seg_id, p0, p1, p2)
+        self.subpaths = []   # (ilk seg_id, son seg_id, kapalı mı, matris)
+
+    def next_id(self):
+        self.seg_id += 1
+        return self.seg_id - 1
+
+    def flatten(self, chord_tol):
+        ids, blocks = [], []
+        for sid, pts in self.points:
+            ids.append(np.full(len(pts), sid))
+            blocks.append(pts)
+
+        tol = max(float(chord_tol), 1e-9)
+        for kind, data in (("c", self.cubics), ("q", self.quads)):
+            if not data:
+                continue
+            sid = np.array([d[0] for d in data])
+            P = np.array([d[1:] for d in data], dtype=float)  # (n,k,2)
+            if kind == "c":
+                d = np.maximum(
+                    np.linalg.norm(P[:, 0] - 2 * P[:, 1] + P[:, 2], axis=1),
+                    np.linalg.norm(P[:, 1] - 2 * P[:, 2] + P[:, 3], axis=1),
+                )
+                n = np.ceil(np.sqrt(0.75 * d / tol))
+            else:
+                d = np.linalg.norm(P[:, 0] - 2 * P[:, 1] + P[:, 2], axis=1)
+                n = np.ceil(np.sqrt(0.25 * d / tol))
+            n = np.clip(n, 1, 10_000).astype(np.int64)
+            owner = np.repeat(np.arange(len(sid)), n)
+            starts = np.cumsum(n) - n
+            t = ((np.arange(len(owner)) - starts[owner] + 1) / n[owner])[:, None]
+            s = 1.0 - t
+            Q = P[owner]
+            if kind == "c":
+                pts = (s ** 3 * Q[:, 0] + 3 * s * s * t * Q[:, 1]
+                       + 3 * s * t * t * Q[:, 2] + t ** 3 * Q[:, 3])
+            else:
+                pts = s * s * Q[:, 0] + 2 * s * t * Q[:, 1] + t * t * Q[:, 2]
+            ids.append(sid[owner])
+            blocks.append(pts)
+
+        if not blocks:
+            return []
+        all_ids = np.concatenate(ids)
+        all_pts = np.vstack(blocks)
+        order = np.argsort(all_ids, kind="stable")
+        all_ids = all_ids[order]
+        all_pts = all_pts[order]
+
+        out = []
+        for first, last, closed, M in self.subpaths:
+            a = np.searchsorted(all_ids, first, side="left")
+            b = np.searchsorted(all_ids, last, side="right")
+            pts = all_pts[a:b]
+            if len(pts) < 2:
+                continue
+            pts = pts @ M[:2, :2].T + M[:2, 2]
+            out.append((pts, closed))
+        return out
+
+
+def _svg_arc_points(p0, rx, ry, phi_deg, large, sweep, p1, chord_tol):
+    """SVG eliptik yayını (uç nokta parametreli) noktalara çevir (başlangıç hariç)."""
+    rx, ry = abs(rx), abs(ry)
+    if rx < 1e-12 or ry < 1e-12 or np.allclose(p0, p1):
+        return np.array([p1], dtype=float)
+    phi = math.radians(phi_deg)
+    c, s = math.cos(phi), math.sin(phi)
+    dx, dy = (p0[0] - p1[0]) / 2.0, (p0[1] - p1[1]) / 2.0
+    x1p, y1p = c * dx + s * dy, -s * dx + c * dy
+    lam = (x1p / rx) ** 2 + (y1p / ry) ** 2
+    if lam > 1.0:
+        rx *= math.sqrt(lam)
+        ry *= math.sqrt(lam)
+    num = rx * rx * ry * ry - rx * rx * y1p * y1p - ry * ry * x1p * x1p
+    den = rx * rx * y1p * y1p + ry * ry * x1p * x1p
+    coef = math.sqrt(max(0.0, num / den)) if den > 0 else 0.0
+    if large == sweep:
+        coef = -coef
+    cxp, cyp = coef * rx * y1p / ry, -coef * ry * x1p / rx
+    cx = c * cxp - s * cyp + (p0[0] + p1[0]) / 2.0
+    cy = s * cxp + c * cyp + (p0[1] + p1[1]) / 2.0
+    th1 = math.atan2((y1p - cyp) / ry, (x1p - cxp) / rx)
+    th2 = math.atan2((-y1p - cyp) / ry, (-x1p - cxp) / rx)
+    dth = th2 - th1
+    if sweep and dth < 0:
+        dth += 2 * math.pi
+    elif not sweep and dth > 0:
+        dth -= 2 * math.pi
+    n = int(_arc_segments(max(rx, ry), dth, chord_tol))
+    t = th1 + dth * np.arange(1, n + 1) / n
+    x = cx + rx * np.cos(t) * c - ry * np.sin(t) * s
+    y = cy + rx * np.cos(t) * s + ry * np.sin(t) * c
+    pts = np.column_stack((x, y))
+    pts[-1] = p1
+    return pts
+
+
+def _svg_path(d, segs, M, chord_tol):
+    tokens = _SVG_TOKEN_RE.findall(d or "")
+    i = 0
+    cmd = None
+    cur = np.zeros(2)
+    start = np.zeros(2)
+    last_ctrl = None
+    last_cmd = ""
+    first_seg = None
+
+    def begin(p):
+        nonlocal first_seg
+        sid = segs.next_id()
+        segs.points.append((sid, np.array([p], dtype=float)))
+        first_seg = sid
+
+    def end(closed):
+        nonlocal first_seg
+        if first_seg is not None and segs.seg_id - 1 > first_seg:
+            segs.subpaths.append((first_seg, segs.seg_id - 1, closed, M))
+        first_seg = None
+
+    while i < len(tokens):
+        tok = tokens[i]
+        if tok.isalpha():
+            cmd = tok
+            i += 1
+            if cmd in "Zz":
+                if first_seg is not None:
+                    if not np.allclose(cur, start):
+                        segs.points.append((segs.next_id(), start[None, :].copy()))
+                    end(True)
+                cur = start.copy()
+                last_cmd = "Z"
+                continue
+        if cmd is None:
+            break
+        up = cmd.upper()
+        k = _PARAM_COUNT[up]
+        if k == 0 or i + k > len(tokens):
+            break
+        try:
+            v = [float(t) for t in tokens[i:i + k]]
+        except ValueError:
+            break
+        i += k
+        rel = cmd.islower()
+        base = cur if rel else np.zeros(2)
+
+        if up == "M":
+            end(False)
+            cur = base + v[0:2]
+            start = cur.copy()
+            begin(cur)
+            # Ardından gelen koordinat çiftleri örtük L/l
+            cmd = "l" if rel else "L"
+            last_ctrl = None
+        elif up in "LHV":
+            if first_seg is None:
+                begin(cur)
+            if up == "L":
+                nxt = base + v[0:2]
+            elif up == "H":
+                nxt = np.array([(cur[0] if rel else 0.0) + v[0], cur[1]])
+            else:
+                nxt = np.array([cur[0], (cur[1] if rel else 0.0) + v[0]])
+            segs.points.append((segs.next_id(), nxt[None, :].copy()))
+            cur = nxt
+            last_ctrl = None
+        elif up in "CS":
+            if first_seg is None:
+                begin(cur)
+            if up == "C":
+                c1 = base + v[0:2]
+                c2 = base + v[2:4]
+                p = base + v[4:6]
+            else:
+                c1 = 2 * cur - last_ctrl if (last_ctrl is not None and last_cmd in "CS") else cur.copy()
+                c2 = base + v[0:2]
+                p = base + v[2:4]
+            segs.cubics.append((segs.next_id(), cur.copy(), c1, c2, p))
+            last_ctrl = c2
+            cur = p
+        elif up in "QT":
+            if first_seg is None:
+                begin(cur)
+            if up == "Q":
+                c1 = base + v[0:2]
+                p = base + v[2:4]
+            else:
+                c1 = 2 * cur - last_ctrl if (last_ctrl is not None and last_cmd in "QT") else cur.copy()
+                p = base + v[0:2]
+            segs.quads.append((segs.next_id(), cur.copy(), c1, p))
+            last_ctrl = c1
+            cur = p
+        elif up == "A":
+            if first_seg is None:
+                begin(cur)
+            p = base + v[5:7]
+            pts = _svg_arc_points(cur, v[0], v[1], v[2], bool(v[3]), bool(v[4]), p, chord_tol)
+            segs.points.append((segs.next_id(), pts))
+            cur = p
+            last_ctrl = None
+        last_cmd = up
+    end(False)
+
+
+def _svg_shape_points(tag, el):
+    """path dışındaki temel şekilleri nokta listesine çevir (kapalı mı?)."""
+    def g(name, default=0.0):
+        return float(el.get(name, default) or default)
+
+    if tag in ("polyline", "polygon"):
+        v = [float(t) for t in _SVG_NUM_RE.findall(el.get("points", ""))]
+        pts = np.array(v[:len(v) // 2 * 2], dtype=float).reshape(-1, 2)
+        return pts, tag == "polygon"
+    if tag == "line":
+        return np.array([[g("x1"), g("y1")], [g("x2"), g("y2")]]), False
+    if tag == "rect":
+        x, y, w, h = g("x"), g("y"), g("width"), g("height")
+        return np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]]), True
+    return None, False
+
+
+def load_svg_contours(path: str, chord_tol: float = DEFAULT_CHORD_TOL,
+                      join_tol: float | None = None):
+    """
+    SVG dosyasından kapalı konturları (mm cinsinden) oku.
+
+    Birim: kök <svg> width/height + viewBox'tan hesaplanır; yoksa
+    1 kullanıcı birimi = 1 px = 25.4/96 mm kabul edilir. SVG'nin Y ekseni
+    aşağı baktığı için Y çevrilir.
+    """
+    if join_tol is None:
+        join_tol = max(chord_tol, 1e-4)
+
+    tree = ET.parse(path)
+    root = tree.getroot()
+
+    # Kullanıcı birimi -> mm
+    scale = _UNIT_MM["px"]
+    vb = [float(t) for t in _SVG_NUM_RE.findall(root.get("viewBox", ""))]
+    width_mm = _parse_length_mm(root.get("width"))
+    if len(vb) == 4 and vb[2] > 0 and width_mm:
+        scale = width_mm / vb[2]
+    root_M = np.diag([scale, -scale, 1.0])
+    if len(vb) == 4:
+        root_M = root_M @ np.array([[1, 0, -vb[0]], [0, 1, -vb[1]], [0, 0, 1.0]])
+
+    # Kiriş toleransı kullanıcı biriminde
+    tol_user = chord_tol / max(scale, 1e-12)
+
+    segs = _SvgSegments()
+    extra = []  # (pts_mm, kapalı)
+
+    def walk(el, M):
+        M = M @ _parse_transform(el.get("transform"))
+        tag = el.tag.rsplit("}", 1)[-1]
+        if tag in ("defs", "clipPath", "mask", "symbol", "metadata"):
+            return
+        if tag == "path":
+            _svg_path(el.get("d"), segs, M, tol_user)
+        elif tag in ("circle", "ellipse"):
+            cx, cy = float(el.get("cx", 0) or 0), float(el.get("cy", 0) or 0)
+            if tag == "circle":
+                rx = ry = float(el.get("r", 0) or 0)
+            else:
+                rx, ry = float(el.get("rx", 0) or 0), float(el.get("ry", 0) or 0)
+            n = int(_arc_segments(max(rx, ry), 2 * np.pi, tol_user))
+            t = np.linspace(0.0, 2 * np.pi, n + 1)
+            pts = np.column_stack((cx + rx * np.cos(t), cy + ry * np.sin(t)))
+            extra.append((pts @ M[:2, :2].T + M[:2, 2], True))
+        else:
+            pts, closed = _svg_shape_points(tag, el)
+            if pts is not None and len(pts) > 1:
+                extra.append((pts @ M[:2, :2].T + M[:2, 2], closed))
+        for child in el:
+            walk(child, M)
+
+    walk(root, root_M)
+
+    closed, pieces = [], []
+    for pts, is_closed in segs.flatten(tol_user) + extra:
+        if is_closed or _is_closed(pts, join_tol):
+            closed.append(pts)
+        else:
+            pieces.append(pts)
+    if closed:
+        points, counts = _close_flat(np.concatenate(closed), [len(p) for p in closed])
+        closed = _split_by_counts(points, counts)
+
+    chained, _ = chain_pieces(pieces, join_tol)
+    closed.extend(chained)
+    if not closed:
+        raise RuntimeError("SVG içinde kapalı kontur bulunamadı.")
+    return closed
+
+
+# ---------------------------------------------------------------------------
+#  Ortak giriş noktası
+# ---------------------------------------------------------------------------
+
+def load_2d_contours(path: str, chord_tol: float = DEFAULT_CHORD_TOL):
+    """Uzantıya göre DXF ya da SVG okuyucuyu çağır."""
+    ext = path.rsplit(".", 1)[-1].lower() if "." in path else ""
+    if ext == "dxf":
+        return load_dxf_contours(path, chord_tol=chord_tol)
+    if ext == "svg":
+        return load_svg_contours(path, chord_tol=chord_tol)
+    raise ValueError(f"Desteklenmeyen 2D dosya türü: .{ext}")
+
+
+def load_2d_outer(path: str, chord_tol: float = DEFAULT_CHORD_TOL):
+    """Çizimin dış konturu ve toplam kontur sayısı: (kontur, sayı)."""
+    ext = path.rsplit(".", 1)[-1].lower() if "." in path else ""
+    if ext == "dxf":
+        return load_dxf_outer(path, chord_tol=chord_tol)
+    contours = load_2d_contours(path, chord_tol=chord_tol)
+    return outer_contour(contours), len(contours)
+
+
+def outer_contour(contours):
+    """En büyük alanlı konturu seç (mesh yolundaki dış kontur seçimiyle aynı)."""
+    if not contours:
+        raise RuntimeError("Kontur bulunamadı.")
+    return max(contours, key=lambda c: abs(polygon_area(c)))
@@ -0,0 +1,130 @@
+# knife_glyphs.py
+"""
+Yol boyunca bıçak yönü işaretleri (A ekseni açısını kontrol etmek için).
+
+Yol üzerinde eşit yay uzunluğu aralıklarıyla örnekler alınır: konum +
+o noktadaki A açısı. Her örnek, bıçak yönünü gösteren ince bir üçgene
+(uç bıçak yönünde) dönüştürülür. Sabit işlevli OpenGL'de örnekleme
+(instancing) olmadığından üçgenler NumPy ile bir kez, vektörel olarak
+üretilir; bütün seviyeler tek bir köşe tamponuna art arda yazılır ve
+bir seviye tek glDrawArrays çağrısıyla çizilir.
+
+Seviyeler: k. seviyede örnek aralığı spacing * 2**k ve işaret boyu
+aralığın LENGTH_RATIO katıdır. Çizimde ekrandaki aralığı SPACING_PX
+pikselden küçük olmayan en sık seviye seçilir; yakınlaştıkça işaretler
+sıklaşır, ekrandaki boyları yaklaşık sabit kalır.
+"""
+
+import numpy as np
+
+import gl_resources
+from path_lod import pixel_size
+
+# En sık seviyedeki en fazla işaret sayısı ve en küçük aralık (mm)
+MAX_GLYPHS = 20000
+MIN_SPACING = 0.5
+# Ekranda iki işaret arası en az (piksel)
+SPACING_PX = 28.0
+# İşaret boyu / aralık, işaret genişliği / boy
+LENGTH_RATIO = 0.7
+WIDTH_RATIO = 0.3
+# İşaretlerin yolun üstüne kaldırılması (mm)
+LIFT_Z = 0.3
+
+
+def glyph_triangles(positions, angles_deg, length, width_ratio: float = WIDTH_RATIO):
+    """
+    Her (konum, açı) için bir üçgen: uç açı yönünde length/2 ileride, taban
+    length/2 geride. Dönen: (3*M, 3) float32 köşe dizisi (GL_TRIANGLES).
+
+    length tek sayı ya da (M,) dizi olabilir.
+    """
+    p = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    a = np.radians(np.asarray(angles_deg, dtype=np.float64).reshape(-1))
+    half = 0.5 * np.broadcast_to(np.asarray(length, dtype=np.float64), a.shape)
+    d = np.column_stack((np.cos(a), np.sin(a), np.zeros_like(a))) * half[:, None]
+    n = np.column_stack((-d[:, 1], d[:, 0], np.zeros_like(a))) * width_ratio
+    out = np.empty((len(p), 3, 3), dtype=np.float32)
+    out[:, 0] = p + d
+    out[:, 1] = p - d + n
+    out[:, 2] = p - d - n
+    return out.reshape(-1, 3)
+
+
+def sample_path(points, angles_deg, spacing: float, cum=None):
+    """
+    Yol üzerinde spacing (mm) aralıklı örnekler. Dönen: (konumlar (K,3),
+    açılar (K,)); açı, örneğin düştüğü segmentin bitiş noktasınınkidir.
+    cum: noktalara kadar birikimli yay uzunluğu (verilmezse hesaplanır).
+    """
+    pts = np.asarray(points, dtype=np.float64)
+    if cum is None:
+        cum = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(pts, axis=0), axis=1))))
+    seg = np.diff(cum)
+    s = np.arange(0.0, cum[-1], spacing)
+    i = np.clip(np.searchsorted(cum, s, side="right"), 1, len(pts) - 1)
+    t = (s - cum[i - 1]) / np.where(seg[i - 1] > 0, seg[i - 1], 1.0)
+    pos = pts[i - 1] + (pts[i] - pts[i - 1]) * t[:, None]
+    return pos, np.asarray(angles_deg, dtype=np.float64)[i]
+
+
+def tangent_angles(points) -> np.ndarray:
+    """A açısı yoksa: her noktaya gelen segmentin XY yönü (derece)."""
+    d = np.diff(np.asarray(points, dtype=np.float64)[:, :2], axis=0)
+    ang = np.degrees(np.arctan2(d[:, 1], d[:, 0]))
+    return np.concatenate((ang[:1], ang)) if len(ang) else np.zeros(len(points))
+
+
+class KnifeGlyphs:
+    """
+    Yolun bıçak yönü işaretleri.
+
+    vertices : (V,3) float32, bütün seviyelerin üçgenleri art arda
+    levels   : [(ilk köşe, köşe sayısı, aralık mm), ...] sıktan seyreğe
+    """
+
+    def __init__(self, points, angles_deg=None):
+        self.key = gl_resources.new_key()
+        pts = np.asarray(points, dtype=np.float64)
+        if angles_deg is None or len(angles_deg) != len(pts):
+            angles_deg = tangent_angles(pts)
+        self.lo = pts.min(axis=0) if len(pts) else np.zeros(3)
+        self.hi = pts.max(axis=0) if len(pts) else np.zeros(3)
+        self.source = None
+        self.drawn_level = 0
+
+        cum = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(pts, axis=0), axis=1))))
+        total = float(cum[-1])
+        parts, self.levels = [], []
+        first = 0
+        spacing = max(total / MAX_GLYPHS, MIN_SPACING)
+        lifted = pts + (0.0, 0.0, LIFT_Z)
+        while total > 0 and total / spacing >= 2:
+            pos, ang = sample_path(lifted, angles_deg, spacing, cum)
+            tri = glyph_triangles(pos, ang, LENGTH_RATIO * spacing)
+            parts.append(tri)
+            self.levels.append((first, len(tri), spacing))
+            first += len(tri)
+            spacing *= 2.0
+        self.vertices = (np.concatenate(parts) if parts
+                         else np.zeros((0, 3), dtype=np.float32))
+
+    def __len__(self) -> int:
+        """En sık seviyedeki işaret sayısı."""
+        return self.levels[0][1] // 3 if self.levels else 0
+
+    def level_for_pixel(self, pixel_mm: float, spacing_px: float = SPACING_PX) -> int:
+        """Ekrandaki aralığı spacing_px'ten küçük olmayan en sık seviye."""
+        for k, (_first, _count, spacing) in enumerate(self.levels):
+            if spacing >= pixel_mm * spacing_px:
+                return k
+        return len(self.levels) - 1
+
+    def draw(self, user: str, spacing_px: float = SPACING_PX) -> int:
+        """Ekran ölçeğine uygun seviyeyi tek çağrıyla çiz; dönen: üçgen sayısı."""
+        if not self.levels:
+            return 0
+        self.drawn_level = self.level_for_pixel(pixel_size(self.lo, self.hi), spacing_px)
+        first, count, _spacing = self.levels[self.drawn_level]
+        gl_resources.draw_triangle_range(self, first, count, user)
+        return count // 3
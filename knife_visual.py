@@ -16,8 +16,15 @@ def estimate_visual_length(points_xy, scale=0.1):
     return max(5.0, d*scale)
 
 def draw_knife_gl_3d(base_xyz, angle_deg, length, lift_z=10.0):
-    # placeholder
-    return
+    # Tek bıçak işareti (yol boyunca toplu çizim: knife_glyphs.KnifeGlyphs)
+    from OpenGL.GL import glBegin, glEnd, glVertex3f, GL_TRIANGLES
+    from knife_glyphs import glyph_triangles
+    x,y,z=base_xyz
+    tri=glyph_triangles([(x,y,z+lift_z)],[angle_deg],length)
+    glBegin(GL_TRIANGLES)
+    for v in tri:
+        glVertex3f(*v)
+    glEnd()
 
 def draw_knife_2d_matplotlib(ax, base_xy, angle_deg, length, color='orange'):
     x,y=base_xy
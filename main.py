@@ -1,5 +1,7 @@
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt
 from main_window import MainWindow
+import logging
 import sys
 
 # Uygulama versiyon bilgisi
@@ -10,6 +12,12 @@ def main():
     # Versiyon bilgisini konsola yaz
     print(f"TangentialCAM {__version__} başlatılıyor...")
 
+    # Yükleme / üretim aşama sürelerini konsola yaz
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    # Model ve 3D önizleme görüntüleyicileri mesh tamponlarını paylaşır
+    # (gl_resources); QApplication'dan önce ayarlanmalı
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     win = MainWindow()
 
@@ -1,14 +1,21 @@
+import os
+
 from PyQt5.QtWidgets import (
     QMainWindow,
     QWidget,
     QVBoxLayout,
     QTabWidget,
+    QFileDialog,
+    QMessageBox,
 )
 
 from tab_model import ModelTab
 from tab_preview import PreviewTab
 from tab_preview3d import Preview3DTab
-from stl_loader import make_transform_matrix, apply_transform
+from stl_loader import make_transform_matrix
+from gl_resources import SharedMesh, memory_report_text
+from mesh_cache import cached_content_hash
+from project_file import PROJECT_EXT, save_project, load_project
 
 # Opsiyonel G-kod sekmesi
 try:
@@ -29,6 +36,8 @@ class MainWindow(QMainWindow):
 
         # Dahili durum
         self._mesh = None          # Trimesh veya None
+        self._shared_mesh = None   # GPU'da paylaşılan mesh (gl_resources.SharedMesh)
+        self._mesh_path = None     # Seçilen STL dosyasının yolu (akışlı mod için)
         self._path_data = None     # Yol verisi (en az .xy içeren)
 
         # G54 parça orjini modu (Model sekmesinden seçilecek)
@@ -69,14 +78,55 @@ class MainWindow(QMainWindow):
             self.tabs.addTab(self.gcode_tab, "G-kodu Önizleme")
         self.tabs.addTab(self.preview3d_tab, "3D Önizleme")
 
+        self._build_menu()
+
+    def _build_menu(self):
+        menu = self.menuBar().addMenu("Dosya")
+        act_open = menu.addAction("Proje Aç...")
+        act_open.triggered.connect(self.on_open_project)
+        act_save = menu.addAction("Proje Kaydet...")
+        act_save.triggered.connect(self.on_save_project)
+
+        menu = self.menuBar().addMenu("Görünüm")
+        act_gpu = menu.addAction("GPU Bellek Raporu...")
+        act_gpu.triggered.connect(self.on_gpu_report)
+        act_stats = menu.addAction("Performans Göstergesi")
+        act_stats.setCheckable(True)
+        act_stats.setShortcut("F3")
+        act_stats.toggled.connect(self.on_toggle_render_stats)
+
+    def on_gpu_report(self):
+        """Paylaşılan OpenGL tamponlarının boyutu ve paylaşımın kazancı."""
+        QMessageBox.information(self, "GPU Bellek Raporu", memory_report_text())
+
+    def on_toggle_render_stats(self, visible: bool):
+        """3D görüntüleyicilerde FPS / kare süresi göstergesini aç / kapat."""
+        self.model_tab.viewer.set_stats_overlay(visible)
+        self.preview3d_tab.viewer.set_stats_overlay(visible)
+
+    def closeEvent(self, event):
+        """Arka plan iş parçacıkları sekmelerle birlikte silinmeden önce durdurulur."""
+        self.model_tab.stop_workers()
+        if self.gcode_tab is not None:
+            self.gcode_tab.stop_workers()
+        super().closeEvent(event)
+
     # ------------------------------------------------------------------
     #  ModelTab <-> PathTab için ARAYÜZ
     # ------------------------------------------------------------------
 
     # ---- Mesh erişimi ----
-    def set_mesh(self, mesh):
-        """ModelTab STL yüklediğinde çağrılır."""
+    def set_mesh(self, mesh, shared_mesh=None):
+        """
+        ModelTab STL yüklediğinde çağrılır.
+
+        shared_mesh: Model görüntüleyicinin kullandığı SharedMesh; 3D
+        önizleme aynı GPU tamponlarını kullanır (verilmezse mesh'ten kurulur).
+        """
         self._mesh = mesh
+        if shared_mesh is None and mesh is not None:
+            shared_mesh = SharedMesh(mesh.vertices, mesh.faces, mesh.face_normals)
+        self._shared_mesh = shared_mesh
 
         # 3D önizleme sekmesine dönüştürülmüş mesh'i gönder
         self._update_preview3d_mesh()
@@ -85,6 +135,14 @@ class MainWindow(QMainWindow):
         """Yol üretim kodu mesh'e ihtiyaç duyduğunda buradan alır."""
         return self._mesh
 
+    def set_mesh_path(self, path):
+        """ModelTab STL dosyası seçildiğinde çağrılır (yükleme başarısız olsa da)."""
+        self._mesh_path = path
+
+    def get_mesh_path(self):
+        """Akışlı yol üretimi mesh yerine doğrudan dosyayı okur."""
+        return self._mesh_path
+
     # ---- Dönüş / ölçek parametreleri ----
     def set_transform_params(self, rot_x, rot_y, rot_z, scale):
         """Model sekmesi STL'i döndürdüğünde / ölçeklediğinde çağrılır."""
@@ -104,28 +162,27 @@ class MainWindow(QMainWindow):
         }
 
     def _update_preview3d_mesh(self):
-        """3D önizleme sekmesinde, yol ile aynı transform uygulanmış mesh'i çizer."""
-        if self.preview3d_tab is None or self._mesh is None:
-            return
-
-        try:
-            M = make_transform_matrix(
-                self.last_rot_x, self.last_rot_y, self.last_rot_z, self.last_scale
-            )
-            t_mesh = apply_transform(self._mesh, M)
-        except Exception:
-            # Mesh ya da matris hatası durumunda sessizce geç
+        """
+        3D önizleme sekmesinde mesh'i yol ile aynı dönüşümle çizer. Köşeler
+        kopyalanıp dönüştürülmez; dönüşüm model matrisi olarak verilir.
+        """
+        if self.preview3d_tab is None or self._shared_mesh is None:
             return
 
-        self.preview3d_tab.set_mesh(t_mesh)
+        M = make_transform_matrix(
+            self.last_rot_x, self.last_rot_y, self.last_rot_z, self.last_scale
+        )
+        self.preview3d_tab.set_mesh(self._shared_mesh, M)
 
     # ---- Yol / path verisi ----
-    def set_path_data(self, path_data):
+    def set_path_data(self, path_data, show_preview: bool = True):
         """
         Yol Üret sekmesi hesapladığı yolu buraya verir.
         path_data:
            - tab_path içinde oluşturulan nesne,
              en azından .xy alanı (Nx2 koordinatlar) bulunmalı.
+        Önizleme sekmeleri yolu görünür olduklarında çizer.
+        show_preview=False: sekme değiştirilmez (proje açılışı).
         """
         self._path_data = path_data
 
@@ -146,7 +203,7 @@ class MainWindow(QMainWindow):
             self.gcode_tab.set_path_data(path_data)
 
         # Yol üretildikten sonra otomatik olarak 2D Yol Önizleme'ye geç
-        if self.preview_tab is not None:
+        if show_preview and self.preview_tab is not None:
             self.tabs.setCurrentWidget(self.preview_tab)
 
     def get_path_data(self):
@@ -162,6 +219,20 @@ class MainWindow(QMainWindow):
             # Ve sekmeyi öne getir
             self.tabs.setCurrentWidget(self.gcode_tab)
 
+    def set_gcode_job(self, job):
+        """
+        G-kodu sekmesine yol verisinden program kuran fonksiyonu gönder
+        (job(compact=...) -> GCodeProgram); çıktı seçenekleri sekmede seçilir.
+        """
+        if self.gcode_tab is not None:
+            self.gcode_tab.set_gcode_job(job)
+            self.tabs.setCurrentWidget(self.gcode_tab)
+
+    def show_backplot(self, parsed):
+        """Okunmuş bir G-kodu dosyasını (gcode_parser.ParsedGCode) 3D önizlemede çiz."""
+        if self.preview3d_tab is not None:
+            self.preview3d_tab.set_backplot(parsed)
+
     def set_origin_mode(self, mode: str):
         """Model sekmesinden seçilen G54 parça orjini modunu kaydeder."""
         self.origin_mode = str(mode)
@@ -169,3 +240,114 @@ class MainWindow(QMainWindow):
     def get_origin_mode(self) -> str:
         """G-kodu üretimi sırasında kullanılan G54 parça orjini modu."""
         return getattr(self, "origin_mode", "bottom_left")
+
+    # ------------------------------------------------------------------
+    #  Proje dosyası (.tcam)
+    # ------------------------------------------------------------------
+
+    def on_save_project(self):
+        fname, _ = QFileDialog.getSaveFileName(
+            self, "Proje kaydet", "",
+            f"TangentialCAM Projesi (*{PROJECT_EXT});;Tüm Dosyalar (*)",
+        )
+        if not fname:
+            return
+        if not fname.lower().endswith(PROJECT_EXT):
+            fname += PROJECT_EXT
+        try:
+            self.save_project_to(fname)
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Proje kaydedilemedi: {e}")
+
+    def save_project_to(self, fname: str):
+        """Mevcut GUI durumunu (ayarlar + üretilmiş yol + G-kodu) kaydet."""
+        stl_path = self.get_mesh_path()
+        stl_hash = None
+        if stl_path and os.path.exists(stl_path):
+            stl_hash = cached_content_hash(stl_path)
+
+        gcode_chunks = None
+        if self.gcode_tab is not None and hasattr(self.gcode_tab, "iter_gcode_chunks"):
+            gcode_chunks = self.gcode_tab.iter_gcode_chunks()
+
+        save_project(
+            fname,
+            stl_path=stl_path,
+            stl_hash=stl_hash,
+            transform=self.get_transform_params(),
+            origin_mode=self.get_origin_mode(),
+            path_settings=self.model_tab.path_panel.get_settings(),
+            gcode_settings={
+                "preview_2d": self.preview_tab.get_settings(),
+                "preview_3d": self.preview3d_tab.get_settings(),
+                "output": (self.gcode_tab.get_settings()
+                           if self.gcode_tab is not None else {}),
+            },
+            path_data=self._path_data,
+            gcode_chunks=gcode_chunks,
+        )
+
+    def on_open_project(self):
+        fname, _ = QFileDialog.getOpenFileName(
+            self, "Proje aç", "",
+            f"TangentialCAM Projesi (*{PROJECT_EXT});;Tüm Dosyalar (*)",
+        )
+        if not fname:
+            return
+        try:
+            self.open_project(fname)
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Proje açılamadı: {e}")
+
+    def open_project(self, fname: str):
+        """
+        Projeyi yeniden hesaplama yapmadan geri yükle.
+
+        Yol dizileri ve G-kodu tembel okunur; STL arka planda (önbellekten)
+        yüklenir ve kayıtlı dönüşüm yükleme bitince uygulanır.
+        """
+        proj = load_project(fname)
+
+        self.model_tab.path_panel.apply_settings(proj.path_settings)
+        gs = proj.gcode_settings
+        self.preview_tab.apply_settings(gs.get("preview_2d", {}))
+        self.preview3d_tab.apply_settings(gs.get("preview_3d", {}))
+        if self.gcode_tab is not None:
+            self.gcode_tab.apply_settings(gs.get("output", {}))
+        self.model_tab.set_origin_mode(proj.origin_mode)
+
+        t = proj.transform
+        if t:
+            self.set_transform_params(
+                t.get("rot_x", 0.0), t.get("rot_y", 0.0),
+                t.get("rot_z", 0.0), t.get("scale", 1.0),
+            )
+
+        stl_path = proj.stl_path
+        if stl_path and os.path.exists(stl_path):
+            if proj.stl_hash and cached_content_hash(stl_path) != proj.stl_hash:
+                QMessageBox.warning(
+                    self, "Uyarı",
+                    "STL dosyası proje kaydedildikten sonra değişmiş.\n"
+                    "Kayıtlı yol eski modele ait olabilir.",
+                )
+            self.model_tab.load_mesh(stl_path, transform=t)
+        elif stl_path:
+            QMessageBox.warning(self, "Uyarı", f"STL dosyası bulunamadı:\n{stl_path}")
+            self.set_mesh_path(stl_path)
+
+        # Tembel PathData: dizileri sekmeler görünür olunca okunur
+        path_data = proj.path_data()
+        if path_data is not None:
+            self.set_path_data(path_data, show_preview=False)
+
+        if self.gcode_tab is not None:
+            if proj.has_gcode():
+                self.gcode_tab.set_gcode_program(
+                    proj.iter_gcode,
+                    "G-kodu projede kayıtlı (sekme açılınca yüklenecek).",
+                )
+            else:
+                self.gcode_tab.set_gcode_text("")
+
+        self.setWindowFilePath(fname)
@@ -0,0 +1,182 @@
+# mesh_cache.py
+"""
+Büyük STL'lerin tekrar açılışını hızlandıran ikili (binary) mesh önbelleği.
+
+Her STL için önbellek klasöründe ayrı bir alt klasör tutulur:
+
+    vertices.npy  : (N,3) float32, kaynaştırılmış (welded) köşeler
+    faces.npy     : (M,3) int32 üçgen indisleri
+    normals.npy   : (M,3) float32 yüzey normalleri
+    bounds.npy    : (2,3) float32 [min, max]
+    meta.json     : kaynak dosya yolu, boyutu, mtime ve içerik hash'i
+
+Diziler `mmap_mode='r'` ile açılır; okuma neredeyse anlıktır ve aynı
+dosyayı açan süreçler sayfaları işletim sistemi üzerinden paylaşır.
+
+Anahtar: dosya yolu + boyut + mtime + içerik hash'i. Boyut ve mtime
+tutuyorsa hash hesaplanmaz; sadece mtime değişmişse (ör. dosya kopyalandı)
+içerik hash'i karşılaştırılır, aynıysa önbellek yine kullanılır.
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+import trimesh
+
+from stl_loader import load_stl
+
+log = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+CACHE_DIR = os.environ.get(
+    "TANGENTIALCAM_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "TangentialCAM", "mesh"),
+)
+
+_ARRAYS = ("vertices", "faces", "normals", "bounds")
+
+
+def _entry_dir(path: str) -> str:
+    key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:20]
+    return os.path.join(CACHE_DIR, key)
+
+
+def file_content_hash(path: str, block_size: int = 4 << 20) -> str:
+    """Dosya içeriğinin BLAKE2b özeti (blok blok okunur)."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            h.update(block)
+    return h.hexdigest()
+
+
+def _read_meta(entry: str):
+    try:
+        with open(os.path.join(entry, "meta.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(entry: str, meta: dict):
+    tmp = os.path.join(entry, "meta.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1)
+    os.replace(tmp, os.path.join(entry, "meta.json"))
+
+
+def cached_content_hash(path: str) -> str:
+    """Önbellekte dosya değişmemiş görünüyorsa kayıtlı hash'i, yoksa yenisini döndür."""
+    meta = _read_meta(_entry_dir(path))
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if (meta and meta.get("size") == st.st_size
+            and meta.get("mtime_ns") == st.st_mtime_ns and meta.get("content_hash")):
+        return meta["content_hash"]
+    return file_content_hash(path)
+
+
+def load_cached_arrays(path: str):
+    """
+    Geçerli önbellek varsa dizileri (mmap, salt-okunur) sözlük olarak döndür.
+    Yoksa ya da kaynak dosya değişmişse None döner.
+    """
+    entry = _entry_dir(path)
+    meta = _read_meta(entry)
+    if not meta or meta.get("version") != CACHE_VERSION:
+        return None
+
+    st = os.stat(path)
+    if meta.get("size") != st.st_size:
+        return None
+    if meta.get("mtime_ns") != st.st_mtime_ns:
+        # Dosyaya dokunulmuş ama içerik aynı olabilir
+        if meta.get("content_hash") != file_content_hash(path):
+            return None
+        meta["mtime_ns"] = st.st_mtime_ns
+        try:
+            _write_meta(entry, meta)
+        except OSError:
+            pass
+
+    try:
+        arrays = {
+            name: np.load(os.path.join(entry, name + ".npy"), mmap_mode="r")
+            for name in _ARRAYS
+        }
+    except (OSError, ValueError):
+        return None
+    return arrays
+
+
+def store_mesh(path: str, mesh: trimesh.Trimesh, content_hash: str | None = None):
+    """Yüklenmiş mesh'i önbelleğe yaz. Hata olursa sessizce geç (önbellek opsiyonel)."""
+    if len(mesh.vertices) == 0 or len(mesh.faces) == 0:
+        # Boş mesh'in sınırları yok; önbelleğe almaya değmez
+        return
+    entry = _entry_dir(path)
+    try:
+        os.makedirs(entry, exist_ok=True)
+        st = os.stat(path)
+        if content_hash is None:
+            content_hash = file_content_hash(path)
+
+        verts = np.ascontiguousarray(mesh.vertices, dtype=np.float32)
+        arrays = {
+            "vertices": verts,
+            "faces": np.ascontiguousarray(mesh.faces, dtype=np.int32),
+            "normals": np.ascontiguousarray(mesh.face_normals, dtype=np.float32),
+            "bounds": np.array([verts.min(axis=0), verts.max(axis=0)],
+                               dtype=np.float32),
+        }
+        # meta.json en son yazılır; yarım kalan yazım geçersiz sayılır
+        if os.path.exists(os.path.join(entry, "meta.json")):
+            os.remove(os.path.join(entry, "meta.json"))
+        for name, arr in arrays.items():
+            tmp = os.path.join(entry, name + ".tmp.npy")
+            np.save(tmp, arr)
+            os.replace(tmp, os.path.join(entry, name + ".npy"))
+
+        _write_meta(entry, {
+            "version": CACHE_VERSION,
+            "source": os.path.abspath(path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "content_hash": content_hash,
+        })
+    except (OSError, ValueError) as e:
+        log.warning("Mesh önbelleği yazılamadı: %s", e)
+
+
+def mesh_from_arrays(arrays: dict) -> trimesh.Trimesh:
+    """Önbellek dizilerinden (yeniden işlemeden) Trimesh oluştur."""
+    return trimesh.Trimesh(
+        vertices=arrays["vertices"],
+        faces=arrays["faces"],
+        face_normals=arrays["normals"],
+        process=False,
+    )
+
+
+def load_stl_cached(path: str):
+    """
+    load_stl'in önbellekli hali.
+
+    Dönen: (mesh, cache_hit)
+    """
+    arrays = load_cached_arrays(path)
+    if arrays is not None:
+        return mesh_from_arrays(arrays), True
+
+    mesh = load_stl(path)
+    store_mesh(path, mesh)
+    return mesh, False
@@ -0,0 +1,74 @@
+# mesh_edges.py
+"""
+Tel kafes (wireframe) çizimi için mesh kenarları.
+
+Her üçgen 3 kenar verir; komşu üçgenlerin ortak kenarı iki kez çıkar.
+Kenarlar (küçük indis, büyük indis) olarak sıralanıp tek bir int64
+anahtara paketlenir ve anahtarlar sıralanarak tekilleştirilir; böylece
+her kenar bir kez çizilir (kapalı bir yüzeyde satır sayısı yarıya iner).
+
+Keskin kenar modunda sadece iki yüzü arasındaki açı (dihedral) eşiği
+aşan kenarlar, açık kenarlar (tek yüzlü) ve ikiden fazla yüzü olan
+kenarlar tutulur; pürüzsüz taramalarda çizgi sayısı on kat ve daha çok
+azalır.
+"""
+
+import numpy as np
+
+# Keskin kenar modunda varsayılan açı eşiği (derece)
+FEATURE_ANGLE_DEG = 30.0
+
+
+def _edge_keys(faces):
+    f = np.asarray(faces, dtype=np.int64)
+    m = len(f)
+    e = np.concatenate((f[:, [0, 1]], f[:, [1, 2]], f[:, [2, 0]]))
+    e.sort(axis=1)
+    n_vertices = int(f.max()) + 1 if m else 1
+    return e[:, 0] * n_vertices + e[:, 1], n_vertices, m
+
+
+def unique_edges(faces) -> np.ndarray:
+    """Tekil kenarlar (E,2) uint32; GL_LINES indis tamponu olarak kullanılabilir."""
+    keys, n_vertices, _m = _edge_keys(faces)
+    keys = np.unique(keys)
+    return np.column_stack((keys // n_vertices, keys % n_vertices)).astype(np.uint32)
+
+
+def face_normals(vertices, faces) -> np.ndarray:
+    v = np.asarray(vertices, dtype=np.float64)
+    f = np.asarray(faces, dtype=np.int64)
+    n = np.cross(v[f[:, 1]] - v[f[:, 0]], v[f[:, 2]] - v[f[:, 0]])
+    lens = np.linalg.norm(n, axis=1)
+    lens[lens == 0] = 1.0
+    return n / lens[:, None]
+
+
+def feature_edges(vertices, faces, angle_deg: float = FEATURE_ANGLE_DEG,
+                  normals=None) -> np.ndarray:
+    """
+    Keskin kenarlar (E,2) uint32: yüz normalleri arasındaki açı angle_deg'i
+    aşan, tek yüzlü ya da ikiden fazla yüzlü kenarlar.
+
+    normals: (M,3) birim yüz normalleri (yoksa hesaplanır).
+    """
+    keys, n_vertices, m = _edge_keys(faces)
+    if m == 0:
+        return np.zeros((0, 2), dtype=np.uint32)
+    if normals is None:
+        normals = face_normals(vertices, faces)
+    normals = np.asarray(normals, dtype=np.float64)
+
+    order = np.argsort(keys, kind="stable")
+    sk = keys[order]
+    first = np.flatnonzero(np.concatenate(([True], sk[1:] != sk[:-1])))
+    counts = np.diff(np.append(first, len(sk)))
+
+    # k. kenar satırı (k % m). üçgene aittir
+    face_a = order[first] % m
+    face_b = order[np.minimum(first + 1, len(sk) - 1)] % m
+    cos = np.einsum("ij,ij->i", normals[face_a], normals[face_b])
+    keep = (counts != 2) | (cos < np.cos(np.radians(angle_deg)))
+
+    k = sk[first[keep]]
+    return np.column_stack((k // n_vertices, k % n_vertices)).astype(np.uint32)
@@ -0,0 +1,137 @@
+# mesh_load_worker.py
+"""
+STL'i arka plan iş parçacığında yükleyen QThread.
+
+Aşamalar (her biri ayrı ilerleme sinyali ve süre logu üretir):
+    cache        : önbellek kontrolü (varsa diziler mmap ile açılır)
+    read         : dosyayı oku (önbellek yoksa)
+    weld         : köşeleri kaynaştır (önbellekte zaten kaynaşmış)
+    normals      : yüzey normalleri
+    upload-prep  : viewer için float32 diziler + sınırlar
+
+GUI iş parçacığına sadece sonuç (MeshLoadResult) teslim edilir; viewer'a
+aktarım ve MainWindow bildirimi orada yapılır.
+"""
+
+import logging
+import time
+
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from mesh_cache import load_cached_arrays, mesh_from_arrays, store_mesh
+from stl_loader import load_stl
+
+log = logging.getLogger(__name__)
+
+
+class LoadCancelled(Exception):
+    """Kullanıcı başka dosya seçtiğinde yükleme iptal edilir."""
+
+
+class MeshLoadResult:
+    """Arka planda hazırlanan mesh ve viewer dizileri."""
+
+    def __init__(self, path, mesh, vertices, faces, face_normals, bounds,
+                 cache_hit, timings):
+        self.path = path
+        self.mesh = mesh                  # trimesh.Trimesh
+        self.vertices = vertices          # (N,3) float32
+        self.faces = faces                # (M,3) int32
+        self.face_normals = face_normals  # (M,3) float32
+        self.bounds = bounds              # (2,3) [min, max]
+        self.cache_hit = bool(cache_hit)
+        self.timings = timings            # {aşama: saniye}
+
+
+class MeshLoadWorker(QThread):
+    """Tek bir STL dosyasını yükler; iptal edilebilir."""
+
+    progress = pyqtSignal(int, str)
+    loaded = pyqtSignal(object)   # MeshLoadResult
+    failed = pyqtSignal(str)
+
+    def __init__(self, path: str, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self._cancelled = False
+        self._timings = {}
+
+    def cancel(self):
+        """Bir sonraki aşama sınırında yüklemeyi durdur."""
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def _phase(self, name: str, pct: int, msg: str, fn):
+        if self._cancelled:
+            raise LoadCancelled()
+        self.progress.emit(pct, msg)
+        t0 = time.perf_counter()
+        result = fn()
+        dt = time.perf_counter() - t0
+        self._timings[name] = dt
+        log.info("STL yükleme [%s] %.3f s (%s)", name, dt, self.path)
+        return result
+
+    def run(self):
+        try:
+            result = self._load()
+        except LoadCancelled:
+            log.info("STL yükleme iptal edildi (%s)", self.path)
+            return
+        except Exception as e:
+            if not self._cancelled:
+                self.failed.emit(str(e))
+            return
+        if not self._cancelled:
+            self.progress.emit(100, "Hazır")
+            self.loaded.emit(result)
+
+    def _load(self) -> MeshLoadResult:
+        arrays = self._phase(
+            "cache", 5, "Önbellek kontrol ediliyor...",
+            lambda: load_cached_arrays(self.path),
+        )
+        cache_hit = arrays is not None
+
+        if cache_hit:
+            mesh = mesh_from_arrays(arrays)
+            self._timings["weld"] = 0.0
+        else:
+            mesh = self._phase(
+                "read", 10, "STL okunuyor...",
+                lambda: load_stl(self.path, process=False),
+            )
+            self._phase("weld", 45, "Köşeler kaynaştırılıyor...", mesh.process)
+
+        normals = self._phase(
+            "normals", 65, "Normaller hesaplanıyor...",
+            lambda: np.asarray(mesh.face_normals, dtype=np.float32),
+        )
+
+        if not cache_hit:
+            # Bir sonraki açılış için önbelleğe yaz (iptal edildiyse gereksiz)
+            if self._cancelled:
+                raise LoadCancelled()
+            store_mesh(self.path, mesh)
+
+        def prep():
+            verts = np.ascontiguousarray(mesh.vertices, dtype=np.float32)
+            faces = np.ascontiguousarray(mesh.faces, dtype=np.int32)
+            if cache_hit:
+                bounds = np.asarray(arrays["bounds"], dtype=float)
+            else:
+                bounds = np.array([verts.min(axis=0), verts.max(axis=0)],
+                                  dtype=float)
+            return verts, faces, bounds
+
+        verts, faces, bounds = self._phase(
+            "upload-prep", 85, "Görüntü verisi hazırlanıyor...", prep
+        )
+
+        return MeshLoadResult(
+            self.path, mesh, verts, faces, normals, bounds,
+            cache_hit, dict(self._timings),
+        )
@@ -0,0 +1,163 @@
+# mesh_lod.py
+"""
+Etkileşimli görüntüleme için basitleştirilmiş mesh seviyeleri (LOD).
+
+Köşe kümeleme (vertex clustering): uzay `cell` boyutlu küplere bölünür,
+aynı küpe düşen köşeler ağırlık merkezlerinde birleştirilir, köşeleri
+birleşip çizgiye / noktaya dönüşen üçgenler ve tekrarlanan üçgenler
+atılır. Tamamı NumPy ile yapılır (np.unique + np.bincount); bir köşenin
+yer değiştirmesi en fazla bir küp köşegeni kadardır.
+
+Hedef üçgen sayısı için küp boyutu yüzey alanından tahmin edilir (yüzeyi
+kesen her küp ~2 üçgen verir) ve birkaç adımda düzeltilir.
+
+Eşikler tangential_cam.ini [lod] bölümünden okunur:
+
+    build_above       = 500000        bu kadar üçgenden büyük mesh'ler için LOD üret
+    levels            = 250000, 60000 seviyelerin hedef üçgen sayıları
+    interactive_faces = 250000        döndürürken çizilebilecek en fazla üçgen
+    idle_ms           = 300           etkileşim bitince tam çözünürlüğe geçiş (ms)
+"""
+
+import logging
+import time
+
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from settings import load_section
+
+log = logging.getLogger(__name__)
+
+DEFAULT_LOD = {
+    "build_above": 500_000,
+    "levels": (250_000, 60_000),
+    "interactive_faces": 250_000,
+    "idle_ms": 300,
+}
+
+
+def lod_settings() -> dict:
+    """INI [lod] bölümü (eksik anahtarlar için DEFAULT_LOD)."""
+    data = dict(DEFAULT_LOD)
+    section = load_section("lod")
+    try:
+        for key in ("build_above", "interactive_faces", "idle_ms"):
+            if key in section:
+                data[key] = int(float(section[key]))
+        if "levels" in section:
+            data["levels"] = tuple(int(float(x)) for x in section["levels"].split(",")
+                                   if x.strip())
+    except ValueError:
+        log.warning("tangential_cam.ini [lod] okunamadı, varsayılanlar kullanılıyor")
+        return dict(DEFAULT_LOD)
+    return data
+
+
+def cluster_vertices(vertices, faces, cell: float):
+    """
+    Köşe kümeleme ile basitleştir.
+
+    Dönen: (vertices (K,3) float32, faces (F,3) uint32)
+    """
+    v = np.asarray(vertices, dtype=np.float64)
+    f = np.asarray(faces, dtype=np.int64)
+    q = np.floor((v - v.min(axis=0)) / float(cell)).astype(np.int64)
+    dims = q.max(axis=0) + 1
+    key = (q[:, 0] * dims[1] + q[:, 1]) * dims[2] + q[:, 2]
+    _uniq, inv = np.unique(key, return_inverse=True)
+    inv = inv.ravel()
+    n = int(inv.max()) + 1 if len(inv) else 0
+
+    f = inv[f]
+    ok = (f[:, 0] != f[:, 1]) & (f[:, 1] != f[:, 2]) & (f[:, 0] != f[:, 2])
+    f = f[ok]
+    if len(f):
+        # Aynı üç kümeyi birleştiren üçgenlerden ilki kalır (yönü korunur)
+        s = np.sort(f, axis=1)
+        if n < 2_000_000:
+            packed = (s[:, 0] * n + s[:, 1]) * n + s[:, 2]
+            _k, first = np.unique(packed, return_index=True)
+        else:
+            _k, first = np.unique(s, axis=0, return_index=True)
+        f = f[np.sort(first)]
+
+    # Sadece kalan üçgenlerin kullandığı kümeler: ağırlık merkezleri
+    used = np.zeros(n, dtype=bool)
+    used[f.ravel()] = True
+    remap = np.cumsum(used) - 1
+    cnt = np.bincount(inv, minlength=n)
+    centers = np.column_stack([np.bincount(inv, weights=v[:, k], minlength=n)
+                               for k in range(3)]) / np.maximum(cnt, 1)[:, None]
+    return (centers[used].astype(np.float32),
+            remap[f].astype(np.uint32).reshape(-1, 3))
+
+
+def surface_area(vertices, faces) -> float:
+    v = np.asarray(vertices, dtype=np.float64)
+    f = np.asarray(faces, dtype=np.int64)
+    n = np.cross(v[f[:, 1]] - v[f[:, 0]], v[f[:, 2]] - v[f[:, 0]])
+    return 0.5 * float(np.linalg.norm(n, axis=1).sum())
+
+
+def simplify_to(vertices, faces, target_faces: int, tries: int = 4):
+    """
+    Yaklaşık target_faces üçgenli basitleştirilmiş mesh.
+
+    Dönen: (vertices, faces, cell)
+    """
+    area = surface_area(vertices, faces)
+    cell = np.sqrt(2.0 * max(area, 1e-12) / max(int(target_faces), 1))
+    best = None
+    for _ in range(tries):
+        sv, sf = cluster_vertices(vertices, faces, cell)
+        if best is None or abs(len(sf) - target_faces) < abs(len(best[1]) - target_faces):
+            best = (sv, sf, cell)
+        ratio = len(sf) / float(target_faces)
+        if 0.8 <= ratio <= 1.2 or len(sf) == 0:
+            break
+        cell *= np.sqrt(ratio)
+    return best
+
+
+def build_lods(vertices, faces, levels=None, build_above=None) -> list:
+    """
+    Mesh'ten küçük LOD seviyeleri: [(vertices, faces, cell), ...] (ayrıntılıdan
+    kabaya). Mesh build_above'dan küçükse ya da hedef mesh'ten büyükse
+    seviye üretilmez.
+    """
+    cfg = lod_settings()
+    levels = cfg["levels"] if levels is None else levels
+    build_above = cfg["build_above"] if build_above is None else build_above
+    n_faces = len(faces)
+    if n_faces <= build_above:
+        return []
+    out = []
+    for target in sorted(levels, reverse=True):
+        if target >= n_faces:
+            continue
+        t0 = time.perf_counter()
+        sv, sf, cell = simplify_to(vertices, faces, target)
+        log.info("LOD %d üçgen -> %d (hücre %.3f mm) %.2f s",
+                 n_faces, len(sf), cell, time.perf_counter() - t0)
+        if len(sf):
+            out.append((sv, sf, cell))
+    return out
+
+
+class LodBuildWorker(QThread):
+    """LOD seviyelerini arka planda üretir; sonuç GUI iş parçacığında mesh'e bağlanır."""
+
+    built = pyqtSignal(object, object)   # (kaynak mesh, [(vertices, faces, cell), ...])
+
+    def __init__(self, mesh, parent=None):
+        super().__init__(parent)
+        self.mesh = mesh
+
+    def run(self):
+        try:
+            lods = build_lods(self.mesh.vertices, self.mesh.faces)
+        except Exception as e:
+            log.warning("LOD üretilemedi: %s", e)
+            lods = []
+        self.built.emit(self.mesh, lods)
@@ -0,0 +1,178 @@
+# path_colors.py
+"""
+Yolu bir özniteliğe göre renklendirme (sorunlu yerleri bulmak için).
+
+Modlar (nokta başına değer, NumPy ile bir kez hesaplanır):
+
+    z          takım Z'si (mm)
+    a_rate     A ekseni açısal hızı (derece/s): noktaya gelen segmentteki
+               |dA|, segmentin besleme planındaki (yoksa sabit) beslemeyle
+               geçilme süresine bölünür
+    feed       besleme planı (mm/dk, PathData.feed)
+    deviation  kontur sapması (mm): seyreltilmiş yolun, seyreltilmeden
+               önceki kontura (PathData.outline) en büyük uzaklığı; nokta
+               komşu iki segmentin büyüğünü alır
+
+Değerler 2-98. yüzdelik aralığına göre mavi -> yeşil -> sarı -> kırmızı
+renge (uint8) çevrilir. 3D önizleme her modun renklerini ayrı bir renk
+tamponuna yükler; mod değiştirmek sadece bağlanan tamponu değiştirir.
+"""
+
+import numpy as np
+
+# (ayar adı, etiket, birim)
+COLOR_MODES = (
+    ("flat", "Renk: düz", ""),
+    ("z", "Renk: Z derinliği", "mm"),
+    ("a_rate", "Renk: A hızı", "°/s"),
+    ("feed", "Renk: besleme", "mm/dk"),
+    ("deviation", "Renk: kontur sapması", "mm"),
+)
+
+# Besleme planı yoksa kullanılan besleme (mm/dk)
+DEFAULT_FEED = 2000.0
+
+# Renk skalası durakları: mavi, camgöbeği, yeşil, sarı, kırmızı
+_STOPS = np.array([
+    [40, 60, 220],
+    [0, 170, 220],
+    [40, 190, 60],
+    [240, 200, 0],
+    [220, 30, 30],
+], dtype=float)
+
+
+def a_rate(xy, angles, feed=None, default_feed: float = DEFAULT_FEED) -> np.ndarray:
+    """Nokta başına A hızı (derece/s); 0. nokta 1.'ninkini alır."""
+    xy = np.asarray(xy, dtype=float)
+    n = len(xy)
+    if n < 2:
+        return np.zeros(n)
+    length = np.hypot(*np.diff(xy[:, :2], axis=0).T)
+    f = np.full(n - 1, float(default_feed)) if feed is None else np.asarray(feed, dtype=float)[1:]
+    f = np.where(f > 0, f, default_feed)
+    dt = length / (f / 60.0)
+    dA = np.abs(np.diff(np.asarray(angles, dtype=float)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(dt > 0, dA / dt, 0.0)
+    return np.concatenate((rate[:1], rate))
+
+
+def outline_deviation(xy_geom, outline, step: int) -> np.ndarray:
+    """
+    Nokta başına kontur sapması (mm). xy_geom[i] = outline[i*step] kabul
+    edilir; kontur noktası j, (j // step). segmentin kirişine ölçülür.
+    """
+    p = np.asarray(xy_geom, dtype=float)[:, :2]
+    q = np.asarray(outline, dtype=float)[:, :2]
+    n, step = len(p), int(step)
+    if n < 2 or len(q) == 0 or step < 1:
+        return np.zeros(n)
+    # xy_geom = outline[::step] olduğundan len(q) <= n*step: kontur son
+    # noktayla n*step'e tamamlanıp (n, step) kovalara bölünür; kova i,
+    # i -> i+1 segmentine (sonuncusu p[n-1] noktasına) ölçülür
+    q = q[:n * step]
+    if len(q) < n * step:
+        q = np.concatenate((q, np.repeat(q[-1:], n * step - len(q), axis=0)))
+    q = q.reshape(n, step, 2)
+    ab = np.zeros_like(p)
+    ab[:-1] = p[1:] - p[:-1]
+    aq = q - p[:, None, :]
+    denom = np.einsum("ij,ij->i", ab, ab)
+    t = np.einsum("ikj,ij->ik", aq, ab) / np.where(denom > 0, denom, 1.0)[:, None]
+    d = aq - ab[:, None, :] * np.clip(t, 0.0, 1.0)[:, :, None]
+    seg = np.sqrt(np.einsum("ikj,ikj->ik", d, d).max(axis=1))
+    # Nokta i: (i-1 -> i) ve (i -> i+1) segmentlerinin büyüğü
+    return np.maximum(seg, np.concatenate(([0.0], seg[:-1])))
+
+
+def attribute(mode: str, path_data, points, angles=None):
+    """
+    mode için nokta başına değerler (N,) ya da veri yoksa None.
+
+    points: (N,3) çizilen noktalar; path_data: PathData (feed / outline /
+    xy_geom için, yoksa None).
+    """
+    n = len(points)
+    if mode == "z":
+        return np.asarray(points, dtype=float)[:, 2]
+    feed = getattr(path_data, "feed", None)
+    if feed is not None and len(feed) != n:
+        feed = None
+    if mode == "a_rate":
+        if angles is None or len(angles) != n:
+            return None
+        return a_rate(points, angles, feed)
+    if mode == "feed":
+        return None if feed is None else np.asarray(feed, dtype=float)
+    if mode == "deviation":
+        outline = getattr(path_data, "outline", None)
+        geom = getattr(path_data, "xy_geom", None)
+        step = int(getattr(path_data, "meta", {}).get("outline_step", 0) or 0)
+        if outline is None or geom is None or len(geom) != n or step < 1:
+            return None
+        return outline_deviation(geom, outline, step)
+    return None
+
+
+def value_range(values):
+    """Renk skalasının uçları: 2-98. yüzdelik (aykırı değerler skalayı ezmesin)."""
+    lo, hi = np.percentile(values, (2, 98)) if len(values) else (0.0, 0.0)
+    if hi <= lo:
+        hi = lo + 1e-9
+    return float(lo), float(hi)
+
+
+def _lut(size: int = 256) -> np.ndarray:
+    """Duraklar arasında doğrusal ara değerli (size,3) uint8 renk tablosu."""
+    x = np.linspace(0.0, len(_STOPS) - 1, size)
+    i = np.minimum(x.astype(int), len(_STOPS) - 2)
+    f = (x - i)[:, None]
+    return (_STOPS[i] * (1.0 - f) + _STOPS[i + 1] * f).astype(np.uint8)
+
+
+_LUT = _lut()
+
+
+def colormap(values, lo: float, hi: float) -> np.ndarray:
+    """Değerler -> (N,3) uint8 renk (mavi düşük, kırmızı yüksek)."""
+    u = (np.asarray(values, dtype=float) - lo) * ((len(_LUT) - 1) / (hi - lo))
+    return _LUT[np.clip(u, 0, len(_LUT) - 1).astype(np.intp)]
+
+
+class PathColors:
+    """
+    Bir yolun renk kolonları; her mod ilk istendiğinde bir kez hesaplanır.
+
+    colors[mod] = ((N,3) uint8, (alt, üst)) ya da veri yoksa None
+    """
+
+    def __init__(self, path_data, points, angles=None):
+        self.path_data = path_data
+        self.points = points
+        self.angles = angles
+        self.colors = {}
+
+    def get(self, mode: str):
+        if mode == "flat":
+            return None
+        if mode not in self.colors:
+            values = attribute(mode, self.path_data, self.points, self.angles)
+            if values is None:
+                self.colors[mode] = None
+            else:
+                lo, hi = value_range(values)
+                self.colors[mode] = (colormap(values, lo, hi), (lo, hi))
+        return self.colors[mode]
+
+
+def legend_text(mode: str, color_range) -> str:
+    """Renk skalası açıklaması ("" düz modda, veri yoksa uyarı)."""
+    if mode == "flat":
+        return ""
+    label, unit = next((lbl, u) for key, lbl, u in COLOR_MODES if key == mode)
+    name = label.split(": ", 1)[-1]
+    if color_range is None:
+        return f"{name}: veri yok"
+    lo, hi = color_range
+    return f"{name}: {lo:.3g} (mavi) … {hi:.3g} {unit} (kırmızı)"
@@ -1,9 +1,12 @@
+import os
+
 import numpy as np
+import shapely
 import trimesh
 from shapely.geometry import Polygon
 from shapely.ops import unary_union
 
-from stl_loader import apply_transform
+from stl_loader import apply_transform, iter_stl_triangles
 
 
 class PathData:
@@ -21,6 +24,14 @@ class PathData:
         Modelin kendi koordinat sistemindeki XY (mesh ile çakışan kontur).
     meta : dict
         İlave bilgileri tutmak için serbest sözlük.
+    feed : (N,) array veya None
+        Segment başına besleme (mm/dk), bkz. feed_schedule.
+    lift : (N,) bool array veya None
+        Segmentten önce bıçak kaldırılıp döndürülecek mi.
+    outline : (K,2) array veya None
+        Seyreltilmeden önceki kontur (xy_geom ile aynı koordinatlarda);
+        xy_geom[i] = outline[i * meta["outline_step"]]. Kontur sapması
+        renklendirmesi için (path_colors).
     """
     def __init__(self, xy: np.ndarray, z: np.ndarray, angles: np.ndarray,
                  xy_geom: np.ndarray = None, meta: dict | None = None):
@@ -31,6 +42,17 @@ class PathData:
         self.xy_geom = xy if xy_geom is None else xy_geom
         # İlave bilgiler (ör: rotate_90, offsetler vs.)
         self.meta = {} if meta is None else dict(meta)
+        # Besleme planı kolonları (feed_schedule.apply_feed_schedule)
+        self.feed = None
+        self.lift = None
+        self.outline = None
+
+
+def _decimate(xy: np.ndarray, step: int):
+    """Kontur noktalarını seyrelt; dönen: (seyreltilmiş kontur, gerçek adım)."""
+    if step > 1 and len(xy) > step:
+        return xy[::step], int(step)
+    return xy, 1
 
 
 def _get_concave_outline_xy(mesh: trimesh.Trimesh,
@@ -118,27 +140,19 @@ def _compute_angles(contour_xy: np.ndarray,
                     progress=lambda p, msg="": None) -> np.ndarray:
     """
     XY kontur boyunca tangential bıçak açısını (derece) hesaplar.
+
+    Her noktada eğim (p_next - p_prev) doğrultusudur; kontur kapalı kabul
+    edilir (ilk noktanın öncesi son nokta).
     """
     N = len(contour_xy)
     if N < 2:
         raise RuntimeError("Açı hesaplamak için yeterli nokta yok.")
 
-    angles = np.zeros(N, dtype=float)
-
-    for i in range(N):
-        p_prev = contour_xy[i - 1]
-        p_curr = contour_xy[i]
-        p_next = contour_xy[(i + 1) % N]
-
-        # Merkezdeki noktanın eğimi: (p_next - p_prev)
-        v = p_next - p_prev
-        dx, dy = v[0], v[1]
-        angle = np.degrees(np.arctan2(dy, dx))
-        angles[i] = angle
-
-        if i % 200 == 0:
-            progress(70 + 15 * i / max(1, N), "Açı hesaplanıyor...")
+    xy = np.asarray(contour_xy, dtype=float)
+    v = np.roll(xy, -1, axis=0) - np.roll(xy, 1, axis=0)
+    angles = np.degrees(np.arctan2(v[:, 1], v[:, 0]))
 
+    progress(85, "Açı hesaplandı.")
     return angles
 
 
@@ -200,9 +214,10 @@ def generate_tangential_path(
     t_mesh = apply_transform(mesh, transform_matrix)
 
     progress(15, "Concave kontur hesaplanıyor...")
-    contour_xy = _get_concave_outline_xy(
-        t_mesh, min_area=min_area, step_decimate=step_decimate, progress=progress
+    outline_xy = _get_concave_outline_xy(
+        t_mesh, min_area=min_area, step_decimate=1, progress=progress
     )
+    contour_xy, step = _decimate(outline_xy, step_decimate)
 
     progress(40, "Z örnekleniyor...")
     zs = _sample_surface_z(t_mesh, contour_xy, progress=progress)
@@ -222,10 +237,278 @@ def generate_tangential_path(
     meta = {
         "rotate_90": bool(rotate_90_for_machine),
         "depth": float(depth),
+        "outline_step": step,
+    }
+
+    progress(100, "Yol hazır.")
+    path = PathData(xy_rot, z_tool, angles_rot, xy_geom=contour_xy, meta=meta)
+    path.outline = outline_xy
+    return path
+
+
+def generate_path_from_contour(
+    contour_xy: np.ndarray,
+    step_decimate: int,
+    rotate_90_for_machine: bool,
+    depth_from_top: float,
+    surface_z: float = 0.0,
+    meta: dict | None = None,
+    progress_callback=lambda p, msg="": None,
+) -> PathData:
+    """
+    Hazır bir 2D konturdan (DXF/SVG) doğrudan PathData üret.
+
+    Mesh işlemeye gerek yoktur: yüzey düz kabul edilir (Z = surface_z),
+    açı hesabı ve makine hizalaması mesh yolundakiyle aynıdır.
+    """
+
+    def progress(p, msg=""):
+        progress_callback(int(p), msg)
+
+    outline_xy = np.asarray(contour_xy, dtype=float)[:, :2]
+    contour_xy, step = _decimate(outline_xy, step_decimate)
+
+    depth = abs(depth_from_top)
+    z_tool = np.full(len(contour_xy), float(surface_z) - depth)
+
+    progress(70, "Açı (A ekseni) hesaplanıyor...")
+    angles = _compute_angles(contour_xy, progress=progress)
+
+    progress(85, "Makine eksenlerine göre hizalanıyor...")
+    xy_rot, angles_rot = _rotate_for_machine(
+        contour_xy, angles, rotate_90=rotate_90_for_machine
+    )
+
+    info = {
+        "rotate_90": bool(rotate_90_for_machine),
+        "depth": float(depth),
+        "outline_step": step,
+    }
+    if meta:
+        info.update(meta)
+
+    progress(100, "Yol hazır.")
+    path = PathData(xy_rot, z_tool, angles_rot, xy_geom=contour_xy, meta=info)
+    path.outline = outline_xy
+    return path
+
+
+class _HeightField:
+    """
+    Akışlı mod için seyrek yükseklik haritası.
+
+    XY düzlemi `cell` boyutlu hücrelere bölünür; her dolu hücrede o hücreye
+    düşen köşelerin en büyük Z'si tutulur. Sınırlar önceden bilinmediği için
+    hücreler (ix, iy) anahtarıyla sıralı diziler halinde saklanır; bellek
+    üçgen sayısıyla değil dolu hücre sayısıyla orantılıdır.
+    """
+
+    def __init__(self, cell: float = 1.0):
+        self.cell = float(cell) if cell > 0 else 1.0
+        self.keys = np.empty(0, dtype=np.int64)
+        self.zmax = np.empty(0, dtype=float)
+
+    def _key(self, xy: np.ndarray) -> np.ndarray:
+        ij = np.floor(xy / self.cell).astype(np.int64)
+        # 2^31 hücreyi aşan parçalar pratikte yok; iki indeksi tek int64'e paketle
+        return (ij[:, 0] << 32) + (ij[:, 1] & 0xFFFFFFFF)
+
+    def add_points(self, xyz: np.ndarray):
+        keys = np.concatenate((self.keys, self._key(xyz[:, :2])))
+        zs = np.concatenate((self.zmax, xyz[:, 2]))
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        zs = zs[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        self.keys = keys[starts]
+        self.zmax = np.maximum.reduceat(zs, starts)
+
+    def sample(self, xy: np.ndarray) -> np.ndarray:
+        """
+        XY noktalarının hücre Z'sini döndür. Kendi hücresi boş olan noktalar
+        için komşu 8 hücrenin en büyüğü alınır; hücresi dolu noktalar
+        komşulardan etkilenmez.
+        """
+        out = np.full(len(xy), np.nan)
+        if len(self.keys) == 0:
+            return out
+        ij = np.floor(xy / self.cell).astype(np.int64)
+        out[:] = self._lookup(ij)
+        miss = np.flatnonzero(np.isnan(out))
+        if len(miss):
+            near = np.full(len(miss), np.nan)
+            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1),
+                           (-1, -1), (-1, 1), (1, -1), (1, 1)):
+                near = np.fmax(near, self._lookup(ij[miss] + (dx, dy)))
+            out[miss] = near
+        return out
+
+    def _lookup(self, ij: np.ndarray) -> np.ndarray:
+        """(ix, iy) hücrelerinin Z'si (boş hücre: NaN)."""
+        k = (ij[:, 0] << 32) + (ij[:, 1] & 0xFFFFFFFF)
+        pos = np.minimum(np.searchsorted(self.keys, k), len(self.keys) - 1)
+        return np.where(self.keys[pos] == k, self.zmax[pos], np.nan)
+
+
+def _stream_outline_and_heightfield(stl_path: str,
+                                    transform_matrix: np.ndarray,
+                                    chunk_size: int,
+                                    z_cell: float,
+                                    cull_back_faces: bool,
+                                    progress=lambda p, msg="": None):
+    """
+    STL'i parça parça okuyup XY dış konturunu ve yükseklik haritasını kurar.
+
+    Her parçada: transform -> dejenere (ve istenirse aşağı bakan) üçgenleri
+    ele -> XY'ye projele -> parçayı kendi içinde birleştir -> biriken
+    konturla birleştir. Biriken konturun delikleri her adımda doldurulur;
+    sonuçta sadece dış sınır kullanıldığından bu, karmaşıklığı sınırlı tutar.
+    """
+    M = np.asarray(transform_matrix, dtype=float)
+    R = M[:3, :3]
+    t = M[:3, 3]
+
+    hf = _HeightField(z_cell)
+    running = None
+    n_tri = 0
+    n_used = 0
+
+    file_size = max(1, os.path.getsize(stl_path))
+    tri_bytes = 50.0  # binary kayıt boyutu; ASCII için yalnızca ilerleme tahmini
+
+    for tris in iter_stl_triangles(stl_path, chunk_size=chunk_size):
+        n_tri += len(tris)
+        pts = tris.reshape(-1, 3) @ R.T + t
+        tris = pts.reshape(-1, 3, 3)
+
+        hf.add_points(pts)
+
+        a = tris[:, 1, :2] - tris[:, 0, :2]
+        b = tris[:, 2, :2] - tris[:, 0, :2]
+        cross = a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+        if cull_back_faces:
+            keep = cross > 1e-12
+        else:
+            keep = np.abs(cross) > 1e-12
+        tris = tris[keep]
+        if len(tris) == 0:
+            continue
+        n_used += len(tris)
+
+        polys = shapely.polygons(tris[:, :, :2])
+        part = shapely.union_all(polys)
+        running = part if running is None else shapely.union(running, part)
+        running = _fill_holes(running)
+
+        pct = min(1.0, n_tri * tri_bytes / file_size)
+        progress(10 + 50 * pct, f"Akışlı kontur: {n_tri} üçgen işlendi...")
+
+    if running is None or running.is_empty:
+        raise RuntimeError("Geçerli üçgen poligonu bulunamadı.")
+    return running, hf, n_tri, n_used
+
+
+def _fill_holes(geom):
+    """Polygon/MultiPolygon içindeki delikleri at (sadece dış sınırlar kalsın)."""
+    if isinstance(geom, Polygon):
+        return Polygon(geom.exterior)
+    polys = [Polygon(g.exterior) for g in getattr(geom, "geoms", [])
+             if isinstance(g, Polygon)]
+    if not polys:
+        return geom
+    return unary_union(polys)
+
+
+def generate_tangential_path_streaming(
+    stl_path: str,
+    transform_matrix: np.ndarray,
+    min_area: float,
+    step_decimate: int,
+    rotate_90_for_machine: bool,
+    depth_from_top: float,
+    chunk_size: int = 200_000,
+    z_cell: float = 1.0,
+    cull_back_faces: bool = True,
+    progress_callback=lambda p, msg="": None,
+) -> PathData:
+    """
+    Belleğe sığmayan STL'ler için akışlı yol üretimi.
+
+    generate_tangential_path ile aynı çıktıyı üretir, fakat mesh hiçbir
+    zaman bütün olarak yüklenmez: üçgenler `chunk_size`'lık parçalar halinde
+    okunur, birleştirilir ve Z değerleri `z_cell` (mm) çözünürlüklü bir
+    yükseklik haritasından örneklenir. Tepe bellek parça boyutuyla sınırlıdır.
+
+    cull_back_faces:
+        Aşağı bakan üçgenleri ele (kapalı mesh'lerde sonuç değişmez,
+        birleşim maliyeti yarıya iner). Tek yüzlü, aşağı bakan taramalarda
+        False verilmeli.
+    """
+
+    def progress(p, msg=""):
+        progress_callback(int(p), msg)
+
+    progress(5, "STL akışlı okunuyor...")
+    merged, hf, n_tri, n_used = _stream_outline_and_heightfield(
+        stl_path, transform_matrix, chunk_size, z_cell, cull_back_faces,
+        progress=progress,
+    )
+
+    if isinstance(merged, Polygon):
+        outer = merged
+    else:
+        outer = max(
+            (g for g in merged.geoms if isinstance(g, Polygon)),
+            key=lambda g: g.area,
+            default=None,
+        )
+        if outer is None:
+            raise RuntimeError("Dış kontur bulunamadı.")
+
+    if min_area > 0.0 and outer.area < min_area:
+        raise RuntimeError(
+            f"Dış kontur alanı çok küçük: {outer.area:.6f} < {min_area:.6f}"
+        )
+
+    outline_xy = np.array(outer.exterior.coords)[:, :2]
+    contour_xy, step = _decimate(outline_xy, step_decimate)
+
+    progress(65, "Z yükseklik haritasından örnekleniyor...")
+    zs = hf.sample(contour_xy)
+    if np.isnan(zs).all():
+        zs = np.zeros(len(contour_xy))
+    elif np.isnan(zs).any():
+        # Boş hücreye düşen noktalar: kontur boyunca en yakın dolu değeri kullan
+        idx = np.arange(len(zs))
+        ok = ~np.isnan(zs)
+        zs = np.interp(idx, idx[ok], zs[ok])
+
+    depth = abs(depth_from_top)
+    z_tool = zs - depth
+
+    progress(70, "Açı (A ekseni) hesaplanıyor...")
+    angles = _compute_angles(contour_xy, progress=progress)
+
+    progress(85, "Makine eksenlerine göre hizalanıyor...")
+    xy_rot, angles_rot = _rotate_for_machine(
+        contour_xy, angles, rotate_90=rotate_90_for_machine
+    )
+
+    meta = {
+        "rotate_90": bool(rotate_90_for_machine),
+        "depth": float(depth),
+        "streaming": True,
+        "triangles": int(n_tri),
+        "triangles_used": int(n_used),
+        "outline_step": step,
     }
 
     progress(100, "Yol hazır.")
-    return PathData(xy_rot, z_tool, angles_rot, xy_geom=contour_xy, meta=meta)
+    path = PathData(xy_rot, z_tool, angles_rot, xy_geom=contour_xy, meta=meta)
+    path.outline = outline_xy
+    return path
+
+
 # ---------------------------------------------------------
 # Geriye dönük uyumluluk: eski kodlar generate_path diyordu
 # ---------------------------------------------------------
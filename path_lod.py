@@ -0,0 +1,189 @@
+# path_lod.py
+"""
+Takım yolu çizgisi için ekran ölçeğine göre seyreltme piramidi.
+
+Yol noktaları GPU'ya bir kez yüklenir (gl_resources "path" VBO). Her
+seviye, tam noktalar içinden seçilmiş artan indislerden oluşur ve ayrı
+bir indis tamponu olarak yüklenir (GL_LINE_STRIP):
+
+    seviye 0   bütün noktalar
+    seviye k   BASE_BUCKET * 4**(k-1) noktalık ardışık kovaların her
+               birinden ilk nokta ile X / Y / Z'de en küçük ve en büyük
+               noktalar (min/max seyreltme)
+
+Uç noktalar korunduğundan seyrek seviyenin zarfı tam yolunkiyle aynıdır.
+Her seviyenin hatası (atılan noktaların seyrek çizgiye en büyük uzaklığı,
+mm) kurulurken vektörel olarak hesaplanır. Çizimde o anki izdüşüm
+matrisinden yolun en yakın noktasındaki piksel boyu bulunur ve hatası
+tolerance_px pikselden küçük kalan en seyrek seviye çizilir;
+yakınlaştıkça tam ayrıntıya dönülür.
+"""
+
+import time
+
+import numpy as np
+from OpenGL.GL import (
+    glGetFloatv, glGetIntegerv,
+    GL_MODELVIEW_MATRIX, GL_PROJECTION_MATRIX, GL_VIEWPORT,
+)
+
+import gl_resources
+
+# İlk seyrek seviyenin kova boyu; sonraki her seviyede 4 katı
+BASE_BUCKET = 16
+# Bu kadar noktadan az kalan seviyeden sonra piramit bitirilir
+MIN_POINTS = 2048
+# Çizimde izin verilen sapma (piksel)
+TOLERANCE_PX = 0.5
+
+
+def _bucket_extremes(points: np.ndarray, bucket: int) -> np.ndarray:
+    """
+    Bütün noktalar üzerinde: her kovanın ilk noktası ve eksen başına en
+    küçük / en büyük noktası (artan indisler).
+    """
+    n = len(points)
+    nb = -(-n // bucket)
+    pad = nb * bucket - n
+    if pad:
+        # Son kova son noktayla doldurulur (uç olarak seçilirse n-1'e düşer)
+        points = np.concatenate((points, np.repeat(points[-1:], pad, axis=0)))
+    cube = points.reshape(nb, bucket, points.shape[1])
+    picks = np.column_stack([np.zeros(nb, dtype=np.int64)]
+                            + list(cube.argmin(axis=1).T) + list(cube.argmax(axis=1).T))
+    picks.sort(axis=1)
+    picks += (np.arange(nb, dtype=np.int64) * bucket)[:, None]
+    idx = picks.ravel()
+    idx = np.append(idx[np.concatenate(([True], idx[1:] != idx[:-1]))], n - 1)
+    idx = np.minimum(idx, n - 1)
+    return idx[np.concatenate(([True], idx[1:] != idx[:-1]))]
+
+
+def _group_extremes(points: np.ndarray, idx: np.ndarray, bucket: int) -> np.ndarray:
+    """
+    Bir önceki seviyenin indisleri (idx) üzerinde aynı seçim: kova, noktanın
+    tam yoldaki indisinden bulunur (idx // bucket).
+    """
+    group = idx // bucket
+    first = np.concatenate(([True], group[1:] != group[:-1]))
+    last = np.append(first[1:], True)
+    keep = first | last
+    sub = points[idx]
+    for axis in range(sub.shape[1]):
+        order = np.lexsort((sub[:, axis], group))
+        keep[order[first]] = True      # grup içinde en küçük
+        keep[order[last]] = True       # grup içinde en büyük
+    return idx[keep]
+
+
+def _level_error(points: np.ndarray, keep: np.ndarray, idx=None) -> float:
+    """
+    idx noktalarının (None: bütün noktalar), keep indisli çizgi parçalarına
+    en büyük uzaklığı. Her nokta, indisi arasında kaldığı parçaya ölçülür.
+    """
+    if idx is None:
+        idx = np.arange(len(points))
+    if len(keep) == len(idx):
+        return 0.0
+    seg = np.clip(np.searchsorted(keep, idx, side="right") - 1, 0, len(keep) - 2)
+    a = points[keep[seg]]
+    ab = points[keep[seg + 1]] - a
+    ap = points[idx] - a
+    denom = np.einsum("ij,ij->i", ab, ab)
+    t = np.einsum("ij,ij->i", ap, ab) / np.where(denom > 0, denom, 1.0)
+    d = ap - ab * np.clip(t, 0.0, 1.0)[:, None]
+    return float(np.sqrt(np.einsum("ij,ij->i", d, d).max()))
+
+
+def pixel_size(lo, hi) -> float:
+    """
+    Geçerli GL matrislerine göre (lo, hi) kutusunun kameraya en yakın
+    noktasında bir pikselin mm karşılığı (perspektif izdüşüm).
+    """
+    mv = np.asarray(glGetFloatv(GL_MODELVIEW_MATRIX), dtype=np.float64).reshape(4, 4)
+    proj = np.asarray(glGetFloatv(GL_PROJECTION_MATRIX), dtype=np.float64).reshape(4, 4)
+    height = max(int(glGetIntegerv(GL_VIEWPORT)[3]), 1)
+    corners = np.array([[x, y, z] for x in (lo[0], hi[0])
+                        for y in (lo[1], hi[1])
+                        for z in (lo[2], hi[2])], dtype=np.float64)
+    # OpenGL matrisleri sütun sıralı: satır vektörüyle p @ M
+    eye_z = corners @ mv[:3, 2] + mv[3, 2]
+    depth = max(float((-eye_z).min()), 1e-3)
+    return 2.0 * depth / (proj[1, 1] * height)
+
+
+class PathPyramid:
+    """
+    Çok çözünürlüklü yol çizgisi.
+
+    points : (N,3) float32
+    levels : [(indisler (K,) uint32, hata mm), ...]; 0. seviye bütün noktalar
+    """
+
+    def __init__(self, points):
+        self.key = gl_resources.new_key()
+        self.points = np.ascontiguousarray(points, dtype=np.float32)
+        self.lo = self.points.min(axis=0) if len(self.points) else np.zeros(3, np.float32)
+        self.hi = self.points.max(axis=0) if len(self.points) else np.zeros(3, np.float32)
+        t0 = time.perf_counter()
+        self.levels = [(np.arange(len(self.points), dtype=np.uint32), 0.0)]
+        idx, err = None, 0.0
+        bucket = BASE_BUCKET
+        while bucket < len(self.points):
+            n = len(self.points) if idx is None else len(idx)
+            if n <= MIN_POINTS:
+                break
+            if idx is None:
+                keep = _bucket_extremes(self.points, bucket)
+            else:
+                keep = _group_extremes(self.points, idx, bucket)
+            bucket *= 4
+            if len(keep) >= 0.8 * n:
+                continue
+            # İlk seviyenin hatası tam; sonrakiler üst sınır: bir önceki
+            # seviyenin hatası + onun noktalarının yeni çizgiye uzaklığı
+            err += _level_error(self.points, keep, idx)
+            self.levels.append((keep.astype(np.uint32), err))
+            idx = keep
+        self.build_time = time.perf_counter() - t0
+        self.drawn_level = 0
+        # Görüntüleyicinin yol değişikliğini anlaması için kaynak dizi
+        self.source = None
+        # Nokta başına renkler (path_colors.PathColors; görüntüleyici verir)
+        self.colors = None
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def level_for_pixel(self, pixel_mm: float, tolerance_px: float = TOLERANCE_PX) -> int:
+        """Hatası tolerance_px pikseli aşmayan en seyrek seviye."""
+        limit = pixel_mm * tolerance_px
+        best = 0
+        for k, (_idx, err) in enumerate(self.levels):
+            if err <= limit:
+                best = k
+        return best
+
+    def draw(self, user: str, tolerance_px: float = TOLERANCE_PX,
+             color_mode: str | None = None) -> int:
+        """
+        Ekran ölçeğine uygun seviyeyi çiz; dönen: çizilen çizgi parçası
+        sayısı. color_mode: self.colors'tan köşe renkleri (None: glColor).
+        """
+        if len(self.points) < 2:
+            return 0
+        pixel = pixel_size(self.lo, self.hi)
+        self.drawn_level = self.level_for_pixel(pixel, tolerance_px)
+        return gl_resources.draw_line_strip(self, self.drawn_level, user,
+                                            color_mode=color_mode)
+
+    def draw_upto(self, index: int, user: str) -> int:
+        """
+        Yolun 0..index noktalarını son draw()'daki seviyeyle çiz (tampon
+        önekinden, yeniden yükleme yok). Dönen: seviyede index'e kadar
+        tutulan son noktanın indisi (kalan kısmı çağıran tamamlar).
+        """
+        idx = self.levels[self.drawn_level][0]
+        count = int(np.searchsorted(idx, index, side="right"))
+        gl_resources.draw_line_strip(self, self.drawn_level, user, count)
+        return int(idx[count - 1]) if count else 0
@@ -0,0 +1,152 @@
+# playback.py
+"""
+Takım yolu simülasyonu: zaman çizelgesi ve oynatma.
+
+Zaman çizelgesi yol noktalarına varış zamanlarıdır (Timeline.times, s):
+her segmentin süresi uzunluğunun beslemeye bölümüdür; besleme planı
+(PathData.feed, feed_schedule) varsa segment başına besleme, yoksa sabit
+besleme kullanılır. A ekseni sınırı açıksa segment, A ekseninin dönüşünü
+bitirmesinden kısa süremez:
+
+    t_i = max(L_i / F_i, |dA_i| / vA_max)
+
+Oynatmada her karede gerçek geçen süre hız çarpanıyla çarpılıp simülasyon
+zamanına eklenir; konum, zaman dizisinde ikili aramayla (np.searchsorted)
+bulunan segment içinde doğrusal olarak ara değerlenir. Çizim tarafı
+(Path3DViewer) yol tamponunu yeniden yüklemez; kesilmiş kısmı tamponun
+önekinden, hareketli bıçağı tek işaret olarak çizer.
+"""
+
+import time
+
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# Besleme planı yoksa kullanılan besleme (mm/dk; gcode_generator varsayılanı)
+DEFAULT_FEED = 2000.0
+# Oynatma hız çarpanları
+SPEEDS = (1.0, 2.0, 5.0, 10.0, 50.0, 100.0)
+# Oynatma karesi aralığı (ms)
+FRAME_MS = 16
+
+
+class Timeline:
+    """
+    points : (N,3) yol noktaları
+    angles : (N,) A açıları (derece) ya da None
+    times  : (N,) noktaya varış zamanı (s), times[0] = 0
+    """
+
+    def __init__(self, points, angles=None, feed=None, a_vmax=None,
+                 default_feed: float = DEFAULT_FEED):
+        self.points = np.asarray(points, dtype=float)
+        n = len(self.points)
+        self.angles = (None if angles is None or len(angles) != n
+                       else np.asarray(angles, dtype=float))
+
+        length = np.linalg.norm(np.diff(self.points, axis=0), axis=1)
+        if feed is not None and len(feed) == n:
+            f = np.asarray(feed, dtype=float)[1:]
+        else:
+            f = np.full(len(length), float(default_feed))
+        f = np.where(f > 0, f, default_feed)
+        seg = length / (f / 60.0)
+        if a_vmax and self.angles is not None:
+            seg = np.maximum(seg, np.abs(np.diff(self.angles)) / (float(a_vmax) / 60.0))
+        self.segment_time = seg
+        self.times = np.concatenate(([0.0], np.cumsum(seg)))
+
+    @property
+    def total(self) -> float:
+        return float(self.times[-1]) if len(self.times) else 0.0
+
+    def state_at(self, t: float):
+        """
+        t anındaki durum: (segment başı indisi i, konum (3,), A açısı).
+        Bıçak i -> i+1 segmentindedir (sonda i = N-1).
+        """
+        n = len(self.points)
+        if n == 0:
+            return 0, np.zeros(3), 0.0
+        t = min(max(float(t), 0.0), self.total)
+        i = int(np.searchsorted(self.times, t, side="right")) - 1
+        if i >= n - 1:
+            angle = float(self.angles[-1]) if self.angles is not None else 0.0
+            return n - 1, self.points[-1].copy(), angle
+        dt = self.times[i + 1] - self.times[i]
+        u = (t - self.times[i]) / dt if dt > 0 else 1.0
+        pos = self.points[i] + (self.points[i + 1] - self.points[i]) * u
+        if self.angles is not None:
+            angle = float(self.angles[i] + (self.angles[i + 1] - self.angles[i]) * u)
+        else:
+            d = self.points[i + 1] - self.points[i]
+            angle = float(np.degrees(np.arctan2(d[1], d[0])))
+        return i, pos, angle
+
+
+class Playback(QObject):
+    """
+    Oynat / duraklat / sar. Her karede `moved(t)` yayınlanır; zaman gerçek
+    geçen süre × hız çarpanı kadar ilerler.
+    """
+
+    moved = pyqtSignal(float)
+    state_changed = pyqtSignal(bool)    # oynuyor mu
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.timeline = None
+        self.time = 0.0
+        self.speed = 1.0
+        self._timer = QTimer(self)
+        self._timer.setInterval(FRAME_MS)
+        self._timer.timeout.connect(self._tick)
+        self._last = None
+
+    def set_timeline(self, timeline):
+        self.pause()
+        self.timeline = timeline
+        self.time = 0.0
+        self.moved.emit(self.time)
+
+    def is_playing(self) -> bool:
+        return self._timer.isActive()
+
+    def play(self):
+        if self.timeline is None or self.timeline.total <= 0:
+            return
+        if self.time >= self.timeline.total:
+            self.time = 0.0
+        self._last = time.perf_counter()
+        self._timer.start()
+        self.state_changed.emit(True)
+
+    def pause(self):
+        if self._timer.isActive():
+            self._timer.stop()
+            self.state_changed.emit(False)
+
+    def toggle(self):
+        if self.is_playing():
+            self.pause()
+        else:
+            self.play()
+
+    def set_speed(self, speed: float):
+        self.speed = float(speed)
+
+    def seek(self, t: float):
+        if self.timeline is None:
+            return
+        self.time = min(max(float(t), 0.0), self.timeline.total)
+        self._last = time.perf_counter()
+        self.moved.emit(self.time)
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.time += (now - self._last) * self.speed
+        self._last = now
+        if self.time >= self.timeline.total:
+            self.time = self.timeline.total
+            self.pause()
+        self.moved.emit(self.time)
@@ -0,0 +1,212 @@
+# project_file.py
+"""
+TangentialCAM proje dosyası (.tcam).
+
+Tek bir zip kabı içinde:
+
+    project.json     : sürüm, STL yolu + hash, dönüşüm, yol / G-kodu ayarları,
+                       PathData.meta
+    path/<kolon>.npy : üretilmiş PathData dizileri (xy, z, angles, xy_geom ...)
+    gcode.nc         : (opsiyonel) üretilmiş G-kodu (akışla yazılır/okunur)
+
+Açılışta sadece project.json okunur. Diziler, bir sekme ilgili alana ilk
+eriştiğinde zip'ten okunur (LazyPathData); G-kodu metni de ancak G-kodu
+sekmesi istediğinde açılır.
+"""
+
+import io
+import json
+import os
+import zipfile
+
+import numpy as np
+
+from path_generator import PathData
+
+PROJECT_VERSION = 1
+PROJECT_EXT = ".tcam"
+
+# PathData üzerinde diske yazılan dizi kolonları
+PATH_COLUMNS = ("xy", "z", "angles", "xy_geom", "feed", "lift", "outline")
+
+
+class LazyPathData(PathData):
+    """
+    Dizileri proje dosyasından ilk erişimde okuyan PathData.
+
+    Bir kolon atanırsa (ör. yeniden hesaplanırsa) diskteki değer yerine
+    atanan değer kullanılır.
+    """
+
+    def __init__(self, project, columns, meta=None):
+        # PathData.__init__ çağrılmaz: dizileri hemen okumak istemiyoruz
+        self._project = project
+        self._columns = set(columns)
+        self._loaded = {}
+        self.meta = {} if meta is None else dict(meta)
+
+    def _get(self, name):
+        if name not in self._loaded:
+            if name in self._columns:
+                self._loaded[name] = self._project.read_array("path/" + name)
+            elif name == "xy_geom":
+                return self._get("xy")
+            else:
+                self._loaded[name] = None
+        return self._loaded[name]
+
+    def _set(self, name, value):
+        self._loaded[name] = value
+
+    xy = property(lambda self: self._get("xy"), lambda self, v: self._set("xy", v))
+    z = property(lambda self: self._get("z"), lambda self, v: self._set("z", v))
+    angles = property(lambda self: self._get("angles"),
+                      lambda self, v: self._set("angles", v))
+    xy_geom = property(lambda self: self._get("xy_geom"),
+                       lambda self, v: self._set("xy_geom", v))
+    feed = property(lambda self: self._get("feed"), lambda self, v: self._set("feed", v))
+    lift = property(lambda self: self._get("lift"), lambda self, v: self._set("lift", v))
+    outline = property(lambda self: self._get("outline"),
+                       lambda self, v: self._set("outline", v))
+
+
+class ProjectFile:
+    """Açılmış bir .tcam dosyası (zip tembel okunur)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with zipfile.ZipFile(path, "r") as zf:
+            self.names = set(zf.namelist())
+            self.data = json.loads(zf.read("project.json").decode("utf-8"))
+        if self.data.get("version", 0) > PROJECT_VERSION:
+            raise RuntimeError(
+                f"Proje dosyası daha yeni bir sürümle kaydedilmiş "
+                f"(v{self.data.get('version')})."
+            )
+
+    # ---- ham erişim ----
+
+    def read_array(self, name: str) -> np.ndarray:
+        with zipfile.ZipFile(self.path, "r") as zf:
+            with zf.open(name + ".npy") as f:
+                return np.load(io.BytesIO(f.read()), allow_pickle=False)
+
+    # ---- içerik ----
+
+    @property
+    def stl_path(self):
+        return (self.data.get("stl") or {}).get("path")
+
+    @property
+    def stl_hash(self):
+        return (self.data.get("stl") or {}).get("hash")
+
+    @property
+    def transform(self) -> dict:
+        return dict(self.data.get("transform") or {})
+
+    @property
+    def origin_mode(self) -> str:
+        return self.data.get("origin_mode", "bottom_left")
+
+    @property
+    def path_settings(self) -> dict:
+        return dict(self.data.get("path_settings") or {})
+
+    @property
+    def gcode_settings(self) -> dict:
+        return dict(self.data.get("gcode_settings") or {})
+
+    def has_path(self) -> bool:
+        return ("path/xy.npy") in self.names
+
+    def path_data(self):
+        """PathData (tembel) ya da yol kaydedilmemişse None."""
+        if not self.has_path():
+            return None
+        columns = [c for c in PATH_COLUMNS if f"path/{c}.npy" in self.names]
+        return LazyPathData(self, columns, meta=self.data.get("path_meta"))
+
+    def has_gcode(self) -> bool:
+        return "gcode.nc" in self.names
+
+    def read_gcode(self) -> str:
+        with zipfile.ZipFile(self.path, "r") as zf:
+            return zf.read("gcode.nc").decode("utf-8")
+
+    def iter_gcode(self, chunk_chars: int = 4 << 20):
+        """G-kodunu zip'ten parça parça (str) oku; tamamı belleğe alınmaz."""
+        with zipfile.ZipFile(self.path, "r") as zf:
+            with zf.open("gcode.nc") as raw:
+                f = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                while True:
+                    chunk = f.read(chunk_chars)
+                    if not chunk:
+                        break
+                    yield chunk
+
+
+def _json_safe(obj):
+    """meta içindeki numpy skalerlerini JSON'a uygun hale getir."""
+    if isinstance(obj, dict):
+        return {str(k): _json_safe(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_json_safe(v) for v in obj]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    return str(obj)
+
+
+def save_project(path: str,
+                 stl_path=None,
+                 stl_hash=None,
+                 transform=None,
+                 origin_mode="bottom_left",
+                 path_settings=None,
+                 gcode_settings=None,
+                 path_data=None,
+                 gcode_text=None,
+                 gcode_chunks=None):
+    """
+    Projeyi tek bir zip dosyasına yaz (önce geçici dosyaya, sonra yer değiştir).
+
+    G-kodu gcode_text (tam metin) ya da gcode_chunks (metin parçaları
+    iteratörü, zip'e akışla yazılır) olarak verilebilir.
+    """
+    data = {
+        "version": PROJECT_VERSION,
+        "stl": {"path": stl_path, "hash": stl_hash},
+        "transform": transform or {},
+        "origin_mode": origin_mode,
+        "path_settings": path_settings or {},
+        "gcode_settings": gcode_settings or {},
+        "path_meta": _json_safe(getattr(path_data, "meta", None) or {}),
+    }
+
+    tmp = path + ".tmp"
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("project.json", json.dumps(_json_safe(data), indent=1))
+
+        if path_data is not None:
+            for name in PATH_COLUMNS:
+                arr = getattr(path_data, name, None)
+                if arr is None:
+                    continue
+                buf = io.BytesIO()
+                np.save(buf, np.asarray(arr), allow_pickle=False)
+                zf.writestr("path/" + name + ".npy", buf.getvalue())
+
+        if gcode_text:
+            zf.writestr("gcode.nc", gcode_text)
+        elif gcode_chunks is not None:
+            with zf.open("gcode.nc", "w", force_zip64=True) as f:
+                for chunk in gcode_chunks:
+                    f.write(chunk.encode("utf-8"))
+
+    os.replace(tmp, path)
+
+
+def load_project(path: str) -> ProjectFile:
+    return ProjectFile(path)
@@ -0,0 +1,182 @@
+# render_stats.py
+"""
+3D görüntüleyiciler için kare süresi ölçümü ve performans göstergesi (HUD).
+
+Her görüntüleyici bir RenderStats tutar; paintGL başında begin_frame(),
+sonunda end_frame() çağrılır, arada çizilen üçgen / çizgi sayıları
+eklenir. Tampon yükleme süresi gl_resources.upload_stats'tan kare başına
+fark olarak alınır. Ölçülen süre paintGL'in CPU süresidir (Python +
+sürücüye komut gönderme); GPU'nun kareyi bitirmesi beklenmez.
+
+Fare hareketi olayları kare hızından sık gelir. Görüntüleyiciler
+doğrudan update() yerine request_update() kullanır: önceki istek henüz
+çizilmediyse yeni istek Qt'ye iletilmez, "birleştirilen" olarak sayılır
+(kamera açıları olaylarda zaten biriktiği için kare bir sonraki çizimde
+son durumu gösterir).
+
+snapshot() aynı değerleri sözlük olarak verir (otomatik ölçümler için).
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+from OpenGL.GL import (
+    glPushAttrib, glPopAttrib, glDisable, glEnable, glBlendFunc,
+    glMatrixMode, glPushMatrix, glPopMatrix, glLoadIdentity, glOrtho,
+    glColor4f, glRectf, glRasterPos2f,
+    GL_ALL_ATTRIB_BITS, GL_LIGHTING, GL_DEPTH_TEST, GL_BLEND,
+    GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_PROJECTION, GL_MODELVIEW,
+)
+from OpenGL.GLUT import glutBitmapCharacter, GLUT_BITMAP_8_BY_13
+
+import gl_resources
+
+# Yüzdelik ve FPS hesabında tutulan son kare sayısı
+WINDOW = 240
+
+_LINE_HEIGHT = 15
+_CHAR_WIDTH = 8
+
+
+class RenderStats:
+    """Bir görüntüleyicinin kare istatistikleri."""
+
+    def __init__(self, window: int = WINDOW):
+        self.frame_ms = deque(maxlen=window)    # paintGL süreleri (ms)
+        self.stamps = deque(maxlen=window)      # kare başlangıç zamanları (s)
+        self.reset()
+
+    def reset(self):
+        self.frame_ms.clear()
+        self.stamps.clear()
+        self.frames = 0
+        self.triangles = 0          # son karede çizilen üçgen
+        self.lines = 0              # son karede çizilen çizgi parçası
+        self.upload_ms = 0.0        # son karedeki tampon yükleme süresi
+        self.upload_total_ms = 0.0
+        self.requested = 0          # request_update çağrıları
+        self.coalesced = 0          # çizim beklerken gelip birleştirilen istekler
+        self.pending = 0            # son çizilmemiş istek sayısı
+        self.last_pending = 0       # son karenin karşıladığı istek sayısı
+        self._t0 = None
+        self._upload0 = 0.0
+
+    # ---- çizim istekleri ----
+    def request(self) -> bool:
+        """
+        Yeni bir yeniden çizim isteği. Önceki istek henüz çizilmediyse
+        False döner (update() çağrılmamalı).
+        """
+        self.requested += 1
+        self.pending += 1
+        if self.pending > 1:
+            self.coalesced += 1
+            return False
+        return True
+
+    # ---- kare ----
+    def begin_frame(self):
+        self._t0 = time.perf_counter()
+        self.stamps.append(self._t0)
+        self._upload0 = gl_resources.upload_stats["seconds"]
+        self.last_pending = self.pending
+        self.pending = 0
+        self.triangles = 0
+        self.lines = 0
+
+    def add_triangles(self, n: int):
+        self.triangles += int(n)
+
+    def add_lines(self, n: int):
+        self.lines += int(n)
+
+    def end_frame(self):
+        if self._t0 is None:
+            return
+        self.frame_ms.append((time.perf_counter() - self._t0) * 1000.0)
+        self.upload_ms = (gl_resources.upload_stats["seconds"] - self._upload0) * 1000.0
+        self.upload_total_ms += self.upload_ms
+        self.frames += 1
+        self._t0 = None
+
+    # ---- sonuç ----
+    def fps(self) -> float:
+        """Son bir saniyedeki kare hızı."""
+        if len(self.stamps) < 2:
+            return 0.0
+        now = time.perf_counter()
+        recent = [t for t in self.stamps if now - t <= 1.0]
+        if len(recent) < 2:
+            return 0.0
+        return (len(recent) - 1) / max(recent[-1] - recent[0], 1e-9)
+
+    def snapshot(self) -> dict:
+        ms = np.fromiter(self.frame_ms, dtype=float)
+        if len(ms):
+            p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+            worst = float(ms.max())
+        else:
+            p50 = p95 = p99 = worst = 0.0
+        return {
+            "frames": self.frames,
+            "fps": self.fps(),
+            "frame_ms_p50": float(p50),
+            "frame_ms_p95": float(p95),
+            "frame_ms_p99": float(p99),
+            "frame_ms_max": worst,
+            "triangles": self.triangles,
+            "lines": self.lines,
+            "upload_ms": self.upload_ms,
+            "upload_total_ms": self.upload_total_ms,
+            "requested": self.requested,
+            "coalesced": self.coalesced,
+            "pending": self.last_pending,
+        }
+
+    def text_lines(self) -> list:
+        s = self.snapshot()
+        return [
+            f"FPS {s['fps']:.1f}   kare {s['frames']}",
+            f"kare ms  p50 {s['frame_ms_p50']:.1f}  p95 {s['frame_ms_p95']:.1f}  "
+            f"p99 {s['frame_ms_p99']:.1f}  max {s['frame_ms_max']:.1f}",
+            f"ucgen {s['triangles']:,}   cizgi {s['lines']:,}",
+            f"yukleme {s['upload_ms']:.1f} ms (toplam {s['upload_total_ms']:.0f} ms)",
+            f"istek {s['requested']}  birlestirilen {s['coalesced']}  "
+            f"bekleyen {s['pending']}",
+        ]
+
+
+def draw_overlay(lines, width: int, height: int):
+    """
+    Metin satırlarını sol üst köşede yarı saydam kutuda çiz. GL durumu ve
+    matrisler korunur.
+    """
+    glPushAttrib(GL_ALL_ATTRIB_BITS)
+    glDisable(GL_LIGHTING)
+    glDisable(GL_DEPTH_TEST)
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    glMatrixMode(GL_PROJECTION)
+    glPushMatrix()
+    glLoadIdentity()
+    glOrtho(0, width, height, 0, -1, 1)     # piksel koordinatı, y aşağı
+    glMatrixMode(GL_MODELVIEW)
+    glPushMatrix()
+    glLoadIdentity()
+
+    box_w = 12 + _CHAR_WIDTH * max((len(s) for s in lines), default=0)
+    box_h = 8 + _LINE_HEIGHT * len(lines)
+    glColor4f(0.0, 0.0, 0.0, 0.6)
+    glRectf(4, 4, 4 + box_w, 4 + box_h)
+    glColor4f(1.0, 1.0, 1.0, 1.0)
+    for i, text in enumerate(lines):
+        glRasterPos2f(10, 4 + _LINE_HEIGHT * (i + 1))
+        for ch in text:
+            glutBitmapCharacter(GLUT_BITMAP_8_BY_13, ord(ch))
+
+    glPopMatrix()
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()
+    glMatrixMode(GL_MODELVIEW)
+    glPopAttrib()
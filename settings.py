@@ -33,3 +33,13 @@ def save_settings(data: dict):
 
     with open(INI_FILE, "w", encoding="utf-8") as f:
         cfg.write(f)
+
+
+def load_section(name: str) -> dict:
+    """INI dosyasındaki bir bölümü (ör. "machine") ham metin sözlüğü olarak oku."""
+    cfg = configparser.ConfigParser()
+    if os.path.exists(INI_FILE):
+        cfg.read(INI_FILE, encoding="utf-8")
+    if name in cfg:
+        return dict(cfg[name])
+    return {}
@@ -1,9 +1,29 @@
+import os
+import re
+
 import numpy as np
 import trimesh
 
+# Binary STL kaydı: normal (3f) + 3 köşe (9f) + attribute (uint16) = 50 byte
+_STL_RECORD = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("verts", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+_ASCII_VERTEX_RE = re.compile(
+    rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)", re.IGNORECASE
+)
+
+
+def load_stl(path: str, process: bool = True) -> trimesh.Trimesh:
+    """
+    STL'i Trimesh olarak yükle.
 
-def load_stl(path: str) -> trimesh.Trimesh:
-    mesh = trimesh.load(path)
+    process=False verilirse köşeler kaynaştırılmaz (weld); arka planda
+    yüklemede bu adım ayrıca ölçülmek için sonradan yapılır.
+    """
+    mesh = trimesh.load(path, process=process)
     if isinstance(mesh, trimesh.Scene):
         parts = [
             g for g in mesh.geometry.values()
@@ -17,6 +37,72 @@ def load_stl(path: str) -> trimesh.Trimesh:
     return mesh
 
 
+def _is_binary_stl(path: str) -> bool:
+    """Dosya boyutu başlıktaki üçgen sayısıyla tutuyorsa binary kabul et."""
+    size = os.path.getsize(path)
+    if size < 84:
+        return False
+    with open(path, "rb") as f:
+        f.seek(80)
+        count = int(np.frombuffer(f.read(4), dtype="<u4")[0])
+    return size == 84 + 50 * count
+
+
+def iter_stl_triangles(path: str, chunk_size: int = 200_000):
+    """
+    STL dosyasındaki üçgenleri parça parça okur (mesh'i belleğe almadan).
+
+    Her adımda (n,3,3) float64 köşe dizisi döner; n <= chunk_size.
+    Binary STL doğrudan kayıt kayıt, ASCII STL ise blok blok okunur.
+    """
+    chunk_size = max(1, int(chunk_size))
+
+    if _is_binary_stl(path):
+        with open(path, "rb") as f:
+            f.seek(80)
+            count = int(np.frombuffer(f.read(4), dtype="<u4")[0])
+            done = 0
+            while done < count:
+                n = min(chunk_size, count - done)
+                rec = np.fromfile(f, dtype=_STL_RECORD, count=n)
+                if len(rec) == 0:
+                    break
+                done += len(rec)
+                yield rec["verts"].astype(float)
+        return
+
+    # ASCII: satır sınırında bölünmüş bloklar halinde oku
+    block_bytes = chunk_size * 3 * 48
+    pending = []   # henüz üçgene tamamlanmamış köşe satırları
+    tail = b""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_bytes)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b"\n")
+            if cut < 0:
+                tail = block
+                continue
+            tail = block[cut + 1:]
+            pending.extend(_ASCII_VERTEX_RE.findall(block[:cut + 1]))
+
+            n_full = (len(pending) // 3) * 3
+            while n_full >= chunk_size * 3:
+                part = pending[:chunk_size * 3]
+                del pending[:chunk_size * 3]
+                n_full -= chunk_size * 3
+                yield np.array(part, dtype=float).reshape(-1, 3, 3)
+
+    if tail:
+        pending.extend(_ASCII_VERTEX_RE.findall(tail))
+    n_full = (len(pending) // 3) * 3
+    for i in range(0, n_full, chunk_size * 3):
+        part = pending[i:min(i + chunk_size * 3, n_full)]
+        yield np.array(part, dtype=float).reshape(-1, 3, 3)
+
+
 def make_transform_matrix(rot_x_deg: float,
                           rot_y_deg: float,
                           rot_z_deg: float,
@@ -1,8 +1,47 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QTextEdit, QPushButton, QFileDialog
+import time
+from functools import partial
+
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QFileDialog, QCheckBox, QDoubleSpinBox, QComboBox, QSpinBox,
+    QInputDialog, QMessageBox, QApplication,
+)
+from PyQt5.QtCore import Qt
+
+from gcode_writer import write_gcode
+from gcode_split import split_program, resume_program, write_parts
+from gcode_parser import parse_gcode, iter_text
+from cycle_time import simulate, summary_text, machine_limits, format_duration
+from gcode_sender import GCodeSender, summary_text as send_summary_text
+from gcode_send_worker import GCodeSendWorker
+from gcode_view import GCodeView, LineIndex
+
+# Kaydederken bölme seçenekleri: (ayar adı, etiket)
+SPLIT_MODES = (
+    ("none", "Bölme yok"),
+    ("lines", "Dosya başına en fazla satır"),
+    ("kbytes", "Dosya başına en fazla KB"),
+    ("parts", "Eşit parça sayısı"),
+)
+
+
+def _size_text(n_chars: int) -> str:
+    if n_chars >= 1_000_000:
+        return f"{n_chars / 1e6:.2f} MB"
+    return f"{n_chars / 1e3:.1f} KB"
 
 
 class GCodeTab(QWidget):
-    """Tab 3: G-kodu önizleme (şimdilik sadece metin gösteriyor)."""
+    """
+    Tab 3: G-kodu önizleme.
+
+    Sekme G-kodunun tamamını tutmaz; parça parça metin üreten bir "program
+    kaynağı" (çağrıldığında yeni bir parça iteratörü döndüren fonksiyon)
+    tutar. Görüntüleyici (gcode_view.GCodeView) programın tamamını
+    gösterir ama metni belleğe almaz: program geçici bir dosyaya akıtılıp
+    mmap ile açılır, sadece ekrandaki satırlar çözülür. Kaydet programı
+    doğrudan diske (istenirse .gz) akıtır.
+    """
 
     def __init__(self, main_window):
         super().__init__()
@@ -14,42 +53,457 @@ class GCodeTab(QWidget):
         self.label = QLabel("Henüz G-kodu üretilmedi.")
         layout.addWidget(self.label)
 
-        # G-kodunu gösteren metin alanı
-        self.text_edit = QTextEdit()
-        self.text_edit.setReadOnly(True)
-        layout.addWidget(self.text_edit, 1)
+        # G-kodu görüntüleyici (sanal liste, arama, satıra gitme)
+        self.view = GCodeView()
+        layout.addWidget(self.view, 1)
 
-        # G-kodu diske kaydetme butonu
+        # Kompakt çıktı: tekrarlanan modal kelimeler (G1, F, değişmeyen
+        # X/Y/Z/A) ve sondaki sıfırlar yazılmaz
+        self.chk_compact = QCheckBox(
+            "Kompakt çıktı (tekrarlanan G1/F/Z/A ve sondaki sıfırları atla)"
+        )
+        self.chk_compact.toggled.connect(self._on_options_changed)
+        layout.addWidget(self.chk_compact)
+
+        # Yay uydurma: tolerans içindeki nokta dizileri G2/G3 olarak yazılır
+        row = QHBoxLayout()
+        row.addWidget(QLabel("G2/G3 yay toleransı (mm, 0 = kapalı):"))
+        self.spin_arc_tol = QDoubleSpinBox()
+        self.spin_arc_tol.setDecimals(3)
+        self.spin_arc_tol.setRange(0.0, 1.0)
+        self.spin_arc_tol.setSingleStep(0.005)
+        self.spin_arc_tol.setValue(0.0)
+        self.spin_arc_tol.editingFinished.connect(self._on_options_changed)
+        row.addWidget(self.spin_arc_tol)
+        row.addStretch(1)
+        layout.addLayout(row)
+
+        # Program belleği sınırlı kontrolcüler için dosyalara bölme
+        row = QHBoxLayout()
+        row.addWidget(QLabel("Kaydederken böl:"))
+        self.combo_split = QComboBox()
+        for _key, label in SPLIT_MODES:
+            self.combo_split.addItem(label)
+        row.addWidget(self.combo_split)
+        self.spin_split = QSpinBox()
+        self.spin_split.setRange(2, 100_000_000)
+        self.spin_split.setSingleStep(1000)
+        self.spin_split.setValue(50_000)
+        row.addWidget(self.spin_split)
+        row.addStretch(1)
+        layout.addLayout(row)
+
+        # G-kodu diske kaydetme butonları
+        row = QHBoxLayout()
         self.btn_save = QPushButton("Kaydet...")
         self.btn_save.clicked.connect(self.on_save_clicked)
-        layout.addWidget(self.btn_save)
+        row.addWidget(self.btn_save)
+        # Yarıda kalan iş: bir yol noktasından / satırdan devam programı
+        self.btn_resume = QPushButton("Devam Programı...")
+        self.btn_resume.clicked.connect(self.on_resume_clicked)
+        row.addWidget(self.btn_resume)
+        # Başka CAM'lerden gelen programı önizleme + 3D geri çizim
+        self.btn_open = QPushButton("G-kodu Dosyası Aç...")
+        self.btn_open.clicked.connect(self.on_open_clicked)
+        row.addWidget(self.btn_open)
+        # Seri port üzerinden kontrolcüye akışla gönderme (GRBL)
+        self.btn_send = QPushButton("Makineye Gönder...")
+        self.btn_send.clicked.connect(self.on_send_clicked)
+        row.addWidget(self.btn_send)
+        layout.addLayout(row)
+
+        # Program kaynağı ve önizlemenin güncel olup olmadığı
+        self._program = None
+        self._preview_pending = False
+        # Yol verisinden program kuran fonksiyon (job(**seçenekler) -> GCodeProgram)
+        self._job = None
+        # Son kurulan programlar (seçenekler -> GCodeProgram); yay uydurma
+        # pahalı olduğundan önizleme, etiket ve kayıt aynı programı kullanır
+        self._built = {}
+        # Diskten açılan programın okunmuş hali (gcode_parser.ParsedGCode)
+        self._parsed = None
+        # Kaynak bir dosyaysa yolu (görüntüleyici dosyayı doğrudan mmap ile
+        # açar) ya da bellekteki metin
+        self._source_path = None
+        self._source_text = None
+        # Gönderim: iş parçacığı ve son kullanılan port / mod
+        self._send_worker = None
+        self._send_port = "/dev/ttyUSB0"
+        self._send_mode = "char"
+        self._send_baud = 115200
+
+    # ------------------------------------------------------------------ kaynak
+
+    def set_gcode_program(self, program, note: str = ""):
+        """
+        program(): her çağrıda baştan başlayan bir metin parçası iteratörü
+        döndürür (ör. functools.partial(iter_gcode_3d, path_data, ...)).
+
+        Önizleme sekme görünür olduğunda hazırlanır.
+        """
+        self._job = None
+        self._built = {}
+        self._parsed = None
+        self._set_source(program, note)
+
+    def set_gcode_job(self, job, note: str = ""):
+        """
+        job(compact=..., arc_tolerance=...) -> GCodeProgram (ör.
+        functools.partial(gcode_program_3d, path_data, ...)). Çıktı
+        seçenekleri değişince program yeniden kurulur; boyut, tasarruf ve
+        yay uydurma raporu etikette gösterilir.
+        """
+        self._job = job
+        self._built = {}
+        self._parsed = None
+        self._set_source(self._job_chunks, note)
+
+    def output_options(self) -> dict:
+        return {
+            "compact": self.chk_compact.isChecked(),
+            "arc_tolerance": float(self.spin_arc_tol.value()),
+        }
+
+    def _build(self, **options):
+        key = tuple(sorted(options.items()))
+        if key not in self._built:
+            self._built[key] = self._job(**options)
+        return self._built[key]
+
+    def _job_chunks(self):
+        return self._build(**self.output_options()).iter_chunks()
+
+    def _on_options_changed(self, *_args):
+        if self._job is not None:
+            # Sadece güncel seçenekler ve tam çıktı (karşılaştırma için) tutulur
+            keep = {tuple(sorted(self.output_options().items())),
+                    tuple(sorted({"compact": False, "arc_tolerance": 0.0}.items()))}
+            self._built = {k: v for k, v in self._built.items() if k in keep}
+            self._set_source(self._job_chunks)
+
+    def _set_source(self, program, note: str = "", path: str | None = None,
+                    text: str | None = None):
+        self._program = program
+        self._source_path = path
+        self._source_text = text
+        self._preview_pending = program is not None
+        self.view.clear()
+        if program is None:
+            self.label.setText("Henüz G-kodu üretilmedi.")
+            return
+        self.label.setText(note or "G-kodu hazır (sekme açılınca önizlenecek).")
+        if self.isVisible():
+            self._load_pending()
 
     def set_gcode_text(self, text: str):
         if not text:
-            self.label.setText("Henüz G-kodu üretilmedi.")
-            self.text_edit.clear()
+            self.set_gcode_program(None)
         else:
-            self.label.setText("G-kodu:")
-            self.text_edit.setPlainText(text)
+            # Kısa metin: görüntüleyici dosya yerine bellekteki tamponu indeksler
+            self._job = None
+            self._built = {}
+            self._parsed = None
+            self._set_source(lambda: iter((text,)), text=text)
 
+    def iter_gcode_chunks(self):
+        """Mevcut G-kodunun parça iteratörü (yoksa None)."""
+        if self._program is None:
+            return None
+        return self._program()
 
-    def on_save_clicked(self):
-        """Mevcut G-kodunu dosyaya kaydet."""
-        text = self.text_edit.toPlainText()
-        if not text.strip():
-            # Kaydedilecek bir şey yok
+    # ------------------------------------------------------------------ önizleme
+
+    def _load_pending(self):
+        if not self._preview_pending or self._program is None:
             return
+        self._preview_pending = False
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            if self._source_path is not None:
+                index = LineIndex.from_file(self._source_path)
+            elif self._source_text is not None:
+                index = LineIndex.from_text(self._source_text)
+            else:
+                index = LineIndex.from_chunks(self._program())
+        except Exception as e:
+            self.label.setText("G-kodu önizlenemedi.")
+            QMessageBox.critical(self, "Hata", f"G-kodu önizlenemedi:\n{e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        self.view.set_line_index(index)
+        lines = self._info_lines()
+        head = "G-kodu" + (f" [{lines[0]}]" if lines else f" [{len(index):,} satır]")
+        self.label.setText("\n".join([head] + lines[1:]))
+
+    def _info_lines(self) -> list:
+        """Program boyutu / tam çıktıya göre kazanç, yay raporu ve süre tahmini."""
+        if self._parsed is not None:
+            return self._parsed_lines()
+        if self._job is None:
+            return []
+        options = self.output_options()
+        full = self._build(compact=False, arc_tolerance=0.0)
+        full_size = full.size_chars()
+        prog = self._build(**options)
+        if prog is full:
+            lines = [f"{full.line_count():,} satır, {_size_text(full_size)}"]
+        else:
+            size = prog.size_chars()
+            saved = full_size - size
+            pct = 100.0 * saved / full_size if full_size else 0.0
+            lines = [
+                f"{prog.line_count():,} satır, {_size_text(size)}; "
+                f"tam çıktıya göre {_size_text(saved)} (%{pct:.0f}) tasarruf"
+            ]
+        if prog.arc_fit is not None:
+            lines.append(prog.arc_fit.report())
+        if prog.motion_source is not None:
+            limits = machine_limits()
+            result = simulate(prog.motion(), limits)
+            lines.append(summary_text(result))
+            if prog.feed_scheduled:
+                # Besleme planının etkisi: aynı program sabit beslemeyle
+                const = simulate(self._build(**options, use_feed_column=False).motion(),
+                                 limits)
+                diff = const["total"] - result["total"]
+                lines.append(
+                    f"Sabit beslemeyle: {format_duration(const['total'])} "
+                    f"(besleme planı {format_duration(abs(diff))} "
+                    f"{'kısa' if diff >= 0 else 'uzun'})"
+                )
+        return lines
+
+    def _parsed_lines(self) -> list:
+        parsed = self._parsed
+        lines = parsed.summary_text().split("\n")
+        if len(parsed):
+            lines.append(summary_text(simulate(parsed.to_motion(), machine_limits())))
+        return lines
+
+    # ------------------------------------------------------------------ dosya aç
+
+    def on_open_clicked(self):
+        fname, _ = QFileDialog.getOpenFileName(
+            self,
+            "G-kodu dosyası aç",
+            "",
+            "G-code Files (*.nc *.tap *.gcode *.ngc *.nc.gz);;Tüm Dosyalar (*)",
+        )
+        if fname:
+            self.open_gcode_file(fname)
+
+    def open_gcode_file(self, path: str):
+        """Dosyayı oku: önizleme, istatistikler ve 3D önizlemede geri çizim."""
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            t0 = time.perf_counter()
+            parsed = parse_gcode(path)
+            dt = time.perf_counter() - t0
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"G-kodu okunamadı:\n{e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self._job = None
+        self._built = {}
+        self._parsed = parsed
+        self._set_source(partial(iter_text, path), f"{path} ({dt:.1f} s'de okundu)", path)
+        self.main_window.show_backplot(parsed)
+
+    # ------------------------------------------------------------------ ayarlar
+
+    def get_settings(self) -> dict:
+        data = self.output_options()
+        data["split_mode"] = SPLIT_MODES[self.combo_split.currentIndex()][0]
+        data["split_value"] = self.spin_split.value()
+        data["send_port"] = self._send_port
+        data["send_mode"] = self._send_mode
+        data["send_baud"] = self._send_baud
+        return data
+
+    def apply_settings(self, data: dict):
+        keys = [key for key, _label in SPLIT_MODES]
+        if data.get("split_mode") in keys:
+            self.combo_split.setCurrentIndex(keys.index(data["split_mode"]))
+        if "split_value" in data:
+            self.spin_split.setValue(int(data["split_value"]))
+        if data.get("send_port"):
+            self._send_port = str(data["send_port"])
+        if data.get("send_mode") in GCodeSender.MODES:
+            self._send_mode = data["send_mode"]
+        if data.get("send_baud"):
+            self._send_baud = int(data["send_baud"])
+        if "compact" in data:
+            self.chk_compact.setChecked(bool(data["compact"]))
+        if "arc_tolerance" in data:
+            self.spin_arc_tol.setValue(float(data["arc_tolerance"]))
+            self._on_options_changed()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._load_pending()
+
+    # ------------------------------------------------------------------ kaydet
+
+    def _ask_save_path(self, title: str) -> str:
         fname, _ = QFileDialog.getSaveFileName(
             self,
-            "G-kodu kaydet",
+            title,
             "",
-            "G-code Files (*.nc *.tap *.gcode);;Tüm Dosyalar (*)",
+            "G-code Files (*.nc *.tap *.gcode);;"
+            "Sıkıştırılmış G-code (*.nc.gz *.gcode.gz);;Tüm Dosyalar (*)",
         )
+        return fname
+
+    def _current_program(self):
+        """Seçeneklere göre kurulmuş GCodeProgram (yol verisi yoksa None)."""
+        if self._job is None:
+            QMessageBox.information(
+                self, "G-kodu",
+                "Bölme ve devam programı sadece yol verisinden üretilen "
+                "G-kodu için kullanılabilir.",
+            )
+            return None
+        return self._build(**self.output_options())
+
+    def on_save_clicked(self):
+        """Mevcut G-kodunu dosyaya akışla kaydet (.gz uzantısı -> gzip)."""
+        if self._program is None:
+            # Kaydedilecek bir şey yok
+            return
+        mode = SPLIT_MODES[self.combo_split.currentIndex()][0]
+        if mode != "none":
+            self.save_split(mode, self.spin_split.value())
+            return
+        fname = self._ask_save_path("G-kodu kaydet")
         if not fname:
             return
         try:
-            with open(fname, "w", encoding="utf-8") as f:
-                f.write(text)
+            stats = write_gcode(fname, self._program())
+            self.label.setText(
+                f"Kaydedildi: {fname} ({stats['lines']:,} satır, "
+                f"{_size_text(stats['chars'])} metin)"
+            )
         except Exception as e:
-            # Çok detaylı hata mesajı göstermiyoruz; istersen MessageBox eklenebilir.
-            print("G-kodu kaydedilirken hata:", e)
+            self.label.setText("G-kodu kaydedilemedi.")
+            QMessageBox.critical(self, "Hata", f"G-kodu kaydedilemedi:\n{e}")
+
+    def save_split(self, mode: str, value: int):
+        """Programı güvenli noktalardan bölüp ad_01, ad_02 ... olarak kaydet."""
+        program = self._current_program()
+        if program is None:
+            return
+        fname = self._ask_save_path("G-kodu kaydet (bölünmüş)")
+        if not fname:
+            return
+        kwargs = {"lines": {"max_lines": value},
+                  "kbytes": {"max_bytes": value * 1000},
+                  "parts": {"parts": value}}[mode]
+        try:
+            written = write_parts(fname, split_program(program, **kwargs))
+        except Exception as e:
+            self.label.setText("G-kodu bölünerek kaydedilemedi.")
+            QMessageBox.critical(self, "Hata", f"G-kodu bölünerek kaydedilemedi:\n{e}")
+            return
+        largest = max(stats["chars"] for _f, stats in written)
+        self.label.setText(
+            f"{len(written)} dosyaya bölündü: {written[0][0]} ... "
+            f"{written[-1][0]} (en büyüğü {_size_text(largest)})"
+        )
+
+    def on_resume_clicked(self):
+        """Yol noktasından ya da G-kodu satırından devam eden programı kaydet."""
+        program = self._current_program()
+        if program is None:
+            return
+        kinds = ["G-kodu satırı", "Yol noktası"]
+        kind, ok = QInputDialog.getItem(self, "Devam Programı", "Nereden devam edilsin:",
+                                        kinds, 0, False)
+        if not ok:
+            return
+        if kind == kinds[0]:
+            value, ok = QInputDialog.getInt(self, "Devam Programı", "G-kodu satırı:",
+                                            1, 1, program.line_count())
+            kwargs = {"gcode_line": value}
+        else:
+            value, ok = QInputDialog.getInt(self, "Devam Programı", "Yol noktası indisi:",
+                                            0, 0, 2_000_000_000)
+            kwargs = {"path_index": value}
+        if not ok:
+            return
+        fname = self._ask_save_path("Devam programını kaydet")
+        if not fname:
+            return
+        try:
+            resumed = resume_program(program, **kwargs)
+            stats = write_gcode(fname, resumed.iter_chunks())
+        except Exception as e:
+            self.label.setText("Devam programı kaydedilemedi.")
+            QMessageBox.critical(self, "Hata", f"Devam programı kaydedilemedi:\n{e}")
+            return
+        self.label.setText(
+            f"Devam programı kaydedildi: {fname} ({stats['lines']:,} satır; "
+            f"{resumed.header[program.n_setup]})"
+        )
+
+    # ------------------------------------------------------------------ gönder
+
+    def on_send_clicked(self):
+        """Programı seri port üzerinden kontrolcüye gönder / gönderimi durdur."""
+        if self._send_worker is not None:
+            self._send_worker.stop()
+            self.btn_send.setEnabled(False)
+            self.label.setText("Durduruluyor: kontrolcü tamponundaki satırlar bitiriliyor...")
+            return
+        if self._program is None:
+            return
+        port, ok = QInputDialog.getText(self, "Makineye Gönder", "Seri port:",
+                                        text=self._send_port)
+        if not ok or not port.strip():
+            return
+        modes = ["Karakter sayma (hızlı)", "Gönder-bekle (basit)"]
+        current = GCodeSender.MODES.index(self._send_mode)
+        mode, ok = QInputDialog.getItem(self, "Makineye Gönder", "Akış modu:",
+                                        modes, current, False)
+        if not ok:
+            return
+        self._send_port = port.strip()
+        self._send_mode = GCodeSender.MODES[modes.index(mode)]
+
+        worker = GCodeSendWorker(self._program, self._send_port, self._send_baud,
+                                 self._send_mode, parent=self)
+        worker.progress.connect(self._on_send_progress)
+        worker.finished_ok.connect(self._on_send_finished)
+        worker.failed.connect(self._on_send_failed)
+        worker.finished.connect(self._on_send_thread_done)
+        self._send_worker = worker
+        self.btn_send.setText("Gönderimi Durdur")
+        self.label.setText(f"{self._send_port} portuna gönderiliyor...")
+        worker.start()
+
+    def _on_send_progress(self, stats: dict):
+        total = stats.get("total_lines")
+        pct = f" (%{100.0 * stats['acked_lines'] / total:.0f})" if total else ""
+        self.label.setText(
+            f"Gönderiliyor: {stats['acked_lines']:,} satır{pct}, "
+            f"{stats['lines_per_s']:,.0f} satır/s, {stats['stalls']} takılma"
+        )
+
+    def _on_send_finished(self, stats: dict):
+        self.label.setText("Gönderim bitti: " + send_summary_text(stats))
+
+    def _on_send_failed(self, message: str):
+        self.label.setText(f"Gönderim hatası: {message}")
+
+    def _on_send_thread_done(self):
+        self._send_worker = None
+        self.btn_send.setText("Makineye Gönder...")
+        self.btn_send.setEnabled(True)
+
+    def stop_workers(self):
+        """Uygulama kapanırken: gönderimi durdur ve iş parçacığının bitmesini bekle."""
+        if self._send_worker is not None:
+            self._send_worker.stop()
+            self._send_worker.wait()
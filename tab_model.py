@@ -1,9 +1,12 @@
+from functools import partial
+
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
-    QPushButton, QLineEdit, QLabel, QFileDialog, QComboBox
+    QPushButton, QLineEdit, QLabel, QFileDialog, QComboBox, QProgressBar
 )
 from gl_viewer import GLViewer
-from stl_loader import load_stl
+from gl_resources import SharedMesh
+from mesh_load_worker import MeshLoadWorker
 from settings import load_settings, save_settings
 from tab_path import PathTab   # Yol üret paneli olarak kullanacağız
 
@@ -16,6 +19,11 @@ class ModelTab(QWidget):
         self.main_window = main_window
         self.mesh = None
 
+        # Arka plan STL yükleyicisi (en son başlatılan) ve henüz bitmemişler
+        self._load_worker = None
+        self._workers = set()
+        self._pending_transform = None
+
         # Döndürme değerleri
         self.rot_x = 0.0
         self.rot_y = 0.0
@@ -90,6 +98,12 @@ class ModelTab(QWidget):
         fg_layout.addWidget(self.edit_path)
         fg_layout.addWidget(btn_browse)
 
+        # Yükleme ilerlemesi (sadece yükleme sırasında görünür)
+        self.progress_load = QProgressBar()
+        self.progress_load.setRange(0, 100)
+        self.progress_load.setVisible(False)
+        fg_layout.addWidget(self.progress_load)
+
         right_panel.addWidget(file_group)
 
         # --- Dönüşüm butonları grubu ---
@@ -228,22 +242,77 @@ class ModelTab(QWidget):
         self.edit_path.setText(path)
         self.load_mesh(path)
 
-    def load_mesh(self, path):
-        try:
-            mesh = load_stl(path)
-        except Exception as e:
-            self.label_info.setText(f"Hata: {e}")
+    def load_mesh(self, path, transform=None):
+        """
+        STL'i arka planda yükle; GUI donmaz. Önceki yükleme iptal edilir.
+
+        transform: {"rot_x", "rot_y", "rot_z"} verilirse (proje açılışı)
+        yükleme bitince dönüşümler sıfırlanmak yerine bu değerler uygulanır.
+        """
+        # Akışlı yol üretimi mesh yüklenemese bile dosyayı okuyabilir
+        self.main_window.set_mesh_path(path)
+        self.edit_path.setText(path)
+        self._pending_transform = transform
+
+        self._cancel_load()
+
+        worker = MeshLoadWorker(path, self)
+        worker.progress.connect(partial(self._on_load_progress, worker))
+        worker.loaded.connect(partial(self._on_mesh_loaded, worker))
+        worker.failed.connect(partial(self._on_load_failed, worker))
+        worker.finished.connect(partial(self._workers.discard, worker))
+        self._workers.add(worker)
+        self._load_worker = worker
+
+        self.progress_load.setValue(0)
+        self.progress_load.setVisible(True)
+        self.label_info.setText("Yükleniyor...")
+        worker.start()
+
+    def _cancel_load(self):
+        """Süren yüklemeyi iptal et; iş parçacığı kendi bitene kadar tutulur."""
+        if self._load_worker is not None:
+            self._load_worker.cancel()
+            self._load_worker = None
+
+    def stop_workers(self):
+        """Uygulama kapanırken: yüklemeyi iptal et, iş parçacıklarının bitmesini bekle."""
+        self._cancel_load()
+        for worker in list(self._workers):
+            worker.wait()
+        self.viewer.stop_workers()
+
+    def _on_load_progress(self, worker, pct, msg):
+        if worker is not self._load_worker:
+            return
+        self.progress_load.setValue(pct)
+        self.progress_load.setFormat(f"{pct}% - {msg}")
+
+    def _on_load_failed(self, worker, msg):
+        if worker is not self._load_worker:
             return
+        self._load_worker = None
+        self.progress_load.setVisible(False)
+        self.label_info.setText(f"Hata: {msg}")
 
+    def _on_mesh_loaded(self, worker, result):
+        """GUI iş parçacığında sadece hazır tamponları devral."""
+        if worker is not self._load_worker:
+            return
+        self._load_worker = None
+        self.progress_load.setVisible(False)
+
+        mesh = result.mesh
         self.mesh = mesh
-        self.main_window.set_mesh(mesh)
 
-        verts = mesh.vertices
-        faces = mesh.faces
-        self.viewer.set_mesh(verts, faces)
+        verts = result.vertices
+        faces = result.faces
+        # Model görüntüleyici ve 3D önizleme aynı GPU tamponlarını kullanır
+        shared = SharedMesh(verts, faces, face_normals=result.face_normals)
+        self.viewer.set_shared_mesh(shared)
+        self.main_window.set_mesh(mesh, shared)
 
-        vmin = verts.min(axis=0)
-        vmax = verts.max(axis=0)
+        vmin, vmax = result.bounds
         size = vmax - vmin
 
         info = (
@@ -252,12 +321,18 @@ class ModelTab(QWidget):
             f"Boyutlar (X,Y,Z): "
             f"{size[0]:.2f} x {size[1]:.2f} x {size[2]:.2f}"
         )
+        if result.cache_hit:
+            info += "\n(önbellekten yüklendi)"
+        total = sum(result.timings.values())
+        info += f"\nYükleme süresi: {total:.2f} s"
         self.label_info.setText(info)
 
-        # Dönüşümleri sıfırla
-        self.rot_x = 0.0
-        self.rot_y = 0.0
-        self.rot_z = 0.0
+        # Dönüşümleri sıfırla (proje açılışında kayıtlı değerleri kullan)
+        t = self._pending_transform or {}
+        self._pending_transform = None
+        self.rot_x = float(t.get("rot_x", 0.0))
+        self.rot_y = float(t.get("rot_y", 0.0))
+        self.rot_z = float(t.get("rot_z", 0.0))
         self._apply_transform()
 
     def _rotate(self, axis, delta_deg):
@@ -295,6 +370,15 @@ class ModelTab(QWidget):
         self.settings["mesh_color"] = hex_color
         save_settings(self.settings)
 
+    # Combobox sırası ile G54 modu eşleşmesi
+    _ORIGIN_MODES = ("bottom_left", "top_left", "bottom_right", "top_right", "center")
+
+    def set_origin_mode(self, mode: str):
+        """Proje açılışında G54 seçimini geri yükle."""
+        if mode in self._ORIGIN_MODES:
+            self.combo_origin.setCurrentIndex(self._ORIGIN_MODES.index(mode))
+        self.main_window.set_origin_mode(mode)
+
     def _on_origin_changed(self, index: int):
         """G54 parça orjini seçimi değişince MainWindow'a bildir."""
         mode = "bottom_left"
@@ -1,11 +1,15 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
     QLabel, QDoubleSpinBox, QSpinBox, QPushButton,
-    QProgressBar, QTextEdit, QMessageBox, QCheckBox
+    QProgressBar, QTextEdit, QMessageBox, QCheckBox, QFileDialog
 )
 from PyQt5.QtCore import QCoreApplication
 from stl_loader import make_transform_matrix
-from path_generator import generate_path
+from path_generator import (
+    generate_path, generate_tangential_path_streaming, generate_path_from_contour
+)
+from import_2d import load_2d_outer, DEFAULT_CHORD_TOL
+from feed_schedule import apply_feed_schedule, summary_text as feed_summary
 
 
 class PathTab(QWidget):
@@ -46,6 +50,22 @@ class PathTab(QWidget):
         self.chk_rotate = QCheckBox("Makineye göre 90° döndür (X400/Y800)")
         self.chk_rotate.setChecked(True)
 
+        # Akışlı mod: STL'i belleğe almadan parça parça işle (çok büyük dosyalar)
+        self.chk_stream = QCheckBox("Akışlı mod (büyük STL)")
+        self.chk_stream.setChecked(False)
+
+        self.spin_chunk = QSpinBox()
+        self.spin_chunk.setRange(10_000, 5_000_000)
+        self.spin_chunk.setSingleStep(50_000)
+        self.spin_chunk.setValue(200_000)
+
+        # DXF/SVG eğrileri için kiriş toleransı
+        self.spin_chord = QDoubleSpinBox()
+        self.spin_chord.setRange(0.0001, 1.0)
+        self.spin_chord.setDecimals(4)
+        self.spin_chord.setSingleStep(0.005)
+        self.spin_chord.setValue(DEFAULT_CHORD_TOL)
+
         def row(lbl, widget):
             box = QHBoxLayout()
             box.addWidget(QLabel(lbl))
@@ -56,9 +76,46 @@ class PathTab(QWidget):
         row("Nokta Seyreltme:", self.spin_step_dec)
         row("Yüzeyden derinlik (mm):", self.spin_depth)
         pg_layout.addWidget(self.chk_rotate)
+        pg_layout.addWidget(self.chk_stream)
+        row("Parça (üçgen):", self.spin_chunk)
+        row("Kiriş tol. (mm):", self.spin_chord)
 
         layout.addWidget(param_group)
 
+        # --- Besleme planı (A ekseni hızına göre) ---
+        feed_group = QGroupBox("Besleme Planı")
+        fg_layout = QHBoxLayout()
+        feed_group.setLayout(fg_layout)
+
+        self.chk_feed = QCheckBox("A ekseni hızına göre besleme planla")
+        self.chk_feed.setChecked(False)
+
+        self.spin_feed_max = QDoubleSpinBox()
+        self.spin_feed_max.setRange(1.0, 100000.0)
+        self.spin_feed_max.setDecimals(0)
+        self.spin_feed_max.setValue(2000.0)
+
+        self.spin_feed_min = QDoubleSpinBox()
+        self.spin_feed_min.setRange(1.0, 100000.0)
+        self.spin_feed_min.setDecimals(0)
+        self.spin_feed_min.setValue(100.0)
+
+        # Bu açıdan büyük dönüşlerde bıçak kaldırılıp döndürülür (0: kapalı)
+        self.spin_corner = QDoubleSpinBox()
+        self.spin_corner.setRange(0.0, 360.0)
+        self.spin_corner.setDecimals(1)
+        self.spin_corner.setValue(60.0)
+
+        fg_layout.addWidget(self.chk_feed)
+        for lbl, widget in (("En yüksek F (mm/dk):", self.spin_feed_max),
+                            ("En düşük F (mm/dk):", self.spin_feed_min),
+                            ("Köşe kaldırma açısı (°):", self.spin_corner)):
+            fg_layout.addWidget(QLabel(lbl))
+            fg_layout.addWidget(widget)
+        fg_layout.addStretch(1)
+
+        layout.addWidget(feed_group)
+
         # --- Progress + buton ---
         top = QHBoxLayout()
         self.progress = QProgressBar()
@@ -66,8 +123,13 @@ class PathTab(QWidget):
         btn_run = QPushButton("Yol Üret")
         btn_run.clicked.connect(self.on_run)
 
+        # Düz parçalar: STL yerine doğrudan DXF/SVG konturu
+        btn_run_2d = QPushButton("DXF/SVG'den Yol...")
+        btn_run_2d.clicked.connect(self.on_run_2d)
+
         top.addWidget(self.progress, 1)
         top.addWidget(btn_run)
+        top.addWidget(btn_run_2d)
         layout.addLayout(top)
 
         # --- Log kutusu ---
@@ -76,20 +138,82 @@ class PathTab(QWidget):
         self.log_edit.setMinimumHeight(200)
         layout.addWidget(self.log_edit, 1)
 
+    # ------------ Ayarlar (proje dosyası) ------------
+
+    def get_settings(self) -> dict:
+        return {
+            "min_area": self.spin_min_area.value(),
+            "step_decimate": self.spin_step_dec.value(),
+            "depth": self.spin_depth.value(),
+            "rotate_90": self.chk_rotate.isChecked(),
+            "streaming": self.chk_stream.isChecked(),
+            "chunk_size": self.spin_chunk.value(),
+            "chord_tol": self.spin_chord.value(),
+            "feed_schedule": self.chk_feed.isChecked(),
+            "feed_max": self.spin_feed_max.value(),
+            "feed_min": self.spin_feed_min.value(),
+            "corner_deg": self.spin_corner.value(),
+        }
+
+    def apply_settings(self, data: dict):
+        if "min_area" in data:
+            self.spin_min_area.setValue(float(data["min_area"]))
+        if "step_decimate" in data:
+            self.spin_step_dec.setValue(int(data["step_decimate"]))
+        if "depth" in data:
+            self.spin_depth.setValue(float(data["depth"]))
+        if "rotate_90" in data:
+            self.chk_rotate.setChecked(bool(data["rotate_90"]))
+        if "streaming" in data:
+            self.chk_stream.setChecked(bool(data["streaming"]))
+        if "chunk_size" in data:
+            self.spin_chunk.setValue(int(data["chunk_size"]))
+        if "chord_tol" in data:
+            self.spin_chord.setValue(float(data["chord_tol"]))
+        if "feed_schedule" in data:
+            self.chk_feed.setChecked(bool(data["feed_schedule"]))
+        if "feed_max" in data:
+            self.spin_feed_max.setValue(float(data["feed_max"]))
+        if "feed_min" in data:
+            self.spin_feed_min.setValue(float(data["feed_min"]))
+        if "corner_deg" in data:
+            self.spin_corner.setValue(float(data["corner_deg"]))
+
     # ------------ Logic ------------
 
     def log(self, text):
         self.log_edit.append(text)
         self.log_edit.ensureCursorVisible()
 
+    def _schedule_feed(self, path_data):
+        """Seçiliyse yola besleme planı kolonlarını (feed/lift) ekle."""
+        if not self.chk_feed.isChecked():
+            return
+        try:
+            info = apply_feed_schedule(
+                path_data,
+                feed_max=self.spin_feed_max.value(),
+                feed_min=self.spin_feed_min.value(),
+                corner_deg=self.spin_corner.value(),
+            )
+        except Exception as e:
+            self.log(f"Besleme planı hatası: {e}")
+            return
+        self.log(feed_summary(info))
+
     def _progress_cb(self, pct, msg):
         self.progress.setValue(pct)
         self.progress.setFormat(f"{pct}% - {msg}")
         QCoreApplication.processEvents()
 
     def on_run(self):
+        streaming = self.chk_stream.isChecked()
         mesh = self.main_window.get_mesh()
-        if mesh is None:
+        stl_path = self.main_window.get_mesh_path()
+        if streaming and not stl_path:
+            QMessageBox.warning(self, "Uyarı", "Önce Model sekmesinde STL seçin.")
+            return
+        if not streaming and mesh is None:
             QMessageBox.warning(self, "Uyarı", "Önce Model sekmesinde STL yükleyin.")
             return
 
@@ -107,15 +231,27 @@ class PathTab(QWidget):
         self.progress.setValue(0)
 
         try:
-            path_data = generate_path(
-                mesh,
-                transform_matrix=M,
-                min_area=min_area,
-                step_decimate=step_dec,
-                rotate_90_for_machine=rotate_90,
-                depth_from_top=depth,
-                progress_callback=self._progress_cb,
-            )
+            if streaming:
+                path_data = generate_tangential_path_streaming(
+                    stl_path,
+                    transform_matrix=M,
+                    min_area=min_area,
+                    step_decimate=step_dec,
+                    rotate_90_for_machine=rotate_90,
+                    depth_from_top=depth,
+                    chunk_size=self.spin_chunk.value(),
+                    progress_callback=self._progress_cb,
+                )
+            else:
+                path_data = generate_path(
+                    mesh,
+                    transform_matrix=M,
+                    min_area=min_area,
+                    step_decimate=step_dec,
+                    rotate_90_for_machine=rotate_90,
+                    depth_from_top=depth,
+                    progress_callback=self._progress_cb,
+                )
         except Exception as e:
             self.log(f"Hata: {e}")
             QMessageBox.critical(self, "Hata", str(e))
@@ -127,6 +263,47 @@ class PathTab(QWidget):
             f"Y aralığı: {path_data.xy[:,1].min():.2f}..{path_data.xy[:,1].max():.2f}"
         )
 
+        self._schedule_feed(path_data)
+        self.main_window.set_path_data(path_data)
+        self.progress.setValue(100)
+        self.progress.setFormat("Tamamlandı")
+
+    def on_run_2d(self):
+        """DXF/SVG çizimindeki dış konturdan, mesh işlemeden yol üret."""
+        fname, _ = QFileDialog.getOpenFileName(
+            self,
+            "2D çizim seç",
+            "",
+            "2D Çizimler (*.dxf *.svg);;DXF (*.dxf);;SVG (*.svg);;Tüm Dosyalar (*)",
+        )
+        if not fname:
+            return
+        self.load_2d_file(fname)
+
+    def load_2d_file(self, fname):
+        self.log(f"2D dosyadan yol üretimi: {fname}")
+        self.progress.setValue(0)
+        try:
+            self._progress_cb(10, "2D çizim okunuyor...")
+            contour, n_contours = load_2d_outer(fname, chord_tol=self.spin_chord.value())
+            path_data = generate_path_from_contour(
+                contour,
+                step_decimate=self.spin_step_dec.value(),
+                rotate_90_for_machine=self.chk_rotate.isChecked(),
+                depth_from_top=self.spin_depth.value(),
+                meta={"source_2d": fname, "contours": n_contours},
+                progress_callback=self._progress_cb,
+            )
+        except Exception as e:
+            self.log(f"Hata: {e}")
+            QMessageBox.critical(self, "Hata", str(e))
+            return
+
+        self.log(
+            f"Yol üretildi ({n_contours} kontur, en büyüğü kullanıldı). "
+            f"Nokta sayısı: {len(path_data.xy)}"
+        )
+        self._schedule_feed(path_data)
         self.main_window.set_path_data(path_data)
         self.progress.setValue(100)
         self.progress.setFormat("Tamamlandı")
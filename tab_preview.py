@@ -2,9 +2,12 @@ from knife_visual import compute_path_tangent_angle_deg, estimate_visual_length,
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QMessageBox, QComboBox
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
 import numpy as np
+from functools import partial
 
-from gcode_generator import generate_gcode_flat
+from gcode_generator import gcode_program_flat
+from path_colors import COLOR_MODES, PathColors, legend_text
 
 
 class PreviewTab(QWidget):
@@ -14,6 +17,8 @@ class PreviewTab(QWidget):
         super().__init__()
         self.main_window = main_window
         self.path_data = None
+        # Yolun renk kolonları (path_colors; moda göre bir kez hesaplanır)
+        self.path_colors = None
 
         # Ham yol (döndürmeden önceki)
         self.base_x = None
@@ -21,6 +26,9 @@ class PreviewTab(QWidget):
 
         # Görünüm döndürme açısı (sadece ekranda)
         self.view_angle_deg = 0.0
+        # Yol çizimi sekme görünür olunca yapılır (proje açılışında
+        # dizileri gereksiz yere okumamak için)
+        self._path_pending = False
 
         layout = QVBoxLayout()
         self.setLayout(layout)
@@ -45,6 +53,13 @@ class PreviewTab(QWidget):
         self.combo_knife.addItem("Bıçak: -180°")
         bottom.addWidget(self.combo_knife)
 
+        # Yolun renklendirilmesi (Z, A hızı, besleme, kontur sapması)
+        self.combo_color = QComboBox()
+        for _key, label, _unit in COLOR_MODES:
+            self.combo_color.addItem(label)
+        self.combo_color.currentIndexChanged.connect(lambda _i: self._redraw_from_base())
+        bottom.addWidget(self.combo_color)
+
         bottom.addStretch(1)
 
         self.btn_rot_ccw = QPushButton("↺ 90°")
@@ -76,11 +91,36 @@ class PreviewTab(QWidget):
     # ------------------------------------------------------------------ public API
 
     def set_path_data(self, path_data):
-        """MainWindow burayı çağırıyor."""
+        """MainWindow burayı çağırıyor; çizim sekme görünür olunca yapılır."""
         self.path_data = path_data
+        self.path_colors = None
         self.view_angle_deg = 0.0  # yeni yol geldiğinde açıyı sıfırla
+        self._path_pending = True
+        if self.isVisible():
+            self._load_pending()
+
+    def _load_pending(self):
+        if not self._path_pending:
+            return
+        self._path_pending = False
         self._update_plot_from_pathdata()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._load_pending()
+
+    def get_settings(self) -> dict:
+        """Proje dosyası için G-kodu seçenekleri."""
+        return {"knife_index": self.combo_knife.currentIndex(),
+                "color_mode": COLOR_MODES[self.combo_color.currentIndex()][0]}
+
+    def apply_settings(self, data: dict):
+        if "knife_index" in data:
+            self.combo_knife.setCurrentIndex(int(data["knife_index"]))
+        keys = [key for key, _label, _unit in COLOR_MODES]
+        if data.get("color_mode") in keys:
+            self.combo_color.setCurrentIndex(keys.index(data["color_mode"]))
+
     # ------------------------------------------------------------------ G-kodu üret (Z takipsiz)
 
     def on_generate_gcode_flat(self):
@@ -104,8 +144,11 @@ class PreviewTab(QWidget):
             knife_offset = -180.0
 
         origin_mode = self.main_window.get_origin_mode()
-        gcode = generate_gcode_flat(path_data, knife_offset_deg=knife_offset, origin_mode=origin_mode)
-        self.main_window.set_gcode_text(gcode)
+        # Metin burada üretilmez; G-kodu sekmesi çıktı seçeneklerine göre programı
+        # kurar, önizleme ve kayıt için akışla çeker
+        job = partial(gcode_program_flat, path_data,
+                      knife_offset_deg=knife_offset, origin_mode=origin_mode)
+        self.main_window.set_gcode_job(job)
 
 
     # ------------------------------------------------------------------ iç mantık
@@ -149,8 +192,17 @@ class PreviewTab(QWidget):
         # Döndürülmüş koordinatları hesapla
         x_draw, y_draw = self._get_rotated_coords()
 
-        # Çizim
-        self.ax.plot(x_draw, y_draw, "-")
+        # Çizim: düz modda tek çizgi, renkli modda segment başına renk
+        # (segment bitiş noktasının rengini alır) tek LineCollection
+        mode = COLOR_MODES[self.combo_color.currentIndex()][0]
+        entry = self._colors().get(mode)
+        if entry is None or len(x_draw) < 2:
+            self.ax.plot(x_draw, y_draw, "-")
+        else:
+            xy = np.column_stack((x_draw, y_draw))
+            segments = np.stack((xy[:-1], xy[1:]), axis=1)
+            self.ax.add_collection(LineCollection(segments, colors=entry[0][1:] / 255.0,
+                                                  linewidths=1.5))
         self.ax.plot([x_draw[0]], [y_draw[0]], "ro")  # başlangıç
 
         self.ax.set_aspect("equal", adjustable="box")
@@ -169,15 +221,28 @@ class PreviewTab(QWidget):
         self.ax.set_xlim(x_min - dx, x_max + dx)
         self.ax.set_ylim(y_min - dy, y_max + dy)
 
+        legend = legend_text(mode, None if entry is None else entry[1])
         self.label_info.setText(
             f"Nokta sayısı: {len(x_draw)} | "
             f"X: {x_min:.2f}..{x_max:.2f} | "
             f"Y: {y_min:.2f}..{y_max:.2f} | "
             f"Açı: {self.view_angle_deg:.0f}°"
+            + (f" | {legend}" if legend else "")
         )
 
         self.canvas.draw()
 
+    def _colors(self) -> PathColors:
+        """path_data'nın renk kolonları (XY + Z; yoksa Z = 0)."""
+        if self.path_colors is None:
+            n = len(self.base_x)
+            z = getattr(self.path_data, "z", None)
+            z = np.zeros(n) if z is None or len(z) != n else np.asarray(z, dtype=float)
+            points = np.column_stack((self.base_x, self.base_y, z))
+            self.path_colors = PathColors(self.path_data, points,
+                                          getattr(self.path_data, "angles", None))
+        return self.path_colors
+
     def _get_rotated_coords(self):
         """view_angle_deg'e göre base_x/base_y'i döndür."""
         if self.base_x is None or self.base_y is None:
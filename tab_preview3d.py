@@ -1,22 +1,52 @@
 from knife_visual import compute_path_tangent_angle_deg, estimate_visual_length, draw_knife_gl_3d, draw_knife_2d_matplotlib
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QOpenGLWidget, QLabel, QPushButton, QComboBox, QMessageBox
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QOpenGLWidget, QLabel, QPushButton, QComboBox, QCheckBox, QMessageBox, QSlider
 from PyQt5.QtCore import Qt, QPoint
 
 from OpenGL.GL import (
     glClearColor, glEnable, glClear, glViewport,
     glMatrixMode, glLoadIdentity, glTranslatef, glRotatef,
     glBegin, glEnd, glVertex3f, glColor3f, glLineWidth,
-    glPointSize, glRasterPos3f,
+    glPointSize, glRasterPos3f, glShadeModel, glDepthFunc,
+    glEnableClientState, glDisableClientState, glVertexPointer, glColorPointer,
+    glDrawArrays, glPushMatrix, glPopMatrix, glMultMatrixf,
     GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT,
     GL_DEPTH_TEST, GL_PROJECTION, GL_MODELVIEW,
     GL_LINES, GL_LINE_STRIP, GL_POINTS,
+    GL_VERTEX_ARRAY, GL_COLOR_ARRAY, GL_FLOAT, GL_UNSIGNED_BYTE,
+    GL_FLAT, GL_SMOOTH, GL_LESS, GL_LEQUAL,
 )
 from OpenGL.GLU import gluPerspective
 from OpenGL.GLUT import glutInit, glutBitmapCharacter, GLUT_BITMAP_HELVETICA_18
 
 import numpy as np
-
-from gcode_generator import generate_gcode_3d
+from functools import partial
+
+import gl_resources
+from render_stats import RenderStats, draw_overlay
+from path_lod import PathPyramid
+from path_colors import COLOR_MODES, PathColors, legend_text
+from knife_glyphs import KnifeGlyphs
+from playback import Playback, Timeline, SPEEDS
+from feed_schedule import a_axis_speed
+from cycle_time import format_duration
+from gcode_generator import gcode_program_3d
+
+
+# Geri çizim renkleri: G0 (gri), G1 (koyu yeşil), G2 / G3 (mavi / mor)
+BACKPLOT_COLORS = np.array([
+    [150, 150, 150],
+    [0, 130, 60],
+    [30, 90, 220],
+    [150, 60, 200],
+], dtype=np.uint8)
+
+
+# Tel kafes modları: (ayar adı, etiket)
+WIRE_MODES = (
+    ("all", "Kenarlar: tümü"),
+    ("feature", "Kenarlar: sadece keskin"),
+    ("none", "Kenarlar: gizle"),
+)
 
 
 class Path3DViewer(QOpenGLWidget):
@@ -47,16 +77,107 @@ class Path3DViewer(QOpenGLWidget):
         self.last_pos = QPoint()
 
         # Çizilecek veriler
-        self.mesh = None          # Trimesh
+        self.mesh = None          # gl_resources.SharedMesh (Model sekmesiyle ortak)
+        self.model_matrix = None  # (4,4) mesh'in yönü / ölçeği (None: birim)
         self.path_points = None   # (N,3) numpy array
+        self._path_lod = None     # path_points'in seyreltme piramidi (ilk çizimde)
+        self.path_angles = None   # (N,) A açıları (derece) ya da None
+        # Yolun renklendirilmesi: mod ve PathData (besleme / kontur için);
+        # renk kolonları moda göre bir kez hesaplanır (path_colors)
+        self.color_mode = "flat"
+        self._path_source = None
+        self._path_colors = None
+        # Yol boyunca bıçak yönü işaretleri (knife_glyphs, ilk çizimde kurulur)
+        self.show_knife = False
+        self._glyphs = None
+        # Simülasyon: (segment indisi, konum, A açısı) ya da None
+        self.playhead = None
+        # Diskten açılan G-kodunun geri çizimi: (P,3) float32 + (P,3) uint8 renk
+        self.backplot_points = None
+        self.backplot_colors = None
+
+        # Tel kafes modu; kenar indisleri moda göre bir kez hesaplanır ve
+        # ilk çizimde GPU'ya yüklenir (köşe tamponu Model sekmesiyle ortak)
+        self.wire_mode = "all"
+        self.wire_lines = 0
+
+        # Kare istatistikleri; show_stats ile sol üstte gösterilir
+        self.stats = RenderStats()
+        self.show_stats = False
 
     # ---------- DIŞ ARAYÜZ ----------
 
-    def set_mesh(self, mesh):
-        """Model sekmesi STL yüklediğinde çağrılır."""
+    def set_mesh(self, mesh, matrix=None):
+        """
+        Model sekmesi STL yüklediğinde / döndürdüğünde çağrılır.
+
+        mesh  : gl_resources.SharedMesh (köşeler dönüştürülmez)
+        matrix: (4,4) yön / ölçek matrisi (stl_loader.make_transform_matrix);
+                çizimde model matrisi olarak uygulanır.
+        """
         self.mesh = mesh
+        self.model_matrix = (None if matrix is None
+                             else np.ascontiguousarray(np.asarray(matrix).T, dtype=np.float32))
+        self.update()
+
+    def set_playhead(self, state):
+        """
+        Oynatma konumu (playback.Timeline.state_at sonucu; None: kapalı).
+        Kesilmiş kısım ve bıçak çizilir, yol tamponu yeniden yüklenmez.
+        """
+        self.playhead = state
+        self.update()
+
+    def set_show_knife(self, visible: bool):
+        """Yol boyunca A açısını gösteren bıçak işaretlerini aç / kapat."""
+        self.show_knife = bool(visible)
+        self.update()
+
+    def set_color_mode(self, mode: str):
+        """
+        Yolu bir özniteliğe göre renklendir ("flat": düz). Dönen: renk
+        skalasının (alt, üst) değerleri; düz modda ya da veri yoksa None.
+        Renkler moda göre bir kez hesaplanıp yüklenir, mod değiştirmek
+        sadece bağlanan renk tamponunu değiştirir.
+        """
+        self.color_mode = mode
+        entry = self.path_colors().get(mode) if self.path_points is not None else None
+        self.update()
+        return None if entry is None else entry[1]
+
+    def path_colors(self) -> PathColors:
+        """Geçerli yolun renk kolonları (yol değişince yeniden kurulur)."""
+        pts = self.path_points
+        if self._path_colors is None or self._path_colors.points is not pts:
+            self._path_colors = PathColors(self._path_source, pts, self.path_angles)
+        return self._path_colors
+
+    def set_wire_mode(self, mode: str):
+        """Tel kafes: "all" (tekil kenarlar), "feature" (keskin kenarlar), "none"."""
+        if mode == self.wire_mode:
+            return
+        self.wire_mode = mode
+        self.update()
+
+    def set_stats_overlay(self, visible: bool):
+        self.show_stats = bool(visible)
         self.update()
 
+    def render_stats(self) -> dict:
+        """Kare süresi yüzdelikleri, FPS, çizilen çizgi vb. (RenderStats.snapshot)."""
+        return self.stats.snapshot()
+
+    def request_update(self):
+        """Fare olayları için update(): bekleyen çizim varsa istek birleştirilir."""
+        if self.stats.request():
+            self.update()
+
+    def wire_edges(self):
+        """Geçerli moddaki kenarlar (E,2); mesh yoksa ya da mod "none" ise None."""
+        if self.mesh is None or self.wire_mode == "none":
+            return None
+        return self.mesh.edges(self.wire_mode)
+
     def set_path_data(self, path_data):
         """
         Yol verisini alır.
@@ -67,13 +188,20 @@ class Path3DViewer(QOpenGLWidget):
 
         Z dizisi yoksa 0 kabul edilir.
         """
+        self._path_source = None if isinstance(path_data, dict) else path_data
         if path_data is None:
             self.path_points = None
+            self.path_angles = None
             self.update()
             return
 
         xy = None
         z = None
+        if isinstance(path_data, dict):
+            angles = path_data.get("angles")
+        else:
+            angles = getattr(path_data, "angles", None)
+        self.path_angles = None if angles is None else np.asarray(angles, dtype=float)
 
         # dict ise
         if isinstance(path_data, dict):
@@ -119,6 +247,19 @@ class Path3DViewer(QOpenGLWidget):
         self.path_points = np.column_stack((xy[:, 0], xy[:, 1], z))
         self.update()
 
+    def set_backplot(self, points, kinds):
+        """
+        G-kodu geri çizimi: points (P,3), kinds (P,) noktada biten hareketin
+        tipi (0: G0, 1: G1, 2/3: G2/G3). None ile temizlenir.
+        """
+        if points is None or len(points) < 2:
+            self.backplot_points = None
+            self.backplot_colors = None
+        else:
+            self.backplot_points = np.ascontiguousarray(points, dtype=np.float32)
+            self.backplot_colors = BACKPLOT_COLORS[np.clip(kinds, 0, 3)]
+        self.update()
+
     # ---------- OPENGL CALLBACK'LERİ ----------
 
     def initializeGL(self):
@@ -126,6 +267,16 @@ class Path3DViewer(QOpenGLWidget):
         glClearColor(0.98, 0.97, 0.90, 1.0)
         glEnable(GL_DEPTH_TEST)
 
+        ctx = self.context()
+        if ctx is not None:
+            ctx.aboutToBeDestroyed.connect(self._release_gl)
+
+    def _release_gl(self):
+        """GL bağlamı yok edilmeden önce (grupta son bağlamsa) tamponları bırak."""
+        self.makeCurrent()
+        gl_resources.release_context()
+        self.doneCurrent()
+
     def resizeGL(self, w, h):
         glViewport(0, 0, w, h)
         glMatrixMode(GL_PROJECTION)
@@ -136,6 +287,8 @@ class Path3DViewer(QOpenGLWidget):
 
     def paintGL(self):
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        self.stats.begin_frame()
+        gl_resources.collect()
 
         glMatrixMode(GL_MODELVIEW)
         glLoadIdentity()
@@ -159,6 +312,13 @@ class Path3DViewer(QOpenGLWidget):
         if self.path_points is not None:
             self._draw_path()
 
+        if self.backplot_points is not None:
+            self._draw_backplot()
+
+        self.stats.end_frame()
+        if self.show_stats:
+            draw_overlay(self.stats.text_lines(), self.width(), self.height())
+
     # ---------- ÇİZİM FONKSİYONLARI ----------
 
     def _draw_grid(self):
@@ -219,40 +379,18 @@ class Path3DViewer(QOpenGLWidget):
 
     def _draw_mesh(self):
         """
-        Trimesh üçgenlerini çiz.
+        Tel kafes: tekil (ya da keskin) kenarlar, tek glDrawElements çağrısı.
+        Mesh'in yönü model matrisiyle verilir.
         """
         # Mesh rengi: koyu mavi
         glColor3f(0.0, 0.0, 0.8)
-        glBegin(GL_LINES)
-        # Çok detaylı doldurma yapmak yerine sadece kenarları kaba şekilde çiziyoruz
-        # performans ve sadelik için.
-        try:
-            faces = self.mesh.faces
-            vertices = self.mesh.vertices
-        except Exception:
-            glEnd()
-            return
-
-        n_faces = len(faces)
-        for i, f in enumerate(faces):
-            if i % 5000 == 0 and n_faces > 0:
-                # İleride buraya istenirse progress hesabı eklenebilir
-                pass
-
-            v0 = vertices[f[0]]
-            v1 = vertices[f[1]]
-            v2 = vertices[f[2]]
-
-            glVertex3f(v0[0], v0[1], v0[2])
-            glVertex3f(v1[0], v1[1], v1[2])
-
-            glVertex3f(v1[0], v1[1], v1[2])
-            glVertex3f(v2[0], v2[1], v2[2])
-
-            glVertex3f(v2[0], v2[1], v2[2])
-            glVertex3f(v0[0], v0[1], v0[2])
-
-        glEnd()
+        glLineWidth(1.0)
+        glPushMatrix()
+        if self.model_matrix is not None:
+            glMultMatrixf(self.model_matrix)
+        self.wire_lines = gl_resources.draw_edges(self.mesh, self.wire_mode, "preview3d")
+        self.stats.add_lines(self.wire_lines)
+        glPopMatrix()
 
     def _draw_path(self):
         """
@@ -263,14 +401,33 @@ class Path3DViewer(QOpenGLWidget):
         if pts is None or len(pts) == 0:
             return
 
-        # Yol çizgisi
+        # Yol çizgisi: GPU'daki noktalardan ekran ölçeğine uygun seviye
         glColor3f(1.0, 0.2, 0.0)
         glLineWidth(2.0)
-        glBegin(GL_LINE_STRIP)
-        for x, y, z in pts:
+        if self._path_lod is None or self._path_lod.source is not pts:
             # Yüzeyle üst üste binmemesi için Z'yi azıcık yukarı kaydırıyoruz
-            glVertex3f(x, y, z + 0.1)
-        glEnd()
+            self._path_lod = PathPyramid(pts + (0.0, 0.0, 0.1))
+            self._path_lod.source = pts
+        self._path_lod.colors = self.path_colors()
+        color_mode = None
+        if self.playhead is not None:
+            # Kesilecek kısım soluk, kesilmiş kısım aynı köşelerle üstüne
+            glColor3f(0.95, 0.75, 0.65)
+        elif self._path_lod.colors.get(self.color_mode) is not None:
+            color_mode = self.color_mode
+        self.stats.add_lines(self._path_lod.draw("preview3d", color_mode=color_mode))
+        if color_mode is not None:
+            # Renk dizisinden sonra geçerli renk tanımsız kalır
+            glColor3f(1.0, 0.2, 0.0)
+        if self.playhead is not None:
+            self._draw_playhead(pts)
+
+        if self.show_knife:
+            if self._glyphs is None or self._glyphs.source is not pts:
+                self._glyphs = KnifeGlyphs(pts, self.path_angles)
+                self._glyphs.source = pts
+            glColor3f(0.15, 0.15, 0.15)
+            self.stats.add_triangles(self._glyphs.draw("preview3d"))
 
         # Başlangıç noktasını küçük bir nokta ile işaretleyelim
         glPointSize(6.0)
@@ -280,6 +437,42 @@ class Path3DViewer(QOpenGLWidget):
         glEnd()
         glPointSize(1.0)
 
+    def _draw_playhead(self, pts):
+        """Simülasyonda kesilmiş yol (tampon öneki) ve hareketli bıçak."""
+        i, pos, angle = self.playhead
+        glColor3f(1.0, 0.2, 0.0)
+        glLineWidth(3.0)
+        glDepthFunc(GL_LEQUAL)
+        last = self._path_lod.draw_upto(i, "preview3d")
+        glDepthFunc(GL_LESS)
+        # Seviyenin son tutulan noktasından bıçağa kadar olan kısa parça
+        glBegin(GL_LINE_STRIP)
+        for x, y, z in (pts[last], pts[i], pos):
+            glVertex3f(x, y, z + 0.1)
+        glEnd()
+        glLineWidth(1.0)
+
+        span = float(np.linalg.norm(self._path_lod.hi - self._path_lod.lo))
+        glColor3f(0.1, 0.1, 0.1)
+        draw_knife_gl_3d(pos, angle, max(5.0, 0.04 * span), lift_z=0.3)
+
+    def _draw_backplot(self):
+        """
+        Geri çizimi tek bir köşe dizisi çağrısıyla çiz. Düz gölgelemede her
+        segment bitiş noktasının (o hareketin) rengini alır.
+        """
+        glLineWidth(1.0)
+        glShadeModel(GL_FLAT)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, self.backplot_points)
+        glColorPointer(3, GL_UNSIGNED_BYTE, 0, self.backplot_colors)
+        glDrawArrays(GL_LINE_STRIP, 0, len(self.backplot_points))
+        self.stats.add_lines(len(self.backplot_points) - 1)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glShadeModel(GL_SMOOTH)
+
     def _draw_text3d(self, x, y, z, text: str):
         """
         Basit 3D metin çizimi (eksen isimleri için).
@@ -304,7 +497,7 @@ class Path3DViewer(QOpenGLWidget):
             self.rot_y += dx * 0.5
 
         self.last_pos = event.pos()
-        self.update()
+        self.request_update()
 
     def wheelEvent(self, event):
         delta = event.angleDelta().y()
@@ -316,13 +509,14 @@ class Path3DViewer(QOpenGLWidget):
 
         # Aşırıya kaçmasın
         self.distance = max(50.0, min(5000.0, self.distance))
-        self.update()
+        self.request_update()
 
 
 class Preview3DTab(QWidget):
     """
     3D Önizleme sekmesi:
       - Path3DViewer (Z derinlikli yolu gösterir)
+      - Simülasyon: oynat / duraklat, zaman çubuğu, hız çarpanı
       - Alt kısımda: bıçak yönü seçimi + G-kodu oluştur (Z'li) butonu
     """
 
@@ -337,6 +531,37 @@ class Preview3DTab(QWidget):
         self.viewer = Path3DViewer(self)
         layout.addWidget(self.viewer, 1)
 
+        # Simülasyon: oynat / duraklat, zaman çubuğu, hız, A ekseni sınırı
+        sim = QHBoxLayout()
+        layout.addLayout(sim)
+        self.playback = Playback(self)
+        self.playback.moved.connect(self._on_playback_moved)
+        self.playback.state_changed.connect(self._on_playback_state)
+        self.btn_play = QPushButton("Oynat")
+        self.btn_play.setEnabled(False)
+        self.btn_play.clicked.connect(self.playback.toggle)
+        sim.addWidget(self.btn_play)
+        self.slider_time = QSlider(Qt.Horizontal)
+        self.slider_time.setRange(0, 1000)
+        self.slider_time.setEnabled(False)
+        self.slider_time.sliderMoved.connect(self._on_slider_moved)
+        sim.addWidget(self.slider_time, 1)
+        self.label_time = QLabel("")
+        sim.addWidget(self.label_time)
+        self.combo_speed = QComboBox()
+        for speed in SPEEDS:
+            self.combo_speed.addItem(f"{speed:g}x")
+        self.combo_speed.currentIndexChanged.connect(
+            lambda i: self.playback.set_speed(SPEEDS[i]))
+        sim.addWidget(self.combo_speed)
+        self.chk_a_limit = QCheckBox("A ekseni sınırı")
+        self.chk_a_limit.setChecked(True)
+        self.chk_a_limit.toggled.connect(self._rebuild_timeline)
+        sim.addWidget(self.chk_a_limit)
+        self._sim_path = None
+        # Yol, sekme görünür olunca görüntüleyiciye verilir (set_path_data)
+        self._path_pending = False
+
         # Altta kontrol çubuğu
         bottom = QHBoxLayout()
         layout.addLayout(bottom)
@@ -349,17 +574,147 @@ class Preview3DTab(QWidget):
         self.combo_knife.addItem("Bıçak: -180°")
         bottom.addWidget(self.combo_knife)
 
+        # Mesh tel kafesi: tüm tekil kenarlar / sadece keskin kenarlar / gizli
+        self.combo_wire = QComboBox()
+        for _key, label in WIRE_MODES:
+            self.combo_wire.addItem(label)
+        self.combo_wire.currentIndexChanged.connect(self._on_wire_mode_changed)
+        bottom.addWidget(self.combo_wire)
+
+        # Yol boyunca bıçak yönü (A açısı) işaretleri
+        self.chk_knife = QCheckBox("Bıçak yönleri")
+        self.chk_knife.toggled.connect(self.viewer.set_show_knife)
+        bottom.addWidget(self.chk_knife)
+
+        # Yolun renklendirilmesi (Z, A hızı, besleme, kontur sapması)
+        self.combo_color = QComboBox()
+        for _key, label, _unit in COLOR_MODES:
+            self.combo_color.addItem(label)
+        self.combo_color.currentIndexChanged.connect(self._on_color_mode_changed)
+        bottom.addWidget(self.combo_color)
+        self.label_color = QLabel("")
+        bottom.addWidget(self.label_color)
+
         bottom.addStretch(1)
 
+        # Diskten açılan G-kodu dosyasının geri çizimi
+        self.label_backplot = QLabel("")
+        bottom.addWidget(self.label_backplot)
+        self.btn_clear_backplot = QPushButton("Geri Çizimi Kaldır")
+        self.btn_clear_backplot.clicked.connect(lambda: self.set_backplot(None))
+        self.btn_clear_backplot.setVisible(False)
+        bottom.addWidget(self.btn_clear_backplot)
+
         self.btn_make_gcode_3d = QPushButton("G-kodu oluştur (Z'li)")
         self.btn_make_gcode_3d.clicked.connect(self.on_generate_gcode_3d)
         bottom.addWidget(self.btn_make_gcode_3d)
 
-    def set_mesh(self, mesh):
-        self.viewer.set_mesh(mesh)
+    def set_mesh(self, mesh, matrix=None):
+        self.viewer.set_mesh(mesh, matrix)
+
+    def _on_wire_mode_changed(self, index: int):
+        self.viewer.set_wire_mode(WIRE_MODES[index][0])
+
+    def _on_color_mode_changed(self, index: int):
+        mode = COLOR_MODES[index][0]
+        self.label_color.setText(legend_text(mode, self.viewer.set_color_mode(mode)))
 
     def set_path_data(self, path_data):
-        self.viewer.set_path_data(path_data)
+        """Yol görüntüleyiciye, zaman çizelgesi ve renkler sekme görünür olunca kurulur."""
+        self._sim_path = path_data
+        self._path_pending = True
+        if self.isVisible():
+            self._load_pending()
+
+    def _load_pending(self):
+        if not self._path_pending:
+            return
+        self._path_pending = False
+        self.viewer.set_path_data(self._sim_path)
+        self._rebuild_timeline()
+        self._on_color_mode_changed(self.combo_color.currentIndex())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._load_pending()
+
+    # ---- Simülasyon ----
+
+    def _rebuild_timeline(self):
+        """Yol / A sınırı değişince zaman çizelgesini baştan kur."""
+        pts = self.viewer.path_points
+        if pts is None or len(pts) < 2:
+            self.playback.set_timeline(None)
+            self.viewer.set_playhead(None)
+            self.btn_play.setEnabled(False)
+            self.slider_time.setEnabled(False)
+            self.label_time.setText("")
+            return
+        feed = getattr(self._sim_path, "feed", None)
+        a_vmax = a_axis_speed() if self.chk_a_limit.isChecked() else None
+        timeline = Timeline(pts, self.viewer.path_angles, feed=feed, a_vmax=a_vmax)
+        self.btn_play.setEnabled(True)
+        self.slider_time.setEnabled(True)
+        self.playback.set_timeline(timeline)
+
+    def _on_slider_moved(self, value: int):
+        timeline = self.playback.timeline
+        if timeline is not None:
+            self.playback.seek(timeline.total * value / 1000.0)
+
+    def _on_playback_moved(self, t: float):
+        timeline = self.playback.timeline
+        if timeline is None:
+            return
+        total = timeline.total
+        if not self.slider_time.isSliderDown():
+            self.slider_time.blockSignals(True)
+            self.slider_time.setValue(int(round(1000.0 * t / total)) if total > 0 else 0)
+            self.slider_time.blockSignals(False)
+        self.label_time.setText(f"{format_duration(t)} / {format_duration(total)}")
+        # Sadece başta (t = 0, oynatılmıyorken) normal görünüm; duraklatınca
+        # oynatma kafası yerinde kalır
+        active = t > 0 or self.playback.is_playing()
+        self.viewer.set_playhead(timeline.state_at(t) if active else None)
+
+    def _on_playback_state(self, playing: bool):
+        self.btn_play.setText("Duraklat" if playing else "Oynat")
+
+    def set_backplot(self, parsed):
+        """gcode_parser.ParsedGCode'u yol çizgisinin üstüne çiz (None: kaldır)."""
+        if parsed is None or len(parsed) == 0:
+            self.viewer.set_backplot(None, None)
+            self.label_backplot.setText("")
+            self.btn_clear_backplot.setVisible(False)
+            return
+        points, kinds = parsed.backplot()
+        self.viewer.set_backplot(points, kinds)
+        self.label_backplot.setText(
+            f"Geri çizim: {len(parsed):,} hareket "
+            f"(gri G0, yeşil G1, mavi/mor G2/G3)"
+        )
+        self.btn_clear_backplot.setVisible(True)
+
+    def get_settings(self) -> dict:
+        """Proje dosyası için G-kodu seçenekleri."""
+        return {
+            "knife_index": self.combo_knife.currentIndex(),
+            "wire_mode": WIRE_MODES[self.combo_wire.currentIndex()][0],
+            "show_knife": self.chk_knife.isChecked(),
+            "color_mode": COLOR_MODES[self.combo_color.currentIndex()][0],
+        }
+
+    def apply_settings(self, data: dict):
+        if "knife_index" in data:
+            self.combo_knife.setCurrentIndex(int(data["knife_index"]))
+        keys = [key for key, _label in WIRE_MODES]
+        if data.get("wire_mode") in keys:
+            self.combo_wire.setCurrentIndex(keys.index(data["wire_mode"]))
+        if "show_knife" in data:
+            self.chk_knife.setChecked(bool(data["show_knife"]))
+        keys = [key for key, _label, _unit in COLOR_MODES]
+        if data.get("color_mode") in keys:
+            self.combo_color.setCurrentIndex(keys.index(data["color_mode"]))
 
     # ------------------------------------------------------------------ G-kodu üret (Z'li + bıçak yönü)
 
@@ -384,9 +739,12 @@ class Preview3DTab(QWidget):
             knife_offset = -180.0
 
         origin_mode = self.main_window.get_origin_mode()
-        gcode = generate_gcode_3d(
+        # Metin burada üretilmez; G-kodu sekmesi çıktı seçeneklerine göre programı
+        # kurar, önizleme ve kayıt için akışla çeker
+        job = partial(
+            gcode_program_3d,
             path_data,
             knife_offset_deg=knife_offset,
             origin_mode=origin_mode,
         )
-        self.main_window.set_gcode_text(gcode)
+        self.main_window.set_gcode_job(job)
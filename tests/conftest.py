@@ -0,0 +1,5 @@
+# Modüller depo kökünde (düz yapı); testler kökten içe aktarır.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
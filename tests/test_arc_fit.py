@@ -0,0 +1,138 @@
+"""
+G2/G3 yay uydurma: üretilen G-kodu gcode_parser ile geri okunur ve kaynak
+noktalarla karşılaştırılır (uydurma kodundan bağımsız).
+"""
+
+import numpy as np
+import pytest
+
+from arc_fit import ARC_CCW, fit_arcs
+from gcode_generator import gcode_program_flat
+from gcode_parser import parse_gcode
+from knife_glyphs import tangent_angles
+from path_generator import PathData
+
+TOLERANCE = 0.01
+# G-kodu 3 ondalıkla yazılır: koordinat ve merkez yuvarlaması için pay
+RESOLUTION = 0.001
+
+
+def _rounded_rect(n):
+    k = max(n // 4, 4)
+    t = np.linspace(0.0, 0.5 * np.pi, k)
+    parts = [np.column_stack((cx + 20 * np.cos(t + a0), cy + 20 * np.sin(t + a0)))
+             for cx, cy, a0 in ((180, 80, 0.0), (20, 80, 0.5 * np.pi),
+                                (20, 20, np.pi), (180, 20, 1.5 * np.pi))]
+    return np.vstack(parts + [parts[0][:1]])
+
+
+def _contours():
+    t = np.linspace(0.0, 2.0 * np.pi, 721)
+    u = np.linspace(0.0, 60.0, 1500)
+    return {
+        "çember": np.column_stack((100 + 40 * np.cos(t), 50 + 40 * np.sin(t))),
+        "elips": np.column_stack((100 + 80 * np.cos(t), 50 + 25 * np.sin(t))),
+        "conta": _rounded_rect(800),
+        "sinüs": np.column_stack((u * 3, 40 + 10 * np.sin(u / 4))),
+        "spiral": np.column_stack(((10 + 2 * u) * np.cos(u / 3), (10 + 2 * u) * np.sin(u / 3))),
+    }
+
+
+CONTOURS = _contours()
+
+
+def _arc_points(start, end, center, ccw, k):
+    """Yay üzerinde k nokta (başlangıçtan bitişe)."""
+    r = np.hypot(*(start - center))
+    a0 = np.arctan2(*(start - center)[::-1])
+    a1 = np.arctan2(*(end - center)[::-1])
+    sweep = (a1 - a0) % (2 * np.pi) if ccw else -((a0 - a1) % (2 * np.pi))
+    if sweep == 0:
+        sweep = 2 * np.pi if ccw else -2 * np.pi
+    a = a0 + sweep * np.linspace(0.0, 1.0, k)
+    return center + r * np.column_stack((np.cos(a), np.sin(a)))
+
+
+def _moves(parsed):
+    """Kesim hareketleri: (başlangıç (M,2), bitiş (M,2), merkez (M,2), tip (M,))."""
+    cut = parsed.kind != 0
+    return (parsed.starts()[cut, :2], parsed.end[cut, :2],
+            parsed.center[cut], parsed.kind[cut])
+
+
+def _point_to_moves(p, moves):
+    """Her noktanın hareketlere (doğru parçası ya da yay) en küçük uzaklığı."""
+    s, e, c, kind = moves
+    best = np.full(len(p), np.inf)
+    for a, b, cen, k in zip(s, e, c, kind):
+        if k >= 2:
+            r = np.hypot(*(a - cen))
+            ccw = k == ARC_CCW
+            ang0 = np.arctan2(*(a - cen)[::-1])
+            ang1 = np.arctan2(*(b - cen)[::-1])
+            span = (ang1 - ang0) % (2 * np.pi) if ccw else (ang0 - ang1) % (2 * np.pi)
+            span = span or 2 * np.pi
+            ang = np.arctan2(p[:, 1] - cen[1], p[:, 0] - cen[0])
+            rel = (ang - ang0) % (2 * np.pi) if ccw else (ang0 - ang) % (2 * np.pi)
+            on = np.abs(np.hypot(*(p - cen).T) - r)
+            ends = np.minimum(np.hypot(*(p - a).T), np.hypot(*(p - b).T))
+            d = np.where(rel <= span, on, ends)
+        else:
+            ab = b - a
+            t = np.clip((p - a) @ ab / max(ab @ ab, 1e-300), 0.0, 1.0)
+            d = np.hypot(*(p - a - t[:, None] * ab).T)
+        best = np.minimum(best, d)
+    return best
+
+
+def _point_to_polyline(p, xy):
+    a, ab = xy[:-1], np.diff(xy, axis=0)
+    ap = p[:, None, :] - a[None]
+    t = np.clip(np.einsum("pkj,kj->pk", ap, ab) / np.maximum(np.einsum("kj,kj->k", ab, ab), 1e-300),
+                0.0, 1.0)
+    d = ap - t[..., None] * ab[None]
+    return np.sqrt(np.einsum("pkj,pkj->pk", d, d).min(axis=1))
+
+
+def _parse(xy, tmp_path):
+    pd = PathData(xy, np.zeros(len(xy)), tangent_angles(np.column_stack((xy, np.zeros(len(xy))))),
+                  meta={"depth": 1.0})
+    # Bilinmeyen orijin modu: ofset yok, G-kodu kaynakla aynı koordinatlarda
+    program = gcode_program_flat(pd, origin_mode="yok",
+                                 arc_tolerance=TOLERANCE - RESOLUTION)
+    path = tmp_path / "yay.nc"
+    path.write_text(program.text())
+    return program, parse_gcode(str(path))
+
+
+@pytest.mark.parametrize("name", list(CONTOURS))
+def test_arcs_stay_within_tolerance_of_source_points(name, tmp_path):
+    xy = CONTOURS[name]
+    program, parsed = _parse(xy, tmp_path)
+    moves = _moves(parsed)
+
+    # Her kaynak nokta okunan yola toleransta yakın
+    assert _point_to_moves(xy, moves).max() <= TOLERANCE
+
+    # Yaylar noktalar arasında da kaynak çizgiden uzaklaşmıyor (ters yön /
+    # yanlış taraf mm mertebesinde sapar). Kaynak çizginin kirişleri de
+    # eğriden sapar, bu yüzden burada bir tolerans payı daha verilir.
+    s, e, c, kind = moves
+    arc = kind >= 2
+    samples = [_arc_points(a, b, cen, k == ARC_CCW, 16)
+               for a, b, cen, k in zip(s[arc], e[arc], c[arc], kind[arc])]
+    if samples:
+        assert _point_to_polyline(np.vstack(samples), xy).max() <= 2 * TOLERANCE
+
+
+@pytest.mark.parametrize("name", ["çember", "elips", "conta", "spiral"])
+def test_curved_contours_use_arcs(name, tmp_path):
+    xy = CONTOURS[name]
+    program, parsed = _parse(xy, tmp_path)
+    assert np.count_nonzero(parsed.kind >= 2) > 0
+    assert len(parsed) < len(xy) / 4
+
+
+def test_fit_reports_deviation_within_tolerance():
+    for xy in CONTOURS.values():
+        assert fit_arcs(xy, tolerance=TOLERANCE).max_deviation <= TOLERANCE
@@ -0,0 +1,184 @@
+"""
+Vektörel G-kodu motorunun çıktısı, eski satır satır f-string üreticiyle
+bayt bayt aynı olmalı (2D ve 3D; orijin modları, bıçak ofsetleri, NaN /
+sonsuz / çok büyük değerler).
+"""
+
+import numpy as np
+import pytest
+
+from gcode_generator import _compute_origin_offset, generate_gcode_3d, generate_gcode_flat
+from path_generator import PathData
+
+ORIGIN_MODES = ("bottom_left", "bottom_right", "top_left", "top_right", "center", "bilinmeyen")
+OFFSETS = (0.0, 90.0, -180.0, 37.5)
+
+
+# ---- eski üreticiler (gcode_format öncesi, değiştirmeden) ----
+
+def _fmt(v, decimals=3):
+    try:
+        return f"{float(v):.{decimals}f}"
+    except Exception:
+        return str(v)
+
+
+def _ref_xy(path_data, origin_mode):
+    xy = np.asarray(path_data.xy, dtype=float)
+    ox, oy = _compute_origin_offset(xy, origin_mode)
+    return xy - np.array([ox, oy])
+
+
+def _ref_flat(path_data, feed_xy=2000.0, safe_z=5.0, cut_z=-1.0, knife_axis="A",
+              knife_offset_deg=0.0, origin_mode="bottom_left"):
+    xy = _ref_xy(path_data, origin_mode)
+    depth = None
+    if isinstance(getattr(path_data, "meta", None), dict) and "depth" in path_data.meta:
+        try:
+            depth = float(path_data.meta["depth"])
+        except Exception:
+            depth = None
+    if depth is not None:
+        cut_z = -abs(depth)
+    angles = None
+    if getattr(path_data, "angles", None) is not None:
+        angles = np.asarray(path_data.angles, dtype=float)
+        if angles.shape[0] != xy.shape[0]:
+            angles = None
+
+    lines = ["(Tangential CAM - 2D G-kodu, Z takibi yok)", "G21  (mm)",
+             "G90  (mutlak koordinat)", "G54", f"G0 Z{_fmt(safe_z)}"]
+    x0, y0 = xy[0]
+    cmd0 = f"G0 X{_fmt(x0)} Y{_fmt(y0)}"
+    if angles is not None:
+        cmd0 += f" {knife_axis}{_fmt(angles[0] + knife_offset_deg)}"
+    lines.append(cmd0)
+    lines.append(f"G1 Z{_fmt(cut_z)} F{_fmt(feed_xy)}")
+    for i, (x, y) in enumerate(xy[1:], start=1):
+        cmd = f"G1 X{_fmt(x)} Y{_fmt(y)}"
+        if angles is not None:
+            cmd += f" {knife_axis}{_fmt(angles[i] + knife_offset_deg)}"
+        cmd += f" F{_fmt(feed_xy)}"
+        lines.append(cmd)
+    lines.append(f"G0 Z{_fmt(safe_z)}")
+    lines.append("M30")
+    return "\n".join(lines)
+
+
+def _ref_3d(path_data, feed_xy=2000.0, feed_z=800.0, safe_z=5.0, knife_axis="A",
+            knife_offset_deg=0.0, origin_mode="bottom_left"):
+    xy = _ref_xy(path_data, origin_mode)
+    z = None
+    if getattr(path_data, "z", None) is not None:
+        z = np.asarray(path_data.z, dtype=float)
+        if z.shape[0] != xy.shape[0]:
+            z = None
+    angles = None
+    if getattr(path_data, "angles", None) is not None:
+        angles = np.asarray(path_data.angles, dtype=float)
+        if angles.shape[0] != xy.shape[0]:
+            angles = None
+
+    lines = ["(Tangential CAM - 3D G-kodu, Z takipli)", "G21  (mm)",
+             "G90  (mutlak koordinat)", "G54", f"G0 Z{_fmt(safe_z)}"]
+    x0, y0 = xy[0]
+    cmd = f"G0 X{_fmt(x0)} Y{_fmt(y0)}"
+    if angles is not None:
+        cmd += f" {knife_axis}{_fmt(angles[0] + knife_offset_deg)}"
+    lines.append(cmd)
+    if z is not None:
+        lines.append(f"G1 Z{_fmt(z[0])} F{_fmt(feed_z)}")
+    for i in range(1, xy.shape[0]):
+        x, y = xy[i]
+        cmd = f"G1 X{_fmt(x)} Y{_fmt(y)} F{_fmt(feed_xy)}"
+        if z is not None:
+            cmd += f" Z{_fmt(z[i])}"
+        if angles is not None:
+            cmd += f" {knife_axis}{_fmt(angles[i] + knife_offset_deg)}"
+        lines.append(cmd)
+    lines.append(f"G0 Z{_fmt(safe_z)}")
+    lines.append("M30")
+    return "\n".join(lines)
+
+
+# ---- yollar ----
+
+def _path(n=500, seed=0, meta=None):
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0.0, 2.0 * np.pi, n)
+    xy = np.column_stack((200 + 150 * np.cos(t), 400 + 350 * np.sin(t)))
+    xy += rng.normal(scale=0.05, size=xy.shape)
+    z = rng.uniform(-2.0, 0.0, n)
+    angles = rng.uniform(-180.0, 180.0, n)
+    return PathData(xy, z, angles, meta={"depth": 1.0} if meta is None else meta)
+
+
+def _odd_path():
+    """Yuvarlama sınırları, -0, NaN, sonsuz ve çok büyük değerler."""
+    pd = _path(40, seed=1)
+    pd.xy[3] = (0.0005, -0.0005)            # yarım yuvarlama, negatif sıfır
+    pd.xy[4] = (1e15, -1e15)
+    pd.xy[5] = (123456789.9995, 2.0004999)
+    pd.z[6] = np.nan
+    pd.z[7] = np.inf
+    pd.z[8] = -np.inf
+    pd.z[9] = -0.0004
+    pd.angles[10] = np.nan
+    pd.angles[11] = 1e300
+    pd.angles[12] = -1e20
+    return pd
+
+
+def _paths():
+    no_angles = _path(50, seed=2)
+    no_angles.angles = None
+    no_z = _path(50, seed=3)
+    no_z.z = None
+    short_z = _path(50, seed=4)
+    short_z.z = short_z.z[:10]
+    return {
+        "normal": _path(),
+        "tek nokta": _path(1),
+        "uç değerler": _odd_path(),
+        "açı yok": no_angles,
+        "z yok": no_z,
+        "z boyu farklı": short_z,
+        "derinlik yok": _path(50, seed=5, meta={}),
+    }
+
+
+PATHS = _paths()
+
+
+def _assert_same(new, ref):
+    if new != ref:
+        a, b = new.split("\n"), ref.split("\n")
+        for i, (x, y) in enumerate(zip(a, b)):
+            if x != y:
+                pytest.fail(f"satır {i}: {x!r} != {y!r}")
+        pytest.fail(f"satır sayısı {len(a)} != {len(b)}")
+
+
+@pytest.mark.parametrize("name", list(PATHS))
+@pytest.mark.parametrize("origin_mode", ORIGIN_MODES)
+@pytest.mark.parametrize("offset", OFFSETS)
+def test_flat_matches_reference(name, origin_mode, offset):
+    pd = PATHS[name]
+    kw = dict(knife_offset_deg=offset, origin_mode=origin_mode)
+    _assert_same(generate_gcode_flat(pd, **kw), _ref_flat(pd, **kw))
+
+
+@pytest.mark.parametrize("name", list(PATHS))
+@pytest.mark.parametrize("origin_mode", ORIGIN_MODES)
+@pytest.mark.parametrize("offset", OFFSETS)
+def test_3d_matches_reference(name, origin_mode, offset):
+    pd = PATHS[name]
+    kw = dict(knife_offset_deg=offset, origin_mode=origin_mode)
+    _assert_same(generate_gcode_3d(pd, **kw), _ref_3d(pd, **kw))
+
+
+def test_non_default_parameters_match_reference():
+    pd = _odd_path()
+    kw = dict(feed_xy=1234.5678, safe_z=-0.0001, knife_axis="C")
+    _assert_same(generate_gcode_flat(pd, cut_z=-3.3335, **kw), _ref_flat(pd, cut_z=-3.3335, **kw))
+    _assert_same(generate_gcode_3d(pd, feed_z=1e9, **kw), _ref_3d(pd, feed_z=1e9, **kw))
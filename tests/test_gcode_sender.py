@@ -0,0 +1,66 @@
+"""
+GCodeSender'ı pty üzerindeki GrblEmulator'a karşı akıt: alma tamponu
+hiç taşmamalı ve kontrolcünün aldığı satırlar gönderilenlerle aynı olmalı.
+"""
+
+import numpy as np
+import pytest
+
+import gcode_sender
+from gcode_sender import GCodeSender, GrblEmulator, SenderError, iter_lines, open_port
+
+pytestmark = pytest.mark.skipif(gcode_sender.pty is None, reason="pty yok (Windows)")
+
+
+def _program(n=300):
+    rng = np.random.default_rng(0)
+    lines = ["(deneme programı)", "G21", "G90", "G0 Z5.000"]
+    for i, (x, y, a) in enumerate(rng.uniform(-500, 500, size=(n, 3))):
+        line = f"G1 X{x:.3f} Y{y:.3f} A{a:.3f}"
+        if i % 7 == 0:
+            line += f" F{1000 + i}  ; besleme"
+        lines.append(line)
+    lines.append("M2")
+    text = "\n".join(lines) + "\n"
+    # Satırları parça sınırında bölen parçalar
+    return [text[i:i + 97] for i in range(0, len(text), 97)]
+
+
+@pytest.mark.parametrize("mode", GCodeSender.MODES)
+def test_stream_against_emulator(mode):
+    chunks = _program()
+    sent = list(iter_lines(chunks))
+    with GrblEmulator(block_time=0.0005, latency=0.001) as emu:
+        emu.keep_lines = len(sent) + 10
+        port = open_port(emu.path)
+        try:
+            sender = GCodeSender(port, mode=mode, timeout=10.0)
+            sender.wake()
+            stats = sender.stream(iter(chunks))
+        finally:
+            port.close()
+        assert emu.overflows == 0
+        assert emu.max_rx <= emu.rx_buffer
+        assert emu.received == sent
+    assert stats["sent_lines"] == stats["acked_lines"] == len(sent)
+    assert stats["errors"] == []
+
+
+def test_main_stops_emulator_when_port_fails(monkeypatch, tmp_path):
+    program = tmp_path / "is.nc"
+    program.write_text("G0 X0\n")
+    started = []
+
+    class Emulator(GrblEmulator):
+        def start(self):
+            started.append(self)
+            return super().start()
+
+    def fail(path, baud=115200):
+        raise SenderError("port açılamadı")
+
+    monkeypatch.setattr(gcode_sender, "GrblEmulator", Emulator)
+    monkeypatch.setattr(gcode_sender, "open_port", fail)
+    assert gcode_sender.main([str(program), "--emulate"]) == 1
+    assert len(started) == 1
+    assert started[0]._thread is None and started[0]._master is None
@@ -0,0 +1,129 @@
+"""
+Bölme ve devam programları: parçalar gcode_parser ile geri okunur; giriş
+blokları dışındaki kesme hareketleri tam programınkilerle aynı olmalı
+(yaylar, kompakt çıktının atlanan modal kelimeleri ve planlı besleme dahil).
+"""
+
+import numpy as np
+import pytest
+
+from feed_schedule import apply_feed_schedule
+from gcode_generator import gcode_program_3d, gcode_program_flat
+from gcode_parser import parse_gcode
+from gcode_split import resume_program, split_program, write_parts
+from gcode_writer import write_gcode
+from knife_glyphs import tangent_angles
+from path_generator import PathData
+
+SAFE_Z = 5.0
+
+
+def _path(feed_schedule):
+    # Yuvarlatılmış dikdörtgen (yaylar), testere dişi (kaldırılan köşeler)
+    # ve yaya uymayan rastgele yürüyüş
+    k = 60
+    t = np.linspace(0.0, 0.5 * np.pi, k)
+    loop = np.vstack([np.column_stack((cx + 20 * np.cos(t + a0), cy + 20 * np.sin(t + a0)))
+                      for cx, cy, a0 in ((180, 80, 0.0), (20, 80, 0.5 * np.pi),
+                                         (20, 20, np.pi), (180, 20, 1.5 * np.pi))])
+    saw = np.column_stack((200 + 5 * np.arange(40), 10 + 8 * (np.arange(40) % 2)))
+    walk = (450, 50) + np.cumsum(np.random.default_rng(0).uniform(0.5, 2.0, (300, 2)), axis=0)
+    xy = np.vstack((loop, loop[:1], saw, loop + (250, 0), walk))
+    z = -1.0 - 0.5 * np.sin(np.linspace(0.0, 6.0 * np.pi, len(xy)))
+    pd = PathData(xy, z, tangent_angles(xy), meta={"depth": 1.0})
+    if feed_schedule:
+        apply_feed_schedule(pd, feed_max=2000.0, feed_min=200.0, corner_deg=60.0,
+                            a_vmax=20000.0)
+        assert pd.lift.any() and (pd.feed[1:] < 2000.0).any()
+    return pd
+
+
+def _program(kind, compact, arcs, feed_schedule):
+    build = gcode_program_3d if kind == "3d" else gcode_program_flat
+    return build(_path(feed_schedule), safe_z=SAFE_Z, origin_mode="yok", compact=compact,
+                 arc_tolerance=0.01 if arcs else 0.0)
+
+
+def _parse(chunks, path):
+    write_gcode(str(path), chunks)
+    return parse_gcode(str(path))
+
+
+def _cuts(parsed):
+    """XY'de ilerleyen G1/G2/G3 hareketleri: (tür, bitiş, besleme, merkez)."""
+    moved = np.any(parsed.end[:, :2] != parsed.starts()[:, :2], axis=1)
+    keep = (parsed.kind >= 1) & moved
+    return (parsed.kind[keep], parsed.end[keep], parsed.feed[keep],
+            np.nan_to_num(parsed.center[keep], nan=0.0))
+
+
+def _concat(cuts):
+    return tuple(np.concatenate(cols) for cols in zip(*cuts))
+
+
+def _assert_same(a, b):
+    np.testing.assert_array_equal(a[0], b[0])
+    np.testing.assert_allclose(a[1], b[1], atol=1e-9)
+    np.testing.assert_allclose(a[2], b[2], atol=1e-9)
+    np.testing.assert_allclose(a[3], b[3], atol=1e-9)
+
+
+def _assert_rapids_at_safe_z(parsed):
+    # Giriş bloğu bıçağı kaldırmadan XY'de hızlı hareket etmemeli
+    moved = np.any(parsed.end[:, :2] != parsed.starts()[:, :2], axis=1)
+    rapid = (parsed.kind == 0) & moved
+    np.testing.assert_array_equal(parsed.end[rapid, 2], SAFE_Z)
+
+
+CASES = [(kind, compact, arcs, feed)
+         for kind in ("flat", "3d") for compact in (False, True)
+         for arcs in (False, True) for feed in (False, True)]
+
+
+@pytest.mark.parametrize("kind,compact,arcs,feed", CASES)
+def test_split_parts_repeat_full_program_cuts(kind, compact, arcs, feed, tmp_path):
+    program = _program(kind, compact, arcs, feed)
+    full = _cuts(_parse(program.iter_chunks(), tmp_path / "tam.nc"))
+    assert len(full[0]) > 300
+    if arcs:
+        assert (full[0] >= 2).any()
+
+    for mode in ({"parts": 4}, {"max_lines": 90}, {"max_bytes": 2500}):
+        parts = split_program(program, **mode)
+        assert len(parts) > 1, mode
+        written = write_parts(str(tmp_path / "is.nc"), parts)
+        parsed = [parse_gcode(fname) for fname, _stats in written]
+        for p in parsed:
+            _assert_rapids_at_safe_z(p)
+        _assert_same(_concat([_cuts(p) for p in parsed]), full)
+        if "max_lines" in mode:
+            assert max(stats["lines"] for _f, stats in written) <= mode["max_lines"]
+        if "max_bytes" in mode:
+            assert max(stats["chars"] for _f, stats in written) <= mode["max_bytes"]
+
+
+@pytest.mark.parametrize("kind,compact,arcs,feed", CASES)
+def test_resume_repeats_tail_of_full_program(kind, compact, arcs, feed, tmp_path):
+    program = _program(kind, compact, arcs, feed)
+    parsed = _parse(program.iter_chunks(), tmp_path / "tam.nc")
+    full = _cuts(parsed)
+    moved = np.any(parsed.end[:, :2] != parsed.starts()[:, :2], axis=1)
+    cut_lines = parsed.line[(parsed.kind >= 1) & moved]
+
+    for line in (len(program.header) + 1, program.line_count() // 3,
+                 2 * program.line_count() // 3):
+        resumed = resume_program(program, gcode_line=line)
+        tail = _parse(resumed.iter_chunks(), tmp_path / f"devam_{line}.nc")
+        _assert_rapids_at_safe_z(tail)
+        cuts = _cuts(tail)
+        n = len(cuts[0])
+        # İstenen satırdan (0'dan: line - 1) itibaren her kesme tekrarlanır
+        assert n >= np.count_nonzero(cut_lines >= line - 1)
+        _assert_same(cuts, tuple(col[len(full[0]) - n:] for col in full))
+
+    # Yol noktasından devam: o noktaya giden kesme yeniden yapılır
+    resumed = resume_program(program, path_index=150)
+    tail = _cuts(_parse(resumed.iter_chunks(), tmp_path / "devam_nokta.nc"))
+    n = len(tail[0])
+    assert 0 < n < len(full[0])
+    _assert_same(tail, tuple(col[len(full[0]) - n:] for col in full))
@@ -0,0 +1,31 @@
+import numpy as np
+import trimesh
+
+from gl_resources import crease_normals
+
+
+def test_box_corners_keep_face_normals():
+    box = trimesh.creation.box(extents=(10, 20, 30))
+    positions, normals, faces = crease_normals(box.vertices, box.faces)
+    # 90°'lik kenarlarda bölünür: 6 yüz x 4 köşe (özgün 8 köşe başta kalır)
+    assert len(positions) == 8 + 24
+    np.testing.assert_allclose(positions[faces], box.vertices[box.faces], atol=1e-6)
+    np.testing.assert_allclose(normals[faces], np.repeat(box.face_normals[:, None], 3, axis=1),
+                               atol=1e-6)
+    np.testing.assert_allclose(positions[:8], box.vertices, atol=1e-6)
+
+
+def test_smooth_surface_is_not_split():
+    sphere = trimesh.creation.icosphere(3, radius=5.0)
+    positions, normals, faces = crease_normals(sphere.vertices, sphere.faces)
+    assert len(positions) == len(sphere.vertices)
+    radial = positions / np.linalg.norm(positions, axis=1)[:, None]
+    assert np.einsum("ij,ij->i", normals, radial).min() > 0.999
+
+
+def test_cylinder_splits_only_cap_edges():
+    cyl = trimesh.creation.cylinder(radius=1.0, height=2.0, sections=32)
+    positions, normals, faces = crease_normals(cyl.vertices, cyl.faces)
+    # Kenar çemberlerindeki her köşe yan yüz + kapak olarak ikiye ayrılır
+    assert len(np.unique(faces)) == len(cyl.vertices) + 2 * 32
+    assert set(np.round(normals[np.unique(faces), 2], 6)) == {-1.0, 0.0, 1.0}
@@ -0,0 +1,76 @@
+import numpy as np
+
+from import_2d import _close_flat, load_2d_outer, load_dxf_contours, outer_contour, polygon_area
+
+
+def _dxf(entities):
+    lines = ["0", "SECTION", "2", "ENTITIES"] + entities + ["0", "ENDSEC", "0", "EOF"]
+    return "\n".join(lines) + "\n"
+
+
+def _lwpolyline(vertices, closed=True):
+    out = ["0", "LWPOLYLINE", "8", "0", "90", str(len(vertices)), "70", "1" if closed else "0"]
+    for x, y, bulge in vertices:
+        out += ["10", str(x), "20", str(y)]
+        if bulge:
+            out += ["42", str(bulge)]
+    return out
+
+
+def _line(a, b):
+    return ["0", "LINE", "8", "0", "10", str(a[0]), "20", str(a[1]),
+            "11", str(b[0]), "21", str(b[1])]
+
+
+def test_close_flat_matches_per_contour_close():
+    rng = np.random.default_rng(0)
+    counts = np.array([3, 1, 4, 2])
+    points = rng.uniform(size=(counts.sum(), 2))
+    points[6] = points[3]          # 3. kontur zaten kapalı
+    out, new_counts = _close_flat(points, counts)
+
+    start = 0
+    expected = []
+    for n in counts:
+        c = points[start:start + n]
+        start += n
+        expected.append(c if np.array_equal(c[0], c[-1]) else np.vstack((c, c[:1])))
+    assert new_counts.tolist() == [len(c) for c in expected]
+    np.testing.assert_array_equal(out, np.vstack(expected))
+
+
+def test_outer_matches_full_contour_list(tmp_path):
+    ents = []
+    # Bulge'lı küçük kapalı polyline'lar (biri saat yönünde)
+    for k in range(20):
+        x = 12.0 * k
+        verts = [(x, 0, 0), (x + 10, 0, 0.4), (x + 10, 10, 0), (x, 10, -0.3)]
+        ents += _lwpolyline(verts[::-1] if k % 2 else verts)
+    # Dış kontur: açık polyline + LINE zinciri, dairesel yaylı
+    ents += _lwpolyline([(-5, -5, 0), (300, -5, 0.5), (300, 20, 0)], closed=False)
+    ents += _line((300, 20), (-5, 20)) + _line((-5, 20), (-5, -5))
+    ents += ["0", "CIRCLE", "8", "0", "10", "100", "20", "40", "40", "6"]
+    path = tmp_path / "parts.dxf"
+    path.write_text(_dxf(ents))
+
+    contours = load_dxf_contours(str(path))
+    assert len(contours) == 22
+    assert all(np.array_equal(c[0], c[-1]) for c in contours)
+
+    outer, n = load_2d_outer(str(path))
+    assert n == 22
+    np.testing.assert_array_equal(outer, outer_contour(contours))
+    assert abs(polygon_area(outer)) > 300 * 25
+
+
+def test_outer_uses_bulge_area(tmp_path):
+    # Kare 100 + yarım daire 39.27 = 139.27; r=6.6 daire 136.85, r=6.7 daire 141.03
+    square = _lwpolyline([(0, 0, 0), (10, 0, 1.0), (10, 10, 0), (0, 10, 0)])
+    for r, expect_circle in ((6.6, False), (6.7, True)):
+        circle = ["0", "CIRCLE", "8", "0", "10", "50", "20", "0", "40", str(r)]
+        path = tmp_path / f"r{r}.dxf"
+        path.write_text(_dxf(square + circle))
+        outer, n = load_2d_outer(str(path))
+        assert n == 2
+        assert (outer[:, 0].min() > 40) == expect_circle
+        np.testing.assert_array_equal(outer, outer_contour(load_dxf_contours(str(path))))
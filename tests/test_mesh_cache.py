@@ -0,0 +1,16 @@
+import os
+
+import numpy as np
+import trimesh
+
+import mesh_cache
+from mesh_cache import load_cached_arrays, store_mesh
+
+
+def test_store_skips_empty_mesh(monkeypatch, tmp_path):
+    monkeypatch.setattr(mesh_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "bos.stl"
+    path.write_bytes(b"\0" * 84)
+    store_mesh(str(path), trimesh.Trimesh(np.zeros((0, 3)), np.zeros((0, 3), dtype=int)))
+    assert not os.path.exists(mesh_cache.CACHE_DIR)
+    assert load_cached_arrays(str(path)) is None
@@ -0,0 +1,30 @@
+import numpy as np
+
+from path_generator import _HeightField
+
+
+def _field():
+    hf = _HeightField(cell=1.0)
+    # (0,0) hücresi alçak, komşu (1,0) hücresi yüksek duvar
+    hf.add_points(np.array([[0.5, 0.5, 1.0], [1.5, 0.5, 9.0], [5.5, 5.5, 3.0]]))
+    return hf
+
+
+def test_sample_own_cell_ignores_neighbours():
+    hf = _field()
+    z = hf.sample(np.array([[0.5, 0.5]]))
+    assert z[0] == 1.0
+
+
+def test_sample_unaffected_by_missing_point_in_same_call():
+    hf = _field()
+    alone = hf.sample(np.array([[0.5, 0.5]]))
+    # (-1,0) hücresi boş (komşusu (0,0) dolu); (20,20) ve komşuları boş
+    together = hf.sample(np.array([[0.5, 0.5], [-0.5, 0.5], [20.0, 20.0]]))
+    assert together[0] == alone[0]
+    assert together[1] == 1.0           # boş hücre: komşuların en büyüğü
+    assert np.isnan(together[2])        # komşuları da boş
+
+
+def test_sample_empty_field():
+    assert np.isnan(_HeightField().sample(np.zeros((2, 2)))).all()
@@ -0,0 +1,427 @@
+# thumbnail.py
+"""
+OpenGL'siz (ekransız, GPU'suz) PNG önizleme resimleri.
+
+Toplu işler ve iş arşivi için: mesh, Model sekmesindeki dönüşümüyle
+gölgeli olarak, takım yolu üstüne çizgi olarak tamamen NumPy ile
+çizilir. Qt / OpenGL içe aktarılmaz.
+
+Tarama (rasterization):
+
+    - Köşeler bir kez dönüştürülür ve dik (ortografik) izdüşümle ekrana
+      yerleştirilir; resim, mesh + yolun kutusuna sığdırılır.
+    - Üçgen hazırlığı vektöreldir: her üçgen için iki ağırlık merkezi
+      (barycentric) katsayısının ve derinliğin ekran düzlemindeki doğrusal
+      denklemi (ax + by + c) hesaplanır.
+    - Her üçgenin kutusundaki piksel merkezleri np.repeat ile parça
+      (fragment) dizisine açılır (bellek için FRAGMENT_CHUNK'lık gruplar
+      halinde), üçgen içinde kalanlar tutulur.
+    - Z tamponu: derinlik ve gölge tek int64 anahtarda birleştirilir
+      (üst bitler nicemlenmiş derinlik, alt 8 bit gölge); en yakın parça
+      np.minimum.at ile seçilir.
+
+Gölgeleme düz (yüz normali) Lambert'tir, iki yüzlü. Yol, derinlik testi
+olmadan üstte çizilir (kesim derinliği yüzeyin altında kaldığından
+gölgeli yüzeyde görünmezdi); path_colors modlarıyla renklendirilebilir.
+
+Varsayılanlar tangential_cam.ini [thumbnail] bölümünden okunur:
+
+    size      = 256       resim boyu (piksel; "512" ya da "640x480")
+    azimuth   = -60       bakış yönü, Z ekseni etrafında (derece)
+    elevation = 35        bakış yönünün XY düzlemiyle açısı (derece)
+
+Komut satırı (proje .tcam ya da .stl dosyaları):
+
+    python thumbnail.py is1.tcam is2.tcam --size 512 --out-dir onizleme/
+"""
+
+import argparse
+import logging
+import os
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from settings import load_settings, load_section
+
+log = logging.getLogger(__name__)
+
+DEFAULT_THUMBNAIL = {
+    "size": (256, 256),
+    "azimuth": -60.0,
+    "elevation": 35.0,
+}
+
+# Bir seferde açılan en fazla parça (piksel adayı) sayısı
+FRAGMENT_CHUNK = 1_000_000
+# Resim kenarında bırakılan boşluk (oran)
+MARGIN = 0.05
+# Yol rengi (3D önizlemedeki gibi) ve çizgi kalınlığı (piksel)
+PATH_COLOR = (255, 51, 0)
+PATH_WIDTH = 2
+# Ortam ışığı payı (kalanı yöne bağlı)
+AMBIENT = 0.3
+
+_DEPTH_BITS = 47
+
+
+def parse_size(text) -> tuple:
+    """"512" -> (512, 512), "640x480" -> (640, 480)."""
+    parts = [int(float(p)) for p in str(text).lower().replace("×", "x").split("x")]
+    if len(parts) == 1:
+        parts *= 2
+    if len(parts) != 2 or min(parts) < 8:
+        raise ValueError(f"geçersiz boyut: {text}")
+    return parts[0], parts[1]
+
+
+def thumbnail_settings() -> dict:
+    """INI [thumbnail] bölümü (eksik anahtarlar için DEFAULT_THUMBNAIL)."""
+    data = dict(DEFAULT_THUMBNAIL)
+    section = load_section("thumbnail")
+    try:
+        if "size" in section:
+            data["size"] = parse_size(section["size"])
+        for key in ("azimuth", "elevation"):
+            if key in section:
+                data[key] = float(section[key])
+    except ValueError:
+        log.warning("tangential_cam.ini [thumbnail] okunamadı, varsayılanlar kullanılıyor")
+        return dict(DEFAULT_THUMBNAIL)
+    return data
+
+
+def _hex_rgb(text: str, default) -> np.ndarray:
+    try:
+        text = text.lstrip("#")
+        return np.array([int(text[i:i + 2], 16) for i in (0, 2, 4)], dtype=float)
+    except (ValueError, AttributeError):
+        return np.asarray(default, dtype=float)
+
+
+def view_basis(azimuth: float, elevation: float) -> np.ndarray:
+    """
+    (3,3) satırları: ekran sağı, ekran yukarısı, kameraya doğru (Z yukarı
+    dünyada, azimuth / elevation yönünden bakış).
+    """
+    az, el = np.radians(azimuth), np.radians(elevation)
+    toward = np.array([np.cos(el) * np.cos(az), np.cos(el) * np.sin(az), np.sin(el)])
+    right = np.cross((0.0, 0.0, 1.0), toward)
+    if np.linalg.norm(right) < 1e-9:        # tam tepeden bakış
+        right = np.array([1.0, 0.0, 0.0])
+    right /= np.linalg.norm(right)
+    up = np.cross(toward, right)
+    return np.vstack((right, up, toward))
+
+
+class Rasterizer:
+    """
+    Ekran: (height, width); x sağa, y yukarı (satırlar PNG'ye yazılırken
+    çevrilir). Z tamponu int64 anahtarlardır, resim ancak resolve()'da
+    renklendirilir.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = int(width)
+        self.height = int(height)
+        self.zkey = np.full(self.width * self.height, np.iinfo(np.int64).max, dtype=np.int64)
+        self.fragments = 0      # denenen piksel adayı
+        self.triangles = 0      # en az bir adayı olan üçgen
+
+    def triangles_flat(self, screen, depth, faces, shade, zrange):
+        """
+        screen: (V,2) piksel koordinatı, depth: (V,) (küçük = yakın),
+        faces: (F,3), shade: (F,) 0..1 yüz gölgesi, zrange: (zmin, zmax).
+        """
+        x = screen[:, 0][faces]
+        y = screen[:, 1][faces]
+        z = depth[faces]
+        x0, x1, x2 = x.T
+        y0, y1, y2 = y.T
+        area = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+
+        # Piksel merkezleri i + 0.5: kutu [ceil(min - .5), floor(max - .5)]
+        xmin = np.maximum(np.ceil(x.min(axis=1) - 0.5), 0).astype(np.int64)
+        xmax = np.minimum(np.floor(x.max(axis=1) - 0.5), self.width - 1).astype(np.int64)
+        ymin = np.maximum(np.ceil(y.min(axis=1) - 0.5), 0).astype(np.int64)
+        ymax = np.minimum(np.floor(y.max(axis=1) - 0.5), self.height - 1).astype(np.int64)
+        bw = xmax - xmin + 1
+        bh = ymax - ymin + 1
+        live = np.flatnonzero((bw > 0) & (bh > 0) & (np.abs(area) > 1e-12))
+        if not len(live):
+            return
+        self.triangles += len(live)
+
+        # Üçgen hazırlığı: b0, b1 ve derinlik = a*x + b*y + c
+        inv = 1.0 / area[live]
+        x0, x1, x2 = x0[live], x1[live], x2[live]
+        y0, y1, y2 = y0[live], y1[live], y2[live]
+        z0, z1, z2 = z[live].T
+        b0 = np.column_stack(((y1 - y2) * inv, (x2 - x1) * inv, (x1 * y2 - x2 * y1) * inv))
+        b1 = np.column_stack(((y2 - y0) * inv, (x0 - x2) * inv, (x2 * y0 - x0 * y2) * inv))
+        # z = z2 + (z0 - z2) * b0 + (z1 - z2) * b1
+        dz = np.column_stack((z0 - z2, z1 - z2))
+        zp = b0 * dz[:, :1] + b1 * dz[:, 1:]
+        zp[:, 2] += z2
+        setup = np.hstack((b0, b1, zp))
+
+        zmin, zmax = zrange
+        zscale = ((1 << _DEPTH_BITS) - 1) / max(zmax - zmin, 1e-12)
+        shade8 = np.clip(np.round(shade[live] * 255.0), 0, 255).astype(np.int64)
+        xmin, ymin, bw = xmin[live], ymin[live], bw[live]
+        count = bw * bh[live]
+
+        # Üçgenleri toplam aday sayısı FRAGMENT_CHUNK'ı aşmayan gruplara böl
+        ends = np.cumsum(count)
+        cuts = np.searchsorted(ends, np.arange(FRAGMENT_CHUNK, ends[-1], FRAGMENT_CHUNK),
+                               side="right")
+        for lo, hi in zip(np.concatenate(([0], cuts)), np.concatenate((cuts, [len(live)]))):
+            if hi <= lo:
+                continue
+            self._fragments(setup[lo:hi], xmin[lo:hi], ymin[lo:hi], bw[lo:hi],
+                            count[lo:hi], shade8[lo:hi], zmin, zscale)
+
+    def _fragments(self, setup, xmin, ymin, bw, count, shade8, zmin, zscale):
+        total = int(count.sum())
+        self.fragments += total
+        tri = np.repeat(np.arange(len(count)), count)
+        local = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+        w = bw[tri]
+        px = (xmin[tri] + local % w).astype(np.float64)
+        py = (ymin[tri] + local // w).astype(np.float64)
+        del local, w
+        cx, cy = px + 0.5, py + 0.5
+        s = setup[tri]
+        b0 = s[:, 0] * cx + s[:, 1] * cy + s[:, 2]
+        b1 = s[:, 3] * cx + s[:, 4] * cy + s[:, 5]
+        eps = -1e-7
+        inside = (b0 >= eps) & (b1 >= eps) & (b0 + b1 <= 1.0 - eps)
+        tri, px, py, s = tri[inside], px[inside], py[inside], s[inside]
+        z = s[:, 6] * (px + 0.5) + s[:, 7] * (py + 0.5) + s[:, 8]
+        zq = np.clip((z - zmin) * zscale, 0, (1 << _DEPTH_BITS) - 1).astype(np.int64)
+        pix = py.astype(np.int64) * self.width + px.astype(np.int64)
+        np.minimum.at(self.zkey, pix, (zq << 8) | shade8[tri])
+
+    def resolve(self, color, background) -> np.ndarray:
+        """Z tamponundan (height, width, 3) uint8 resim (satır 0 = üst)."""
+        hit = self.zkey != np.iinfo(np.int64).max
+        img = np.empty((self.width * self.height, 3), dtype=np.float64)
+        img[:] = background
+        shade = (self.zkey[hit] & 0xFF) / 255.0
+        img[hit] = np.asarray(color, dtype=float) * shade[:, None]
+        img = np.clip(img, 0, 255).astype(np.uint8).reshape(self.height, self.width, 3)
+        return img[::-1].copy()
+
+
+def draw_polyline(img, screen, colors, width: int = PATH_WIDTH):
+    """
+    Ekran koordinatlı çoklu çizgiyi img (satır 0 = üst) üstüne çiz.
+    Segmentler piksel adımıyla örneklenir (vektörel); colors: (N,3) uint8,
+    her örnek bulunduğu segmentin bitiş noktasının rengini alır.
+    """
+    h, w = img.shape[:2]
+    p = np.asarray(screen, dtype=np.float64)
+    if len(p) < 2:
+        return
+    d = np.diff(p, axis=0)
+    steps = np.maximum(np.ceil(np.abs(d).max(axis=1)), 1).astype(np.int64)
+    seg = np.repeat(np.arange(len(d)), steps)
+    t = (np.arange(len(seg)) - np.repeat(np.cumsum(steps) - steps, steps)) / steps[seg]
+    q = p[seg] + d[seg] * t[:, None]
+    q = np.vstack((q, p[-1:]))
+    c = np.vstack((colors[seg + 1], colors[-1:]))
+    ix = np.floor(q[:, 0]).astype(np.int64)
+    iy = (h - 1) - np.floor(q[:, 1]).astype(np.int64)
+    for ox in range(width):
+        for oy in range(width):
+            x, y = ix + ox, iy - oy
+            ok = (x >= 0) & (x < w) & (y >= 0) & (y < h)
+            img[y[ok], x[ok]] = c[ok]
+
+
+def render(vertices=None, faces=None, matrix=None, path_points=None, path_colors=None,
+           size=None, azimuth=None, elevation=None, mesh_color=None, bg_color=None):
+    """
+    Mesh (+ yol) önizlemesi. Dönen: (height, width, 3) uint8.
+
+    vertices, faces : mesh (None: sadece yol)
+    matrix          : (4,4) mesh dönüşümü (stl_loader.make_transform_matrix)
+    path_points     : (N,3) yol, dönüştürülmüş mesh koordinatlarında
+    path_colors     : (N,3) uint8 nokta renkleri (None: PATH_COLOR)
+    Verilmeyen boyut / açılar INI [thumbnail], renkler [view] bölümünden.
+    """
+    cfg = thumbnail_settings()
+    width, height = parse_size(size) if size is not None else cfg["size"]
+    azimuth = cfg["azimuth"] if azimuth is None else azimuth
+    elevation = cfg["elevation"] if elevation is None else elevation
+    view = load_settings()
+    mesh_color = _hex_rgb(view["mesh_color"], (208, 112, 144)) if mesh_color is None \
+        else np.asarray(mesh_color, dtype=float)
+    bg_color = _hex_rgb(view["bg_color"], (68, 68, 68)) if bg_color is None \
+        else np.asarray(bg_color, dtype=float)
+
+    basis = view_basis(azimuth, elevation)
+    clouds = []
+    eye = None
+    if vertices is not None and faces is not None and len(faces):
+        v = np.asarray(vertices, dtype=np.float64)
+        if matrix is not None:
+            m = np.asarray(matrix, dtype=np.float64)
+            v = v @ m[:3, :3].T + m[:3, 3]
+        eye = v @ basis.T                   # (V,3): sağ, yukarı, kameraya doğru
+        clouds.append(eye[:, :2])
+    path_eye = None
+    if path_points is not None and len(path_points):
+        path_eye = np.asarray(path_points, dtype=np.float64)[:, :3] @ basis.T
+        clouds.append(path_eye[:, :2])
+    if not clouds:
+        img = np.empty((height, width, 3), dtype=np.uint8)
+        img[:] = np.clip(bg_color, 0, 255).astype(np.uint8)
+        return img
+
+    # Kutuyu oranı koruyarak resme sığdır
+    lo = np.min([c.min(axis=0) for c in clouds], axis=0)
+    hi = np.max([c.max(axis=0) for c in clouds], axis=0)
+    span = np.maximum(hi - lo, 1e-9)
+    scale = min(width * (1 - 2 * MARGIN) / span[0], height * (1 - 2 * MARGIN) / span[1])
+    offset = np.array([width, height]) / 2.0 - (lo + hi) / 2.0 * scale
+
+    rast = Rasterizer(width, height)
+    if eye is not None:
+        f = np.asarray(faces, dtype=np.int64)
+        # Yüz normalleri (göz uzayında) ve iki yüzlü Lambert gölge
+        tri = eye[f]
+        n = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+        n /= np.maximum(np.linalg.norm(n, axis=1), 1e-20)[:, None]
+        light = np.array([-0.3, 0.5, 1.0])
+        light /= np.linalg.norm(light)
+        shade = AMBIENT + (1.0 - AMBIENT) * np.abs(n @ light)
+        depth = -eye[:, 2]
+        rast.triangles_flat(eye[:, :2] * scale + offset, depth, f, shade,
+                            (float(depth.min()), float(depth.max())))
+    img = rast.resolve(mesh_color, bg_color)
+
+    if path_eye is not None:
+        if path_colors is None:
+            path_colors = np.tile(np.array(PATH_COLOR, dtype=np.uint8), (len(path_eye), 1))
+        draw_polyline(img, path_eye[:, :2] * scale + offset, path_colors)
+    return img
+
+
+def write_png(path: str, img):
+    """(H,W,3) uint8 resmi PNG olarak yaz (sadece zlib; ek paket gerekmez)."""
+    img = np.ascontiguousarray(img, dtype=np.uint8)
+    h, w = img.shape[:2]
+    # Her satırın başında filtre baytı (0: yok)
+    raw = np.zeros((h, 1 + w * 3), dtype=np.uint8)
+    raw[:, 1:] = img.reshape(h, w * 3)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return (struct.pack(">I", len(data)) + tag + data
+                + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+def _path_points(path_data):
+    """PathData -> (N,3) mesh koordinatlarında (3D önizleme gibi xy_geom öncelikli)."""
+    xy = getattr(path_data, "xy_geom", None)
+    if xy is None:
+        xy = getattr(path_data, "xy", None)
+    if xy is None or len(xy) == 0:
+        return None
+    xy = np.asarray(xy, dtype=np.float64)
+    z = getattr(path_data, "z", None)
+    z = np.zeros(len(xy)) if z is None or len(z) != len(xy) else np.asarray(z, dtype=np.float64)
+    return np.column_stack((xy[:, 0], xy[:, 1], z))
+
+
+def render_file(path: str, size=None, color_mode: str = "flat", with_path: bool = True):
+    """
+    Proje (.tcam) ya da STL dosyasının önizlemesi. Projede mesh, kayıtlı
+    dönüşümle; yol (varsa) üstüne çizilir.
+    """
+    from mesh_cache import load_stl_cached
+    from stl_loader import make_transform_matrix
+
+    if path.lower().endswith(".stl"):
+        mesh, _hit = load_stl_cached(path)
+        return render(mesh.vertices, mesh.faces, size=size)
+
+    from path_colors import PathColors
+    from project_file import load_project
+
+    proj = load_project(path)
+    vertices = faces = matrix = None
+    stl_path = proj.stl_path
+    if stl_path and os.path.exists(stl_path):
+        mesh, _hit = load_stl_cached(stl_path)
+        vertices, faces = mesh.vertices, mesh.faces
+        t = proj.transform
+        matrix = make_transform_matrix(t.get("rot_x", 0.0), t.get("rot_y", 0.0),
+                                       t.get("rot_z", 0.0), t.get("scale", 1.0))
+    elif stl_path:
+        log.warning("STL dosyası bulunamadı: %s", stl_path)
+
+    points = colors = None
+    path_data = proj.path_data() if with_path else None
+    if path_data is not None:
+        points = _path_points(path_data)
+        if points is not None and color_mode != "flat":
+            entry = PathColors(path_data, points, getattr(path_data, "angles", None)).get(color_mode)
+            colors = None if entry is None else entry[0]
+    return render(vertices, faces, matrix, points, colors, size=size)
+
+
+# ---------------------------------------------------------------------------
+# Komut satırı
+# ---------------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    from path_colors import COLOR_MODES
+
+    ap = argparse.ArgumentParser(description="Proje / STL dosyalarından PNG önizleme üret (OpenGL'siz).")
+    ap.add_argument("files", nargs="+", help="proje (.tcam) ya da STL dosyaları")
+    ap.add_argument("--size", help='resim boyu: "256" ya da "640x480" (varsayılan INI [thumbnail])')
+    ap.add_argument("--out-dir", help="PNG klasörü (varsayılan: dosyanın yanı)")
+    ap.add_argument("--color-mode", choices=[key for key, _label, _unit in COLOR_MODES],
+                    default="flat", help="yol renklendirmesi (path_colors)")
+    ap.add_argument("--no-path", action="store_true", help="yolu çizme")
+    args = ap.parse_args(argv)
+
+    if args.size:
+        try:
+            parse_size(args.size)
+        except ValueError as e:
+            ap.error(str(e))
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    failed = 0
+    t_all = time.perf_counter()
+    for src in args.files:
+        stem = os.path.splitext(os.path.basename(src))[0]
+        out = os.path.join(args.out_dir or os.path.dirname(src), stem + ".png")
+        t0 = time.perf_counter()
+        try:
+            img = render_file(src, args.size, args.color_mode, not args.no_path)
+            write_png(out, img)
+        except Exception as e:
+            failed += 1
+            print(f"{src}: hata: {e}")
+            continue
+        print(f"{out}: {img.shape[1]}x{img.shape[0]}, {time.perf_counter() - t0:.2f} s")
+    print(f"{len(args.files) - failed}/{len(args.files)} dosya, "
+          f"toplam {time.perf_counter() - t_all:.2f} s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())